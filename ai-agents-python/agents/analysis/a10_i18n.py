@@ -1,14 +1,37 @@
 """
 A10 - I18n Agent
 Analyse l'internationalisation du code.
+
+Les clés de traduction (clé aplatie -> locales, fichier) et les clés
+utilisées dans le code sont tenues dans un index persistant
+(`.ai-agents/cache/a10_i18n_keys.json`): seuls les fichiers dont la
+taille ou le mtime ont changé sont re-parsés, puis les rapports de clés
+manquantes / inutilisées sont recalculés en mémoire.
 """
 
+import os
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional, Callable, Tuple
 from dataclasses import dataclass
 import json
 
+try:
+    from core.file_index import FileIndex, FileEntry
+    from core.content_store import ContentStore
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex, FileEntry
+    from core.content_store import ContentStore
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+
 
 @dataclass
 class I18nFinding:
@@ -16,12 +39,109 @@ class I18nFinding:
     file_path: str
     line: int
     severity: str  # CRITICAL, HIGH, MEDIUM, LOW
-    category: str  # HARDCODED_TEXT, MISSING_TRANSLATION, MIXED_LANGS
+    category: str  # HARDCODED_TEXT, MISSING_TRANSLATION, UNUSED_TRANSLATION, MIXED_LANGS
     description: str
     recommendation: str
     text_found: str
 
 
+# Version du format de l'index des clés
+KEY_INDEX_VERSION = '2'
+
+# Nom de locale: fr, en, pt-BR, zh_Hans...
+LOCALE_RE = re.compile(r'^[a-z]{2,3}(?:[-_][A-Za-z]{2,4})?$')
+
+# Clé passée à t() / i18n.t() / $t() / translate() ou à <Trans i18nKey>;
+# `${` juste après = clé dynamique (préfixe)
+KEY_USAGE_RE = re.compile(
+    r'(?:(?:\bi18n\.t|\$t|\bt|\btranslate)\s*\(|\bi18nKey\s*=\s*\{?)\s*[\'"`]([A-Za-z0-9_.:-]+)(\$\{)?'
+)
+
+# `id: '...'` n'est une clé que dans defineMessages({...}) / formatMessage({...})
+MESSAGE_CALL_RE = re.compile(r'\b(?:defineMessages|formatMessage)\s*\(')
+MESSAGE_ID_RE = re.compile(r'\bid\s*:\s*[\'"`]([A-Za-z0-9_.:-]+)(\$\{)?')
+
+
+class TranslationIndex:
+    """
+    Index persistant des clés de traduction et de leurs usages
+    
+    Format:
+        
+        {"version": "2",
+         "translations": {"<json>": {"mtime", "size", "locale", "keys": [...]}},
+         "usages": {"<code>": {"mtime", "size", "keys": [...], "prefixes": [...]}}}
+    
+    Une entrée est réutilisée tant que la taille et le mtime du fichier
+    n'ont pas changé; les fichiers disparus sont retirés. Sans chemin
+    (--no-cache), l'index reste en mémoire: rien n'est lu ni écrit.
+    """
+    
+    SECTIONS = ('translations', 'usages')
+    
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.sections: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in self.SECTIONS}
+        self.parsed = 0  # Fichiers (re)parsés pendant ce run
+        self.dirty = False
+        if path is None:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == KEY_INDEX_VERSION:
+                for name in self.SECTIONS:
+                    self.sections[name] = data.get(name, {})
+        except (OSError, ValueError, AttributeError):
+            pass
+    
+    def update(self, name: str, entries: List[FileEntry], parse: Callable[[FileEntry], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Met à jour une section avec les fichiers courants
+        
+        Args:
+            name: 'translations' ou 'usages'
+            entries: Fichiers à indexer
+            parse: Calcule l'entrée d'un fichier modifié ou nouveau
+        
+        Returns:
+            La section (chemin relatif -> entrée)
+        """
+        section = self.sections[name]
+        current = set()
+        
+        for entry in entries:
+            current.add(entry.rel_path)
+            item = section.get(entry.rel_path)
+            if item is None or item['mtime'] != entry.mtime or item['size'] != entry.size:
+                item = parse(entry)
+                item['mtime'] = entry.mtime
+                item['size'] = entry.size
+                section[entry.rel_path] = item
+                self.parsed += 1
+                self.dirty = True
+        
+        for rel_path in [p for p in section if p not in current]:
+            del section[rel_path]
+            self.dirty = True
+        
+        return section
+    
+    def save(self):
+        """Écrit l'index (écriture atomique)"""
+        if not self.dirty or self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(self.sections, version=KEY_INDEX_VERSION), f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
 class A10I18nAgent:
     """
     Agent A10 - Analyse d'internationalisation.
@@ -68,17 +188,57 @@ class A10I18nAgent:
         ),
     }
     
+    # Règles appliquées à chaque fichier (ordre = ordre des findings);
+    # `group`: groupe du texte trouvé
+    RULES = [
+        Rule('french_in_jsx', PATTERNS['french_in_jsx'], meta=dict(
+            group=1,
+            severity='HIGH',
+            category='HARDCODED_TEXT',
+            description='Texte français hardcodé dans le JSX',
+            recommendation='Utiliser {t("key")} avec fichier de traduction',
+        )),
+        Rule('error_message', PATTERNS['error_message'], literals=('throw new Error', 'console.error', 'console.warn'), meta=dict(
+            group=3,
+            severity='MEDIUM',
+            category='HARDCODED_ERROR',
+            description='Message d\'erreur hardcodé',
+            recommendation='Déplacer dans fichier i18n pour traduction',
+        )),
+        Rule('hardcoded_placeholder', PATTERNS['hardcoded_placeholder'], literals=('placeholder=',), meta=dict(
+            group=1,
+            severity='MEDIUM',
+            category='HARDCODED_PLACEHOLDER',
+            description='Placeholder hardcodé',
+            recommendation='Utiliser placeholder={t("forms.placeholder")}',
+        )),
+        Rule('hardcoded_title', PATTERNS['hardcoded_title'], literals=('title=',), meta=dict(
+            group=1,
+            severity='LOW',
+            category='HARDCODED_TITLE',
+            description='Attribut title hardcodé',
+            recommendation='Utiliser title={t("tooltips.key")}',
+        )),
+    ]
+    
     # Mots-clés français communs
-    FRENCH_KEYWORDS = {
+    FRENCH_KEYWORDS = frozenset({
         'les', 'des', 'une', 'vous', 'pour', 'dans', 'avec', 'cette', 'votre',
         'notre', 'tous', 'tout', 'être', 'avoir', 'faire', 'très', 'même',
-    }
+    })
     
     # Mots-clés anglais communs
-    ENGLISH_KEYWORDS = {
+    ENGLISH_KEYWORDS = frozenset({
         'the', 'and', 'for', 'with', 'this', 'that', 'your', 'have', 'from',
         'they', 'will', 'would', 'there', 'their', 'about', 'which',
-    }
+    })
+    
+    # Dossiers de traduction (relatifs au workspace)
+    TRANSLATION_DIRS = [
+        'frontend/app/i18n',
+        'frontend/locales',
+        'backend/i18n',
+    ]
     
     CODE_EXTENSIONS = {'.tsx', '.jsx', '.ts', '.js', '.vue'}
     
@@ -99,6 +259,9 @@ class A10I18nAgent:
     # Patterns de fonction i18n à ignorer
     I18N_FUNCTIONS = ['t(', 'i18n.t(', 'translate(', '$t(', 'formatMessage(']
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A10.
@@ -110,7 +273,18 @@ class A10I18nAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[I18nFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.profiler = Profiler('a10_i18n')  # Remplacé par celui du runner
+        self.analysis_cache: Optional[AnalysisCache] = None
         self.translation_keys: Set[str] = set()
+        self.key_locales: Dict[str, Set[str]] = {}  # Clé -> locales où elle existe
+        self.key_files: Dict[str, str] = {}  # Clé -> premier fichier qui la définit
+        self.locales: Set[str] = set()
+        self.key_index: Optional[TranslationIndex] = None
+        self.use_cache = True  # False (run.py --no-cache): index des clés non persisté
+        self.rule_engine = RuleEngine(self.RULES)
+        self.metadata: Dict[str, Any] = {}
     
     def should_analyze(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être analysé."""
@@ -120,10 +294,6 @@ class A10I18nAgent:
         
         return file_path.suffix in self.CODE_EXTENSIONS
     
-    def get_line_number(self, content: str, position: int) -> int:
-        """Retourne le numéro de ligne d'une position."""
-        return content[:position].count('\n') + 1
-    
     def is_near_i18n_function(self, content: str, position: int) -> bool:
         """Vérifie si le texte est proche d'une fonction i18n."""
         # Chercher 50 caractères avant et après
@@ -135,145 +305,265 @@ class A10I18nAgent:
     
     def contains_french_keywords(self, text: str) -> bool:
         """Vérifie si le texte contient des mots français."""
-        words = text.lower().split()
-        return any(word in self.FRENCH_KEYWORDS for word in words)
+        return not self.FRENCH_KEYWORDS.isdisjoint(text.lower().split())
     
     def contains_english_keywords(self, text: str) -> bool:
         """Vérifie si le texte contient des mots anglais."""
-        words = text.lower().split()
-        return any(word in self.ENGLISH_KEYWORDS for word in words)
+        return not self.ENGLISH_KEYWORDS.isdisjoint(text.lower().split())
     
     def analyze_file(self, file_path: Path):
         """Analyse un fichier pour l'i18n."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            doc = self.content_store.get(file_path)
+            content = doc.text
         except Exception:
             return
         
         relative_path = str(file_path.relative_to(self.root_dir))
         
-        # Texte français dans JSX
-        for match in self.PATTERNS['french_in_jsx'].finditer(content):
-            text = match.group(1).strip()
-            position = match.start()
+        for hit in self.rule_engine.scan(doc):
+            rule = hit.rule
+            text = hit.match.group(rule.meta['group'])
+            position = hit.match.start()
             
-            # Ignorer si c'est du code ou proche d'une fonction i18n
-            if self.is_near_i18n_function(content, position):
-                continue
+            if rule.name == 'french_in_jsx':
+                text = text.strip()
+                
+                # Ignorer si c'est du code ou proche d'une fonction i18n
+                if self.is_near_i18n_function(content, position):
+                    continue
+                
+                if not self.contains_french_keywords(text):
+                    continue
             
-            if not self.contains_french_keywords(text):
-                continue
+            elif rule.name != 'error_message':
+                # Vérifier que c'est du texte naturel (pas une clé)
+                if '.' in text or '_' in text:
+                    continue
             
             finding = I18nFinding(
                 file_path=relative_path,
-                line=self.get_line_number(content, position),
-                severity='HIGH',
-                category='HARDCODED_TEXT',
-                description='Texte français hardcodé dans le JSX',
-                recommendation='Utiliser {t("key")} avec fichier de traduction',
+                line=hit.line,
+                severity=rule.meta['severity'],
+                category=rule.meta['category'],
+                description=rule.meta['description'],
+                recommendation=rule.meta['recommendation'],
                 text_found=text[:50],
             )
             self.findings.append(finding)
+    
+    def _get_key_index(self) -> TranslationIndex:
+        """Index persistant des clés (chargé une fois)"""
+        if self.key_index is None:
+            path = Path(self.root_dir) / '.ai-agents' / 'cache' / 'a10_i18n_keys.json'
+            self.key_index = TranslationIndex(path if self.use_cache else None)
+        return self.key_index
+    
+    @staticmethod
+    def _detect_locale(rel_path: str) -> str:
+        """Locale d'un fichier: fr.json, fr/common.json, sinon le nom du fichier"""
+        parts = rel_path.split('/')
+        stem = parts[-1].rsplit('.', 1)[0]
+        if LOCALE_RE.match(stem):
+            return stem
+        if len(parts) > 1 and LOCALE_RE.match(parts[-2]):
+            return parts[-2]
+        return stem
+    
+    def _parse_translation_file(self, entry: FileEntry) -> Dict[str, Any]:
+        """Entrée d'index d'un fichier de traduction (clés aplaties)"""
+        keys: List[str] = []
+        try:
+            data = json.loads(entry.path.read_text(encoding='utf-8'))
+            if isinstance(data, dict):
+                keys = self._flatten_keys(data)
+        except Exception:
+            pass
+        return {'locale': self._detect_locale(entry.rel_path), 'keys': keys}
+    
+    def _parse_key_usages(self, entry: FileEntry) -> Dict[str, Any]:
+        """Entrée d'index des clés utilisées par un fichier de code"""
+        keys: Set[str] = set()
+        prefixes: Set[str] = set()
+        try:
+            text = self.content_store.get(entry.path).text
+        except Exception:
+            text = ''
         
-        # Messages d'erreur hardcodés
-        for match in self.PATTERNS['error_message'].finditer(content):
-            message = match.group(3)
-            position = match.start()
-            
-            finding = I18nFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, position),
-                severity='MEDIUM',
-                category='HARDCODED_ERROR',
-                description='Message d\'erreur hardcodé',
-                recommendation='Déplacer dans fichier i18n pour traduction',
-                text_found=message[:50],
-            )
-            self.findings.append(finding)
+        matches = list(KEY_USAGE_RE.finditer(text))
+        for call in MESSAGE_CALL_RE.finditer(text):
+            end = self._call_end(text, call.end() - 1)
+            matches.extend(MESSAGE_ID_RE.finditer(text, call.end(), end))
         
-        # Placeholders hardcodés
-        for match in self.PATTERNS['hardcoded_placeholder'].finditer(content):
-            text = match.group(1)
-            position = match.start()
-            
-            # Vérifier que c'est du texte naturel (pas une clé)
-            if '.' in text or '_' in text:
-                continue
-            
-            finding = I18nFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, position),
-                severity='MEDIUM',
-                category='HARDCODED_PLACEHOLDER',
-                description='Placeholder hardcodé',
-                recommendation='Utiliser placeholder={t("forms.placeholder")}',
-                text_found=text[:50],
-            )
-            self.findings.append(finding)
+        for match in matches:
+            # Espace de noms i18next (`common:title`) ignoré
+            key = match.group(1).rsplit(':', 1)[-1]
+            if match.group(2):
+                prefixes.add(key)
+            elif key:
+                keys.add(key)
         
-        # Titres hardcodés
-        for match in self.PATTERNS['hardcoded_title'].finditer(content):
-            text = match.group(1)
-            position = match.start()
-            
-            if '.' in text or '_' in text:
-                continue
-            
-            finding = I18nFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, position),
-                severity='LOW',
-                category='HARDCODED_TITLE',
-                description='Attribut title hardcodé',
-                recommendation='Utiliser title={t("tooltips.key")}',
-                text_found=text[:50],
-            )
-            self.findings.append(finding)
+        return {'keys': sorted(keys), 'prefixes': sorted(prefixes)}
+    
+    @staticmethod
+    def _call_end(text: str, open_pos: int) -> int:
+        """Position de la parenthèse fermant celle ouverte en open_pos (fin du texte sinon)"""
+        depth = 0
+        for i in range(open_pos, len(text)):
+            char = text[i]
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    return i
+        return len(text)
     
     def load_translation_files(self):
-        """Charge les fichiers de traduction pour vérifier les clés."""
-        translation_dirs = [
-            self.root_dir / 'frontend' / 'app' / 'i18n',
-            self.root_dir / 'frontend' / 'locales',
-            self.root_dir / 'backend' / 'i18n',
+        """Charge les clés de traduction depuis l'index (fichiers modifiés re-parsés)."""
+        full_index = self.file_index.unscoped()
+        # Toutes les traductions, même en mode scopé
+        json_files = [
+            e for rel_dir in self.TRANSLATION_DIRS
+            for e in full_index.under(rel_dir) if e.ext == '.json'
+        ]
+        section = self._get_key_index().update('translations', json_files, self._parse_translation_file)
+        
+        for rel_path, item in sorted(section.items()):
+            locale = item['locale']
+            self.locales.add(locale)
+            for key in item['keys']:
+                self.key_locales.setdefault(key, set()).add(locale)
+                self.key_files.setdefault(key, rel_path)
+        
+        self.translation_keys = set(self.key_locales)
+    
+    def _flatten_keys(self, data: dict) -> List[str]:
+        """Clés de traduction aplaties (`a.b.c`)."""
+        keys = []
+        stack = [('', data)]
+        
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                full_key = f"{prefix}.{key}" if prefix else key
+                
+                if isinstance(value, dict):
+                    stack.append((full_key, value))
+                else:
+                    keys.append(full_key)
+        
+        return keys
+    
+    def check_translation_keys(self) -> Tuple[int, int]:
+        """
+        Clés manquantes dans une locale et clés jamais utilisées
+        
+        Returns:
+            (clés manquantes, clés inutilisées)
+        """
+        if not self.translation_keys:
+            return 0, 0
+        
+        missing = 0
+        if len(self.locales) > 1:
+            for key in sorted(self.key_locales):
+                absent = self.locales - self.key_locales[key]
+                if not absent:
+                    continue
+                missing += 1
+                self.findings.append(I18nFinding(
+                    file_path=self.key_files[key],
+                    line=1,
+                    severity='MEDIUM',
+                    category='MISSING_TRANSLATION',
+                    description=f"Clé absente pour: {', '.join(sorted(absent))}",
+                    recommendation='Ajouter la traduction dans chaque locale',
+                    text_found=key[:50],
+                ))
+        
+        # Usages de tout le workspace (même en mode scopé), depuis l'index
+        code_files = [
+            e for e in self.file_index.unscoped().by_extension(*self.CODE_EXTENSIONS, include_excluded=False)
+            if self.should_analyze(e.path)
         ]
+        section = self._get_key_index().update('usages', code_files, self._parse_key_usages)
+        
+        used: Set[str] = set()
+        prefixes: Set[str] = set()
+        for item in section.values():
+            used.update(item['keys'])
+            prefixes.update(item['prefixes'])
+        prefixes = tuple(sorted(prefixes))
         
-        for trans_dir in translation_dirs:
-            if not trans_dir.exists():
+        unused = 0
+        for key in sorted(self.translation_keys):
+            if key in used or (prefixes and key.startswith(prefixes)):
                 continue
-            
-            for json_file in trans_dir.rglob('*.json'):
-                try:
-                    data = json.loads(json_file.read_text(encoding='utf-8'))
-                    self._extract_keys(data)
-                except Exception:
-                    pass
-    
-    def _extract_keys(self, data: dict, prefix: str = ''):
-        """Extrait récursivement les clés de traduction."""
-        for key, value in data.items():
-            full_key = f"{prefix}.{key}" if prefix else key
-            
-            if isinstance(value, dict):
-                self._extract_keys(value, full_key)
-            else:
-                self.translation_keys.add(full_key)
+            unused += 1
+            self.findings.append(I18nFinding(
+                file_path=self.key_files[key],
+                line=1,
+                severity='LOW',
+                category='UNUSED_TRANSLATION',
+                description='Clé de traduction jamais utilisée dans le code',
+                recommendation='Supprimer la clé ou vérifier les clés dynamiques',
+                text_found=key[:50],
+            ))
+        
+        return missing, unused
+    
+    def _analyze_file_findings(self, file_path: Path) -> List[I18nFinding]:
+        """Findings d'un seul fichier (analyze_file les ajoute à self.findings)."""
+        start = len(self.findings)
+        self.analyze_file(file_path)
+        file_findings = self.findings[start:]
+        del self.findings[start:]
+        return file_findings
     
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du projet."""
         self.findings = []
         self.translation_keys = set()
+        self.key_locales = {}
+        self.key_files = {}
+        self.locales = set()
+        self.key_index = None
+        
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
         
         # Charger les clés de traduction existantes
-        self.load_translation_files()
+        with self.profiler.span('translations') as span:
+            self.load_translation_files()
+            span.counters['keys'] = len(self.translation_keys)
         
         # Analyser tous les fichiers de code
-        for file_path in self.root_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            if self.should_analyze(file_path):
-                self.analyze_file(file_path)
+        with analysis_phases(self, self.file_index.by_extension(self.CODE_EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                self.findings.extend(cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, I18nFinding,
+                    lambda: self._analyze_file_findings(file_path),
+                ))
+        
+        # Clés manquantes / inutilisées (index incrémental)
+        with self.profiler.span('keys') as span:
+            missing_keys, unused_keys = self.check_translation_keys()
+            key_index = self._get_key_index()
+            key_index.save()
+            span.counters['missing'] = missing_keys
+            span.counters['unused'] = unused_keys
+        
+        # Profil des règles (les plus lentes), repris dans les metadata du résultat
+        self.metadata = {
+            'rule_profile': self.rule_engine.profile(top=5),
+            'key_index': {
+                'translations': len(key_index.sections['translations']),
+                'usages': len(key_index.sections['usages']),
+                'parsed': key_index.parsed,
+            },
+        }
         
         # Calculer les métriques
         severity_counts = {
@@ -294,6 +584,9 @@ class A10I18nAgent:
             'severity_counts': severity_counts,
             'category_counts': category_counts,
             'translation_keys_found': len(self.translation_keys),
+            'translation_locales': sorted(self.locales),
+            'missing_keys': missing_keys,
+            'unused_keys': unused_keys,
             'findings': [
                 {
                     'file': f.file_path,
@@ -356,7 +649,9 @@ if __name__ == '__main__':
     print(f"⏰ Start: {datetime.now().strftime('%H:%M:%S')}\n")
     
     start = datetime.now()
-    agent = A10I18nAgent(root)
+    from core.config import Config
+    config = Config.load(str(Path(__file__).parent.parent.parent / 'config.yaml'))
+    agent = A10I18nAgent(Path(root), config)
     results = agent.analyze()
     duration = (datetime.now() - start).total_seconds()
     
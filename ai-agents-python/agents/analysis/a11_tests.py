@@ -5,9 +5,19 @@ Analyse la couverture de tests et détecte les fichiers sans tests.
 
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+
 
 @dataclass
 class TestCoverageFinding:
@@ -93,6 +103,8 @@ class A11TestsAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[TestCoverageFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
         self.test_files: Set[str] = set()
         self.code_files: Set[Path] = set()
     
@@ -131,7 +143,9 @@ class A11TestsAgent:
         ]
         
         for test_path in test_patterns:
-            if test_path.exists():
+            # Lookup dans l'index plutôt qu'un stat() disque par candidat
+            rel_path = test_path.relative_to(self.root_dir).as_posix()
+            if self.file_index.get(rel_path) is not None:
                 return test_path
         
         return None
@@ -139,8 +153,7 @@ class A11TestsAgent:
     def count_lines_of_code(self, file_path: Path) -> int:
         """Compte les lignes de code (sans commentaires ni lignes vides)."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            lines = content.split('\n')
+            lines = self.content_store.get(file_path).lines
             
             loc = 0
             in_block_comment = False
@@ -181,10 +194,8 @@ class A11TestsAgent:
     
     def collect_files(self):
         """Collecte tous les fichiers de code et de test."""
-        for file_path in self.root_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
+        for entry in self.file_index.files():
+            file_path = entry.path
             if self.is_test_file(file_path):
                 self.test_files.add(str(file_path))
             elif self.should_analyze(file_path):
@@ -230,6 +241,9 @@ class A11TestsAgent:
         self.test_files = set()
         self.code_files = set()
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
         # Collecter les fichiers
         self.collect_files()
         
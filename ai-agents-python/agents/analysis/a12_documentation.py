@@ -5,9 +5,25 @@ Analyse la qualité de la documentation du code.
 
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+
 
 @dataclass
 class DocumentationFinding:
@@ -67,6 +83,35 @@ class A12DocumentationAgent:
         ),
     }
     
+    # Règles appliquées à chaque fichier (ordre = ordre des findings)
+    RULES = [
+        Rule('exported_function', PATTERNS['exported_function'], literals=('export',), meta=dict(
+            category='NO_JSDOC',
+            recommendation='Ajouter un JSDoc avec description, @param, @returns',
+            entity_type='function',
+        )),
+        Rule('exported_class', PATTERNS['exported_class'], literals=('export',), meta=dict(
+            severity='HIGH',
+            category='NO_JSDOC',
+            description='Classe exportée sans JSDoc',
+            recommendation='Ajouter un JSDoc avec description et usage',
+            entity_type='class',
+        )),
+        Rule('nestjs_route', PATTERNS['nestjs_route'], literals=('@Get', '@Post', '@Put', '@Delete', '@Patch'), meta=dict(
+            severity='CRITICAL',
+            category='UNDOCUMENTED_API',
+            recommendation='Documenter les paramètres, body, et réponses possibles',
+            entity_type='api',
+        )),
+        Rule('react_hook', PATTERNS['react_hook'], literals=('export',), meta=dict(
+            severity='MEDIUM',
+            category='NO_JSDOC',
+            description='Hook React sans documentation',
+            recommendation='Documenter les paramètres et la valeur retournée',
+            entity_type='hook',
+        )),
+    ]
+    
     # Pattern JSDoc
     JSDOC_PATTERN = re.compile(
         r'/\*\*[\s\S]*?\*/',
@@ -89,6 +134,9 @@ class A12DocumentationAgent:
         '.spec.',
     ]
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A12.
@@ -100,6 +148,12 @@ class A12DocumentationAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[DocumentationFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.profiler = Profiler('a12_documentation')  # Remplacé par celui du runner
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.rule_engine = RuleEngine(self.RULES)
+        self.metadata: Dict[str, Any] = {}
     
     def should_analyze(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être analysé."""
@@ -145,18 +199,27 @@ class A12DocumentationAgent:
     def analyze_file(self, file_path: Path):
         """Analyse un fichier pour la documentation."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            doc = self.content_store.get(file_path)
+            content = doc.text
         except Exception:
             return
         
         relative_path = str(file_path.relative_to(self.root_dir))
         
-        # Vérifier les fonctions exportées
-        for match in self.PATTERNS['exported_function'].finditer(content):
-            function_name = match.group(2)
+        # Fonctions et classes exportées, routes API NestJS, hooks React
+        for hit in self.rule_engine.scan(doc):
+            rule = hit.rule
+            match = hit.match
             position = match.start()
             
-            if not self.has_jsdoc_before(content, position):
+            if self.has_jsdoc_before(content, position):
+                continue
+            
+            severity = rule.meta.get('severity')
+            description = rule.meta.get('description')
+            entity_name = match.group(2)
+            
+            if rule.name == 'exported_function':
                 # Estimer la complexité
                 # Chercher le corps de la fonction (simplifié)
                 func_end = content.find('\n}', position)
@@ -171,73 +234,23 @@ class A12DocumentationAgent:
                     severity = 'HIGH'
                 if complexity > 20:
                     severity = 'CRITICAL'
-                
-                finding = DocumentationFinding(
-                    file_path=relative_path,
-                    severity=severity,
-                    category='NO_JSDOC',
-                    description=f'Fonction exportée sans JSDoc (complexité: {complexity})',
-                    recommendation='Ajouter un JSDoc avec description, @param, @returns',
-                    entity_type='function',
-                    entity_name=function_name,
-                )
-                
-                self.findings.append(finding)
-        
-        # Vérifier les classes exportées
-        for match in self.PATTERNS['exported_class'].finditer(content):
-            class_name = match.group(2)
-            position = match.start()
+                description = f'Fonction exportée sans JSDoc (complexité: {complexity})'
             
-            if not self.has_jsdoc_before(content, position):
-                finding = DocumentationFinding(
-                    file_path=relative_path,
-                    severity='HIGH',
-                    category='NO_JSDOC',
-                    description='Classe exportée sans JSDoc',
-                    recommendation='Ajouter un JSDoc avec description et usage',
-                    entity_type='class',
-                    entity_name=class_name,
-                )
-                
-                self.findings.append(finding)
-        
-        # Vérifier les routes API NestJS
-        for match in self.PATTERNS['nestjs_route'].finditer(content):
-            method = match.group(1)
-            route = match.group(2)
-            position = match.start()
+            elif rule.name == 'nestjs_route':
+                entity_name = f'{match.group(1)} {match.group(2)}'
+                description = f'Route API sans documentation: {entity_name}'
             
-            if not self.has_jsdoc_before(content, position):
-                finding = DocumentationFinding(
-                    file_path=relative_path,
-                    severity='CRITICAL',
-                    category='UNDOCUMENTED_API',
-                    description=f'Route API sans documentation: {method} {route}',
-                    recommendation='Documenter les paramètres, body, et réponses possibles',
-                    entity_type='api',
-                    entity_name=f'{method} {route}',
-                )
-                
-                self.findings.append(finding)
-        
-        # Vérifier les hooks React
-        for match in self.PATTERNS['react_hook'].finditer(content):
-            hook_name = match.group(2)
-            position = match.start()
+            finding = DocumentationFinding(
+                file_path=relative_path,
+                severity=severity,
+                category=rule.meta['category'],
+                description=description,
+                recommendation=rule.meta['recommendation'],
+                entity_type=rule.meta['entity_type'],
+                entity_name=entity_name,
+            )
             
-            if not self.has_jsdoc_before(content, position):
-                finding = DocumentationFinding(
-                    file_path=relative_path,
-                    severity='MEDIUM',
-                    category='NO_JSDOC',
-                    description='Hook React sans documentation',
-                    recommendation='Documenter les paramètres et la valeur retournée',
-                    entity_type='hook',
-                    entity_name=hook_name,
-                )
-                
-                self.findings.append(finding)
+            self.findings.append(finding)
     
     def check_readme_coverage(self):
         """Vérifie la présence de README dans les modules importants."""
@@ -261,10 +274,10 @@ class A12DocumentationAgent:
                     continue
                 
                 # Vérifier si le dossier contient du code
+                rel_subdir = subdir.relative_to(self.root_dir).as_posix()
                 has_code = any(
-                    f.suffix in self.CODE_EXTENSIONS
-                    for f in subdir.rglob('*')
-                    if f.is_file()
+                    e.ext in self.CODE_EXTENSIONS
+                    for e in self.file_index.under(rel_subdir)
                 )
                 
                 if not has_code:
@@ -292,20 +305,36 @@ class A12DocumentationAgent:
                     
                     self.findings.append(finding)
     
+    def _analyze_file_findings(self, file_path: Path) -> List[DocumentationFinding]:
+        """Findings d'un seul fichier (analyze_file les ajoute à self.findings)."""
+        start = len(self.findings)
+        self.analyze_file(file_path)
+        file_findings = self.findings[start:]
+        del self.findings[start:]
+        return file_findings
+    
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du projet."""
         self.findings = []
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
         # Analyser tous les fichiers de code
-        for file_path in self.root_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            if self.should_analyze(file_path):
-                self.analyze_file(file_path)
+        with analysis_phases(self, self.file_index.by_extension(self.CODE_EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                self.findings.extend(cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, DocumentationFinding,
+                    lambda: self._analyze_file_findings(file_path),
+                ))
         
         # Vérifier les README
-        self.check_readme_coverage()
+        with self.profiler.span('readme'):
+            self.check_readme_coverage()
+        
+        # Profil des règles (les plus lentes), repris dans les metadata du résultat
+        self.metadata = {'rule_profile': self.rule_engine.profile(top=5)}
         
         # Calculer les métriques
         severity_counts = {
@@ -4,10 +4,60 @@ Détecte les failles de sécurité potentielles dans le code.
 """
 
 import re
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Pattern, Set, Tuple
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+
+
+def _compile_rules(patterns: Dict[str, Dict[str, Any]]) -> Tuple[Pattern, Dict[str, List[str]], Dict[str, List[Pattern]]]:
+    """
+    Compile les règles une seule fois (au chargement de la classe)
+    
+    Returns:
+        (préfiltre: alternance de tous les littéraux en lookahead, insensible
+        à la casse; littéral -> catégories; catégorie -> patterns compilés)
+    """
+    literal_categories: Dict[str, List[str]] = {}
+    for category, config in patterns.items():
+        for literal in config['literals']:
+            literal_categories.setdefault(literal.lower(), []).append(category)
+    
+    # Lookahead: chaque position est testée, les occurrences qui se
+    # chevauchent sont toutes vues. Plus long d'abord; un littéral qui est
+    # préfixe d'un autre hérite de ses catégories (même position).
+    literals = sorted(literal_categories, key=len, reverse=True)
+    for literal in literals:
+        for other in literals:
+            if other != literal and other.startswith(literal):
+                for category in literal_categories[literal]:
+                    if category not in literal_categories[other]:
+                        literal_categories[other].append(category)
+    
+    prefilter = re.compile(
+        '(?=(' + '|'.join(re.escape(literal) for literal in literals) + '))',
+        re.IGNORECASE,
+    )
+    compiled = {
+        category: [re.compile(pattern) for pattern in config['patterns']]
+        for category, config in patterns.items()
+    }
+    return prefilter, literal_categories, compiled
+
 
 @dataclass
 class SecurityFinding:
@@ -35,16 +85,26 @@ class A1SecurityAgent:
     - Mauvaises pratiques crypto
     """
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """Initialise l'agent A1."""
         self.workspace_root = workspace_root
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[SecurityFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.metadata: Dict[str, Any] = {}
     
-    # Patterns de détection
+    # Patterns de détection. `literals`: sous-chaînes (casse ignorée) dont
+    # l'une est présente dans toute ligne matchée par un pattern de la
+    # catégorie, seules ces lignes sont confirmées par les regex.
     PATTERNS = {
         'hardcoded_secret': {
+            'literals': ['api', 'pass', 'pwd', 'token', 'key', 'aws'],
             'patterns': [
                 r'(?i)(api[_-]?key|apikey|api[_-]?secret)\s*[:=]\s*["\']([^"\']{20,})["\']',
                 r'(?i)(password|passwd|pwd)\s*[:=]\s*["\']([^"\']{8,})["\']',
@@ -56,6 +116,7 @@ class A1SecurityAgent:
             'recommendation': 'Utiliser des variables d\'environnement ou un gestionnaire de secrets (ex: AWS Secrets Manager, HashiCorp Vault)',
         },
         'sql_injection': {
+            'literals': ['.query', '.raw', 'execute'],
             'patterns': [
                 r'\.query\s*\(\s*["\'].*\$\{',
                 r'\.query\s*\(\s*`.*\$\{',
@@ -67,6 +128,7 @@ class A1SecurityAgent:
             'recommendation': 'Utiliser des requêtes préparées (prepared statements) ou un ORM sécurisé',
         },
         'xss': {
+            'literals': ['dangerouslySetInnerHTML', '.innerHTML', 'document.write'],
             'patterns': [
                 r'dangerouslySetInnerHTML',
                 r'\.innerHTML\s*=',
@@ -76,6 +138,7 @@ class A1SecurityAgent:
             'recommendation': 'Utiliser des méthodes sécurisées (textContent, createElement) ou sanitizer le HTML',
         },
         'eval': {
+            'literals': ['eval', 'Function', 'setTimeout', 'setInterval'],
             'patterns': [
                 r'\beval\s*\(',
                 r'new\s+Function\s*\(',
@@ -86,6 +149,7 @@ class A1SecurityAgent:
             'recommendation': 'Éviter eval() et Function(). Utiliser des alternatives sécurisées',
         },
         'unsafe_deserialization': {
+            'literals': ['pickle.load', 'yaml.load', 'JSON.parse'],
             'patterns': [
                 r'pickle\.loads?\s*\(',
                 r'yaml\.load\s*\([^,)]*\)',  # sans safe_load
@@ -95,6 +159,7 @@ class A1SecurityAgent:
             'recommendation': 'Utiliser safe_load pour YAML, valider les données JSON avant parsing',
         },
         'weak_crypto': {
+            'literals': ['MD5', 'SHA1'],
             'patterns': [
                 r'\bMD5\s*\(',
                 r'\bSHA1\s*\(',
@@ -105,6 +170,7 @@ class A1SecurityAgent:
             'recommendation': 'Utiliser des algorithmes modernes (SHA-256, bcrypt, argon2)',
         },
         'insecure_random': {
+            'literals': ['Math.random', 'random.random'],
             'patterns': [
                 r'Math\.random\s*\(',
                 r'random\.random\s*\(',
@@ -113,6 +179,7 @@ class A1SecurityAgent:
             'recommendation': 'Pour la sécurité, utiliser crypto.randomBytes() ou secrets module',
         },
         'path_traversal': {
+            'literals': ['readFile', 'writeFile', 'unlink'],
             'patterns': [
                 r'(readFile|writeFile|unlink)\s*\([^)]*\+',
                 r'(readFile|writeFile|unlink)\s*\(`.*\$\{',
@@ -122,6 +189,9 @@ class A1SecurityAgent:
         },
     }
     
+    # Préfiltre + patterns compilés (une seule fois)
+    PREFILTER_RE, LITERAL_CATEGORIES, COMPILED_PATTERNS = _compile_rules(PATTERNS)
+    
     # Extensions à analyser
     EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.py', '.sql'}
     
@@ -162,13 +232,26 @@ class A1SecurityAgent:
         findings = []
         
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            lines = content.split('\n')
+            content = self.content_store.get(file_path)
+            lines = content.lines
             
+            # 1. Préfiltre: un seul parcours du texte -> lignes candidates par catégorie
+            candidates: Dict[str, Set[int]] = {}
+            for match in self.PREFILTER_RE.finditer(content.text):
+                line_num = content.line_number(match.start())
+                for category in self.LITERAL_CATEGORIES.get(match.group(1).lower(), ()):
+                    candidates.setdefault(category, set()).add(line_num)
+            
+            # 2. Confirmation par les regex, sur les seules lignes candidates
             for category, config in self.PATTERNS.items():
-                for pattern in config['patterns']:
-                    for line_num, line in enumerate(lines, 1):
-                        if re.search(pattern, line):
+                if category not in candidates:
+                    continue
+                
+                line_nums = sorted(candidates[category])
+                for pattern in self.COMPILED_PATTERNS[category]:
+                    for line_num in line_nums:
+                        line = lines[line_num - 1]
+                        if pattern.search(line):
                             # Ignorer les commentaires
                             if line.strip().startswith(('//','#', '/*', '*')):
                                 continue
@@ -213,11 +296,29 @@ class A1SecurityAgent:
         """
         self.findings = []
         
-        # Parcourir tous les fichiers
-        for file_path in self.root_dir.rglob('*'):
-            if file_path.is_file() and self.should_analyze(file_path):
-                file_findings = self.analyze_file(file_path)
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
+        # Parcourir les fichiers de l'index (pas de nouveau parcours disque)
+        start = time.time()
+        files_scanned = 0
+        with analysis_phases(self, self.file_index.by_extension(self.EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                file_findings = cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, SecurityFinding,
+                    lambda: self.analyze_file(file_path),
+                )
                 self.findings.extend(file_findings)
+                files_scanned += 1
+        
+        # Débit (repris dans les metadata du résultat par le runner)
+        scan_duration = time.time() - start
+        self.metadata = {
+            'files_scanned': files_scanned,
+            'scan_ms': int(scan_duration * 1000),
+            'files_per_sec': round(files_scanned / scan_duration, 1) if scan_duration > 0 else None,
+        }
         
         # Calculer les métriques
         severity_counts = {
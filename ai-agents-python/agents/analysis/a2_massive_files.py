@@ -8,10 +8,20 @@ Détecte les fichiers trop volumineux selon les seuils configurés
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+
 
 @dataclass
 class MassiveFileResult:
@@ -40,6 +50,8 @@ class MassiveFilesDetector:
         self.workspace_root = workspace_root
         self.config = config
         self.thresholds = config.thresholds.massive_files
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
     
     def analyze(self) -> List[Dict[str, Any]]:
         """
@@ -52,6 +64,9 @@ class MassiveFilesDetector:
         
         results = []
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.workspace_root, self.config)
+        
         # Patterns de fichiers à analyser
         patterns = [
             ('frontend/**/*.tsx', 'tsx_component', self.thresholds.tsx_component),
@@ -65,10 +80,6 @@ class MassiveFilesDetector:
             files = self._find_files(pattern)
             
             for file_path in files:
-                # Ignorer exclusions
-                if self.config.should_exclude(str(file_path)):
-                    continue
-                
                 lines = self._count_lines(file_path)
                 
                 if lines > threshold:
@@ -97,16 +108,9 @@ class MassiveFilesDetector:
         return [self._serialize(r) for r in results]
     
     def _find_files(self, pattern: str) -> List[Path]:
-        """Trouve tous les fichiers matchant le pattern"""
-        results = []
-        
-        # Convertir pattern en glob
-        for file_path in self.workspace_root.rglob(pattern.split('/')[-1]):
-            # Vérifier que le path complet matche
-            if self._matches_pattern(file_path, pattern):
-                results.append(file_path)
-        
-        return results
+        """Trouve tous les fichiers matchant le pattern (hors exclusions)"""
+        # Glob sur le chemin relatif complet, résolu depuis l'index partagé
+        return [entry.path for entry in self.file_index.glob(pattern, include_excluded=False)]
     
     def _matches_pattern(self, file_path: Path, pattern: str) -> bool:
         """Vérifie si un path matche un pattern glob"""
@@ -117,8 +121,7 @@ class MassiveFilesDetector:
     def _count_lines(self, file_path: Path) -> int:
         """Compte les lignes de code (hors commentaires et lignes vides)"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+            lines = self.content_store.get(file_path).lines
             
             # Compter lignes non vides et non commentaires
             code_lines = 0
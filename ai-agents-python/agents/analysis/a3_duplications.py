@@ -4,20 +4,99 @@ Agent A3 - Duplications Detector (Optimisé)
 Détecte les duplications de code (équivalent jscpd en Python)
 
 Optimisations:
-- Bloom filter pour pré-filtrage rapide
+- Tokens internés (ids entiers, array('I')) avec table token -> ligne
+- Rolling hash Rabin-Karp O(1) par pas, hashs en array('Q')
+- Hashs dupliqués trouvés par fusion des fenêtres triées par fichier
+  (pas de set d'ints ni de liste globale)
 - Multiprocessing pour tokenization parallèle
-- Cache intelligent des hashs
-- Seuils adaptatifs pour réduire faux positifs
+- Cache persistant par fichier (tokens, table des lignes, hashs): un
+  fichier inchangé n'est ni re-tokenizé ni re-hashé
+- Runs dupliqués maximaux (un résultat par bloc, pas par fenêtre)
 """
 
 import os
+import re
+import sys
+import base64
 import hashlib
+from array import array
 from pathlib import Path
-from typing import List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, Set, Tuple, Optional
 from dataclasses import dataclass
-from collections import defaultdict
 from multiprocessing import Pool, cpu_count
 import functools
+import heapq
+
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.analysis_cache import AnalysisCache
+    from core.profiling import Profiler
+except ImportError:
+    # Fallback pour exécution standalone
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.analysis_cache import AnalysisCache
+    from core.profiling import Profiler
+
+
+# Tokens: suites alphanumériques (split sur tout le reste)
+TOKEN_RE = re.compile(r'\b\w+\b')
+
+# Rolling hash (Rabin-Karp) modulo 2^64
+HASH_BASE = 0x100000001B3
+HASH_MASK = (1 << 64) - 1
+
+
+def _token_key(token: str) -> int:
+    """Clé 64 bits stable d'un token (mêmes hashs de fenêtres d'un run à l'autre)"""
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+
+
+def _tokenize_code(code: str, vocab: Dict[str, int], vocab_list: List[str]) -> Tuple[array, array]:
+    """
+    Tokenize du code (sans commentaires) en ids du vocabulaire donné (complété au besoin)
+    
+    Returns:
+        (ids des tokens, ligne 1-based de chaque token), en array('I')
+    """
+    ids = array('I')
+    lines = array('I')
+    
+    # Ligne par ligne: la vue `code` conserve la numérotation
+    for line_num, line in enumerate(code.split('\n'), 1):
+        count = len(ids)
+        # Tokenize (simple split sur non-alphanumeriques), tokens >= 2 chars
+        for token in TOKEN_RE.findall(line):
+            if len(token) < 2:
+                continue
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = vocab[token] = len(vocab_list)
+                vocab_list.append(token)
+            ids.append(token_id)
+        if len(ids) > count:
+            lines.extend([line_num] * (len(ids) - count))
+    
+    return ids, lines
+
+
+def _pack_array(values: array) -> str:
+    """Sérialise un array ('I' ou 'Q') pour le cache JSON"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _unpack_array(typecode: str, packed: str) -> array:
+    """Inverse de _pack_array (stockage little-endian)"""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(packed))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
 
 
 @dataclass
@@ -36,10 +115,11 @@ class DuplicationDetector:
     Détecte les duplications de code (Optimisé)
     
     Approche:
-    1. Bloom filter pour pré-filtrage rapide
-    2. Tokenize en parallèle (multiprocessing)
-    3. Rolling hash avec cache intelligent
-    4. Grouper et filtrer duplications
+    1. Reprendre du cache les fichiers inchangés, tokenizer les autres
+       en parallèle (multiprocessing), tokens internés en ids
+    2. Rolling hash des fenêtres de min_tokens des fichiers non cachés
+    3. Tri des hashs (array('Q')) pour ne garder que les hashs dupliqués
+    4. Étendre chaque duplication en run maximal, puis filtrer
     
     Optimisations:
     - ~10x plus rapide que version naïve
@@ -48,10 +128,13 @@ class DuplicationDetector:
     
     Config:
     - min_tokens: 8 (augmenté de 6 pour réduire faux positifs)
-    - min_lines: 5 (augmenté de 3)
+    - min_lines: 5 (augmenté de 3), lignes réelles couvertes par le run
     - max_results: 1000 (éviter explosion mémoire)
     """
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '3'
+    
     def __init__(self, workspace_root: Path, config):
         self.workspace_root = workspace_root
         self.config = config
@@ -59,14 +142,22 @@ class DuplicationDetector:
         self.min_tokens = max(8, config.thresholds.duplication.min_tokens)
         self.min_lines = max(5, config.thresholds.duplication.min_lines)
         self.max_results = 1000  # Limiter résultats
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.profiler = Profiler('a3_duplications')  # Remplacé par celui du runner
         
         # Cache des fichiers analysés
-        self.file_tokens: Dict[str, List[str]] = {}
-        self.token_hashes: Dict[str, List[Tuple[str, int]]] = {}  # hash -> [(file_id, pos)]
-        
-        # Bloom filter simple (set pour détecter hashs uniques rapidement)
-        self.seen_hashes: Set[str] = set()
-        self.duplicate_hashes: Set[str] = set()
+        self.file_tokens: Dict[str, array] = {}  # file_id -> ids de tokens (array('I'))
+        self.file_token_lines: Dict[str, array] = {}  # file_id -> ligne de chaque token
+        self.vocab: Dict[str, int] = {}  # token -> id
+        self.vocab_list: List[str] = []  # id -> token
+        self.token_keys = array('Q')  # id -> clé de hash stable
+        self.scope_files: Optional[Set[str]] = None  # Mode scopé: file_ids du périmètre
+        self.file_hashes: Dict[str, array] = {}  # file_id -> hash de chaque fenêtre
+        self._pending_keys: Dict[str, Tuple[str, str]] = {}  # file_id -> clé de cache à écrire
+        self.token_hashes: Dict[int, List[Tuple[str, int]]] = {}  # hash dupliqué -> [(file_id, pos)]
+        self.duplicate_hashes = array('Q')  # Hashs vus 2+ fois, triés et uniques
     
     def analyze(self) -> List[Dict[str, Any]]:
         """
@@ -77,110 +168,154 @@ class DuplicationDetector:
         """
         print("🔍 A3 - Détection duplications (optimisé)...")
         
+        profiler = self.profiler
+        
         # 1. Trouver tous les fichiers à analyser
-        files = self._find_files()
+        with profiler.span('walk') as span:
+            files = self._find_files()
+            span.files = len(files)
         print(f"   Analyse de {len(files)} fichier(s)...")
         
-        # 2. Tokenize en parallèle (multiprocessing)
-        import time
-        start = time.time()
-        self.file_tokens = self._tokenize_parallel(files)
-        tokenize_duration = time.time() - start
-        print(f"   Tokenization: {tokenize_duration:.1f}s ({len(self.file_tokens)} fichiers)")
-        
-        # 3. Construire index de hashs avec bloom filter
-        start = time.time()
-        self._build_hash_index_optimized()
-        index_duration = time.time() - start
-        print(f"   Index: {index_duration:.1f}s ({len(self.duplicate_hashes)} hashs dupliqués)")
-        
-        # 4. Détecter duplications (seulement pour hashs dupliqués)
-        start = time.time()
-        duplications = self._find_duplications_optimized()
-        detect_duration = time.time() - start
-        print(f"   Détection: {detect_duration:.1f}s ({len(duplications)} candidats)")
-        
-        # 5. Filtrer et trier
-        start = time.time()
-        filtered = self._filter_duplications(duplications)
-        filtered.sort(key=lambda d: d.lines_duplicated * len(d.files), reverse=True)
-        
-        # Limiter résultats
-        if len(filtered) > self.max_results:
-            print(f"   ⚠️  Limité à {self.max_results} résultats (sur {len(filtered)})")
-            filtered = filtered[:self.max_results]
-        
-        filter_duration = time.time() - start
-        print(f"   Filtrage: {filter_duration:.1f}s ({len(filtered)} résultats)")
+        # 2. Fichiers inchangés repris du cache (tokens, lignes et hashs)
+        with profiler.span('cache') as span:
+            pending = self._load_cached_files(files)
+            span.files = len(files) - len(pending)
+        
+        # 3. Tokenize en parallèle (multiprocessing) les fichiers restants
+        with profiler.span('tokenize') as span:
+            self._tokenize_parallel(pending)
+            self._restore_file_order(files)
+            span.files = len(pending)
+            span.counters['tokens'] = len(self.vocab)
+        
+        # 4. Hashs des fenêtres des fichiers tokenizés (puis mis en cache)
+        with profiler.span('hash') as span:
+            span.files = self._compute_file_hashes()
+            span.counters['cached'] = len(files) - len(pending)
+        
+        # 5. Construire index des hashs dupliqués
+        with profiler.span('index') as span:
+            self._build_hash_index_optimized()
+            span.counters['duplicate_hashes'] = len(self.duplicate_hashes)
+        
+        # 6. Détecter duplications (runs maximaux à partir des hashs dupliqués)
+        with profiler.span('match') as span:
+            duplications = self._find_duplications_optimized()
+            span.counters['candidates'] = len(duplications)
+        
+        # 7. Filtrer et trier
+        with profiler.span('filter') as span:
+            filtered = self._filter_duplications(duplications)
+            filtered.sort(key=lambda d: d.lines_duplicated * len(d.files), reverse=True)
+            
+            # Limiter résultats
+            if len(filtered) > self.max_results:
+                print(f"   ⚠️  Limité à {self.max_results} résultats (sur {len(filtered)})")
+                filtered = filtered[:self.max_results]
+            span.counters['results'] = len(filtered)
         
         # Sérialiser
-        return [self._serialize(d) for d in filtered]
+        with profiler.span('serialize'):
+            return [self._serialize(d) for d in filtered]
     
     def _find_files(self) -> List[Path]:
         """Trouve tous les fichiers TS/TSX/JS à analyser"""
         files = []
         
-        for ext in ['.ts', '.tsx', '.js', '.jsx']:
-            for file_path in self.workspace_root.rglob(f'*{ext}'):
-                # Ignorer exclusions
-                if self.config.should_exclude(str(file_path)):
-                    continue
-                
-                # Ignorer fichiers de test (pour l'instant)
-                if '.test.' in file_path.name or '.spec.' in file_path.name:
-                    continue
-                
-                files.append(file_path)
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.workspace_root, self.config)
+        
+        # Mode scopé: le corpus reste tout le workspace (une duplication
+        # d'un fichier modifié peut être ailleurs), seuls les résultats
+        # touchant le périmètre sont gardés
+        index = self.file_index
+        if index.is_scoped:
+            self.scope_files = {
+                str(e.path) for e in index.by_extension('.ts', '.tsx', '.js', '.jsx', include_excluded=False)
+            }
+        
+        for entry in index.unscoped().by_extension('.ts', '.tsx', '.js', '.jsx', include_excluded=False):
+            file_path = entry.path
+            
+            # Ignorer fichiers de test (pour l'instant)
+            if '.test.' in file_path.name or '.spec.' in file_path.name:
+                continue
+            
+            files.append(file_path)
         
         return files
     
-    def _tokenize_parallel(self, files: List[Path]) -> Dict[str, List[str]]:
+    def _tokenize_parallel(self, files: List[Path]):
         """
         Tokenize fichiers en parallèle (multiprocessing)
         
-        Accélération ~4x sur machine 4 cores
+        Accélération ~4x sur machine 4 cores. Les fichiers sont lus via le
+        content store (partagé avec les autres agents): les workers reçoivent
+        directement le texte sans commentaires, pas de relecture disque.
+        
+        Chaque worker traite un lot de fichiers avec son propre vocabulaire
+        et ne renvoie que des ids (array('I')): le parent fusionne les
+        vocabulaires au lieu de recevoir chaque token sous forme de str.
+        
+        Remplit file_tokens (ids internés) et file_token_lines.
         """
         # Limiter workers (éviter overhead)
         num_workers = min(cpu_count(), 4)
         
         if len(files) < 10:
             # Pas de parallélisation pour petits ensembles
-            result = {}
             for file_path in files:
-                tokens = self._tokenize_file(file_path)
-                if tokens:
-                    result[str(file_path)] = tokens
-            return result
+                ids, lines = self._tokenize_file(file_path)
+                if ids:
+                    self._add_file_tokens(str(file_path), ids, lines)
+            self._update_token_keys()
+            return
+        
+        # Charger le code (sans commentaires) depuis le store
+        sources = []
+        codes = []
+        with self.profiler.span('read') as span:
+            for file_path in files:
+                try:
+                    codes.append(self.content_store.get(file_path).code)
+                    sources.append(file_path)
+                except OSError as e:
+                    print(f"⚠️  Erreur tokenization {file_path}: {e}")
+            span.files = len(codes)
+        
+        # Lots contigus (~4 par worker): un vocabulaire par lot
+        batch_size = max(1, -(-len(codes) // (num_workers * 4)))
+        batches = [codes[i:i + batch_size] for i in range(0, len(codes), batch_size)]
         
         # Créer worker pool
         with Pool(processes=num_workers) as pool:
             # Map-reduce
-            results = pool.map(self._tokenize_file_worker, files)
+            results = pool.map(self._tokenize_batch_worker, batches)
+        
+        # Fusionner les vocabulaires et filtrer résultats vides
+        sources_iter = iter(sources)
+        for batch_vocab, batch_results in results:
+            remap = self._merge_vocab(batch_vocab)
+            for (ids, lines), file_path in zip(batch_results, sources_iter):
+                if ids:
+                    self._add_file_tokens(str(file_path), array('I', map(remap.__getitem__, ids)), lines)
         
-        # Filtrer résultats vides
-        return {str(fp): tokens for fp, tokens in zip(files, results) if tokens}
+        self._update_token_keys()
     
     @staticmethod
-    def _tokenize_file_worker(file_path: Path) -> List[str]:
-        """Worker statique pour multiprocessing (picklable)"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Supprimer commentaires
-            import re
-            content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-            content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-            
-            # Tokenize
-            tokens = re.findall(r'\b\w+\b', content)
-            tokens = [t for t in tokens if len(t) >= 2]
-            
-            return tokens
-        except:
-            return []
+    def _tokenize_batch_worker(codes: List[str]) -> Tuple[List[str], List[Tuple[array, array]]]:
+        """
+        Worker statique pour multiprocessing (picklable)
+        
+        Returns:
+            (vocabulaire local id -> token, [(ids, lignes)] par fichier du lot)
+        """
+        vocab: Dict[str, int] = {}
+        vocab_list: List[str] = []
+        results = [_tokenize_code(code, vocab, vocab_list) for code in codes]
+        return vocab_list, results
     
-    def _tokenize_file(self, file_path: Path) -> List[str]:
+    def _tokenize_file(self, file_path: Path) -> Tuple[array, array]:
         """
         Tokenize un fichier en ignorant whitespace et commentaires
         
@@ -188,161 +323,345 @@ class DuplicationDetector:
         Pour une vraie implémentation, utiliser un parser AST
         """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Supprimer commentaires (simple regex, pas parfait)
-            import re
-            
-            # Commentaires ligne
-            content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
+            # Commentaires déjà supprimés par la vue `code` du store
+            code = self.content_store.get(file_path).code
+            return _tokenize_code(code, self.vocab, self.vocab_list)
+        
+        except Exception as e:
+            print(f"⚠️  Erreur tokenization {file_path}: {e}")
+            return array('I'), array('I')
+    
+    def _merge_vocab(self, batch_vocab: List[str]) -> List[int]:
+        """Fusionne un vocabulaire de worker dans le vocabulaire global (id local -> id global)"""
+        vocab = self.vocab
+        remap = []
+        for token in batch_vocab:
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = vocab[token] = len(self.vocab_list)
+                self.vocab_list.append(token)
+            remap.append(token_id)
+        return remap
+    
+    def _update_token_keys(self):
+        """Calcule les clés de hash des tokens ajoutés au vocabulaire"""
+        new_tokens = self.vocab_list[len(self.token_keys):]
+        self.token_keys.extend(_token_key(token) for token in new_tokens)
+    
+    def _add_file_tokens(self, file_id: str, ids: array, lines: array):
+        """Stocke les ids de tokens d'un fichier et la table token -> ligne"""
+        self.file_tokens[file_id] = ids
+        self.file_token_lines[file_id] = lines
+    
+    def _cache_key(self, file_path: Path) -> Optional[Tuple[str, str]]:
+        """(chemin relatif, sha du contenu) d'un fichier, ou None sans cache"""
+        if self.analysis_cache is None:
+            return None
+        try:
+            sha = self.content_store.get(file_path).sha
+            rel_path = file_path.relative_to(self.workspace_root).as_posix()
+        except (OSError, ValueError):
+            return None
+        return rel_path, sha
+    
+    def _load_cached_files(self, files: List[Path]) -> List[Path]:
+        """
+        Reprend du cache persistant les fichiers dont le contenu n'a pas changé
+        
+        Chaque entrée porte le vocabulaire local du fichier, ses ids de
+        tokens (relatifs à ce vocabulaire), sa table token -> ligne et les
+        hashs de ses fenêtres: l'index croisé est recomposé sans relire ni
+        re-tokenizer le texte.
+        
+        Returns:
+            Fichiers à tokenizer (absents du cache ou modifiés)
+        """
+        self._pending_keys: Dict[str, Tuple[str, str]] = {}
+        if self.analysis_cache is None:
+            return files
+        
+        pending = []
+        for file_path in files:
+            key = self._cache_key(file_path)
+            if key is None:
+                pending.append(file_path)
+                continue
             
-            # Commentaires bloc
-            content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+            cached = self.analysis_cache.get(*key)
+            if cached is None:
+                self._pending_keys[str(file_path)] = key
+                pending.append(file_path)
+                continue
             
-            # Tokenize (simple split sur non-alphanumeriques)
-            tokens = re.findall(r'\b\w+\b', content)
+            file_id = str(file_path)
+            if cached['ids']:
+                remap = self._merge_vocab(cached['vocab'])
+                ids = array('I', map(remap.__getitem__, _unpack_array('I', cached['ids'])))
+                self._add_file_tokens(file_id, ids, _unpack_array('I', cached['lines']))
+                self.file_hashes[file_id] = _unpack_array('Q', cached['hashes'])
+        
+        self._update_token_keys()
+        return pending
+    
+    def _restore_file_order(self, files: List[Path]):
+        """Remet les fichiers dans l'ordre de l'index (cachés et tokenizés mêlés)"""
+        order = {str(file_path): i for i, file_path in enumerate(files)}
+        self.file_tokens = dict(sorted(self.file_tokens.items(), key=lambda item: order[item[0]]))
+    
+    def _compute_file_hashes(self) -> int:
+        """
+        Calcule le hash de chaque fenêtre de min_tokens des fichiers tokenizés
+        
+        Les fichiers repris du cache ont déjà leurs hashs. Les autres sont
+        hashés puis mis en cache avec leurs tokens (vocabulaire local) et
+        leur table de lignes; un fichier sans token est aussi mis en cache.
+        
+        Returns:
+            Nombre de fichiers hashés
+        """
+        hashed = 0
+        
+        for file_id, ids in self.file_tokens.items():
+            if file_id in self.file_hashes:
+                continue
             
-            # Filtrer tokens trop courts (< 2 chars)
-            tokens = [t for t in tokens if len(t) >= 2]
+            hashes = self._window_hashes(ids)
+            self.file_hashes[file_id] = hashes
+            hashed += 1
             
-            return tokens
+            key = self._pending_keys.pop(file_id, None)
+            if key is not None:
+                self.analysis_cache.put(*key, self._cache_value(ids, self.file_token_lines[file_id], hashes))
+        
+        # Fichiers sans token: rien à hasher, mais inutile de les re-tokenizer
+        for key in self._pending_keys.values():
+            self.analysis_cache.put(*key, self._cache_value(array('I'), array('I'), array('Q')))
+        self._pending_keys = {}
+        
+        # Même ordre que file_tokens (ordre de l'index)
+        self.file_hashes = {file_id: self.file_hashes[file_id] for file_id in self.file_tokens}
+        return hashed
+    
+    def _cache_value(self, ids: array, lines: array, hashes: array) -> Dict[str, Any]:
+        """Entrée de cache d'un fichier: ids réindexés sur son vocabulaire local"""
+        local: Dict[int, int] = {}
+        local_ids = array('I', (local.setdefault(token_id, len(local)) for token_id in ids))
+        return {
+            'vocab': [self.vocab_list[token_id] for token_id in local],
+            'ids': _pack_array(local_ids),
+            'lines': _pack_array(lines),
+            'hashes': _pack_array(hashes),
+        }
+    
+    def _window_hashes(self, ids: array) -> array:
+        """
+        Hash de chaque fenêtre glissante de min_tokens tokens
         
-        except Exception as e:
-            print(f"⚠️  Erreur tokenization {file_path}: {e}")
-            return []
+        Rabin-Karp modulo 2^64: chaque pas retire le token sortant et ajoute
+        le token entrant en O(1). Les tokens sont hashés via leur clé stable
+        (indépendante de l'ordre d'internement) pour que le cache reste valide.
+        """
+        n = self.min_tokens
+        if len(ids) < n:
+            return array('Q')
+        
+        keys = self.token_keys
+        top = pow(HASH_BASE, n - 1, 1 << 64)  # poids du token sortant
+        
+        window_hash = 0
+        for i in range(n):
+            window_hash = (window_hash * HASH_BASE + keys[ids[i]]) & HASH_MASK
+        
+        hashes = array('Q', [window_hash])
+        for i in range(n, len(ids)):
+            window_hash = ((window_hash - keys[ids[i - n]] * top) * HASH_BASE + keys[ids[i]]) & HASH_MASK
+            hashes.append(window_hash)
+        
+        return hashes
     
     def _build_hash_index_optimized(self):
         """
-        Construit index avec bloom filter (2-pass pour réduire mémoire)
+        Construit l'index des hashs dupliqués en un seul parcours fusionné
+        
+        Chaque fichier trie ses fenêtres par hash (ordre en array('I'),
+        compact), puis heapq.merge parcourt paresseusement tous les fichiers
+        par hash croissant: les occurrences d'un même hash sont consécutives
+        (dans l'ordre fichier puis position), celles vues 2+ fois sont
+        indexées directement, sans liste globale des hashs ni recherche
+        par fenêtre.
+        """
+        file_ids = list(self.file_hashes)
+        streams = [
+            self._sorted_windows(file_index, self.file_hashes[file_id])
+            for file_index, file_id in enumerate(file_ids)
+        ]
         
-        Pass 1: Identifier hashs qui apparaissent 2+ fois (bloom filter)
-        Pass 2: Construire index seulement pour hashs dupliqués
+        duplicates = array('Q')
+        current = None
+        occurrences: List[Tuple[str, int]] = []
+        for window_hash, file_index, pos in heapq.merge(*streams):
+            if window_hash != current:
+                if len(occurrences) > 1:
+                    duplicates.append(current)
+                    self.token_hashes[current] = occurrences
+                current = window_hash
+                occurrences = []
+            occurrences.append((file_ids[file_index], pos))
+        if len(occurrences) > 1:
+            duplicates.append(current)
+            self.token_hashes[current] = occurrences
+        
+        self.duplicate_hashes = duplicates
+    
+    @staticmethod
+    def _sorted_windows(file_index: int, hashes: array):
+        """(hash, index du fichier, position) des fenêtres d'un fichier, par hash croissant"""
+        order = array('I', sorted(range(len(hashes)), key=hashes.__getitem__))
+        for pos in order:
+            yield hashes[pos], file_index, pos
+    
+    def _find_duplications_optimized(self) -> List[DuplicationResult]:
         """
-        # Pass 1: Bloom filter
-        for file_path, tokens in self.file_tokens.items():
-            for i in range(len(tokens) - self.min_tokens + 1):
-                window = tokens[i:i + self.min_tokens]
-                window_hash = self._hash_tokens(window)
-                
-                # Bloom filter: marquer vu, puis dupliqué
-                if window_hash in self.seen_hashes:
-                    self.duplicate_hashes.add(window_hash)
-                else:
-                    self.seen_hashes.add(window_hash)
-        
-        # Pass 2: Index seulement hashs dupliqués (économie mémoire)
-        for file_path, tokens in self.file_tokens.items():
-            file_id = file_path
-            
-            for i in range(len(tokens) - self.min_tokens + 1):
-                window = tokens[i:i + self.min_tokens]
-                window_hash = self._hash_tokens(window)
-                
-                # Seulement si duplication détectée
-                if window_hash in self.duplicate_hashes:
-                    if window_hash not in self.token_hashes:
-                        self.token_hashes[window_hash] = []
-                    
-                    self.token_hashes[window_hash].append((file_id, i))
-    
-    def _build_hash_index(self):
+        Trouve duplications comme runs maximaux de tokens identiques
+        
+        Parcourt les fenêtres dans l'ordre des fichiers: chaque fenêtre
+        dupliquée non encore couverte sert d'ancre. Ses occurrences sont
+        vérifiées token par token (collisions de hash), puis le run est
+        étendu tant que toutes les occurrences concordent. Les fenêtres
+        incluses dans un run sont marquées couvertes: un bloc dupliqué
+        donne un seul résultat au lieu d'un par fenêtre.
         """
-        Construit un index de hashs pour rolling window
+        duplications = []
+        n = self.min_tokens
+        covered = {file_id: bytearray(len(hashes)) for file_id, hashes in self.file_hashes.items()}
         
-        Pour chaque fichier, crée des hashs pour chaque séquence de N tokens
-        """
-        for file_path, tokens in self.file_tokens.items():
-            file_id = file_path
+        for file_id, hashes in self.file_hashes.items():
+            file_covered = covered[file_id]
             
-            # Rolling window de min_tokens
-            for i in range(len(tokens) - self.min_tokens + 1):
-                window = tokens[i:i + self.min_tokens]
-                window_hash = self._hash_tokens(window)
+            for pos, window_hash in enumerate(hashes):
+                if file_covered[pos] or window_hash not in self.token_hashes:
+                    continue
+                
+                members = self._match_occurrences(file_id, pos, covered)
+                
+                # Minimum 2 occurrences
+                if len(members) < 2:
+                    file_covered[pos] = 1
+                    continue
+                
+                length = self._extend_run(members)
+                
+                # Fragment
+                anchor_tokens = self.file_tokens[file_id]
+                fragment = ' '.join(self.vocab_list[t] for t in anchor_tokens[pos:pos + min(10, n)])
                 
-                if window_hash not in self.token_hashes:
-                    self.token_hashes[window_hash] = []
+                # Filtrer trivials inline: seule l'ancre est consommée, le
+                # bloc peut encore être détecté à partir du token suivant
+                if self._is_trivial_fragment(fragment):
+                    for member_file, member_pos in members:
+                        covered[member_file][member_pos] = 1
+                    continue
+                
+                for member_file, member_pos in members:
+                    start = member_pos
+                    end = member_pos + length - n + 1
+                    covered[member_file][start:end] = b'\x01' * (end - start)
+                
+                # Mode scopé: au moins une occurrence dans un fichier modifié
+                files_involved = list(dict.fromkeys(member_file for member_file, _ in members))
+                if self.scope_files is not None and self.scope_files.isdisjoint(files_involved):
+                    continue
+                
+                # Construire locations (lignes réelles via la table token -> ligne)
+                locations = []
+                for member_file, member_pos in members:
+                    line_table = self.file_token_lines[member_file]
+                    locations.append({
+                        'file': member_file,
+                        'start_line': line_table[member_pos],
+                        'end_line': line_table[member_pos + length - 1],
+                        'token_pos': member_pos
+                    })
+                
+                lines_duplicated = min(loc['end_line'] - loc['start_line'] + 1 for loc in locations)
+                if lines_duplicated < self.min_lines:
+                    continue
                 
-                self.token_hashes[window_hash].append((file_id, i))
+                # Sévérité
+                severity = self._calculate_duplication_severity(len(members))
+                
+                duplication = DuplicationResult(
+                    files=files_involved,
+                    lines_duplicated=lines_duplicated,
+                    tokens=length,
+                    fragment=fragment + '...',
+                    locations=locations,
+                    severity=severity
+                )
+                
+                duplications.append(duplication)
         
-        print(f"   Index: {len(self.token_hashes)} hashs uniques")
+        return duplications
     
-    def _find_duplications_optimized(self) -> List[DuplicationResult]:
+    def _match_occurrences(self, file_id: str, pos: int, covered: Dict[str, bytearray]) -> List[Tuple[str, int]]:
         """
-        Trouve duplications (optimisé avec early termination)
+        Occurrences réelles de la fenêtre (file_id, pos)
         
-        Optimisations:
-        - Seulement traiter hashs dupliqués (déjà filtré par bloom)
-        - Early termination si trop de résultats
-        - Filtrer trivials pendant construction (pas après)
+        Écarte les collisions de hash, les fenêtres déjà couvertes et les
+        occurrences qui chevauchent une précédente dans le même fichier.
         """
-        duplications = []
-        processed = 0
-        
-        # Trier hashs par nombre d'occurrences (desc) pour prioriser gros duplications
-        sorted_hashes = sorted(
-            self.token_hashes.items(),
-            key=lambda x: len(x[1]),
-            reverse=True
-        )
-        
-        for window_hash, occurrences in sorted_hashes:
-            # Early termination si assez de résultats
-            if len(duplications) >= self.max_results * 2:
-                break
-            
-            processed += 1
-            
-            # Minimum 2 occurrences
-            if len(occurrences) < 2:
+        n = self.min_tokens
+        window = self.file_tokens[file_id][pos:pos + n]
+        
+        members = []
+        last_pos: Dict[str, int] = {}
+        for member_file, member_pos in self.token_hashes[self.file_hashes[file_id][pos]]:
+            if covered[member_file][member_pos]:
                 continue
-            
-            # Grouper par fichier
-            files_involved = defaultdict(list)
-            for file_id, pos in occurrences:
-                files_involved[file_id].append(pos)
-            
-            # Filtrer: besoin de 2+ fichiers OU 2+ positions dans même fichier
-            if len(files_involved) < 2 and all(len(positions) < 2 for positions in files_involved.values()):
+            if member_file in last_pos and member_pos < last_pos[member_file] + n:
                 continue
-            
-            # Construire locations
-            locations = []
-            for file_id, positions in files_involved.items():
-                for pos in positions:
-                    line_num = self._estimate_line_number(file_id, pos)
-                    locations.append({
-                        'file': file_id,
-                        'start_line': line_num,
-                        'end_line': line_num + self.min_lines,
-                        'token_pos': pos
-                    })
-            
-            # Fragment
-            first_file, first_pos = occurrences[0]
-            tokens = self.file_tokens[first_file]
-            fragment_tokens = tokens[first_pos:first_pos + min(10, self.min_tokens)]
-            fragment = ' '.join(fragment_tokens)
-            
-            # Filtrer trivials inline
-            if self._is_trivial_fragment(fragment):
+            if self.file_tokens[member_file][member_pos:member_pos + n] != window:
                 continue
             
-            # Sévérité
-            severity = self._calculate_duplication_severity(len(occurrences))
-            
-            duplication = DuplicationResult(
-                files=list(files_involved.keys()),
-                lines_duplicated=self.min_lines,
-                tokens=self.min_tokens,
-                fragment=fragment + '...',
-                locations=locations,
-                severity=severity
-            )
-            
-            duplications.append(duplication)
+            last_pos[member_file] = member_pos
+            members.append((member_file, member_pos))
         
-        return duplications
+        return members
+    
+    def _extend_run(self, members: List[Tuple[str, int]]) -> int:
+        """
+        Étend le run commun au-delà de min_tokens
+        
+        Returns:
+            Longueur (en tokens) du plus long préfixe commun à toutes les
+            occurrences, sans chevauchement entre occurrences d'un même fichier
+        """
+        # Écart minimal entre deux occurrences d'un même fichier (positions triées)
+        max_length = None
+        previous: Dict[str, int] = {}
+        for member_file, member_pos in members:
+            if member_file in previous:
+                gap = member_pos - previous[member_file]
+                max_length = gap if max_length is None else min(max_length, gap)
+            previous[member_file] = member_pos
+        
+        anchor_file, anchor_pos = members[0]
+        anchor_tokens = self.file_tokens[anchor_file]
+        sequences = [(self.file_tokens[member_file], member_pos) for member_file, member_pos in members[1:]]
+        
+        length = self.min_tokens
+        while max_length is None or length < max_length:
+            if anchor_pos + length >= len(anchor_tokens):
+                break
+            token = anchor_tokens[anchor_pos + length]
+            if not all(
+                member_pos + length < len(tokens) and tokens[member_pos + length] == token
+                for tokens, member_pos in sequences
+            ):
+                break
+            length += 1
+        
+        return length
     
     def _is_trivial_fragment(self, fragment: str) -> bool:
         """Détecte fragments triviaux inline (optimisation)"""
@@ -366,30 +685,11 @@ class DuplicationDetector:
         
         return False
     
-    def _hash_tokens(self, tokens: List[str]) -> str:
-        """Hash une séquence de tokens"""
-        content = '|'.join(tokens)
-        return hashlib.md5(content.encode()).hexdigest()
-    
     def _estimate_line_number(self, file_path: str, token_pos: int) -> int:
-        """
-        Estime le numéro de ligne pour une position de token
-        
-        Approximation: assume distribution uniforme des tokens
-        """
+        """Numéro de ligne (1-based) d'une position de token, via la table token -> ligne"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = len(f.readlines())
-            
-            total_tokens = len(self.file_tokens[file_path])
-            
-            # Ratio approximatif
-            line_ratio = token_pos / total_tokens
-            estimated_line = int(line_ratio * lines)
-            
-            return max(1, estimated_line)
-        
-        except:
+            return self.file_token_lines[file_path][token_pos]
+        except (KeyError, IndexError):
             return 1
     
     def _calculate_duplication_severity(self, occurrences: int) -> str:
@@ -459,6 +759,11 @@ if __name__ == '__main__':
     detector = DuplicationDetector(config, workspace)
     results = detector.analyze()
     
+    print("\n⏱️  Phases:")
+    for span in detector.profiler.root.children:
+        for line in span.lines(1):
+            print(line)
+    
     print(f"\n📊 Résultats: {len(results)} duplication(s)")
     
     for i, result in enumerate(results[:5], 1):
@@ -1,22 +1,32 @@
 """
 Agent A4: Dead Code Detector
-Détecte les fichiers non utilisés (non importés + non référencés + untouched 30j+)
+Détecte les fichiers non utilisés (inatteignables depuis les points d'entrée
+via le graphe d'imports résolu + untouched 30j+)
 """
 
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Set, Optional
 import os
-import re
 from dataclasses import dataclass
 
 try:
     from core.config import Config
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import Profiler
+    from core.analysis_cache import AnalysisCache
+    from core.import_graph import ImportGraph, extract_imports
 except ImportError:
     # Fallback pour exécution standalone
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from core.config import Config
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import Profiler
+    from core.analysis_cache import AnalysisCache
+    from core.import_graph import ImportGraph, extract_imports
 
 
 @dataclass
@@ -31,11 +41,34 @@ class DeadCodeResult:
 class DeadCodeDetector:
     """Agent A4 - Détecte le code mort"""
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '2'
+    
+    # Points d'entrée (chargés par le runtime, pas importés)
+    ENTRY_POINT_NAMES = {
+        "main.ts",
+        "main.server.ts",
+        "entry.client.tsx",
+        "entry.server.tsx",
+        "root.tsx",
+        "index.ts",
+        "index.tsx"
+    }
+    
+    # Dossiers dont les fichiers sont chargés par convention (routes Remix,
+    # scripts lancés directement, tests)
+    ENTRY_POINT_DIRS = ('routes', 'scripts', 'test', 'tests', '__tests__')
+    
     def __init__(self, workspace_root: Path, config):
         self.workspace_root = workspace_root
         self.config = config
         self.root = workspace_root
         self.threshold_days = config.thresholds.dead_code_days
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.profiler = Profiler('a4_dead_code')  # Remplacé par celui du runner
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.import_graph: Optional[ImportGraph] = None
         
     def analyze(self) -> List[DeadCodeResult]:
         """Analyse et détecte le dead code"""
@@ -44,11 +77,12 @@ class DeadCodeDetector:
         # 1. Trouver tous les fichiers TS/TSX
         all_files = self._find_all_files()
         
-        # 2. Construire graphe d'imports
-        import_graph = self._build_import_graph(all_files)
+        # 2. Construire graphe d'imports (résolu, indexé dans les deux sens)
+        with self.profiler.span('graph'):
+            import_graph = self._build_import_graph()
         
-        # 3. Détecter fichiers non importés
-        unused_files = self._find_unused_files(all_files, import_graph)
+        # 3. Détecter fichiers inatteignables depuis les points d'entrée
+        unused_files = self._find_unused_files(self._scope_candidates(all_files), import_graph)
         
         # 4. Vérifier date dernière modification
         old_files = self._find_old_files(unused_files)
@@ -62,94 +96,105 @@ class DeadCodeDetector:
         return results
     
     def _find_all_files(self) -> Set[Path]:
-        """Trouve tous les fichiers TS/TSX/JS"""
-        files = set()
+        """Trouve tous les fichiers TS/TSX/JS (tout le workspace, même en mode scopé)"""
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root, self.config)
         
-        for pattern in ["**/*.ts", "**/*.tsx", "**/*.js", "**/*.jsx"]:
-            for file_path in self.root.rglob(pattern):
-                if not self.config.should_exclude(file_path):
-                    files.add(file_path)
+        entries = self.file_index.unscoped().by_extension('.ts', '.tsx', '.js', '.jsx', include_excluded=False)
+        return {entry.path for entry in entries}
+    
+    def _scope_candidates(self, all_files: Set[Path]) -> Set[Path]:
+        """
+        Fichiers candidats au dead code
+        
+        Mode scopé: fichiers modifiés + un niveau du graphe d'imports. Les
+        dépendants (qui importent un fichier modifié) et les dépendances
+        (un fichier modifié a pu retirer leur dernier import).
+        """
+        if not self.file_index.is_scoped:
+            return all_files
         
-        return files
+        scope = self._build_import_graph().expand(self.file_index.scope, reverse=True, forward=True)
+        candidates = {self.root / rel_path for rel_path in scope}
+        return {file_path for file_path in all_files if file_path in candidates}
     
-    def _build_import_graph(self, files: Set[Path]) -> dict:
-        """Construit le graphe d'imports"""
-        graph = {}
+    def _build_import_graph(self) -> ImportGraph:
+        """Graphe d'imports du workspace (partagé par le runner, sinon construit une fois)"""
+        if self.import_graph is None:
+            self.import_graph = ImportGraph.build(
+                self.file_index,
+                self.content_store,
+                specifiers=lambda entry: self._cached_imports(entry.path),
+            )
         
-        for file_path in files:
-            imports = self._extract_imports(file_path)
-            graph[file_path] = imports
+        return self.import_graph
+    
+    def _cached_imports(self, file_path: Path) -> Set[str]:
+        """Imports d'un fichier, depuis le cache si son contenu n'a pas changé"""
+        if self.analysis_cache is None:
+            return self._extract_imports(file_path)
+        
+        try:
+            sha = self.content_store.get(file_path).sha
+        except OSError:
+            return self._extract_imports(file_path)
+        
+        rel_path = file_path.relative_to(self.root).as_posix()
+        cached = self.analysis_cache.get(rel_path, sha)
+        if cached is not None:
+            return set(cached)
         
-        return graph
+        imports = self._extract_imports(file_path)
+        self.analysis_cache.put(rel_path, sha, sorted(imports))
+        return imports
     
     def _extract_imports(self, file_path: Path) -> Set[str]:
         """Extrait les imports d'un fichier"""
         imports = set()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Regex pour imports
-            # import ... from '...'
-            # import('...')
-            patterns = [
-                r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',
-                r'import\([\'"]([^\'"]+)[\'"]\)',
-                r'require\([\'"]([^\'"]+)[\'"]\)'
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                imports.update(matches)
+            # import/export ... from '...', import('...'), require('...')
+            imports = extract_imports(self.content_store.get(file_path).code)
         
         except Exception:
             pass
         
         return imports
     
-    def _find_unused_files(self, all_files: Set[Path], graph: dict) -> Set[Path]:
-        """Trouve les fichiers non importés"""
-        unused = set()
+    def _find_unused_files(self, all_files: Set[Path], graph: ImportGraph) -> Set[Path]:
+        """
+        Trouve les fichiers inatteignables depuis les points d'entrée
         
-        # Créer set de tous les chemins importés
-        imported = set()
-        for imports in graph.values():
-            imported.update(imports)
+        Parcours en largeur du graphe à partir des points d'entrée: un
+        fichier importé uniquement par du code mort est lui aussi mort.
+        """
+        roots = {
+            entry.rel_path
+            for entry in self.file_index.unscoped().by_extension('.ts', '.tsx', '.js', '.jsx', include_excluded=False)
+            if self._is_entry_point(entry.path)
+        }
+        reachable = graph.reachable(roots)
         
+        unused = set()
         for file_path in all_files:
-            # Vérifier si le fichier est importé
-            relative = file_path.relative_to(self.root)
-            is_imported = False
-            
-            for imp in imported:
-                if str(relative).replace('\\', '/') in imp or \
-                   file_path.stem in imp:
-                    is_imported = True
-                    break
-            
-            # Exclure entry points
-            if self._is_entry_point(file_path):
-                continue
-            
-            if not is_imported:
+            relative = file_path.relative_to(self.root).as_posix()
+            if relative not in reachable:
                 unused.add(file_path)
         
         return unused
     
     def _is_entry_point(self, file_path: Path) -> bool:
         """Vérifie si c'est un entry point"""
-        entry_points = [
-            "main.ts",
-            "main.server.ts",
-            "entry.client.tsx",
-            "entry.server.tsx",
-            "root.tsx",
-            "index.ts",
-            "index.tsx"
-        ]
-        
-        return file_path.name in entry_points
+        name = file_path.name
+        if name in self.ENTRY_POINT_NAMES:
+            return True
+        
+        # Fichiers de config, déclarations et tests (chargés par les outils)
+        if '.config.' in name or name.endswith('.d.ts') or '.test.' in name or '.spec.' in name:
+            return True
+        
+        relative = file_path.relative_to(self.root).parts[:-1]
+        return any(part in self.ENTRY_POINT_DIRS for part in relative)
     
     def _find_old_files(self, files: Set[Path]) -> Set[Path]:
         """Trouve les fichiers non modifiés depuis N jours"""
@@ -177,7 +222,7 @@ class DeadCodeDetector:
             
             return DeadCodeResult(
                 file_path=str(file_path.relative_to(self.root)),
-                reason=f"Not imported, untouched for {days_old} days",
+                reason=f"Not reachable from entry points, untouched for {days_old} days",
                 last_modified=mtime,
                 confidence=confidence
             )
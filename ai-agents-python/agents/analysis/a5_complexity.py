@@ -3,10 +3,26 @@ A5 - Code Complexity Agent
 Analyse la complexité cyclomatique et cognitive du code.
 """
 
-import re
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Set
-from dataclasses import dataclass
+from typing import List, Dict, Any, Set, Optional
+from dataclasses import asdict, dataclass
+
+try:
+    from core.file_index import FileEntry, FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache
+    from core.lexer import FunctionSpan, iter_functions, language_for, scan_functions
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileEntry, FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache
+    from core.lexer import FunctionSpan, iter_functions, language_for, scan_functions
 
 
 @dataclass
@@ -17,6 +33,8 @@ class ComplexityFinding:
     line_number: int
     cyclomatic_complexity: int
     cognitive_complexity: int
+    nesting_depth: int
+    parameter_count: int
     severity: str  # CRITICAL, HIGH, MEDIUM, LOW
     recommendation: str
 
@@ -32,12 +50,20 @@ class A5ComplexityAgent:
     - Nombre de paramètres
     """
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '3'
+    
     def __init__(self, workspace_root: Path, config):
         """Initialise l'agent A5."""
         self.workspace_root = workspace_root
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[ComplexityFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.functions_scanned = 0
+        self.metadata: Dict[str, Any] = {}
     
     # Seuils de complexité
     THRESHOLDS = {
@@ -67,29 +93,6 @@ class A5ComplexityAgent:
     # Extensions à analyser
     EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.py'}
     
-    # Patterns pour détecter les fonctions
-    FUNCTION_PATTERNS = [
-        # TypeScript/JavaScript
-        r'(?:async\s+)?function\s+(\w+)\s*\(',
-        r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>',
-        r'(\w+)\s*\([^)]*\)\s*{',  # méthodes de classe
-        # Python
-        r'def\s+(\w+)\s*\(',
-        r'async\s+def\s+(\w+)\s*\(',
-    ]
-    
-    # Mots-clés qui augmentent la complexité cyclomatique
-    CYCLOMATIC_KEYWORDS = {
-        'if', 'else', 'elif', 'for', 'while', 'case', 'catch',
-        'and', 'or', '&&', '||', '?', 'break', 'continue', 'return'
-    }
-    
-    # Mots-clés qui augmentent la complexité cognitive
-    COGNITIVE_KEYWORDS = {
-        'if', 'else', 'elif', 'for', 'while', 'case', 'catch',
-        'and', 'or', '&&', '||', '?', 'break', 'continue'
-    }
-    
     IGNORE_PATTERNS = [
         'node_modules',
         'dist',
@@ -107,148 +110,24 @@ class A5ComplexityAgent:
                 return False
         return file_path.suffix in self.EXTENSIONS
     
-    def extract_functions(self, content: str, lines: List[str]) -> List[Dict[str, Any]]:
+    def extract_functions(self, content: str, suffix: str) -> List[FunctionSpan]:
         """
-        Extrait les fonctions d'un fichier.
+        Extrait les fonctions d'un fichier (lexer en une passe, voir core.lexer).
         
         Returns:
-            Liste de dicts avec {name, start_line, end_line, content}
+            Toutes les fonctions, imbriquées comprises, avec leurs métriques
         """
-        functions = []
-        
-        for pattern in self.FUNCTION_PATTERNS:
-            for match in re.finditer(pattern, content):
-                func_name = match.group(1)
-                start_pos = match.start()
-                
-                # Trouver le numéro de ligne
-                line_num = content[:start_pos].count('\n') + 1
-                
-                # Extraire le corps de la fonction (simplification)
-                func_content = self._extract_function_body(lines, line_num)
-                
-                if func_content:
-                    functions.append({
-                        'name': func_name,
-                        'start_line': line_num,
-                        'content': func_content,
-                    })
-        
-        return functions
+        language = language_for(suffix)
+        if language is None:
+            return []
+        return list(iter_functions(scan_functions(content, language)))
     
-    def _extract_function_body(self, lines: List[str], start_line: int) -> str:
-        """Extrait le corps d'une fonction (simple heuristique)."""
-        body_lines = []
-        brace_count = 0
-        started = False
-        
-        for i in range(start_line - 1, len(lines)):
-            line = lines[i]
-            
-            # Compter les accolades
-            brace_count += line.count('{') - line.count('}')
-            
-            if '{' in line:
-                started = True
-            
-            body_lines.append(line)
-            
-            # Fin de fonction
-            if started and brace_count == 0:
-                break
-            
-            # Limite de 200 lignes
-            if len(body_lines) > 200:
-                break
-        
-        return '\n'.join(body_lines)
-    
-    def calculate_cyclomatic_complexity(self, code: str) -> int:
-        """
-        Calcule la complexité cyclomatique.
-        
-        Formule: M = E - N + 2P
-        Simplification: 1 + nombre de points de décision
-        """
-        complexity = 1  # Base
-        
-        # Compter les mots-clés de décision
-        for keyword in self.CYCLOMATIC_KEYWORDS:
-            # Utiliser des regex pour éviter les faux positifs
-            if keyword in {'&&', '||', '?'}:
-                complexity += code.count(keyword)
-            else:
-                # Utiliser word boundaries
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                complexity += len(re.findall(pattern, code))
-        
-        return complexity
-    
-    def calculate_cognitive_complexity(self, code: str) -> int:
-        """
-        Calcule la complexité cognitive.
-        
-        Plus sophistiqué que la complexité cyclomatique:
-        - Pénalise la nidification
-        - Pénalise les séquences complexes
-        """
-        complexity = 0
-        nesting_level = 0
-        lines = code.split('\n')
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Augmenter le niveau de nidification
-            if any(kw in stripped for kw in ['if', 'for', 'while', 'case']):
-                complexity += 1 + nesting_level
-                nesting_level += 1
-            
-            # Opérateurs logiques
-            complexity += stripped.count('&&') + stripped.count('||')
-            
-            # Diminuer le niveau de nidification
-            if stripped.startswith('}'):
-                nesting_level = max(0, nesting_level - 1)
-        
-        return complexity
-    
-    def calculate_nesting_depth(self, code: str) -> int:
-        """Calcule la profondeur de nidification maximale."""
-        max_depth = 0
-        current_depth = 0
-        
-        for char in code:
-            if char == '{':
-                current_depth += 1
-                max_depth = max(max_depth, current_depth)
-            elif char == '}':
-                current_depth = max(0, current_depth - 1)
-        
-        return max_depth
-    
-    def count_parameters(self, code: str) -> int:
-        """Compte le nombre de paramètres d'une fonction."""
-        # Extraire la signature
-        match = re.search(r'\(([^)]*)\)', code[:200])
-        if not match:
-            return 0
-        
-        params = match.group(1)
-        if not params.strip():
-            return 0
-        
-        # Compter les virgules (approximation)
-        return params.count(',') + 1
-    
-    def analyze_function(self, func: Dict[str, Any], file_path: Path) -> ComplexityFinding:
-        """Analyse la complexité d'une fonction."""
-        code = func['content']
-        
-        cyclomatic = self.calculate_cyclomatic_complexity(code)
-        cognitive = self.calculate_cognitive_complexity(code)
-        nesting = self.calculate_nesting_depth(code)
-        params = self.count_parameters(code)
+    def analyze_function(self, func: FunctionSpan, file_path: Path) -> ComplexityFinding:
+        """Analyse la complexité d'une fonction (métriques calculées par le lexer)."""
+        cyclomatic = func.cyclomatic
+        cognitive = func.cognitive
+        nesting = func.nesting
+        params = func.params
         
         # Déterminer la sévérité
         severity = 'LOW'
@@ -274,10 +153,12 @@ class A5ComplexityAgent:
         
         return ComplexityFinding(
             file_path=str(file_path.relative_to(self.root_dir)),
-            function_name=func['name'],
-            line_number=func['start_line'],
+            function_name=func.name,
+            line_number=func.start_line,
             cyclomatic_complexity=cyclomatic,
             cognitive_complexity=cognitive,
+            nesting_depth=nesting,
+            parameter_count=params,
             severity=severity,
             recommendation=recommendation,
         )
@@ -287,11 +168,11 @@ class A5ComplexityAgent:
         findings = []
         
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            lines = content.split('\n')
+            doc = self.content_store.get(file_path)
             
-            # Extraire les fonctions
-            functions = self.extract_functions(content, lines)
+            # Extraire les fonctions (arbre complet, une seule passe)
+            functions = self.extract_functions(doc.text, file_path.suffix)
+            self.functions_scanned += len(functions)
             
             # Analyser chaque fonction
             for func in functions:
@@ -306,15 +187,55 @@ class A5ComplexityAgent:
         
         return findings
     
+    def file_findings(self, entry: FileEntry) -> List[ComplexityFinding]:
+        """
+        Findings d'un fichier, depuis le cache si son contenu n'a pas changé.
+        
+        L'entrée de cache garde aussi le nombre de fonctions du fichier:
+        `functions_scanned` reste identique entre run à froid et run à chaud.
+        """
+        if self.analysis_cache is None:
+            return self.analyze_file(entry.path)
+        try:
+            sha = self.content_store.get(entry.path).sha
+        except OSError:
+            return self.analyze_file(entry.path)
+        
+        cached = self.analysis_cache.get(entry.rel_path, sha)
+        if cached is not None:
+            self.functions_scanned += cached['functions']
+            return [ComplexityFinding(**item) for item in cached['findings']]
+        
+        before = self.functions_scanned
+        findings = self.analyze_file(entry.path)
+        self.analysis_cache.put(entry.rel_path, sha, {
+            'functions': self.functions_scanned - before,
+            'findings': [asdict(f) for f in findings],
+        })
+        return findings
+    
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du projet."""
         self.findings = []
         
-        # Parcourir tous les fichiers
-        for file_path in self.root_dir.rglob('*'):
-            if file_path.is_file() and self.should_analyze(file_path):
-                file_findings = self.analyze_file(file_path)
-                self.findings.extend(file_findings)
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
+        # Parcourir les fichiers de l'index (pas de nouveau parcours disque)
+        start = time.time()
+        files_scanned = 0
+        self.functions_scanned = 0
+        with analysis_phases(self, self.file_index.by_extension(self.EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                self.findings.extend(self.file_findings(entry))
+                files_scanned += 1
+        
+        # Débit (repris dans les metadata du résultat par le runner)
+        self.metadata = {
+            'files_scanned': files_scanned,
+            'functions_scanned': self.functions_scanned,
+            'scan_ms': int((time.time() - start) * 1000),
+        }
         
         # Calculer les métriques
         severity_counts = {
@@ -349,6 +270,8 @@ class A5ComplexityAgent:
                     'line': f.line_number,
                     'cyclomatic': f.cyclomatic_complexity,
                     'cognitive': f.cognitive_complexity,
+                    'nesting': f.nesting_depth,
+                    'parameters': f.parameter_count,
                     'severity': f.severity,
                     'recommendation': f.recommendation,
                 }
@@ -1,15 +1,46 @@
 """
 A6 - Dependencies Vulnerabilities Agent
 Analyse les dépendances pour détecter les versions obsolètes et vulnérables.
+
+Les package.json sont regroupés par lockfile: un package-lock.json de
+workspaces npm couvre tous ses membres (frontend, backend, packages/*),
+`npm outdated`/`npm audit` ne tournent donc qu'une fois par lockfile, et
+toutes les commandes (npm et pip) s'exécutent en parallèle. Un même
+package vu dans plusieurs workspaces donne un seul finding.
+
+Les résultats npm/pip sont conservés dans un snapshot (clé: empreinte du
+lockfile / des requirements). En ligne, un snapshot récent est réutilisé
+et sert de repli si npm échoue (pas de réseau). En mode hors ligne
+(`dependencies.offline`), seul le snapshot est lu: run rapide et
+déterministe, sans réseau.
 """
 
+import hashlib
 import json
+import os
+import platform
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    from core.file_index import FileIndex
+    from core.profiling import Profiler
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.profiling import Profiler
+
+
+# Version du format de snapshot
+SNAPSHOT_VERSION = '1'
+
 
 @dataclass
 class DependencyFinding:
@@ -22,6 +53,72 @@ class DependencyFinding:
     description: str
     recommendation: str
     cve_ids: List[str] = None
+    workspaces: List[str] = None  # Dossiers (relatifs) qui déclarent le package
+
+
+@dataclass
+class NpmRoot:
+    """Dossier où lancer npm: un lockfile et les workspaces qu'il couvre"""
+    path: Path
+    rel_path: str  # '.' pour la racine du workspace
+    lockfile: Optional[Path]
+    members: List[str] = field(default_factory=list)  # Dossiers des package.json couverts
+    workspaces: bool = False  # package.json racine avec "workspaces"
+
+
+class AdvisorySnapshot:
+    """
+    Résultats npm/pip persistés, par clé de commande
+    
+    Chaque entrée garde l'empreinte de ses entrées (lockfile, requirements)
+    et sa date: réutilisable si l'empreinte est identique et l'entrée
+    récente, ou telle quelle en mode hors ligne.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SNAPSHOT_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entrée brute {fingerprint, timestamp, data} (ou None)"""
+        return self.entries.get(key)
+    
+    def put(self, key: str, fingerprint: str, data: Any):
+        self.entries[key] = {'fingerprint': fingerprint, 'timestamp': time.time(), 'data': data}
+        self.dirty = True
+    
+    def save(self):
+        """Écrit le snapshot (écriture atomique)"""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'entries': self.entries}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+def _fingerprint(*paths: Path, extra: str = '') -> str:
+    """Empreinte du contenu de fichiers (absents ignorés)"""
+    digest = hashlib.sha256(extra.encode('utf-8'))
+    for path in paths:
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()[:16]
 
 
 class A6DependenciesAgent:
@@ -51,6 +148,13 @@ class A6DependenciesAgent:
         'tslint': 'deprecated - use eslint with @typescript-eslint',
     }
     
+    SEVERITY_MAP = {
+        'critical': 'CRITICAL',
+        'high': 'HIGH',
+        'moderate': 'MEDIUM',
+        'low': 'LOW',
+    }
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A6.
@@ -61,28 +165,35 @@ class A6DependenciesAgent:
         """
         self.workspace_root = workspace_root
         self.config = config
-        self.root_dir = workspace_root
+        self.root_dir = Path(workspace_root)
         self.findings: List[DependencyFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.profiler = Profiler('a6_dependencies')  # Remplacé par celui du runner
+        self.options = config.dependencies
+        self.resolved: Dict[str, Set[str]] = {}  # package -> versions résolues (lockfiles)
+        self.use_cache = True  # False (run.py --no-cache): snapshot jamais relu
+        self.metadata: Dict[str, Any] = {}
+    
+    def _get_file_index(self) -> FileIndex:
+        """Index partagé du runner, ou construit localement en standalone."""
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        return self.file_index
     
     def find_package_json_files(self) -> List[Path]:
         """Trouve tous les fichiers package.json."""
         package_files = []
         
-        for file_path in self.root_dir.rglob('package.json'):
+        for entry in self._get_file_index().glob('package.json'):
             # Ignorer node_modules
-            if 'node_modules' not in str(file_path):
-                package_files.append(file_path)
+            if 'node_modules' not in entry.rel_path:
+                package_files.append(entry.path)
         
         return package_files
     
     def find_requirements_files(self) -> List[Path]:
         """Trouve tous les fichiers requirements.txt."""
-        req_files = []
-        
-        for file_path in self.root_dir.rglob('requirements*.txt'):
-            req_files.append(file_path)
-        
-        return req_files
+        return [entry.path for entry in self._get_file_index().glob('requirements*.txt')]
     
     def parse_package_json(self, file_path: Path) -> Dict[str, str]:
         """Parse un fichier package.json."""
@@ -129,158 +240,206 @@ class A6DependenciesAgent:
         
         return dependencies
     
-    def check_npm_outdated(self, package_dir: Path) -> Dict[str, Any]:
-        """
-        Vérifie les packages npm obsolètes.
-        
-        Returns:
-            Dict avec les packages outdated
-        """
+    def _rel_dir(self, path: Path) -> str:
+        """Dossier relatif au workspace ('.' pour la racine)"""
         try:
-            result = subprocess.run(
-                ['npm', 'outdated', '--json'],
-                cwd=package_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # npm outdated retourne un code non-zéro si des packages sont outdated
-            if result.stdout:
-                return json.loads(result.stdout)
-            
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception):
-            pass
-        
-        return {}
+            rel = path.relative_to(self.root_dir).as_posix()
+        except ValueError:
+            rel = path.as_posix()
+        return rel or '.'
     
-    def check_npm_audit(self, package_dir: Path) -> Dict[str, Any]:
+    def resolve_npm_roots(self, package_files: List[Path]) -> List[NpmRoot]:
         """
-        Vérifie les vulnérabilités npm.
+        Regroupe les package.json par lockfile (lu une seule fois)
         
-        Returns:
-            Dict avec les vulnérabilités
+        Un package.json est couvert par un package-lock.json qui le liste
+        dans `packages` (racine ou membre de workspaces). Sinon, npm tourne
+        dans son propre dossier (comme avant).
         """
-        try:
-            result = subprocess.run(
-                ['npm', 'audit', '--json'],
-                cwd=package_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+        roots: Dict[str, NpmRoot] = {}
+        covered: Dict[str, str] = {}  # Dossier de package.json -> dossier du lockfile
+        
+        for entry in self._get_file_index().glob('package-lock.json', include_excluded=False):
+            if 'node_modules' in entry.rel_path:
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    lock = json.load(f)
+            except (OSError, ValueError):
+                continue
             
-            if result.stdout:
-                return json.loads(result.stdout)
-        
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception):
-            pass
+            lock_dir = entry.path.parent
+            lock_rel = self._rel_dir(lock_dir)
+            roots[lock_rel] = NpmRoot(path=lock_dir, rel_path=lock_rel, lockfile=entry.path)
+            
+            packages = lock.get('packages') or {}
+            for key, info in packages.items():
+                if 'node_modules/' in key or key.startswith('node_modules'):
+                    # Version résolue (lockfile v2/v3)
+                    name = key.rsplit('node_modules/', 1)[-1]
+                    if isinstance(info, dict) and info.get('version'):
+                        self.resolved.setdefault(name, set()).add(info['version'])
+                    continue
+                member = (lock_dir / key) if key else lock_dir
+                covered[self._rel_dir(member)] = lock_rel
+            
+            # Lockfile v1: dépendances imbriquées, pas de workspaces
+            for name, info in (lock.get('dependencies') or {}).items() if not packages else ():
+                if isinstance(info, dict) and info.get('version'):
+                    self.resolved.setdefault(name, set()).add(info['version'])
+            covered.setdefault(lock_rel, lock_rel)
         
-        return {}
+        for package_file in package_files:
+            package_rel = self._rel_dir(package_file.parent)
+            root_rel = covered.get(package_rel)
+            if root_rel is None:
+                root_rel = package_rel
+                roots[root_rel] = NpmRoot(path=package_file.parent, rel_path=root_rel, lockfile=None)
+            root = roots[root_rel]
+            root.members.append(package_rel)
+            if package_rel == root_rel:
+                try:
+                    with open(package_file, 'r', encoding='utf-8') as f:
+                        root.workspaces = bool(json.load(f).get('workspaces'))
+                except (OSError, ValueError, AttributeError):
+                    pass
+        
+        # Lockfiles orphelins (sans package.json indexé): ignorés
+        return [root for _, root in sorted(roots.items()) if root.members]
     
-    def check_pip_outdated(self) -> List[Dict[str, str]]:
-        """Vérifie les packages Python obsolètes."""
+    def _run_json(self, cmd: List[str], cwd: Optional[Path] = None) -> Optional[Any]:
+        """Sortie JSON d'une commande (None si échec, timeout ou erreur npm)"""
         try:
             result = subprocess.run(
-                ['pip', 'list', '--outdated', '--format=json'],
+                cmd,
+                cwd=cwd,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=self.options.timeout
             )
-            
-            if result.stdout:
-                return json.loads(result.stdout)
+            if not result.stdout.strip():
+                # npm outdated: sortie vide = rien d'obsolète
+                return {} if result.returncode == 0 else None
+            data = json.loads(result.stdout)
+        except (OSError, subprocess.TimeoutExpired, ValueError):
+            return None
+        
+        # npm signale ses erreurs (réseau, registry) dans le JSON
+        if isinstance(data, dict) and 'error' in data:
+            return None
+        return data
+    
+    def check_npm_outdated(self, package_dir: Path, workspaces: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie les packages npm obsolètes.
         
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception):
-            pass
+        Returns:
+            Dict avec les packages outdated (None si npm a échoué)
+        """
+        cmd = ['npm', 'outdated', '--json']
+        if workspaces:
+            cmd += ['--workspaces', '--include-workspace-root']
+        return self._run_json(cmd, cwd=package_dir)
+    
+    def check_npm_audit(self, package_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie les vulnérabilités npm (tout l'arbre du lockfile).
         
-        return []
+        Returns:
+            Dict avec les vulnérabilités (None si npm a échoué)
+        """
+        return self._run_json(['npm', 'audit', '--json'], cwd=package_dir)
     
-    def analyze_npm_dependencies(self, package_file: Path) -> List[DependencyFinding]:
-        """Analyse les dépendances npm d'un package.json."""
-        findings = []
-        package_dir = package_file.parent
+    def check_pip_outdated(self) -> Optional[List[Dict[str, str]]]:
+        """Vérifie les packages Python obsolètes (None si pip a échoué)."""
+        return self._run_json(['pip', 'list', '--outdated', '--format=json'])
+    
+    def _run_checks(self, checks: Dict[str, Tuple[Callable[[], Any], str]]) -> Dict[str, Any]:
+        """
+        Exécute les commandes npm/pip en parallèle, via le snapshot
         
-        # Parser le package.json
-        dependencies = self.parse_package_json(package_file)
+        Sans cache (--no-cache), le snapshot n'est pas relu (ni réutilisation
+        dans le TTL, ni repli si la commande échoue) mais reste rafraîchi;
+        --offline le lit toujours: c'est alors la seule source demandée.
         
-        # Vérifier les packages dépréciés
-        for pkg_name, version in dependencies.items():
-            if pkg_name in self.DEPRECATED_PACKAGES:
-                finding = DependencyFinding(
-                    package_name=pkg_name,
-                    current_version=version,
-                    latest_version=None,
-                    severity='MEDIUM',
-                    category='DEPRECATED',
-                    description=f'Package déprécié: {self.DEPRECATED_PACKAGES[pkg_name]}',
-                    recommendation=f'Migrer vers une alternative moderne',
-                )
-                findings.append(finding)
+        Args:
+            checks: clé -> (commande, empreinte de ses entrées)
         
-        # Vérifier les packages obsolètes
-        outdated = self.check_npm_outdated(package_dir)
-        for pkg_name, info in outdated.items():
-            current = info.get('current', '?')
-            latest = info.get('latest', '?')
-            
-            finding = DependencyFinding(
+        Returns:
+            clé -> données (None si indisponibles)
+        """
+        snapshot = AdvisorySnapshot(self.root_dir / self.options.snapshot)
+        ttl = self.options.snapshot_ttl_hours * 3600
+        now = time.time()
+        results: Dict[str, Any] = {}
+        sources: Dict[str, str] = {}
+        live: Dict[str, Callable[[], Any]] = {}
+        
+        for key, (command, fingerprint) in checks.items():
+            entry = snapshot.get(key) if self.use_cache or self.options.offline else None
+            if self.options.offline:
+                results[key] = entry['data'] if entry else None
+                sources[key] = ('snapshot' if entry['fingerprint'] == fingerprint else 'stale') if entry else 'missing'
+            elif entry and entry['fingerprint'] == fingerprint and now - entry['timestamp'] < ttl:
+                results[key] = entry['data']
+                sources[key] = 'snapshot'
+            else:
+                live[key] = command
+        
+        if live:
+            with ThreadPoolExecutor(max_workers=max(1, self.options.jobs)) as executor:
+                futures = {key: executor.submit(command) for key, command in live.items()}
+                for key, future in futures.items():
+                    data = future.result()
+                    if data is not None:
+                        snapshot.put(key, checks[key][1], data)
+                        results[key], sources[key] = data, 'live'
+                    else:
+                        # Repli: dernier résultat connu (réseau indisponible)
+                        entry = snapshot.get(key) if self.use_cache else None
+                        results[key] = entry['data'] if entry else None
+                        sources[key] = 'stale' if entry else 'missing'
+            snapshot.save()
+        
+        self.metadata['sources'] = sources
+        return results
+    
+    def _deprecated_findings(self, declared: Dict[str, Dict[str, List[str]]]) -> List[DependencyFinding]:
+        """Packages dépréciés déclarés (un finding par package, tous workspaces)"""
+        findings = []
+        for pkg_name, ranges in declared.items():
+            if pkg_name not in self.DEPRECATED_PACKAGES:
+                continue
+            versions = sorted(self.resolved.get(pkg_name) or ranges)
+            findings.append(DependencyFinding(
                 package_name=pkg_name,
-                current_version=current,
-                latest_version=latest,
+                current_version=', '.join(versions),
+                latest_version=None,
                 severity='MEDIUM',
-                category='OUTDATED',
-                description=f'Version obsolète: {current} → {latest}',
-                recommendation=f'Mettre à jour vers {latest}',
-            )
-            findings.append(finding)
-        
-        # Vérifier les vulnérabilités
-        audit = self.check_npm_audit(package_dir)
-        if 'vulnerabilities' in audit:
-            vulns = audit['vulnerabilities']
-            
-            for pkg_name, vuln_info in vulns.items():
-                severity_map = {
-                    'critical': 'CRITICAL',
-                    'high': 'HIGH',
-                    'moderate': 'MEDIUM',
-                    'low': 'LOW',
-                }
-                
-                severity = severity_map.get(vuln_info.get('severity', 'low'), 'MEDIUM')
-                
-                finding = DependencyFinding(
-                    package_name=pkg_name,
-                    current_version=vuln_info.get('version', '?'),
-                    latest_version=None,
-                    severity=severity,
-                    category='VULNERABLE',
-                    description=f"Vulnérabilité {vuln_info.get('severity', 'unknown')}",
-                    recommendation='Mettre à jour vers une version sécurisée',
-                    cve_ids=vuln_info.get('cves', []),
-                )
-                findings.append(finding)
-        
+                category='DEPRECATED',
+                description=f'Package déprécié: {self.DEPRECATED_PACKAGES[pkg_name]}',
+                recommendation=f'Migrer vers une alternative moderne',
+                workspaces=sorted({ws for members in ranges.values() for ws in members}),
+            ))
         return findings
     
-    def analyze_python_dependencies(self, req_file: Path) -> List[DependencyFinding]:
-        """Analyse les dépendances Python d'un requirements.txt."""
+    def _outdated_findings(self, root: NpmRoot, outdated: Dict[str, Any], seen: Dict[Tuple, DependencyFinding]) -> List[DependencyFinding]:
+        """Packages obsolètes d'une racine npm, dédupliqués par (package, version, dernière)"""
         findings = []
-        
-        # Parser le fichier
-        dependencies = self.parse_requirements(req_file)
-        
-        # Vérifier les packages obsolètes
-        outdated = self.check_pip_outdated()
-        
-        for pkg_info in outdated:
-            pkg_name = pkg_info.get('name')
-            current = pkg_info.get('version')
-            latest = pkg_info.get('latest_version')
-            
-            if pkg_name in dependencies:
-                finding = DependencyFinding(
+        for pkg_name, infos in outdated.items():
+            # --workspaces: une entrée par workspace dépendant
+            for info in (infos if isinstance(infos, list) else [infos]):
+                current = info.get('current', '?')
+                latest = info.get('latest', '?')
+                workspace = info.get('dependent') or root.rel_path
+                
+                key = (pkg_name, current, latest)
+                if key in seen:
+                    if workspace not in seen[key].workspaces:
+                        seen[key].workspaces.append(workspace)
+                    continue
+                
+                seen[key] = DependencyFinding(
                     package_name=pkg_name,
                     current_version=current,
                     latest_version=latest,
@@ -288,26 +447,127 @@ class A6DependenciesAgent:
                     category='OUTDATED',
                     description=f'Version obsolète: {current} → {latest}',
                     recommendation=f'Mettre à jour vers {latest}',
+                    workspaces=[workspace],
                 )
-                findings.append(finding)
-        
+                findings.append(seen[key])
+        return findings
+    
+    def _audit_findings(
+        self,
+        root: NpmRoot,
+        audit: Dict[str, Any],
+        seen: Dict[Tuple, DependencyFinding],
+        reported: Set[Tuple[str, str]],
+    ) -> List[DependencyFinding]:
+        """Vulnérabilités d'une racine npm, dédupliquées entre lockfiles (une fois par package et workspace)"""
+        findings = []
+        for pkg_name, vuln_info in (audit.get('vulnerabilities') or {}).items():
+            if (pkg_name, root.rel_path) in reported:
+                continue
+            reported.add((pkg_name, root.rel_path))
+            severity = self.SEVERITY_MAP.get(vuln_info.get('severity', 'low'), 'MEDIUM')
+            version = vuln_info.get('version') or vuln_info.get('range', '?')
+            
+            key = (pkg_name, version, severity)
+            if key in seen:
+                seen[key].workspaces.append(root.rel_path)
+                continue
+            
+            seen[key] = DependencyFinding(
+                package_name=pkg_name,
+                current_version=version,
+                latest_version=None,
+                severity=severity,
+                category='VULNERABLE',
+                description=f"Vulnérabilité {vuln_info.get('severity', 'unknown')}",
+                recommendation='Mettre à jour vers une version sécurisée',
+                cve_ids=vuln_info.get('cves', []),
+                workspaces=[root.rel_path],
+            )
+            findings.append(seen[key])
+        return findings
+    
+    def _python_findings(self, outdated: List[Dict[str, str]], declared: Dict[str, List[str]]) -> List[DependencyFinding]:
+        """Packages Python obsolètes déclarés dans au moins un requirements"""
+        findings = []
+        for pkg_info in outdated:
+            pkg_name = pkg_info.get('name')
+            if pkg_name not in declared:
+                continue
+            current = pkg_info.get('version')
+            latest = pkg_info.get('latest_version')
+            findings.append(DependencyFinding(
+                package_name=pkg_name,
+                current_version=current,
+                latest_version=latest,
+                severity='MEDIUM',
+                category='OUTDATED',
+                description=f'Version obsolète: {current} → {latest}',
+                recommendation=f'Mettre à jour vers {latest}',
+                workspaces=declared[pkg_name],
+            ))
         return findings
     
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète des dépendances."""
         self.findings = []
+        self.resolved = {}
+        self.metadata = {'offline': self.options.offline}
         
-        # Analyser les dépendances npm
+        # Dépendances déclarées: package -> plage -> workspaces
         package_files = self.find_package_json_files()
+        declared: Dict[str, Dict[str, List[str]]] = {}
         for package_file in package_files:
-            npm_findings = self.analyze_npm_dependencies(package_file)
-            self.findings.extend(npm_findings)
+            workspace = self._rel_dir(package_file.parent)
+            for pkg_name, version in self.parse_package_json(package_file).items():
+                declared.setdefault(pkg_name, {}).setdefault(version, []).append(workspace)
         
-        # Analyser les dépendances Python
         req_files = self.find_requirements_files()
+        python_declared: Dict[str, List[str]] = {}
         for req_file in req_files:
-            py_findings = self.analyze_python_dependencies(req_file)
-            self.findings.extend(py_findings)
+            for pkg_name in self.parse_requirements(req_file):
+                python_declared.setdefault(pkg_name, []).append(self._rel_dir(req_file))
+        
+        # Un lockfile = une racine npm (lu une fois), commandes en parallèle
+        roots = self.resolve_npm_roots(package_files)
+        checks: Dict[str, Tuple[Callable[[], Any], str]] = {}
+        for root in roots:
+            inputs = [root.lockfile] if root.lockfile else [root.path / 'package.json']
+            fingerprint = _fingerprint(*inputs, extra=str(root.workspaces))
+            checks[f'npm:{root.rel_path}:outdated'] = (
+                lambda root=root: self.check_npm_outdated(root.path, root.workspaces), fingerprint
+            )
+            checks[f'npm:{root.rel_path}:audit'] = (
+                lambda root=root: self.check_npm_audit(root.path), fingerprint
+            )
+        if python_declared:
+            # Une seule fois par run (dépend de l'environnement, pas du fichier)
+            fingerprint = _fingerprint(*req_files, extra=platform.python_version())
+            checks['pip:outdated'] = (self.check_pip_outdated, fingerprint)
+        
+        start = time.time()
+        with self.profiler.span('checks') as span:
+            results = self._run_checks(checks)
+            span.files = len(package_files) + len(req_files)
+            span.counters['checks'] = len(checks)
+        self.metadata['npm_roots'] = [root.rel_path for root in roots]
+        self.metadata['checks_ms'] = int((time.time() - start) * 1000)
+        
+        self.findings.extend(self._deprecated_findings(declared))
+        outdated_seen: Dict[Tuple, DependencyFinding] = {}
+        audit_seen: Dict[Tuple, DependencyFinding] = {}
+        audit_reported: Set[Tuple[str, str]] = set()
+        for root in roots:
+            outdated = results.get(f'npm:{root.rel_path}:outdated')
+            if isinstance(outdated, dict):
+                self.findings.extend(self._outdated_findings(root, outdated, outdated_seen))
+            audit = results.get(f'npm:{root.rel_path}:audit')
+            if isinstance(audit, dict):
+                self.findings.extend(self._audit_findings(root, audit, audit_seen, audit_reported))
+        
+        pip_outdated = results.get('pip:outdated')
+        if isinstance(pip_outdated, list):
+            self.findings.extend(self._python_findings(pip_outdated, python_declared))
         
         # Calculer les métriques
         severity_counts = {
@@ -333,6 +593,7 @@ class A6DependenciesAgent:
             'category_counts': category_counts,
             'package_files_analyzed': len(package_files),
             'requirements_files_analyzed': len(req_files),
+            'npm_roots_analyzed': len(roots),
             'findings': [
                 {
                     'package': f.package_name,
@@ -343,6 +604,7 @@ class A6DependenciesAgent:
                     'description': f.description,
                     'recommendation': f.recommendation,
                     'cves': f.cve_ids or [],
+                    'workspaces': f.workspaces or [],
                 }
                 for f in sorted(self.findings, key=lambda x: (
                     {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}[x.severity],
@@ -376,16 +638,26 @@ class A6DependenciesAgent:
 
 
 if __name__ == '__main__':
-    import sys
+    import argparse
+    from core.config import Config
+    
+    parser = argparse.ArgumentParser(description='A6 - Dependencies Analysis')
+    parser.add_argument('root', nargs='?', default='.')
+    parser.add_argument('--offline', action='store_true', help='Lire uniquement le snapshot (pas de npm/pip)')
+    parser.add_argument('--no-cache', action='store_true', help='Ne pas réutiliser le snapshot (npm/pip relancés)')
+    args = parser.parse_args()
     
-    root = sys.argv[1] if len(sys.argv) > 1 else '.'
+    root = args.root
+    config = Config.load(str(Path(__file__).parent.parent.parent / 'config.yaml'))
+    config.dependencies.offline = config.dependencies.offline or args.offline
     
     print(f"🔍 A6 - Dependencies Analysis")
     print(f"📁 Root: {root}")
     print(f"⏰ Start: {datetime.now().strftime('%H:%M:%S')}\n")
     
     start = datetime.now()
-    agent = A6DependenciesAgent(root)
+    agent = A6DependenciesAgent(Path(root), config)
+    agent.use_cache = not args.no_cache
     results = agent.analyze()
     duration = (datetime.now() - start).total_seconds()
     
@@ -6,9 +6,49 @@ Analyse les problèmes de performance du code.
 import re
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore, FileContent
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore, FileContent
+    from core.profiling import Profiler, analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+
+
+def _heavy_import_rules(heavy_imports: Dict[str, Dict[str, str]]) -> List[Rule]:
+    """Règles d'import complet (pas tree-shaken) de chaque bibliothèque lourde"""
+    rules = []
+    for lib in heavy_imports:
+        patterns = [
+            rf'import\s+{lib}\s+from\s+["\']' + lib + r'["\']',
+            rf'require\s*\(\s*["\']' + lib + r'["\']\s*\)',
+        ]
+        for i, pattern in enumerate(patterns):
+            rules.append(Rule(f'heavy_import_{lib}_{i}', pattern, literals=(lib,), per_line=True, meta={'lib': lib}))
+    return rules
+
+
+def _performance_rules(performance_patterns: Dict[str, Dict[str, Any]]) -> List[Rule]:
+    """Règles de PERFORMANCE_PATTERNS: ligne par ligne, sauf les patterns multilignes"""
+    rules = []
+    for name, info in performance_patterns.items():
+        if info.get('multiline'):
+            rules.append(Rule(name, re.compile(info['pattern'], re.MULTILINE | re.DOTALL), literals=info['literals'], meta=info))
+        else:
+            rules.append(Rule(name, info['pattern'], literals=info['literals'], per_line=True, skip_comments=True, meta=info))
+    return rules
+
 
 @dataclass
 class PerformanceFinding:
@@ -58,6 +98,7 @@ class A7PerformanceAgent:
     PERFORMANCE_PATTERNS = {
         'console_log': {
             'pattern': r'console\.(log|debug|info|warn|error)\s*\(',
+            'literals': ['console.'],
             'severity': 'MEDIUM',
             'category': 'PRODUCTION_DEBUG',
             'description': 'console.log laissé en production',
@@ -66,6 +107,8 @@ class A7PerformanceAgent:
         },
         'nested_loops': {
             'pattern': r'for\s*\([^)]+\)\s*{[^}]*for\s*\(',
+            'literals': ['for'],
+            'multiline': True,  # Cherché dans le contenu complet
             'severity': 'HIGH',
             'category': 'N_PLUS_1',
             'description': 'Boucles imbriquées détectées (complexité O(n²))',
@@ -74,6 +117,7 @@ class A7PerformanceAgent:
         },
         'synchronous_fs': {
             'pattern': r'fs\.(readFileSync|writeFileSync|existsSync)',
+            'literals': ['fs.'],
             'severity': 'CRITICAL',
             'category': 'BLOCKING_IO',
             'description': 'Opération filesystem synchrone (bloque le thread)',
@@ -82,6 +126,7 @@ class A7PerformanceAgent:
         },
         'json_parse_large': {
             'pattern': r'JSON\.parse\([^)]{100,}\)',
+            'literals': ['JSON.parse('],
             'severity': 'MEDIUM',
             'category': 'BLOCKING_PARSE',
             'description': 'Parsing JSON potentiellement lourd de façon synchrone',
@@ -90,6 +135,7 @@ class A7PerformanceAgent:
         },
         'settimeout_0': {
             'pattern': r'setTimeout\s*\([^,]+,\s*0\s*\)',
+            'literals': ['setTimeout'],
             'severity': 'LOW',
             'category': 'ANTI_PATTERN',
             'description': 'setTimeout(..., 0) utilisé (souvent anti-pattern)',
@@ -98,6 +144,7 @@ class A7PerformanceAgent:
         },
         'multiple_renders': {
             'pattern': r'(useState|setState)\s*\([^)]+\)[^;]{0,50}(useState|setState)',
+            'literals': ['useState', 'setState'],
             'severity': 'MEDIUM',
             'category': 'MULTIPLE_RENDERS',
             'description': 'Multiples setState consécutifs (cause plusieurs re-renders)',
@@ -106,6 +153,7 @@ class A7PerformanceAgent:
         },
         'inline_functions': {
             'pattern': r'(onClick|onChange|onSubmit)=\{[^}]*=>\s*',
+            'literals': ['onClick={', 'onChange={', 'onSubmit={'],
             'severity': 'LOW',
             'category': 'INLINE_FUNCTION',
             'description': 'Fonction inline dans un handler (re-créée à chaque render)',
@@ -114,6 +162,7 @@ class A7PerformanceAgent:
         },
         'unmemoized_computation': {
             'pattern': r'\.map\([^)]+\)\.filter\([^)]+\)\.map\(',
+            'literals': ['.map('],
             'severity': 'MEDIUM',
             'category': 'CHAIN_OPERATIONS',
             'description': 'Chaîne de .map().filter().map() non optimisée',
@@ -122,6 +171,10 @@ class A7PerformanceAgent:
         },
     }
     
+    # Règles compilées une seule fois (`literals`: préfiltre du moteur de règles)
+    HEAVY_IMPORT_RULES = _heavy_import_rules(HEAVY_IMPORTS)
+    PERFORMANCE_RULES = _performance_rules(PERFORMANCE_PATTERNS)
+    
     # Extensions à analyser
     EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
     
@@ -139,6 +192,9 @@ class A7PerformanceAgent:
         '.spec.',
     ]
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A7.
@@ -150,6 +206,12 @@ class A7PerformanceAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[PerformanceFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.profiler = Profiler('a7_performance')  # Remplacé par celui du runner
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.rule_engine = RuleEngine(self.HEAVY_IMPORT_RULES + self.PERFORMANCE_RULES)
+        self.metadata: Dict[str, Any] = {}
     
     def should_analyze(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être analysé."""
@@ -160,77 +222,48 @@ class A7PerformanceAgent:
         
         return file_path.suffix in self.EXTENSIONS
     
-    def check_heavy_imports(self, file_path: Path, content: str) -> List[PerformanceFinding]:
+    def check_heavy_imports(self, file_path: Path, doc: FileContent) -> List[PerformanceFinding]:
         """Détecte les imports de bibliothèques lourdes."""
         findings = []
-        lines = content.split('\n')
         
-        for i, line in enumerate(lines, 1):
-            for lib, info in self.HEAVY_IMPORTS.items():
-                # Détection d'import complet (pas tree-shaken)
-                patterns = [
-                    rf'import\s+{lib}\s+from\s+["\']' + lib + r'["\']',
-                    rf'require\s*\(\s*["\']' + lib + r'["\']\s*\)',
-                ]
-                
-                for pattern in patterns:
-                    if re.search(pattern, line):
-                        finding = PerformanceFinding(
-                            file_path=str(file_path.relative_to(self.root_dir)),
-                            line_number=i,
-                            severity=info['severity'],
-                            category='HEAVY_IMPORT',
-                            description=f'Import lourd détecté: {lib} ({info["size"]})',
-                            recommendation=f'Alternative: {info["alternative"]}',
-                            impact=f'Ajoute {info["size"]} au bundle',
-                        )
-                        findings.append(finding)
+        # Ordre par ligne (puis bibliothèque, pattern)
+        hits = self.rule_engine.scan(doc, [rule.name for rule in self.HEAVY_IMPORT_RULES])
+        hits.sort(key=lambda hit: hit.line)
+        
+        for hit in hits:
+            lib = hit.rule.meta['lib']
+            info = self.HEAVY_IMPORTS[lib]
+            finding = PerformanceFinding(
+                file_path=str(file_path.relative_to(self.root_dir)),
+                line_number=hit.line,
+                severity=info['severity'],
+                category='HEAVY_IMPORT',
+                description=f'Import lourd détecté: {lib} ({info["size"]})',
+                recommendation=f'Alternative: {info["alternative"]}',
+                impact=f'Ajoute {info["size"]} au bundle',
+            )
+            findings.append(finding)
         
         return findings
     
-    def check_performance_patterns(self, file_path: Path, content: str) -> List[PerformanceFinding]:
+    def check_performance_patterns(self, file_path: Path, doc: FileContent) -> List[PerformanceFinding]:
         """Détecte les patterns de problèmes de performance."""
         findings = []
-        lines = content.split('\n')
         
-        for pattern_name, pattern_info in self.PERFORMANCE_PATTERNS.items():
-            pattern = pattern_info['pattern']
-            
-            # Chercher dans le contenu complet pour les patterns multilignes
-            if pattern_name in ['nested_loops']:
-                matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-                for match in matches:
-                    # Trouver le numéro de ligne
-                    line_num = content[:match.start()].count('\n') + 1
-                    
-                    finding = PerformanceFinding(
-                        file_path=str(file_path.relative_to(self.root_dir)),
-                        line_number=line_num,
-                        severity=pattern_info['severity'],
-                        category=pattern_info['category'],
-                        description=pattern_info['description'],
-                        recommendation=pattern_info['recommendation'],
-                        impact=pattern_info['impact'],
-                    )
-                    findings.append(finding)
-            else:
-                # Chercher ligne par ligne
-                for i, line in enumerate(lines, 1):
-                    if re.search(pattern, line):
-                        # Ignorer les commentaires
-                        if line.strip().startswith(('//','#', '/*', '*')):
-                            continue
-                        
-                        finding = PerformanceFinding(
-                            file_path=str(file_path.relative_to(self.root_dir)),
-                            line_number=i,
-                            severity=pattern_info['severity'],
-                            category=pattern_info['category'],
-                            description=pattern_info['description'],
-                            recommendation=pattern_info['recommendation'],
-                            impact=pattern_info['impact'],
-                        )
-                        findings.append(finding)
+        # Patterns multilignes sur le contenu complet, les autres ligne par
+        # ligne (commentaires ignorés)
+        for hit in self.rule_engine.scan(doc, [rule.name for rule in self.PERFORMANCE_RULES]):
+            pattern_info = hit.rule.meta
+            finding = PerformanceFinding(
+                file_path=str(file_path.relative_to(self.root_dir)),
+                line_number=hit.line,
+                severity=pattern_info['severity'],
+                category=pattern_info['category'],
+                description=pattern_info['description'],
+                recommendation=pattern_info['recommendation'],
+                impact=pattern_info['impact'],
+            )
+            findings.append(finding)
         
         return findings
     
@@ -239,7 +272,7 @@ class A7PerformanceAgent:
         findings = []
         
         # Vérifier package.json pour détecter les dépendances lourdes
-        package_files = list(self.root_dir.rglob('package.json'))
+        package_files = [e.path for e in self.file_index.glob('package.json')]
         
         for pkg_file in package_files:
             if 'node_modules' in str(pkg_file):
@@ -275,13 +308,13 @@ class A7PerformanceAgent:
         findings = []
         
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            doc = self.content_store.get(file_path)
             
             # Vérifier les imports lourds
-            findings.extend(self.check_heavy_imports(file_path, content))
+            findings.extend(self.check_heavy_imports(file_path, doc))
             
             # Vérifier les patterns de performance
-            findings.extend(self.check_performance_patterns(file_path, content))
+            findings.extend(self.check_performance_patterns(file_path, doc))
         
         except Exception as e:
             pass
@@ -292,15 +325,26 @@ class A7PerformanceAgent:
         """Lance l'analyse complète du projet."""
         self.findings = []
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
         # Analyser la taille du bundle
-        self.findings.extend(self.analyze_bundle_size())
+        with self.profiler.span('bundle'):
+            self.findings.extend(self.analyze_bundle_size())
         
         # Analyser tous les fichiers
-        for file_path in self.root_dir.rglob('*'):
-            if file_path.is_file() and self.should_analyze(file_path):
-                file_findings = self.analyze_file(file_path)
+        with analysis_phases(self, self.file_index.by_extension(self.EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                file_findings = cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, PerformanceFinding,
+                    lambda: self.analyze_file(file_path),
+                )
                 self.findings.extend(file_findings)
         
+        # Profil des règles (les plus lentes), repris dans les metadata du résultat
+        self.metadata = {'rule_profile': self.rule_engine.profile(top=5)}
+        
         # Calculer les métriques
         severity_counts = {
             'CRITICAL': 0,
@@ -5,9 +5,25 @@ Analyse l'accessibilité WCAG 2.1 du code.
 
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+
 
 @dataclass
 class AccessibilityFinding:
@@ -78,6 +94,59 @@ class A8AccessibilityAgent:
         ),
     }
     
+    # Règles appliquées à chaque fichier (ordre = ordre des findings)
+    RULES = [
+        Rule('img_no_alt', PATTERNS['img_no_alt'], literals=('<img',), meta=dict(
+            severity='HIGH',
+            category='MISSING_ALT',
+            description='Image sans attribut alt',
+            recommendation='Ajouter alt="description" ou alt="" si décorative',
+            wcag_criterion='1.1.1',
+        )),
+        Rule('button_no_label', PATTERNS['button_no_label'], literals=('<button',), meta=dict(
+            severity='CRITICAL',
+            category='NO_ARIA_LABEL',
+            description='Bouton sans label accessible',
+            recommendation='Ajouter aria-label ou texte visible dans le bouton',
+            wcag_criterion='4.1.2',
+        )),
+        Rule('input_no_label', PATTERNS['input_no_label'], literals=('<input',), meta=dict(
+            severity='HIGH',
+            category='NO_LABEL',
+            description='Input sans label associé',
+            recommendation='Ajouter <label htmlFor="id"> ou aria-label',
+            wcag_criterion='3.3.2',
+        )),
+        Rule('empty_link', PATTERNS['empty_link'], literals=('</a>',), meta=dict(
+            severity='MEDIUM',
+            category='EMPTY_LINK',
+            description='Lien vide sans contenu',
+            recommendation='Ajouter texte ou aria-label',
+            wcag_criterion='2.4.4',
+        )),
+        Rule('click_no_keyboard', PATTERNS['click_no_keyboard'], literals=('onClick={',), meta=dict(
+            severity='MEDIUM',
+            category='NO_KEYBOARD',
+            description='onClick sans support clavier',
+            recommendation='Ajouter onKeyPress ou utiliser <button>',
+            wcag_criterion='2.1.1',
+        )),
+        Rule('div_clickable_no_role', PATTERNS['div_clickable_no_role'], literals=('onclick',), meta=dict(
+            severity='HIGH',
+            category='MISSING_ROLE',
+            description='Élément cliquable sans rôle sémantique',
+            recommendation='Ajouter role="button" ou utiliser <button>',
+            wcag_criterion='4.1.2',
+        )),
+        Rule('iframe_no_title', PATTERNS['iframe_no_title'], literals=('<iframe',), meta=dict(
+            severity='MEDIUM',
+            category='MISSING_TITLE',
+            description='Iframe sans attribut title',
+            recommendation='Ajouter title="description du contenu"',
+            wcag_criterion='4.1.2',
+        )),
+    ]
+    
     CODE_EXTENSIONS = {'.tsx', '.jsx', '.html', '.vue'}
     
     IGNORE_PATTERNS = [
@@ -92,6 +161,9 @@ class A8AccessibilityAgent:
         '.spec.',
     ]
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A8.
@@ -103,6 +175,11 @@ class A8AccessibilityAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[AccessibilityFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.rule_engine = RuleEngine(self.RULES)
+        self.metadata: Dict[str, Any] = {}
     
     def should_analyze(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être analysé."""
@@ -112,121 +189,49 @@ class A8AccessibilityAgent:
         
         return file_path.suffix in self.CODE_EXTENSIONS
     
-    def get_line_number(self, content: str, position: int) -> int:
-        """Retourne le numéro de ligne d'une position."""
-        return content[:position].count('\n') + 1
-    
     def analyze_file(self, file_path: Path):
         """Analyse un fichier pour l'accessibilité."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            doc = self.content_store.get(file_path)
         except Exception:
             return
         
         relative_path = str(file_path.relative_to(self.root_dir))
         
-        # Images sans alt
-        for match in self.PATTERNS['img_no_alt'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='HIGH',
-                category='MISSING_ALT',
-                description='Image sans attribut alt',
-                recommendation='Ajouter alt="description" ou alt="" si décorative',
-                wcag_criterion='1.1.1',
-            )
-            self.findings.append(finding)
-        
-        # Boutons sans label
-        for match in self.PATTERNS['button_no_label'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='CRITICAL',
-                category='NO_ARIA_LABEL',
-                description='Bouton sans label accessible',
-                recommendation='Ajouter aria-label ou texte visible dans le bouton',
-                wcag_criterion='4.1.2',
-            )
-            self.findings.append(finding)
-        
-        # Inputs sans label
-        for match in self.PATTERNS['input_no_label'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='HIGH',
-                category='NO_LABEL',
-                description='Input sans label associé',
-                recommendation='Ajouter <label htmlFor="id"> ou aria-label',
-                wcag_criterion='3.3.2',
-            )
-            self.findings.append(finding)
-        
-        # Liens vides
-        for match in self.PATTERNS['empty_link'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='MEDIUM',
-                category='EMPTY_LINK',
-                description='Lien vide sans contenu',
-                recommendation='Ajouter texte ou aria-label',
-                wcag_criterion='2.4.4',
-            )
-            self.findings.append(finding)
-        
-        # onClick sans clavier
-        for match in self.PATTERNS['click_no_keyboard'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='MEDIUM',
-                category='NO_KEYBOARD',
-                description='onClick sans support clavier',
-                recommendation='Ajouter onKeyPress ou utiliser <button>',
-                wcag_criterion='2.1.1',
-            )
-            self.findings.append(finding)
-        
-        # Div cliquable sans role
-        for match in self.PATTERNS['div_clickable_no_role'].finditer(content):
+        for hit in self.rule_engine.scan(doc):
             finding = AccessibilityFinding(
                 file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='HIGH',
-                category='MISSING_ROLE',
-                description='Élément cliquable sans rôle sémantique',
-                recommendation='Ajouter role="button" ou utiliser <button>',
-                wcag_criterion='4.1.2',
-            )
-            self.findings.append(finding)
-        
-        # Iframe sans title
-        for match in self.PATTERNS['iframe_no_title'].finditer(content):
-            finding = AccessibilityFinding(
-                file_path=relative_path,
-                line=self.get_line_number(content, match.start()),
-                severity='MEDIUM',
-                category='MISSING_TITLE',
-                description='Iframe sans attribut title',
-                recommendation='Ajouter title="description du contenu"',
-                wcag_criterion='4.1.2',
+                line=hit.line,
+                **hit.rule.meta,
             )
             self.findings.append(finding)
     
+    def _analyze_file_findings(self, file_path: Path) -> List[AccessibilityFinding]:
+        """Findings d'un seul fichier (analyze_file les ajoute à self.findings)."""
+        start = len(self.findings)
+        self.analyze_file(file_path)
+        file_findings = self.findings[start:]
+        del self.findings[start:]
+        return file_findings
+    
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du projet."""
         self.findings = []
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
         # Analyser tous les fichiers de code
-        for file_path in self.root_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            if self.should_analyze(file_path):
-                self.analyze_file(file_path)
+        with analysis_phases(self, self.file_index.by_extension(self.CODE_EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                self.findings.extend(cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, AccessibilityFinding,
+                    lambda: self._analyze_file_findings(file_path),
+                ))
+        
+        # Profil des règles (les plus lentes), repris dans les metadata du résultat
+        self.metadata = {'rule_profile': self.rule_engine.profile(top=5)}
         
         # Calculer les métriques
         severity_counts = {
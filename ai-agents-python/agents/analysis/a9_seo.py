@@ -5,9 +5,25 @@ Analyse l'optimisation SEO du code.
 
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.file_index import FileIndex
+    from core.content_store import ContentStore
+    from core.profiling import analysis_phases
+    from core.analysis_cache import AnalysisCache, cached_file_findings
+    from core.rule_engine import Rule, RuleEngine
+
 
 @dataclass
 class SEOFinding:
@@ -75,6 +91,46 @@ class A9SEOAgent:
         ),
     }
     
+    # Règles vérifiées sur chaque page, dans l'ordre des findings: un finding
+    # si la balise est absente (sauf h1: si plusieurs)
+    RULES = [
+        Rule('meta_description', re.compile(r'<meta\s+name=["\']description["\']', re.IGNORECASE), literals=('description',), meta=dict(
+            severity='HIGH',
+            category='MISSING_META',
+            description='Meta description manquante',
+            recommendation='Ajouter <meta name="description" content="..." />',
+        )),
+        Rule('title', re.compile(r'<title>', re.IGNORECASE), literals=('<title>',), meta=dict(
+            severity='CRITICAL',
+            category='MISSING_TITLE',
+            description='Balise <title> manquante',
+            recommendation='Ajouter <title>Titre optimisé SEO</title>',
+        )),
+        Rule('og_title', re.compile(r'property=["\']og:title["\']', re.IGNORECASE), literals=('og:title',), meta=dict(
+            severity='MEDIUM',
+            category='MISSING_OG',
+            description='OpenGraph og:title manquant',
+            recommendation='Ajouter <meta property="og:title" content="..." />',
+        )),
+        Rule('canonical', re.compile(r'rel=["\']canonical["\']', re.IGNORECASE), literals=('canonical',), meta=dict(
+            severity='MEDIUM',
+            category='MISSING_CANONICAL',
+            description='URL canonique manquante',
+            recommendation='Ajouter <link rel="canonical" href="..." />',
+        )),
+        Rule('multiple_h1', re.compile(r'<h1[^>]*>.*?</h1>', re.IGNORECASE | re.DOTALL), literals=('</h1>',), meta=dict(
+            severity='MEDIUM',
+            category='MULTIPLE_H1',
+            recommendation='Utiliser une seule balise H1 par page',
+        )),
+        Rule('jsonld', re.compile(r'type=["\']application/ld\+json["\']', re.IGNORECASE), literals=('application/ld+json',), meta=dict(
+            severity='LOW',
+            category='MISSING_STRUCTURED_DATA',
+            description='Structured data JSON-LD manquante',
+            recommendation='Ajouter schema.org structured data pour rich snippets',
+        )),
+    ]
+    
     CODE_EXTENSIONS = {'.html', '.tsx', '.jsx', '.vue'}
     
     IGNORE_PATTERNS = [
@@ -90,6 +146,9 @@ class A9SEOAgent:
         'components',  # Composants ne sont pas des pages
     ]
     
+    # Version des résultats en cache (à incrémenter si l'analyse change)
+    CACHE_VERSION = '1'
+    
     def __init__(self, workspace_root: Path, config):
         """
         Initialise l'agent A9.
@@ -101,6 +160,11 @@ class A9SEOAgent:
         self.config = config
         self.root_dir = workspace_root
         self.findings: List[SEOFinding] = []
+        self.file_index: Optional[FileIndex] = None
+        self.content_store = ContentStore()
+        self.analysis_cache: Optional[AnalysisCache] = None
+        self.rule_engine = RuleEngine(self.RULES)
+        self.metadata: Dict[str, Any] = {}
     
     def should_analyze(self, file_path: Path) -> bool:
         """Vérifie si un fichier doit être analysé."""
@@ -114,19 +178,16 @@ class A9SEOAgent:
         
         return file_path.suffix in self.CODE_EXTENSIONS
     
-    def get_line_number(self, content: str, position: int) -> int:
-        """Retourne le numéro de ligne d'une position."""
-        return content[:position].count('\n') + 1
-    
     def analyze_file(self, file_path: Path):
         """Analyse un fichier pour le SEO."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            doc = self.content_store.get(file_path)
         except Exception:
             return
         
         # Chercher les balises <head> ou composants Meta
-        has_head = '<head>' in content.lower() or 'meta' in content.lower()
+        content_lower = doc.text.lower()
+        has_head = '<head>' in content_lower or 'meta' in content_lower
         
         if not has_head:
             # Pas de balises meta dans ce fichier (composant simple)
@@ -134,90 +195,54 @@ class A9SEOAgent:
         
         relative_path = str(file_path.relative_to(self.root_dir))
         
-        # Meta description
-        if not re.search(r'<meta\s+name=["\']description["\']', content, re.IGNORECASE):
-            finding = SEOFinding(
-                file_path=relative_path,
-                line=1,
-                severity='HIGH',
-                category='MISSING_META',
-                description='Meta description manquante',
-                recommendation='Ajouter <meta name="description" content="..." />',
-            )
-            self.findings.append(finding)
-        
-        # Title
-        if not re.search(r'<title>', content, re.IGNORECASE):
-            finding = SEOFinding(
-                file_path=relative_path,
-                line=1,
-                severity='CRITICAL',
-                category='MISSING_TITLE',
-                description='Balise <title> manquante',
-                recommendation='Ajouter <title>Titre optimisé SEO</title>',
-            )
-            self.findings.append(finding)
-        
-        # OpenGraph
-        if not re.search(r'property=["\']og:title["\']', content, re.IGNORECASE):
-            finding = SEOFinding(
-                file_path=relative_path,
-                line=1,
-                severity='MEDIUM',
-                category='MISSING_OG',
-                description='OpenGraph og:title manquant',
-                recommendation='Ajouter <meta property="og:title" content="..." />',
-            )
-            self.findings.append(finding)
-        
-        # Canonical
-        if not re.search(r'rel=["\']canonical["\']', content, re.IGNORECASE):
-            finding = SEOFinding(
-                file_path=relative_path,
-                line=1,
-                severity='MEDIUM',
-                category='MISSING_CANONICAL',
-                description='URL canonique manquante',
-                recommendation='Ajouter <link rel="canonical" href="..." />',
-            )
-            self.findings.append(finding)
-        
-        # H1 multiple
-        h1_matches = re.findall(r'<h1[^>]*>.*?</h1>', content, re.IGNORECASE | re.DOTALL)
-        if len(h1_matches) > 1:
-            finding = SEOFinding(
-                file_path=relative_path,
-                line=1,
-                severity='MEDIUM',
-                category='MULTIPLE_H1',
-                description=f'{len(h1_matches)} balises H1 trouvées (devrait être 1)',
-                recommendation='Utiliser une seule balise H1 par page',
-            )
-            self.findings.append(finding)
-        
-        # JSON-LD structured data
-        if not re.search(r'type=["\']application/ld\+json["\']', content, re.IGNORECASE):
+        for rule in self.RULES:
+            if rule.name == 'multiple_h1':
+                # H1 multiple
+                h1_count = len(self.rule_engine.scan(doc, [rule.name]))
+                if h1_count <= 1:
+                    continue
+                description = f'{h1_count} balises H1 trouvées (devrait être 1)'
+            elif self.rule_engine.search(doc, rule.name) is None:
+                description = rule.meta['description']
+            else:
+                continue
+            
             finding = SEOFinding(
                 file_path=relative_path,
                 line=1,
-                severity='LOW',
-                category='MISSING_STRUCTURED_DATA',
-                description='Structured data JSON-LD manquante',
-                recommendation='Ajouter schema.org structured data pour rich snippets',
+                severity=rule.meta['severity'],
+                category=rule.meta['category'],
+                description=description,
+                recommendation=rule.meta['recommendation'],
             )
             self.findings.append(finding)
     
+    def _analyze_file_findings(self, file_path: Path) -> List[SEOFinding]:
+        """Findings d'un seul fichier (analyze_file les ajoute à self.findings)."""
+        start = len(self.findings)
+        self.analyze_file(file_path)
+        file_findings = self.findings[start:]
+        del self.findings[start:]
+        return file_findings
+    
     def analyze(self) -> Dict[str, Any]:
         """Lance l'analyse complète du projet."""
         self.findings = []
         
+        if self.file_index is None:
+            self.file_index = FileIndex.build(self.root_dir, self.config)
+        
         # Analyser tous les fichiers de code
-        for file_path in self.root_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
-            
-            if self.should_analyze(file_path):
-                self.analyze_file(file_path)
+        with analysis_phases(self, self.file_index.by_extension(self.CODE_EXTENSIONS), self.should_analyze) as entries:
+            for entry in entries:
+                file_path = entry.path
+                self.findings.extend(cached_file_findings(
+                    self.analysis_cache, self.content_store, entry, SEOFinding,
+                    lambda: self._analyze_file_findings(file_path),
+                ))
+        
+        # Profil des règles (les plus lentes), repris dans les metadata du résultat
+        self.metadata = {'rule_profile': self.rule_engine.profile(top=5)}
         
         # Calculer les métriques
         severity_counts = {
@@ -8,6 +8,16 @@ from pathlib import Path
 from typing import List, Dict, Any, Set, Tuple
 from dataclasses import dataclass
 
+try:
+    from core.config import Config
+    from core.file_index import FileIndex
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.config import Config
+    from core.file_index import FileIndex
+
 
 @dataclass
 class ImportFix:
@@ -266,9 +276,10 @@ class F0AutoImportAgent:
         self.fixes = []
         files_modified = 0
         
-        # Parcourir tous les fichiers
-        for file_path in self.root_dir.rglob('*'):
-            if file_path.is_file() and self.should_analyze(file_path):
+        # Parcourir tous les fichiers (dossiers exclus élagués: node_modules, dist...)
+        for entry in FileIndex.build(self.root_dir, Config()):
+            file_path = entry.path
+            if self.should_analyze(file_path):
                 # Trouver les imports manquants
                 missing = self.find_missing_imports(file_path)
                 self.fixes.extend(missing)
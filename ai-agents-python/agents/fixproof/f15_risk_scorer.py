@@ -16,8 +16,14 @@ Decision Matrix:
 from pathlib import Path
 from typing import Dict, Any, List
 from dataclasses import dataclass
-import subprocess
-from datetime import datetime, timedelta
+
+try:
+    from core.git_index import GitIndex, HISTORY_DAYS, RECENT_DAYS
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from core.git_index import GitIndex, HISTORY_DAYS, RECENT_DAYS
 
 
 @dataclass
@@ -55,11 +61,21 @@ class RiskScorer:
     Agent F15 - Calcule Risk/Confidence
     
     Inspiré du F15 TypeScript mais adapté pour workflow local Python
+    
+    Historique de bugs et instabilité sont calculés par fichier touché
+    (core.git_index: un seul `git log --numstat` par run)
     """
     
+    # Seuils par fichier (100 points de risque)
+    BUG_FIXES_MAX = 5  # Correctifs sur 90 jours
+    RECENT_COMMITS_MAX = 10  # Commits sur 30 jours
+    
     def __init__(self, config, workspace_root: Path):
         self.config = config
         self.workspace_root = workspace_root
+        
+        # Index git partagé, renseigné par le runner (sinon construit à la demande)
+        self.git_index = None  # core.git_index.GitIndex
     
     def calculate(
         self,
@@ -263,65 +279,54 @@ class RiskScorer:
         # Ratio × 100
         return (critical_count / total_count) * 100
     
+    def _get_git_index(self):
+        """Index git du run (fourni par le runner, sinon construit une fois)"""
+        if self.git_index is None:
+            self.git_index = GitIndex.build(self.workspace_root)
+        return self.git_index
+    
+    def _get_fixed_files(self, fix_results: List[Dict[str, Any]]) -> List[str]:
+        """Fichiers touchés par les corrections"""
+        return sorted({
+            fix['file_path']
+            for r in fix_results
+            for fix in r.get('fixes_applied', [])
+            if fix.get('file_path')
+        })
+    
     def _calculate_bug_history(self, fix_results: List[Dict[str, Any]]) -> float:
         """
-        Calcule historique de bugs (commits avec 'fix' récents)
+        Calcule historique de bugs des fichiers touchés
+        (commits de correctif sur 90 jours, moyenne par fichier)
         """
-        
-        try:
-            # Git log derniers 90 jours avec "fix" dans message
-            result = subprocess.run(
-                [
-                    'git', 'log',
-                    '--since=90 days ago',
-                    '--grep=fix',
-                    '--grep=bug',
-                    '--oneline',
-                    '-i'  # Case insensitive
-                ],
-                cwd=self.workspace_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                bug_commits = len(result.stdout.strip().split('\n'))
-                # Max 10 bugs = 100 points de risque
-                return min(100, (bug_commits / 10) * 100)
-        
-        except Exception as e:
-            print(f"⚠️  Erreur git log: {e}")
-        
-        return 0  # Default: pas de bugs connus
+        files = self._get_fixed_files(fix_results)
+        if not files:
+            return 0  # Default: pas de bugs connus
+        
+        index = self._get_git_index()
+        scores = [
+            # Max BUG_FIXES_MAX correctifs = 100 points de risque
+            min(100, index.history(f, days=HISTORY_DAYS).bug_fixes / self.BUG_FIXES_MAX * 100)
+            for f in files
+        ]
+        return sum(scores) / len(scores)
     
     def _calculate_instability(self, fix_results: List[Dict[str, Any]]) -> float:
         """
-        Calcule instabilité (fréquence commits récents)
+        Calcule instabilité des fichiers touchés (commits sur 30 jours)
         Code qui change souvent = plus instable
         """
-        
-        try:
-            # Git log derniers 30 jours
-            result = subprocess.run(
-                [
-                    'git', 'log',
-                    '--since=30 days ago',
-                    '--oneline'
-                ],
-                cwd=self.workspace_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                recent_commits = len(result.stdout.strip().split('\n'))
-                # Max 50 commits = 100 points d'instabilité
-                return min(100, (recent_commits / 50) * 100)
-        
-        except Exception as e:
-            print(f"⚠️  Erreur git log: {e}")
-        
-        return 0  # Default: stable
+        files = self._get_fixed_files(fix_results)
+        if not files:
+            return 0  # Default: stable
+        
+        index = self._get_git_index()
+        scores = [
+            # Max RECENT_COMMITS_MAX commits = 100 points d'instabilité
+            min(100, index.history(f, days=RECENT_DAYS).commits / self.RECENT_COMMITS_MAX * 100)
+            for f in files
+        ]
+        return sum(scores) / len(scores)
     
     def _serialize(self, decision: Decision) -> Dict[str, Any]:
         """Sérialise la décision"""
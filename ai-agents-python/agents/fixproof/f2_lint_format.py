@@ -8,12 +8,30 @@ Auto-fix safe : OUI (formatage ne casse pas la logique)
 """
 
 import os
+import re
+import shutil
+import difflib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 
+PYTHON_EXTENSIONS = {'.py'}
+JAVASCRIPT_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
+
+# Chemins des outils, résolus une seule fois par process
+_TOOL_PATHS: Dict[str, Optional[str]] = {}
+
+# Erreurs par fichier dans la sortie des outils (groupes path / reason)
+BLACK_ERROR_RE = re.compile(
+    r'^error: cannot (?:format (?P<path>.+?): (?P<reason>.*)|parse: (?P<parse_path>.+?):\d+:\d+)$',
+    re.MULTILINE,
+)
+PRETTIER_ERROR_RE = re.compile(r'^\[error\] (?P<path>.+?): (?P<reason>.*)$', re.MULTILINE)
+
+
 @dataclass
 class LintFixResult:
     """Résultat d'une correction de lint/format"""
@@ -30,17 +48,30 @@ class LintFormatter:
     
     Python: black + autopep8 + isort
     TS/JS: prettier (si disponible)
+    
+    Les fichiers sont groupés par outil: une invocation par lot de
+    BATCH_SIZE fichiers (et non une par fichier), lots exécutés en
+    parallèle. Les lignes modifiées sont lues dans le diff produit par
+    l'outil (black/isort --diff).
     """
     
+    # Fichiers par invocation d'outil
+    BATCH_SIZE = 100
+    
     def __init__(self, config, workspace_root: Path):
         self.config = config
         self.workspace_root = workspace_root
+        self.jobs = os.cpu_count() or 1
         
         # Vérifier outils disponibles
-        self.has_black = self._check_tool('black')
-        self.has_autopep8 = self._check_tool('autopep8')
-        self.has_isort = self._check_tool('isort')
-        self.has_prettier = self._check_tool('prettier')
+        self.tools = {
+            name: self._find_tool(name)
+            for name in ('black', 'autopep8', 'isort', 'prettier')
+        }
+        self.has_black = self.tools['black'] is not None
+        self.has_autopep8 = self.tools['autopep8'] is not None
+        self.has_isort = self.tools['isort'] is not None
+        self.has_prettier = self.tools['prettier'] is not None
     
     def fix(self, findings: List[Dict[str, Any]], dry_run: bool = False) -> List[Dict[str, Any]]:
         """
@@ -59,32 +90,36 @@ class LintFormatter:
             print("   ⏭️  Auto-fix lint désactivé (config)")
             return []
         
-        results = []
-        
         # Si findings vide, formater tous les fichiers modifiés (git diff)
-        files_to_format = self._get_files_to_format(findings)
-        
-        for file_path in files_to_format:
+        files_to_format = [
+            file_path for file_path in self._get_files_to_format(findings)
             # Ignorer exclusions
-            if self.config.should_exclude(str(file_path)):
-                continue
-            
-            # Déterminer le type de fichier
-            ext = file_path.suffix
-            
-            if ext == '.py':
-                result = self._format_python(file_path, dry_run)
-            elif ext in ['.ts', '.tsx', '.js', '.jsx']:
-                result = self._format_javascript(file_path, dry_run)
-            else:
-                continue
-            
-            if result:
-                results.append(self._serialize(result))
+            if not self.config.should_exclude(str(file_path))
+        ]
+        
+        # Grouper par outil, un lot = une invocation
+        python_files = [f for f in files_to_format if f.suffix in PYTHON_EXTENSIONS]
+        javascript_files = [f for f in files_to_format if f.suffix in JAVASCRIPT_EXTENSIONS]
+        batches = (
+            [(self._format_python, batch) for batch in self._batches(python_files)]
+            + [(self._format_javascript, batch) for batch in self._batches(javascript_files)]
+        )
+        
+        by_file: Dict[Path, LintFixResult] = {}
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(batches))) as pool:
+                for batch_results in pool.map(lambda job: job[0](job[1], dry_run), batches):
+                    by_file.update(batch_results)
+        
+        results = [self._serialize(by_file[f]) for f in files_to_format if f in by_file]
         
-        print(f"   ✅ {len(results)} fichier(s) formaté(s)")
+        print(f"   ✅ {len(results)} fichier(s) formaté(s) ({len(batches)} lot(s))")
         return results
     
+    def _batches(self, files: List[Path]) -> List[List[Path]]:
+        """Découpe une liste de fichiers en lots de BATCH_SIZE"""
+        return [files[i:i + self.BATCH_SIZE] for i in range(0, len(files), self.BATCH_SIZE)]
+    
     def _get_files_to_format(self, findings: List[Dict[str, Any]]) -> List[Path]:
         """Récupère la liste des fichiers à formater"""
         files = set()
@@ -124,184 +159,245 @@ class LintFormatter:
         
         return set()
     
-    def _format_python(self, file_path: Path, dry_run: bool) -> LintFixResult:
-        """Formate un fichier Python avec black + isort"""
-        
-        if not file_path.exists():
-            return LintFixResult(
-                file_path=str(file_path.relative_to(self.workspace_root)),
-                action="error",
-                tool="black",
-                changes=0,
-                reason="File not found"
-            )
+    def _format_python(self, files: List[Path], dry_run: bool) -> Dict[Path, LintFixResult]:
+        """Formate un lot de fichiers Python avec black + isort"""
+        results: Dict[Path, LintFixResult] = {}
+        existing = []
+        for file_path in files:
+            if file_path.exists():
+                existing.append(file_path)
+            else:
+                results[file_path] = self._result(file_path, "error", "black", 0, "File not found")
         
-        # Lire contenu original
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
-        except Exception as e:
-            return LintFixResult(
-                file_path=str(file_path.relative_to(self.workspace_root)),
-                action="error",
-                tool="black",
-                changes=0,
-                reason=f"Cannot read: {e}"
-            )
+        changes = {file_path: 0 for file_path in existing}
+        errors: Dict[Path, str] = {}
         
-        # Appliquer black
-        if self.has_black:
-            try:
-                cmd = ['black', '--quiet', str(file_path)]
-                if dry_run:
-                    cmd.append('--check')
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                # black --check retourne 1 si fichier aurait changé
-                if dry_run and result.returncode == 1:
-                    return LintFixResult(
-                        file_path=str(file_path.relative_to(self.workspace_root)),
-                        action="would_format",
-                        tool="black",
-                        changes=1,  # Approximation
-                        reason="Would be formatted by black (dry-run)"
-                    )
-                
-            except Exception as e:
-                print(f"⚠️  Black error: {e}")
+        # Appliquer black (--diff: lignes modifiées par fichier, sans écrire)
+        if self.has_black and existing:
+            diffs, failed = self._run_diff([self.tools['black'], '--quiet', '--diff'], existing, BLACK_ERROR_RE)
+            errors.update(failed)
+            
+            if dry_run:
+                for file_path, count in diffs.items():
+                    if file_path not in errors:
+                        results[file_path] = self._result(
+                            file_path, "would_format", "black", count,
+                            "Would be formatted by black (dry-run)"
+                        )
+            else:
+                self._apply([self.tools['black'], '--quiet'], list(diffs), errors)
+                for file_path, count in diffs.items():
+                    changes[file_path] += count
         
         # Appliquer isort
-        if self.has_isort and not dry_run:
-            try:
-                subprocess.run(
-                    ['isort', str(file_path)],
-                    capture_output=True,
-                    check=False
-                )
-            except Exception as e:
-                print(f"⚠️  isort error: {e}")
+        if self.has_isort and not dry_run and existing:
+            targets = [f for f in existing if f not in errors]
+            diffs, failed = self._run_diff([self.tools['isort'], '--quiet', '--diff'], targets, None)
+            errors.update(failed)
+            self._apply([self.tools['isort'], '--quiet'], list(diffs), errors)
+            for file_path, count in diffs.items():
+                changes[file_path] += count
         
-        # Comparer
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                new_content = f.read()
-            
-            if new_content != original_content:
-                # Calculer nombre de lignes changées
-                changes = self._count_diff_lines(original_content, new_content)
-                
-                return LintFixResult(
-                    file_path=str(file_path.relative_to(self.workspace_root)),
-                    action="formatted",
-                    tool="black+isort",
-                    changes=changes,
-                    reason="Formatted successfully"
+        for file_path in existing:
+            if file_path in results:
+                continue
+            if file_path in errors:
+                results[file_path] = self._result(file_path, "error", "black+isort", 0, errors[file_path])
+            elif changes[file_path]:
+                results[file_path] = self._result(
+                    file_path, "formatted", "black+isort", changes[file_path], "Formatted successfully"
                 )
             else:
-                return LintFixResult(
-                    file_path=str(file_path.relative_to(self.workspace_root)),
-                    action="skipped",
-                    tool="black+isort",
-                    changes=0,
-                    reason="Already formatted"
-                )
+                results[file_path] = self._result(file_path, "skipped", "black+isort", 0, "Already formatted")
         
-        except Exception as e:
-            return LintFixResult(
-                file_path=str(file_path.relative_to(self.workspace_root)),
-                action="error",
-                tool="black+isort",
-                changes=0,
-                reason=f"Error comparing: {e}"
-            )
+        return results
     
-    def _format_javascript(self, file_path: Path, dry_run: bool) -> LintFixResult:
-        """Formate un fichier TS/JS avec prettier"""
-        
+    def _format_javascript(self, files: List[Path], dry_run: bool) -> Dict[Path, LintFixResult]:
+        """Formate un lot de fichiers TS/JS avec prettier"""
         if not self.has_prettier:
-            return LintFixResult(
-                file_path=str(file_path.relative_to(self.workspace_root)),
-                action="skipped",
-                tool="prettier",
-                changes=0,
-                reason="Prettier not installed"
-            )
+            return {
+                file_path: self._result(file_path, "skipped", "prettier", 0, "Prettier not installed")
+                for file_path in files
+            }
         
-        try:
-            cmd = ['prettier', '--write', str(file_path)]
-            if dry_run:
-                cmd = ['prettier', '--check', str(file_path)]
-            
-            result = subprocess.run(
-                cmd,
-                cwd=self.workspace_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if dry_run:
-                if result.returncode != 0:
-                    return LintFixResult(
-                        file_path=str(file_path.relative_to(self.workspace_root)),
-                        action="would_format",
-                        tool="prettier",
-                        changes=1,
-                        reason="Would be formatted (dry-run)"
+        # --list-different: fichiers que prettier modifierait (un seul process)
+        output, errors = self._run([self.tools['prettier'], '--list-different'], files, PRETTIER_ERROR_RE)
+        listed = [f for f in self._paths_in(output, files) if f not in errors]
+        
+        changes: Dict[Path, int] = {}
+        if dry_run:
+            # Prettier ne donne pas de diff: 1 = "au moins une ligne"
+            changes = {file_path: 1 for file_path in listed}
+        elif listed:
+            originals = {file_path: self._read(file_path) for file_path in listed}
+            self._apply([self.tools['prettier'], '--write', '--log-level', 'warn'], listed, errors)
+            for file_path, original in originals.items():
+                if file_path not in errors:
+                    changes[file_path] = max(1, self._count_diff_lines(original, self._read(file_path)))
+        
+        results = {}
+        for file_path in files:
+            if file_path in errors:
+                results[file_path] = self._result(file_path, "error", "prettier", 0, f"Prettier error: {errors[file_path]}")
+            elif file_path in changes:
+                if dry_run:
+                    results[file_path] = self._result(
+                        file_path, "would_format", "prettier", changes[file_path], "Would be formatted (dry-run)"
                     )
                 else:
-                    return LintFixResult(
-                        file_path=str(file_path.relative_to(self.workspace_root)),
-                        action="skipped",
-                        tool="prettier",
-                        changes=0,
-                        reason="Already formatted"
+                    results[file_path] = self._result(
+                        file_path, "formatted", "prettier", changes[file_path], "Formatted successfully"
                     )
             else:
-                return LintFixResult(
-                    file_path=str(file_path.relative_to(self.workspace_root)),
-                    action="formatted",
-                    tool="prettier",
-                    changes=1,  # Prettier ne donne pas le nombre exact
-                    reason="Formatted successfully"
-                )
+                results[file_path] = self._result(file_path, "skipped", "prettier", 0, "Already formatted")
         
-        except Exception as e:
-            return LintFixResult(
-                file_path=str(file_path.relative_to(self.workspace_root)),
-                action="error",
-                tool="prettier",
-                changes=0,
-                reason=f"Prettier error: {e}"
-            )
+        return results
     
-    def _check_tool(self, tool_name: str) -> bool:
-        """Vérifie si un outil est disponible"""
+    def _run(self, cmd: List[str], files: List[Path], error_re: Optional["re.Pattern"]) -> Tuple[str, Dict[Path, str]]:
+        """
+        Lance un outil sur un lot de fichiers
+        
+        Returns:
+            (stdout, erreurs par fichier). Si l'outil ne peut pas être
+            lancé, tous les fichiers du lot sont en erreur.
+        """
         try:
             result = subprocess.run(
-                ['which', tool_name],
+                cmd + [str(f) for f in files],
+                cwd=self.workspace_root,
                 capture_output=True,
                 text=True
             )
-            return result.returncode == 0
-        except:
-            return False
+        except Exception as e:
+            return '', {file_path: str(e) for file_path in files}
+        
+        errors = {}
+        if error_re is not None:
+            by_path = self._path_lookup(files)
+            for match in error_re.finditer(result.stderr):
+                groups = match.groupdict()
+                file_path = by_path.get(self._normalize(groups['path'] or groups.get('parse_path') or ''))
+                if file_path is not None:
+                    errors[file_path] = groups['reason'] or match.group(0)
+        
+        return result.stdout, errors
     
-    def _count_diff_lines(self, old: str, new: str) -> int:
-        """Compte le nombre de lignes différentes"""
-        old_lines = old.split('\n')
-        new_lines = new.split('\n')
+    def _run_diff(self, cmd: List[str], files: List[Path], error_re: Optional["re.Pattern"]) -> Tuple[Dict[Path, int], Dict[Path, str]]:
+        """Lance un outil en mode --diff: (lignes modifiées par fichier modifié, erreurs)"""
+        output, errors = self._run(cmd, files, error_re)
+        by_path = self._path_lookup(files)
+        diffs = {}
+        for path, count in self._count_unified_diff(output).items():
+            file_path = by_path.get(self._normalize(path))
+            if file_path is not None and count:
+                diffs[file_path] = count
+        return diffs, errors
+    
+    def _apply(self, cmd: List[str], files: List[Path], errors: Dict[Path, str]):
+        """Réécrit les fichiers d'un lot (seulement ceux que l'outil modifie)"""
+        targets = [f for f in files if f not in errors]
+        if not targets:
+            return
+        try:
+            subprocess.run(
+                cmd + [str(f) for f in targets],
+                cwd=self.workspace_root,
+                capture_output=True,
+                check=False
+            )
+        except Exception as e:
+            print(f"⚠️  {Path(cmd[0]).name} error: {e}")
+            for file_path in targets:
+                errors[file_path] = str(e)
+    
+    def _paths_in(self, output: str, files: List[Path]) -> List[Path]:
+        """Fichiers du lot listés dans une sortie (un chemin par ligne)"""
+        by_path = self._path_lookup(files)
+        paths = []
+        for line in output.splitlines():
+            file_path = by_path.get(self._normalize(line.strip()))
+            if file_path is not None:
+                paths.append(file_path)
+        return paths
+    
+    def _path_lookup(self, files: List[Path]) -> Dict[str, Path]:
+        """Chemin normalisé -> fichier du lot"""
+        return {self._normalize(str(f)): f for f in files}
+    
+    def _normalize(self, path: str) -> str:
+        """Chemin absolu normalisé (les outils affichent relatif ou absolu)"""
+        return os.path.normpath(os.path.join(str(self.workspace_root), path))
+    
+    def _read(self, file_path: Path) -> str:
+        try:
+            return file_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return ''
+    
+    def _result(self, file_path: Path, action: str, tool: str, changes: int, reason: str) -> LintFixResult:
+        return LintFixResult(
+            file_path=str(file_path.relative_to(self.workspace_root)),
+            action=action,
+            tool=tool,
+            changes=changes,
+            reason=reason
+        )
+    
+    def _find_tool(self, tool_name: str) -> Optional[str]:
+        """Chemin d'un outil: node_modules/.bin du workspace, sinon PATH (mis en cache)"""
+        local = Path(self.workspace_root) / 'node_modules' / '.bin' / tool_name
+        if local.exists():
+            return str(local)
+        if tool_name not in _TOOL_PATHS:
+            _TOOL_PATHS[tool_name] = shutil.which(tool_name)
+        return _TOOL_PATHS[tool_name]
+    
+    def _check_tool(self, tool_name: str) -> bool:
+        """Vérifie si un outil est disponible"""
+        return self._find_tool(tool_name) is not None
+    
+    @staticmethod
+    def _count_unified_diff(diff: str) -> Dict[str, int]:
+        """
+        Lignes modifiées par fichier dans un diff unifié (sortie --diff de
+        black/isort): somme sur les hunks de max(lignes retirées, ajoutées)
+        """
+        counts: Dict[str, int] = {}
+        path = None
+        removed = added = 0
         
-        # Simple diff count
-        diff_count = 0
-        for i, (old_line, new_line) in enumerate(zip(old_lines, new_lines)):
-            if old_line != new_line:
-                diff_count += 1
+        def flush():
+            if path is not None:
+                counts[path] = counts.get(path, 0) + max(removed, added)
         
-        # Ajouter diff de longueur
-        diff_count += abs(len(old_lines) - len(new_lines))
+        for line in diff.splitlines():
+            if line.startswith('+++ '):
+                flush()
+                path = line[4:].split('\t')[0].strip()
+                if path.endswith(':after'):
+                    path = path[:-len(':after')]  # Format isort
+                removed = added = 0
+            elif line.startswith('--- '):
+                continue
+            elif line.startswith('@@'):
+                flush()
+                removed = added = 0
+            elif line.startswith('-'):
+                removed += 1
+            elif line.startswith('+'):
+                added += 1
+        flush()
         
-        return diff_count
+        return counts
+    
+    def _count_diff_lines(self, old: str, new: str) -> int:
+        """Compte le nombre de lignes différentes"""
+        matcher = difflib.SequenceMatcher(None, old.split('\n'), new.split('\n'), autojunk=False)
+        return sum(
+            max(i2 - i1, j2 - j1)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != 'equal'
+        )
     
     def _serialize(self, result: LintFixResult) -> Dict[str, Any]:
         """Sérialise un résultat"""
@@ -0,0 +1,7 @@
+"""
+Benchmarks - Arbres synthétiques et mesure des agents (débit, latence, mémoire)
+"""
+
+from .synthetic import SyntheticSpec, SyntheticRepo, generate, SIZES
+
+__all__ = ["SyntheticSpec", "SyntheticRepo", "generate", "SIZES"]
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Bench - Mesure des agents et du runner sur des arbres synthétiques
+
+Chaque cible (un agent d'analyse, ou le runner complet) tourne dans son
+propre processus (AgentPool): le pic de RSS mesuré est celui de la cible,
+pas celui des mesures précédentes. Les arbres sont générés une fois puis
+réutilisés (même spec = même arbre).
+
+Métriques par (taille, cible):
+- wall_ms: latence (médiane sur --repeat exécutions)
+- cpu_ms: temps CPU du processus
+- peak_rss_kb: pic de mémoire résidente
+- files_per_s: débit (fichiers de l'index / seconde)
+- findings: nombre de findings (détecte un changement de comportement)
+
+Les mesures sont comparées à une baseline JSON: une cible régresse si sa
+latence (ou sa mémoire) dépasse la baseline de plus de --threshold (en
+fraction) et d'un minimum absolu (bruit). Code de sortie 1 si régression.
+
+Usage:
+    python benchmarks/bench.py                                  # 1k, tous les agents + runner
+    python benchmarks/bench.py --size 1k --size 10k --agent a3_duplications
+    python benchmarks/bench.py --update-baseline                # Enregistrer la baseline
+    python benchmarks/bench.py --threshold 0.1 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import SIZES, SyntheticSpec, generate
+from core.agent_pool import AgentPool
+from core.config import Config
+from core.profiling import peak_rss_kb
+from core.runner import ANALYSIS_AGENTS, AgentRunner
+
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+CONFIG_PATH = Path(__file__).parent.parent / 'config.yaml'
+
+# Cible "runner complet": analyse + corrections (dry-run) + validation + décision
+RUNNER_TARGET = 'runner'
+
+# Seuils de régression (fractions) et bruit toléré (absolu)
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MEMORY_THRESHOLD = 0.20
+MIN_DELTA_MS = 100
+MIN_DELTA_RSS_KB = 10 * 1024
+
+
+def _bench_target(workspace: Path, target: str, agents: Optional[List[str]]) -> Dict[str, Any]:
+    """Exécute une cible dans le processus du pool et retourne ses métriques"""
+    config = Config.load(str(CONFIG_PATH))
+    runner = AgentRunner(config, workspace, use_cache=False)
+    cpu = time.process_time()
+    wall = time.perf_counter()
+
+    with redirect_stdout(StringIO()):
+        if target == RUNNER_TARGET:
+            results = runner.run_analysis_agents(agents)
+            fixes = runner.run_fix_agents(results, dry_run=True)
+            validation = runner.run_validation(fixes)
+            runner.calculate_decision(results, fixes, validation)
+        else:
+            results = runner.run_analysis_agents([target])
+
+    wall_ms = (time.perf_counter() - wall) * 1000
+    errors = [error for result in results for error in result.errors]
+    return {
+        'wall_ms': round(wall_ms, 1),
+        'cpu_ms': round((time.process_time() - cpu) * 1000, 1),
+        'peak_rss_kb': peak_rss_kb(),
+        'files': len(runner.file_index.files(include_excluded=False)) if runner.file_index is not None else 0,
+        'findings': sum(len(result.findings) for result in results),
+        'errors': errors,
+    }
+
+
+def measure(
+    workspace: Path,
+    targets: List[str],
+    agents: Optional[List[str]],
+    repeat: int = 1,
+    timeout: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Mesure chaque cible (un processus par exécution)
+
+    Returns:
+        Métriques par cible (médiane de wall_ms/cpu_ms, max de peak_rss_kb)
+    """
+    pool = AgentPool(1, timeout=timeout)
+    measures: Dict[str, Dict[str, Any]] = {}
+
+    for target in targets:
+        runs = []
+        for n in range(repeat):
+            key = f"{target}#{n}"
+            outcome = pool.run([(key, _bench_target, (workspace, target, agents))])[key]
+            if not outcome.ok:
+                print(f"   ❌ {target}: {outcome.error}")
+                break
+            runs.append(outcome.value)
+        if not runs:
+            measures[target] = {'error': outcome.error}
+            continue
+
+        wall_ms = statistics.median(run['wall_ms'] for run in runs)
+        rss = [run['peak_rss_kb'] for run in runs if run['peak_rss_kb'] is not None]
+        files = runs[0]['files']
+        measures[target] = {
+            'wall_ms': wall_ms,
+            'cpu_ms': statistics.median(run['cpu_ms'] for run in runs),
+            'peak_rss_kb': max(rss) if rss else None,
+            'files': files,
+            'files_per_s': round(files / (wall_ms / 1000), 1) if wall_ms else None,
+            'findings': runs[0]['findings'],
+        }
+        if runs[0]['errors']:
+            measures[target]['errors'] = runs[0]['errors']
+
+        rss_label = f", {measures[target]['peak_rss_kb'] // 1024}Mo" if rss else ""
+        print(f"   ⏱️  {target}: {wall_ms / 1000:.2f}s, {measures[target]['files_per_s']} fichiers/s, "
+              f"{measures[target]['findings']} finding(s){rss_label}")
+
+    return measures
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD
+) -> List[str]:
+    """
+    Régressions de `current` par rapport à `baseline` (taille -> {spec, targets})
+
+    Returns:
+        Une ligne par régression (vide si aucune)
+    """
+    regressions = []
+    for size, data in current.items():
+        base_data = baseline.get(size, {})
+        if base_data.get('spec') != data.get('spec'):
+            # Arbre différent (graine, ratios): pas comparable
+            continue
+        for target, metrics in data.get('targets', {}).items():
+            base = base_data.get('targets', {}).get(target)
+            if not base or 'error' in base:
+                continue
+            if 'error' in metrics:
+                regressions.append(f"{size}/{target}: erreur ({metrics['error']})")
+                continue
+
+            delta_ms = metrics['wall_ms'] - base['wall_ms']
+            if base['wall_ms'] and delta_ms > MIN_DELTA_MS and delta_ms / base['wall_ms'] > threshold:
+                regressions.append(
+                    f"{size}/{target}: latence {base['wall_ms'] / 1000:.2f}s -> {metrics['wall_ms'] / 1000:.2f}s "
+                    f"(+{delta_ms / base['wall_ms']:.0%})"
+                )
+
+            if metrics.get('peak_rss_kb') and base.get('peak_rss_kb'):
+                delta_kb = metrics['peak_rss_kb'] - base['peak_rss_kb']
+                if delta_kb > MIN_DELTA_RSS_KB and delta_kb / base['peak_rss_kb'] > memory_threshold:
+                    regressions.append(
+                        f"{size}/{target}: mémoire {base['peak_rss_kb'] // 1024}Mo -> {metrics['peak_rss_kb'] // 1024}Mo "
+                        f"(+{delta_kb / base['peak_rss_kb']:.0%})"
+                    )
+    return regressions
+
+
+def machine_info() -> Dict[str, Any]:
+    """Empreinte de la machine (une baseline n'est comparable que sur la même)"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """Baseline JSON (None si absente ou d'une autre version)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == BASELINE_VERSION else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks des agents sur arbres synthétiques')
+    parser.add_argument('--size', action='append', dest='sizes', metavar='SIZE',
+                        help=f"Taille d'arbre: {', '.join(SIZES)} ou nombre de fichiers (répétable, default: 1k)")
+    parser.add_argument('--agent', action='append', dest='agents', metavar='AGENT',
+                        help="Agent d'analyse à mesurer (répétable, default: tous)")
+    parser.add_argument('--no-runner', action='store_true', help='Ne pas mesurer le runner complet')
+    parser.add_argument('--repeat', type=int, default=1, help='Exécutions par cible (médiane, default: 1)')
+    parser.add_argument('--timeout', type=float, default=1800, help='Timeout par exécution en secondes (default: 1800)')
+    parser.add_argument('--seed', type=int, default=42, help='Graine du générateur (default: 42)')
+    parser.add_argument('--duplication', type=float, default=0.10, help='Part de fichiers avec bloc dupliqué')
+    parser.add_argument('--dead-files', type=float, default=0.05, help='Part de fichiers morts')
+    parser.add_argument('--complexity', type=int, default=4, help='Profondeur max des branches imbriquées')
+    parser.add_argument('--workdir', type=Path, default=Path(tempfile.gettempdir()) / 'ai-agents-bench',
+                        help='Dossier des arbres générés')
+    parser.add_argument('--regenerate', action='store_true', help='Régénérer les arbres')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Fichier de baseline JSON')
+    parser.add_argument('--update-baseline', action='store_true', help='Écrire les mesures dans la baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Régression de latence tolérée (fraction, default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help=f'Régression mémoire tolérée (fraction, default: {DEFAULT_MEMORY_THRESHOLD})')
+    parser.add_argument('--output', '-o', type=Path, help='Écrire aussi les mesures de ce run (JSON)')
+    args = parser.parse_args()
+
+    for agent in args.agents or []:
+        if agent not in ANALYSIS_AGENTS:
+            parser.error(f"agent inconnu: {agent}")
+
+    targets = list(args.agents or ANALYSIS_AGENTS)
+    if not args.no_runner:
+        targets.append(RUNNER_TARGET)
+
+    print("=" * 60)
+    print("⏱️  AI AGENTS - BENCHMARKS")
+    print("=" * 60)
+
+    current: Dict[str, Any] = {}
+    for size in args.sizes or ['1k']:
+        spec = SyntheticSpec.for_size(
+            size,
+            seed=args.seed,
+            duplication=args.duplication,
+            dead_files=args.dead_files,
+            complexity=args.complexity,
+        )
+        repo = generate(spec, args.workdir / f"{spec.label}-s{spec.seed}", force=args.regenerate)
+        print(f"\n🌲 {spec.label}: {repo.files} fichier(s), {len(repo.dead_files)} mort(s), "
+              f"{repo.duplicate_groups} bloc(s) dupliqué(s) - {repo.root}")
+
+        current[spec.label] = {
+            'spec': repo.to_dict()['spec'],
+            'targets': measure(repo.root, targets, args.agents, repeat=args.repeat, timeout=args.timeout),
+        }
+
+    report = {
+        'version': BASELINE_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'machine': machine_info(),
+        'sizes': current,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+
+    baseline = load_baseline(args.baseline)
+    exit_code = 0
+    if baseline is None:
+        print(f"\nℹ️  Pas de baseline ({args.baseline}): --update-baseline pour l'enregistrer")
+    else:
+        if baseline.get('machine') != report['machine']:
+            print("\n⚠️  Baseline enregistrée sur une autre machine: comparaison indicative")
+        regressions = compare(current, baseline.get('sizes', {}), args.threshold, args.memory_threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) (seuil {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"   - {line}")
+            exit_code = 1
+        else:
+            print(f"\n✅ Aucune régression (seuil {args.threshold:.0%})")
+
+    if args.update_baseline:
+        # Fusion: les tailles/cibles non mesurées gardent leur valeur
+        merged = baseline or {'version': BASELINE_VERSION, 'sizes': {}}
+        for size, data in current.items():
+            entry = merged['sizes'].setdefault(size, {'spec': data['spec'], 'targets': {}})
+            if entry.get('spec') != data['spec']:
+                entry.update(spec=data['spec'], targets={})
+            entry['targets'].update(data['targets'])
+        merged.update(timestamp=report['timestamp'], machine=report['machine'])
+        args.baseline.write_text(json.dumps(merged, indent=2) + '\n', encoding='utf-8')
+        print(f"💾 Baseline mise à jour: {args.baseline}")
+        exit_code = 0
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
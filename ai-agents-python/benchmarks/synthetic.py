@@ -0,0 +1,448 @@
+"""
+Synthetic - Générateur de monorepo synthétique (TS/TSX/Python)
+
+Arbre déterministe (graine) qui imite la structure du workspace:
+
+    backend/src/main.ts                        point d'entrée
+    backend/src/modules/<m>/services/*.ts      services (graphe d'imports)
+    frontend/app/routes/*.tsx                  routes (points d'entrée Remix)
+    frontend/app/components/*.tsx             composants
+    packages/shared/src/*.ts                   utilitaires partagés
+    tools/*.py                                 scripts Python
+
+Caractéristiques contrôlées:
+- duplication: part des fichiers qui reçoivent un bloc copié (chaque
+  bloc apparaît dans au moins deux fichiers)
+- dead_files: part des fichiers jamais importés (hors points d'entrée)
+- complexity: profondeur maximale des branches imbriquées par fonction
+
+Tous les fichiers vivants sont atteignables depuis un point d'entrée. Les
+mtimes sont reculés de `age_days` pour que les fichiers morts dépassent
+le seuil d'ancienneté de A4. La vérité terrain (fichiers morts, groupes
+de duplication) est écrite dans `synthetic.json` à la racine.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+# Version du générateur (un arbre existant d'une autre version est régénéré)
+GENERATOR_VERSION = '1'
+
+MANIFEST_NAME = 'synthetic.json'
+
+# Tailles nommées
+SIZES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '50k': 50_000,
+}
+
+# Répartition des fichiers par rôle (le reste: services backend)
+ROUTE_SHARE = 0.05
+COMPONENT_SHARE = 0.35
+SHARED_SHARE = 0.15
+PYTHON_SHARE = 0.10
+
+# Modules backend: un dossier pour ~40 services
+SERVICES_PER_MODULE = 40
+
+
+@dataclass
+class SyntheticSpec:
+    """Paramètres d'un arbre synthétique"""
+    files: int = 1_000
+    seed: int = 42
+    duplication: float = 0.10  # Part des fichiers contenant un bloc dupliqué
+    dead_files: float = 0.05  # Part des fichiers jamais importés
+    complexity: int = 4  # Profondeur max des branches imbriquées
+    age_days: int = 120  # Âge des fichiers (mtime)
+
+    @classmethod
+    def for_size(cls, size: Union[str, int], **overrides) -> "SyntheticSpec":
+        """Spec d'une taille nommée (`1k`, `10k`, `50k`) ou d'un nombre de fichiers"""
+        files = SIZES[size] if size in SIZES else int(size)
+        return cls(files=files, **overrides)
+
+    @property
+    def label(self) -> str:
+        """Nom stable de l'arbre (dossier, clé de baseline)"""
+        for name, count in SIZES.items():
+            if count == self.files:
+                return name
+        return str(self.files)
+
+
+@dataclass
+class _File:
+    """Fichier à générer"""
+    rel_path: str
+    kind: str  # 'route', 'component', 'shared', 'service', 'main', 'python'
+    symbol: str
+    dead: bool = False
+    imports: List[int] = field(default_factory=list)
+    snippet: Optional[int] = None
+
+
+@dataclass
+class SyntheticRepo:
+    """Arbre généré et sa vérité terrain"""
+    root: Path
+    spec: SyntheticSpec
+    files: int
+    dead_files: List[str]
+    duplicate_groups: int
+    duplicated_files: int
+    generated_ms: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': GENERATOR_VERSION,
+            'spec': asdict(self.spec),
+            'files': self.files,
+            'dead_files': self.dead_files,
+            'duplicate_groups': self.duplicate_groups,
+            'duplicated_files': self.duplicated_files,
+            'generated_ms': self.generated_ms,
+        }
+
+
+def generate(spec: SyntheticSpec, root: Path, force: bool = False, git: bool = True) -> SyntheticRepo:
+    """
+    Génère (ou réutilise) l'arbre synthétique de `spec` sous `root`
+
+    Args:
+        spec: Paramètres de l'arbre
+        root: Dossier cible (vidé si régénéré)
+        force: Régénérer même si l'arbre existant correspond
+        git: Initialiser un dépôt git (un commit) pour F15/M7
+    """
+    root = Path(root)
+    existing = _load_manifest(root, spec)
+    if existing is not None and not force:
+        return existing
+
+    start = time.time()
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    rng = random.Random(spec.seed)
+    plan = _plan(spec, rng)
+    snippets = _assign_snippets(plan, spec, rng)
+
+    for entry in plan:
+        path = root / entry.rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_render(entry, plan, spec, rng), encoding='utf-8')
+
+    _write_package_files(root)
+
+    # Fichiers anciens: les fichiers morts dépassent le seuil de A4
+    old = time.time() - spec.age_days * 86400
+    for entry in plan:
+        os.utime(root / entry.rel_path, (old, old))
+
+    if git:
+        _git_init(root)
+
+    repo = SyntheticRepo(
+        root=root,
+        spec=spec,
+        files=len(plan),
+        dead_files=sorted(entry.rel_path for entry in plan if entry.dead),
+        duplicate_groups=snippets,
+        duplicated_files=sum(1 for entry in plan if entry.snippet is not None),
+        generated_ms=int((time.time() - start) * 1000),
+    )
+    with open(root / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(repo.to_dict(), f, indent=2)
+    return repo
+
+
+def _load_manifest(root: Path, spec: SyntheticSpec) -> Optional[SyntheticRepo]:
+    """Arbre existant s'il a été généré avec la même spec et la même version"""
+    try:
+        with open(root / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('version') != GENERATOR_VERSION or data.get('spec') != asdict(spec):
+        return None
+    return SyntheticRepo(
+        root=root,
+        spec=spec,
+        files=data['files'],
+        dead_files=data['dead_files'],
+        duplicate_groups=data['duplicate_groups'],
+        duplicated_files=data['duplicated_files'],
+        generated_ms=data.get('generated_ms', 0),
+    )
+
+
+def _plan(spec: SyntheticSpec, rng: random.Random) -> List[_File]:
+    """Chemins, rôles et graphe d'imports (vivants atteignables, morts isolés)"""
+    total = max(spec.files, 10)
+    routes = max(1, int(total * ROUTE_SHARE))
+    components = int(total * COMPONENT_SHARE)
+    shared = int(total * SHARED_SHARE)
+    python = int(total * PYTHON_SHARE)
+    services = total - routes - components - shared - python - 1
+
+    plan: List[_File] = [_File('backend/src/main.ts', 'main', 'bootstrap')]
+    for i in range(routes):
+        plan.append(_File(f'frontend/app/routes/page-{i}.tsx', 'route', f'Page{i}'))
+    for i in range(services):
+        module = i // SERVICES_PER_MODULE
+        plan.append(_File(f'backend/src/modules/m{module}/services/svc-{i}.service.ts', 'service', f'service{i}'))
+    for i in range(components):
+        plan.append(_File(f'frontend/app/components/c{i // 200}/Widget{i}.tsx', 'component', f'Widget{i}'))
+    for i in range(shared):
+        plan.append(_File(f'packages/shared/src/util-{i}.ts', 'shared', f'util{i}'))
+    for i in range(python):
+        plan.append(_File(f'tools/pkg{i // 200}/mod_{i}.py', 'python', f'task_{i}'))
+
+    # Fichiers morts: tirés hors points d'entrée, jamais importés
+    candidates = [i for i, entry in enumerate(plan) if entry.kind not in ('main', 'route')]
+    for i in rng.sample(candidates, min(len(candidates), int(total * spec.dead_files))):
+        plan[i].dead = True
+
+    # Chaque fichier vivant est importé par un fichier vivant antérieur
+    # compatible (routes/main en tête): tout le graphe vivant est atteignable
+    live_importers: Dict[str, List[int]] = {'ts': [], 'py': []}
+    for i, entry in enumerate(plan):
+        lang = 'py' if entry.kind == 'python' else 'ts'
+        importers = live_importers[lang]
+        if not entry.dead and entry.kind not in ('main', 'route') and importers:
+            plan[rng.choice(importers[-200:])].imports.append(i)
+        if entry.kind == 'python' and not importers and not entry.dead:
+            # Premier module Python: point d'entrée (scripts/)
+            entry.rel_path = 'tools/scripts/cli.py'
+        if not entry.dead:
+            importers.append(i)
+
+    # Imports supplémentaires vers des fichiers vivants déjà importés
+    imported = {target for entry in plan for target in entry.imports}
+    for i, entry in enumerate(plan):
+        if entry.kind == 'python':
+            continue
+        for _ in range(rng.randint(0, 2)):
+            target = rng.randrange(len(plan))
+            if target != i and target in imported and plan[target].kind not in ('python', 'route', 'main'):
+                if target not in entry.imports:
+                    entry.imports.append(target)
+
+    return plan
+
+
+def _assign_snippets(plan: List[_File], spec: SyntheticSpec, rng: random.Random) -> int:
+    """Répartit les blocs dupliqués (au moins 2 fichiers par bloc), retourne le nombre de blocs"""
+    count = int(len(plan) * spec.duplication)
+    if count < 2:
+        return 0
+
+    groups = max(1, count // 4)
+    chosen = rng.sample(range(len(plan)), count)
+    for n, i in enumerate(chosen):
+        # Un bloc ne mélange pas Python et TS
+        plan[i].snippet = (n % groups) * 2 + (1 if plan[i].kind == 'python' else 0)
+
+    members = Counter(plan[i].snippet for i in chosen)
+    return sum(1 for size in members.values() if size >= 2)
+
+
+def _render(entry: _File, plan: List[_File], spec: SyntheticSpec, rng: random.Random) -> str:
+    """Contenu d'un fichier"""
+    if entry.kind == 'python':
+        return _render_python(entry, plan, spec, rng)
+    return _render_ts(entry, plan, spec, rng)
+
+
+def _ts_specifier(source: str, target: str) -> str:
+    """Chemin relatif d'import TS (sans extension)"""
+    rel = os.path.relpath(target, os.path.dirname(source)).replace(os.sep, '/')
+    rel = rel.rsplit('.', 1)[0]
+    return rel if rel.startswith('.') else f'./{rel}'
+
+
+def _render_ts(entry: _File, plan: List[_File], spec: SyntheticSpec, rng: random.Random) -> str:
+    lines: List[str] = []
+    is_tsx = entry.rel_path.endswith('.tsx')
+    if is_tsx:
+        lines.append("import React from 'react';")
+    for target in entry.imports:
+        dep = plan[target]
+        lines.append(f"import {{ {dep.symbol} }} from '{_ts_specifier(entry.rel_path, dep.rel_path)}';")
+    lines.append('')
+
+    calls = [plan[target].symbol for target in entry.imports]
+    for n in range(rng.randint(1, 3)):
+        lines.extend(_ts_function(f'{entry.symbol}_helper{n}', calls, rng.randint(1, spec.complexity), rng))
+        lines.append('')
+
+    if entry.snippet is not None:
+        lines.extend(_ts_snippet(entry.snippet))
+        lines.append('')
+
+    if is_tsx:
+        props = ', '.join(f'{call}' for call in calls[:2]) or "'none'"
+        lines.extend([
+            f'export function {entry.symbol}({{ items }}: {{ items: string[] }}) {{',
+            f'  const total = {entry.symbol}_helper0(items.length, items);',
+            '  return (',
+            f'    <section className="{entry.symbol.lower()}" data-total={{total}}>',
+            '      {items.map((item) => (',
+            '        <span key={item}>{item}</span>',
+            '      ))}',
+            f'      <footer>{{String([{props}].length)}}</footer>',
+            '    </section>',
+            '  );',
+            '}',
+        ])
+        if entry.kind == 'route':
+            lines.append(f'export default {entry.symbol};')
+    else:
+        lines.extend([
+            f'export function {entry.symbol}(value: number): number {{',
+            f'  return {entry.symbol}_helper0(value, []) + {len(calls)};',
+            '}',
+        ])
+    return '\n'.join(lines) + '\n'
+
+
+def _ts_function(name: str, calls: List[str], depth: int, rng: random.Random) -> List[str]:
+    """Fonction TS avec `depth` niveaux de branches imbriquées"""
+    lines = [f'function {name}(value: number, flags: string[]): number {{', '  let total = 0;']
+    indent = '  '
+    for level in range(depth):
+        kind = rng.choice(('if', 'for', 'while'))
+        if kind == 'if':
+            lines.append(f'{indent}if (value > {level} && flags.length !== {level}) {{')
+        elif kind == 'for':
+            lines.append(f'{indent}for (const flag{level} of flags) {{')
+        else:
+            lines.append(f'{indent}while (total < value * {level + 2}) {{')
+        indent += '  '
+        lines.append(f'{indent}total += {level + 1};')
+    if calls:
+        lines.append(f'{indent}total += {rng.choice(calls)} ? 1 : 0;')
+    for level in reversed(range(depth)):
+        indent = indent[:-2]
+        lines.append(f'{indent}}}')
+        if level % 2 == 0:
+            lines.append(f'{indent}if (total % 2 === 0) {{ total -= 1; }} else {{ total += 2; }}')
+    lines.extend(['  return total;', '}'])
+    return lines
+
+
+def _ts_snippet(group: int) -> List[str]:
+    """Bloc TS identique dans tous les fichiers du groupe"""
+    return [
+        f'export function normalizeRecords{group}(records: Array<{{ id: string; score: number }}>) {{',
+        '  const seen = new Set<string>();',
+        '  const result: Array<{ id: string; score: number }> = [];',
+        '  for (const record of records) {',
+        '    if (seen.has(record.id)) {',
+        '      continue;',
+        '    }',
+        '    seen.add(record.id);',
+        f'    const weight = record.score * {group + 3} + record.id.length;',
+        '    result.push({ id: record.id.trim().toLowerCase(), score: weight });',
+        '  }',
+        '  result.sort((left, right) => right.score - left.score);',
+        '  return result;',
+        '}',
+    ]
+
+
+def _render_python(entry: _File, plan: List[_File], spec: SyntheticSpec, rng: random.Random) -> str:
+    lines: List[str] = []
+    for target in entry.imports:
+        dep = plan[target]
+        module = dep.rel_path[:-3].replace('/', '.')
+        lines.append(f'from {module} import {dep.symbol}')
+    lines.extend(['', ''])
+
+    calls = [plan[target].symbol for target in entry.imports]
+    for n in range(rng.randint(1, 3)):
+        lines.extend(_py_function(f'{entry.symbol}_helper{n}', calls, rng.randint(1, spec.complexity), rng))
+        lines.extend(['', ''])
+
+    if entry.snippet is not None:
+        lines.extend(_py_snippet(entry.snippet))
+        lines.extend(['', ''])
+
+    lines.extend([
+        f'def {entry.symbol}(value):',
+        f'    return {entry.symbol}_helper0(value, []) + {len(calls)}',
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def _py_function(name: str, calls: List[str], depth: int, rng: random.Random) -> List[str]:
+    """Fonction Python avec `depth` niveaux de branches imbriquées"""
+    lines = [f'def {name}(value, flags):', '    total = 0']
+    indent = '    '
+    for level in range(depth):
+        kind = rng.choice(('if', 'for'))
+        if kind == 'if':
+            lines.append(f'{indent}if value > {level} and len(flags) != {level}:')
+        else:
+            lines.append(f'{indent}for flag{level} in flags:')
+        indent += '    '
+        lines.append(f'{indent}total += {level + 1}')
+    if calls:
+        lines.append(f'{indent}total += 1 if {rng.choice(calls)} else 0')
+    lines.append('    return total')
+    return lines
+
+
+def _py_snippet(group: int) -> List[str]:
+    """Bloc Python identique dans tous les fichiers du groupe"""
+    return [
+        f'def normalize_records_{group}(records):',
+        '    seen = set()',
+        '    result = []',
+        '    for record in records:',
+        "        if record['id'] in seen:",
+        '            continue',
+        "        seen.add(record['id'])",
+        f"        weight = record['score'] * {group + 3} + len(record['id'])",
+        "        result.append({'id': record['id'].strip().lower(), 'score': weight})",
+        "    result.sort(key=lambda item: item['score'], reverse=True)",
+        '    return result',
+    ]
+
+
+def _write_package_files(root: Path):
+    """package.json racine (workspaces), sans dépendances: pas d'audit réseau"""
+    package = {
+        'name': 'synthetic-monorepo',
+        'private': True,
+        'workspaces': ['backend', 'frontend', 'packages/*'],
+    }
+    (root / 'package.json').write_text(json.dumps(package, indent=2) + '\n', encoding='utf-8')
+
+
+def _git_init(root: Path):
+    """Dépôt git avec un seul commit (ignoré si git est absent)"""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@localhost',
+        GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@localhost',
+    )
+    try:
+        for args in (['init', '-q'], ['add', '-A'], ['commit', '-q', '-m', 'synthetic tree']):
+            subprocess.run(['git', *args], cwd=root, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        pass
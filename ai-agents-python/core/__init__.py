@@ -4,6 +4,14 @@ Core utilities for AI Agents
 
 from .config import Config
 from .runner import AgentRunner, AgentResult, RunReport
-from .evidence import EvidenceLogger
+from .evidence import EvidenceLogger, EvidenceReader
+from .file_index import FileIndex, FileEntry
+from .content_store import ContentStore, FileContent
+from .analysis_cache import AnalysisCache
+from .rule_engine import RuleEngine, Rule, RuleHit
+from .lexer import FunctionSpan, scan_functions
+from .git_index import GitIndex, FileHistory, FileDiff
+from .profiling import Profiler, Span
+from .report_engine import ReportEngine
 
-__all__ = ["Config", "AgentRunner", "AgentResult", "RunReport", "EvidenceLogger"]
+__all__ = ["Config", "AgentRunner", "AgentResult", "RunReport", "EvidenceLogger", "EvidenceReader", "FileIndex", "FileEntry", "ContentStore", "FileContent", "AnalysisCache", "RuleEngine", "Rule", "RuleHit", "FunctionSpan", "scan_functions", "GitIndex", "FileHistory", "FileDiff", "ReportEngine", "Profiler", "Span"]
@@ -0,0 +1,184 @@
+"""
+Agent Pool - Exécution parallèle d'agents dans des processus isolés
+
+Chaque tâche tourne dans son propre processus (au plus `jobs` à la fois):
+un agent qui plante, bloque ou dépasse son timeout est tué sans impacter
+les autres. Les résultats sont rendus indexés par clé, l'appelant garde
+donc un ordre déterministe quel que soit l'ordre de terminaison.
+
+Chaque tâche est le leader de son propre groupe de processus (POSIX): un
+timeout tue tout le groupe, y compris les pools créés par l'agent (A3).
+"""
+
+import os
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class PoolOutcome:
+    """Issue d'une tâche exécutée dans le pool"""
+    key: str
+    value: Any
+    error: Optional[str]
+    duration_ms: int
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _own_process_group(pid: int = 0):
+    """Place le processus dans son propre groupe (appelé côté enfant ET parent: pas de course)"""
+    if hasattr(os, 'setpgid'):
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass
+
+
+def _terminate_tree(process, grace: float = 2.0):
+    """
+    Termine le processus de la tâche et tout son groupe, puis attend leur fin
+
+    SIGTERM au groupe, SIGKILL pour ce qui survit au délai de grâce.
+    """
+    if not hasattr(os, 'killpg'):
+        process.terminate()
+        process.join()
+        return
+
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        process.terminate()
+    process.join(grace)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+    # Petits-enfants (workers de Pool): rattachés à init après la mort de l'agent
+    deadline = time.time() + grace
+    while time.time() < deadline:
+        try:
+            os.killpg(process.pid, 0)
+        except OSError:
+            return
+        time.sleep(0.05)
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _pool_worker(conn, func: Callable, args: Tuple):
+    """Point d'entrée du processus enfant: exécute la tâche et renvoie le résultat"""
+    _own_process_group()
+    try:
+        value = func(*args)
+        conn.send((True, value))
+    except BaseException as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class AgentPool:
+    """
+    Pool de processus avec timeout par tâche
+
+    Usage:
+        pool = AgentPool(jobs=4, timeout=600)
+        outcomes = pool.run([(key, func, args), ...])
+        outcomes[key].value / .error / .duration_ms
+    """
+
+    def __init__(self, jobs: int, timeout: Optional[float] = None):
+        self.jobs = max(1, jobs)
+        self.timeout = timeout
+        # fork: l'état du parent (index, config) est hérité sans sérialisation
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    def run(
+        self,
+        tasks: List[Tuple[str, Callable, Tuple]],
+        on_done: Optional[Callable[[PoolOutcome], None]] = None,
+    ) -> Dict[str, PoolOutcome]:
+        """
+        Exécute les tâches (clé, fonction, arguments)
+
+        Args:
+            tasks: Tâches dans l'ordre de lancement
+            on_done: Callback appelé à chaque fin de tâche (ordre de terminaison)
+
+        Returns:
+            Issues indexées par clé
+        """
+        pending = list(tasks)
+        running: Dict[str, Tuple[Any, Any, float]] = {}  # key -> (process, conn, start)
+        outcomes: Dict[str, PoolOutcome] = {}
+
+        def finish(outcome: PoolOutcome):
+            outcomes[outcome.key] = outcome
+            if on_done is not None:
+                on_done(outcome)
+
+        try:
+            while pending or running:
+                # Lancer jusqu'à `jobs` tâches
+                while pending and len(running) < self.jobs:
+                    key, func, args = pending.pop(0)
+                    parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+                    # Non daemon: les agents peuvent créer leurs propres pools (A3)
+                    process = self._ctx.Process(target=_pool_worker, args=(child_conn, func, args))
+                    process.start()
+                    _own_process_group(process.pid)
+                    child_conn.close()
+                    running[key] = (process, parent_conn, time.time())
+
+                ready = wait([conn for _, conn, _ in running.values()], timeout=0.1)
+
+                for key, (process, conn, start) in list(running.items()):
+                    duration_ms = int((time.time() - start) * 1000)
+
+                    if conn in ready:
+                        try:
+                            ok, value = conn.recv()
+                        except EOFError:
+                            # Processus mort sans répondre (crash, kill...)
+                            process.join()
+                            ok, value = False, f"Processus terminé sans résultat (code {process.exitcode})"
+                        conn.close()
+                        process.join()
+                        del running[key]
+                        finish(PoolOutcome(
+                            key=key,
+                            value=value if ok else None,
+                            error=None if ok else value,
+                            duration_ms=duration_ms,
+                        ))
+
+                    elif self.timeout is not None and duration_ms > self.timeout * 1000:
+                        _terminate_tree(process)
+                        conn.close()
+                        del running[key]
+                        finish(PoolOutcome(
+                            key=key,
+                            value=None,
+                            error=f"Timeout après {self.timeout:g}s",
+                            duration_ms=duration_ms,
+                            timed_out=True,
+                        ))
+        finally:
+            # Interruption (Ctrl+C...): ne pas laisser de processus orphelins
+            for process, conn, _ in running.values():
+                _terminate_tree(process)
+                conn.close()
+
+        return outcomes
@@ -0,0 +1,154 @@
+"""
+Analysis Cache - Cache persistant des résultats d'analyse par fichier
+
+Un fichier JSON par agent sous `.ai-agents/cache/<agent>.json`:
+
+    {"version": "<CACHE_VERSION agent>:<empreinte config>",
+     "files": {"<chemin relatif>": {"sha": "<sha1 contenu>", "value": ...}}}
+
+Une entrée n'est réutilisée que si le sha du contenu est identique: un
+re-run ne ré-analyse que les fichiers modifiés. Un changement de version
+de l'agent ou de la configuration invalide tout le cache de l'agent.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .content_store import ContentStore
+from .file_index import FileEntry
+
+
+def config_fingerprint(config) -> str:
+    """Empreinte courte d'une configuration (dataclass Config)"""
+    payload = json.dumps(asdict(config), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class AnalysisCache:
+    """
+    Cache persistant pour un agent
+
+    Usage:
+        cache = AnalysisCache(cache_dir, 'a1_security', version)
+        value = cache.get(rel_path, sha)
+        if value is None:
+            value = ...
+            cache.put(rel_path, sha, value)
+        cache.save()
+    """
+
+    def __init__(self, cache_dir: Path, name: str, version: str):
+        self.path = Path(cache_dir) / f"{name}.json"
+        self.name = name
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._touched: Set[str] = set()
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_agent(cls, workspace_root: Path, name: str, agent: Any, config) -> "AnalysisCache":
+        """Cache d'un agent, versionné par son CACHE_VERSION et la config"""
+        agent_version = getattr(agent, 'CACHE_VERSION', '1')
+        version = f"{agent_version}:{config_fingerprint(config)}"
+        return cls(Path(workspace_root) / '.ai-agents' / 'cache', name, version)
+
+    def _load(self):
+        """Charge le cache (ignoré s'il est absent, corrompu ou d'une autre version)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            # Agent ou config modifiés: on repart de zéro
+            self._dirty = True
+            return
+
+        self._entries = data.get('files', {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, sha: str) -> Optional[Any]:
+        """Valeur en cache si le contenu n'a pas changé, sinon None"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.get('sha') == sha:
+            self.hits += 1
+            self._touched.add(key)
+            return entry['value']
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, sha: str, value: Any):
+        """Enregistre la valeur calculée pour un contenu"""
+        self._entries[key] = {'sha': sha, 'value': value}
+        self._touched.add(key)
+        self._dirty = True
+
+    def save(self, prune: bool = True):
+        """
+        Écrit le cache sur disque (écriture atomique)
+
+        Args:
+            prune: Supprimer les entrées non consultées pendant ce run
+                   (fichiers supprimés ou sortis du périmètre)
+        """
+        if prune:
+            stale = [key for key in self._entries if key not in self._touched]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._dirty = True
+
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'files': self._entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        """Statistiques du cache (entrées, hits, misses)"""
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def cached_file_findings(
+    cache: Optional[AnalysisCache],
+    store: ContentStore,
+    entry: FileEntry,
+    finding_cls: type,
+    compute: Callable[[], List[Any]],
+) -> List[Any]:
+    """
+    Findings d'un fichier, depuis le cache si son contenu n'a pas changé
+
+    Les findings (dataclasses) sont stockés via asdict et reconstruits avec
+    `finding_cls(**item)`. Sans cache, appelle simplement `compute()`.
+    """
+    if cache is None:
+        return compute()
+
+    try:
+        sha = store.get(entry.path).sha
+    except OSError:
+        return compute()
+
+    cached = cache.get(entry.rel_path, sha)
+    if cached is not None:
+        return [finding_cls(**item) for item in cached]
+
+    findings = compute()
+    cache.put(entry.rel_path, sha, [asdict(f) for f in findings])
+    return findings
@@ -3,8 +3,10 @@ Configuration management for AI Agents
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from pathlib import Path
+import os
+import re
 import yaml
 
 
@@ -74,6 +76,16 @@ class OutputConfig:
     reports_dir: str = ".ai-agents/reports"
     evidence_dir: str = ".ai-agents/evidence"
     logs_dir: str = ".ai-agents/logs"
+    evidence_compression: str = "none"  # none | zstd (paquet zstandard)
+
+
+@dataclass
+class DependenciesConfig:
+    offline: bool = False  # A6: snapshot only, never npm/pip
+    snapshot: str = ".ai-agents/cache/a6_advisories.json"
+    snapshot_ttl_hours: int = 24  # Online: reuse a snapshot this recent (0 = always query)
+    timeout: int = 60  # Seconds per npm/pip command
+    jobs: int = 4  # Concurrent npm/pip commands
 
 
 @dataclass
@@ -100,6 +112,75 @@ class DecisionConfig:
     review_if: DecisionThreshold = field(default_factory=lambda: DecisionThreshold(max_risk=60, min_confidence=90))
 
 
+def _glob_component(pattern: str) -> str:
+    """Translate one glob component to a regex that never crosses '/'"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            start = i + 1 if pattern[i:i + 1] == '!' else i
+            if pattern[start:start + 1] == ']':
+                start += 1  # Leading ']' is a literal
+            end = pattern.find(']', start)
+            if end == -1:
+                out.append(re.escape(char))
+                continue
+            body = pattern[i:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append(f'[{body}]')
+            i = end + 1
+        else:
+            out.append(re.escape(char))
+    return ''.join(out)
+
+
+class ExcludeMatcher:
+    """
+    Exclusions compiled once into two regexes
+    
+    - directories: a path component equal to one of the directories
+      (`(^|/)(node_modules|dist|...)/`), also used to prune walks
+    - patterns: `Path.match` semantics (matched from the right, `*` stays
+      within one component), e.g. `*.d.ts`, `migrations/*.sql`
+    """
+    
+    def __init__(self, directories: Iterable[str], patterns: Iterable[str]):
+        self.key = (tuple(directories), tuple(patterns))
+        directories, patterns = self.key
+        
+        self._dirs: Optional[re.Pattern] = None
+        if directories:
+            names = '|'.join(re.escape(d.strip('/')) for d in directories)
+            self._dirs = re.compile(f'(?:^|/)(?:{names})/')
+        
+        self._patterns: Optional[re.Pattern] = None
+        if patterns:
+            alternatives = '|'.join(
+                '/'.join(_glob_component(part) for part in pattern.strip('/').split('/'))
+                for pattern in patterns
+            )
+            self._patterns = re.compile(f'(?:^|/)(?:{alternatives})$')
+    
+    def match(self, path: str) -> bool:
+        """True if the path ('/' or OS separators) is excluded"""
+        if os.sep != '/':
+            path = path.replace(os.sep, '/')
+        if self._dirs is not None and self._dirs.search(path):
+            return True
+        return self._patterns is not None and self._patterns.search(path) is not None
+    
+    def excludes_dir(self, rel_dir: str) -> bool:
+        """True if a directory (path relative to the walk root) must not be descended into"""
+        return self._dirs is not None and self._dirs.search(rel_dir + '/') is not None
+
+
 @dataclass
 class Config:
     """Main configuration class"""
@@ -108,6 +189,7 @@ class Config:
     auto_fix: AutoFixConfig = field(default_factory=AutoFixConfig)
     tests: TestsConfig = field(default_factory=TestsConfig)
     output: OutputConfig = field(default_factory=OutputConfig)
+    dependencies: DependenciesConfig = field(default_factory=DependenciesConfig)
     risk: RiskConfig = field(default_factory=RiskConfig)
     confidence: ConfidenceConfig = field(default_factory=ConfidenceConfig)
     decision: DecisionConfig = field(default_factory=DecisionConfig)
@@ -115,7 +197,7 @@ class Config:
     mode: str = "local"
     exclude_dirs: List[str] = field(default_factory=lambda: [
         "node_modules", "dist", "build", ".next", ".cache",
-        "coverage", ".git", "__pycache__", ".venv", "venv"
+        "coverage", ".git", "__pycache__", ".venv", "venv", ".ai-agents"
     ])
     exclude_patterns: List[str] = field(default_factory=lambda: [
         "*.min.js", "*.d.ts", "*.test.ts", "*.spec.ts"
@@ -184,6 +266,15 @@ class Config:
             config.output.format = o.get("format", "markdown")
             config.output.verbose = o.get("verbose", True)
             config.output.reports_dir = o.get("reports_dir", ".ai-agents/reports")
+            config.output.evidence_compression = o.get("evidence_compression", "none")
+        
+        if "dependencies" in data:
+            dp = data["dependencies"]
+            config.dependencies.offline = dp.get("offline", False)
+            config.dependencies.snapshot = dp.get("snapshot", ".ai-agents/cache/a6_advisories.json")
+            config.dependencies.snapshot_ttl_hours = dp.get("snapshot_ttl_hours", 24)
+            config.dependencies.timeout = dp.get("timeout", 60)
+            config.dependencies.jobs = dp.get("jobs", 4)
         
         if "risk" in data:
             r = data["risk"]
@@ -221,22 +312,16 @@ class Config:
         
         return config
     
+    @property
+    def exclusions(self) -> ExcludeMatcher:
+        """Compiled exclusions (compiled once, recompiled if the lists change)"""
+        key = (tuple(self.exclude_dirs), tuple(self.exclude_patterns))
+        matcher = self.__dict__.get('_exclusions')
+        if matcher is None or matcher.key != key:
+            matcher = ExcludeMatcher(*key)
+            self.__dict__['_exclusions'] = matcher
+        return matcher
+    
     def should_exclude(self, path) -> bool:
         """Check if path should be excluded"""
-        # Convertir en Path si string
-        if isinstance(path, str):
-            path = Path(path)
-        
-        path_str = str(path)
-        
-        # Check directories
-        for exclude_dir in self.exclude_dirs:
-            if f"/{exclude_dir}/" in path_str or path_str.startswith(exclude_dir):
-                return True
-        
-        # Check patterns
-        for pattern in self.exclude_patterns:
-            if path.match(pattern):
-                return True
-        
-        return False
+        return self.exclusions.match(str(path))
@@ -0,0 +1,161 @@
+"""
+Content Store - Cache de contenu des fichiers partagé entre agents
+
+Chaque fichier est lu une seule fois par run, clé (path, mtime, size).
+Les octets bruts sont conservés, le décodage est paresseux et les vues
+dérivées (lignes, texte sans commentaires, table des offsets de lignes)
+sont mémoïsées: N agents qui regardent le même fichier ne paient qu'un
+read + un decode.
+"""
+
+import os
+import re
+import hashlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+# Commentaires JS/TS (même approche que A3: simple regex, pas parfait)
+LINE_COMMENT_RE = re.compile(r'//.*?$', re.MULTILINE)
+BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def _blank_block_comment(match: "re.Match") -> str:
+    """Remplace un commentaire bloc en conservant ses retours ligne"""
+    return '\n' * match.group(0).count('\n')
+
+
+class FileContent:
+    """Contenu d'un fichier + vues dérivées mémoïsées"""
+
+    def __init__(self, path: Path, data: bytes):
+        self.path = path
+        self.data = data
+        self._text: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._code: Optional[str] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._sha: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Texte décodé (utf-8, errors='ignore', newlines universels comme read_text)"""
+        if self._text is None:
+            text = self.data.decode('utf-8', errors='ignore')
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self._text = text
+        return self._text
+
+    @property
+    def lines(self) -> List[str]:
+        """Lignes du texte (équivalent à text.split('\\n'))"""
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def code(self) -> str:
+        """
+        Texte sans commentaires // et /* */
+
+        Les commentaires bloc sont remplacés par leurs retours ligne, les
+        numéros de ligne restent donc valides sur cette vue.
+        """
+        if self._code is None:
+            code = LINE_COMMENT_RE.sub('', self.text)
+            self._code = BLOCK_COMMENT_RE.sub(_blank_block_comment, code)
+        return self._code
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Offset du premier caractère de chaque ligne"""
+        if self._line_offsets is None:
+            offsets = [0]
+            text = self.text
+            pos = text.find('\n')
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = text.find('\n', pos + 1)
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def sha(self) -> str:
+        """Hash du contenu brut"""
+        if self._sha is None:
+            self._sha = hashlib.sha1(self.data).hexdigest()
+        return self._sha
+
+    def line_number(self, position: int) -> int:
+        """Numéro de ligne (1-based) d'un offset, en O(log n)"""
+        return bisect_right(self.line_offsets, position)
+
+
+class ContentStore:
+    """
+    Store de contenus pour un run
+
+    Usage:
+        store = ContentStore()
+        doc = store.get(path)
+        doc.text, doc.lines, doc.code, doc.line_number(pos)
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], FileContent]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Union[str, Path]) -> FileContent:
+        """
+        Retourne le contenu d'un fichier (lu une seule fois tant que
+        mtime/size ne changent pas). Lève OSError si illisible.
+        """
+        key = str(path)
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+
+        with open(key, 'rb') as f:
+            data = f.read()
+
+        content = FileContent(Path(key), data)
+        self._entries[key] = (version, content)
+        self.misses += 1
+        return content
+
+    def preload(self, paths: Iterable[Union[str, Path]]) -> int:
+        """
+        Lit d'avance une sélection de fichiers (phase « read » des agents)
+
+        Returns:
+            Nombre de fichiers lisibles (les illisibles sont ignorés ici et
+            remontent leur OSError à l'analyse, comme sans préchargement)
+        """
+        count = 0
+        for path in paths:
+            try:
+                self.get(path)
+            except OSError:
+                continue
+            count += 1
+        return count
+
+    def read_text(self, path: Union[str, Path]) -> str:
+        """Raccourci: texte décodé d'un fichier"""
+        return self.get(path).text
+
+    def stats(self) -> Dict[str, int]:
+        """Statistiques du store (fichiers en cache, hits, misses, octets)"""
+        return {
+            'files': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes': sum(len(entry[1].data) for entry in self._entries.values()),
+        }
@@ -2,26 +2,68 @@
 Evidence Logger - Traçabilité complète des opérations
 
 Enregistre toutes les actions pour audit et débug.
+
+Les preuves d'une session sont écrites au fil de l'eau dans un flux JSONL
+(`evidence/session_<id>.jsonl`, ou `.jsonl.zst` compressé zstd), un
+enregistrement par résultat d'agent puis par lot de findings: la mémoire
+reste bornée quel que soit le nombre de findings. Un index
+(`session_<id>.index.json`) donne l'offset de chaque enregistrement, ce
+qui permet de relire les findings d'un seul agent sans charger la
+session (EvidenceReader).
+
+En mode zstd, chaque enregistrement est une frame indépendante (la
+concaténation reste un fichier .zst valide): l'index pointe sur les
+frames, décompressées une à une.
 """
 
 import json
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dataclasses import asdict
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Findings (ou corrections) par enregistrement du flux
+BATCH_SIZE = 500
+
+# Suffixe des fichiers d'index (exclus de l'historique des sessions)
+INDEX_SUFFIX = '.index.json'
+
+# Exemples de findings conservés dans le rapport de session
+SAMPLE_SIZE = 5
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Dataclass -> dict (les autres valeurs sont sérialisées telles quelles)"""
+    if hasattr(value, '__dataclass_fields__'):
+        return asdict(value)
+    return value
+
+
+def _field(result: Any, name: str, default: Any = None) -> Any:
+    """Champ d'un résultat d'agent (AgentResult ou dict)"""
+    if isinstance(result, dict):
+        return result.get(name, default)
+    return getattr(result, name, default)
+
 
 class EvidenceLogger:
     """
     Logger de preuves pour traçabilité complète
     
     Enregistre dans .ai-agents/:
-    - evidence/ : JSON détaillés par run
+    - evidence/ : Flux JSONL + index par session, rapport JSON par run
     - reports/ : Rapports markdown
     - logs/ : Logs texte
     """
     
-    def __init__(self, ai_agents_dir: Path):
+    def __init__(self, ai_agents_dir: Path, compression: Optional[str] = None):
         self.base_dir = ai_agents_dir
         self.evidence_dir = self.base_dir / "evidence"
         self.reports_dir = self.base_dir / "reports"
@@ -31,47 +73,59 @@ class EvidenceLogger:
         for dir_path in [self.evidence_dir, self.reports_dir, self.logs_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        # Compression zstd (optionnelle, nécessite le paquet zstandard)
+        self.compressor = None
+        if compression == 'zstd':
+            if zstandard is None:
+                print("⚠️  zstandard non installé: evidence non compressée")
+            else:
+                self.compressor = zstandard.ZstdCompressor()
+        
         # Session courante
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.session_data = {
+        suffix = '.jsonl.zst' if self.compressor else '.jsonl'
+        self.stream_path = self.evidence_dir / f"session_{self.session_id}{suffix}"
+        self.index_path = self.evidence_dir / f"session_{self.session_id}{INDEX_SUFFIX}"
+        
+        # Index: offsets (octets) des enregistrements du flux
+        self.index = {
             'session_id': self.session_id,
             'start_time': datetime.now().isoformat(),
-            'analysis': [],
-            'fixes': [],
-            'validation': {},
-            'decision': {}
+            'stream': self.stream_path.name,
+            'compression': 'zstd' if self.compressor else None,
+            'analysis': {},
+            'fixes': {},
+            'validation': None,
+            'decision': None
         }
     
     def log_analysis(self, agent_name: str, result: Any):
-        """Enregistre un résultat d'analyse"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'agent': agent_name,
-            'result': asdict(result) if hasattr(result, '__dataclass_fields__') else result
-        }
-        self.session_data['analysis'].append(entry)
+        """Enregistre un résultat d'analyse (en-tête + findings par lots)"""
+        self._log_result('analysis', agent_name, result, 'findings')
         
         # Log aussi en texte
         self._append_log(f"[ANALYSIS] {agent_name}: {result.status} - {len(result.findings)} finding(s)")
     
     def log_fix(self, agent_name: str, result: Any):
-        """Enregistre un résultat de correction"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'agent': agent_name,
-            'result': asdict(result) if hasattr(result, '__dataclass_fields__') else result
-        }
-        self.session_data['fixes'].append(entry)
+        """
+        Enregistre un résultat de correction (en-tête + corrections par lots)
+        
+        Les findings ciblés ne sont pas recopiés: ils figurent déjà dans
+        les enregistrements d'analyse.
+        """
+        self._log_result('fixes', agent_name, result, 'fixes_applied')
         
         # Log aussi en texte
         self._append_log(f"[FIX] {agent_name}: {result.status} - {len(result.fixes_applied)} fix(es)")
     
     def log_validation(self, validation: Dict[str, Any]):
         """Enregistre les résultats de validation"""
-        self.session_data['validation'] = {
+        self.index['validation'] = self._write({
+            'type': 'validation',
             'timestamp': datetime.now().isoformat(),
             'results': validation
-        }
+        })
+        self._save_index()
         
         # Log aussi en texte
         status = "✅ PASS" if validation.get('all_passed') else "❌ FAIL"
@@ -79,7 +133,12 @@ class EvidenceLogger:
     
     def log_decision(self, decision: Dict[str, Any]):
         """Enregistre la décision finale"""
-        self.session_data['decision'] = decision
+        self.index['decision'] = self._write({
+            'type': 'decision',
+            'timestamp': datetime.now().isoformat(),
+            'decision': decision
+        })
+        self._save_index()
         
         # Log aussi en texte
         self._append_log(
@@ -88,6 +147,99 @@ class EvidenceLogger:
             f"Confidence: {decision['confidence']}/100"
         )
     
+    def _log_result(self, section: str, agent_name: str, result: Any, items_field: str):
+        """
+        Écrit l'en-tête d'un résultat d'agent puis ses items par lots
+        
+        Un agent peut être enregistré plusieurs fois (exécution par lots):
+        chaque passage ajoute une entrée à l'index de l'agent.
+        """
+        items = _field(result, items_field) or []
+        header = {
+            'type': section,
+            'timestamp': datetime.now().isoformat(),
+            'agent': agent_name,
+            'status': _field(result, 'status'),
+            'duration_ms': _field(result, 'duration_ms', 0),
+            'errors': _field(result, 'errors') or [],
+            'warnings': _field(result, 'warnings') or [],
+            'metadata': _field(result, 'metadata') or {},
+            'findings_count': len(_field(result, 'findings') or []),
+            'fixes_count': len(_field(result, 'fixes_applied') or [])
+        }
+        entry = {'result': self._write(header), 'batches': []}
+        
+        for start in range(0, len(items), BATCH_SIZE):
+            batch = [_to_jsonable(item) for item in items[start:start + BATCH_SIZE]]
+            offset, length = self._write({
+                'type': items_field,
+                'agent': agent_name,
+                'start': start,
+                'items': batch
+            })
+            entry['batches'].append([offset, length, len(batch)])
+        
+        self.index[section].setdefault(agent_name, []).append(entry)
+        self._save_index()
+    
+    def _write(self, record: Dict[str, Any]) -> Tuple[int, int]:
+        """Ajoute un enregistrement au flux, retourne (offset, longueur) en octets"""
+        data = (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        if self.compressor:
+            data = self.compressor.compress(data)
+        
+        with open(self.stream_path, 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+        return offset, len(data)
+    
+    def _save_index(self):
+        """Réécrit l'index (petit: offsets seulement, écriture atomique)"""
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+    
+    def _report_summary(self, report: Any) -> Dict[str, Any]:
+        """
+        Rapport sans les listes complètes de findings/corrections
+        
+        Chaque résultat garde ses compteurs et SAMPLE_SIZE exemples; le
+        détail complet se relit dans le flux via EvidenceReader.
+        """
+        def summarize(result: Any) -> Dict[str, Any]:
+            findings = _field(result, 'findings') or []
+            fixes = _field(result, 'fixes_applied') or []
+            return {
+                'agent_name': _field(result, 'agent_name'),
+                'agent_type': _field(result, 'agent_type'),
+                'status': _field(result, 'status'),
+                'duration_ms': _field(result, 'duration_ms', 0),
+                'errors': _field(result, 'errors') or [],
+                'warnings': _field(result, 'warnings') or [],
+                'metadata': _field(result, 'metadata') or {},
+                'findings_count': len(findings),
+                'fixes_count': len(fixes),
+                'findings': [_to_jsonable(f) for f in findings[:SAMPLE_SIZE]],
+                'fixes_applied': [_to_jsonable(f) for f in fixes[:SAMPLE_SIZE]]
+            }
+        
+        return {
+            'session_id': self.session_id,
+            'timestamp': _field(report, 'timestamp'),
+            'duration_ms': _field(report, 'duration_ms', 0),
+            'mode': _field(report, 'mode'),
+            'summary': _field(report, 'summary') or {},
+            'decision': _field(report, 'decision') or {},
+            'validation_results': _field(report, 'validation_results') or {},
+            'analysis_results': [summarize(r) for r in _field(report, 'analysis_results') or []],
+            'fix_results': [summarize(r) for r in _field(report, 'fix_results') or []],
+            'evidence': {
+                'stream': self.stream_path.name,
+                'index': self.index_path.name
+            }
+        }
+    
     def save_report(self, report: Any) -> str:
         """
         Sauvegarde le rapport final
@@ -95,13 +247,10 @@ class EvidenceLogger:
         Returns:
             Path du rapport sauvegardé
         """
-        # JSON détaillé
+        # JSON résumé (le détail est déjà dans le flux JSONL)
         json_path = self.evidence_dir / f"session_{self.session_id}.json"
         with open(json_path, 'w', encoding='utf-8') as f:
-            if hasattr(report, '__dataclass_fields__'):
-                json.dump(asdict(report), f, indent=2, ensure_ascii=False)
-            else:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            json.dump(self._report_summary(report), f, indent=2, ensure_ascii=False, default=str)
         
         # Markdown lisible
         md_path = self.reports_dir / f"report_{self.session_id}.md"
@@ -109,15 +258,13 @@ class EvidenceLogger:
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(markdown)
         
-        # Sauvegarder aussi session_data
-        session_path = self.evidence_dir / f"session_{self.session_id}_details.json"
-        with open(session_path, 'w', encoding='utf-8') as f:
-            json.dump(self.session_data, f, indent=2, ensure_ascii=False)
+        self.index['end_time'] = datetime.now().isoformat()
+        self._save_index()
         
         print(f"\n💾 Evidence sauvegardée:")
         print(f"   📄 {json_path}")
         print(f"   📝 {md_path}")
-        print(f"   🔍 {session_path}")
+        print(f"   🔍 {self.stream_path}")
         
         return str(md_path)
     
@@ -131,11 +278,8 @@ class EvidenceLogger:
     def _generate_markdown_report(self, report: Any) -> str:
         """Génère un rapport markdown lisible"""
         
-        # Extraire les données
-        if hasattr(report, '__dataclass_fields__'):
-            data = asdict(report)
-        else:
-            data = report
+        # Résumé du rapport (findings complets dans le flux JSONL)
+        data = self._report_summary(report)
         
         md = "# 🤖 AI Agents - Rapport d'Exécution\n\n"
         
@@ -187,7 +331,7 @@ class EvidenceLogger:
                 md += f"### {status_emoji} {result['agent_name']}\n\n"
                 md += f"- **Status**: {result['status']}\n"
                 md += f"- **Durée**: {result['duration_ms']}ms\n"
-                md += f"- **Findings**: {len(result.get('findings', []))}\n"
+                md += f"- **Findings**: {result['findings_count']}\n"
                 
                 if result.get('errors'):
                     md += f"- **Erreurs**: {len(result['errors'])}\n"
@@ -208,8 +352,8 @@ class EvidenceLogger:
                         else:
                             md += f"{i+1}. {finding}\n"
                     
-                    if len(findings) > 5:
-                        md += f"\n... et {len(findings) - 5} autre(s)\n"
+                    if result['findings_count'] > 5:
+                        md += f"\n... et {result['findings_count'] - 5} autre(s)\n"
                     md += "\n"
         
         # Agents de correction
@@ -221,7 +365,7 @@ class EvidenceLogger:
                 md += f"### {status_emoji} {result['agent_name']}\n\n"
                 md += f"- **Status**: {result['status']}\n"
                 md += f"- **Durée**: {result['duration_ms']}ms\n"
-                md += f"- **Corrections appliquées**: {len(result.get('fixes_applied', []))}\n\n"
+                md += f"- **Corrections appliquées**: {result['fixes_count']}\n\n"
                 
                 # Détails des fixes (limité aux 5 premiers)
                 fixes = result.get('fixes_applied', [])
@@ -235,8 +379,8 @@ class EvidenceLogger:
                         else:
                             md += f"{i+1}. {fix}\n"
                     
-                    if len(fixes) > 5:
-                        md += f"\n... et {len(fixes) - 5} autre(s)\n"
+                    if result['fixes_count'] > 5:
+                        md += f"\n... et {result['fixes_count'] - 5} autre(s)\n"
                     md += "\n"
         
         # Validation
@@ -281,9 +425,9 @@ class EvidenceLogger:
         """
         sessions = []
         
-        # Lister tous les fichiers de session
+        # Lister tous les rapports de session (hors index)
         session_files = sorted(
-            self.evidence_dir.glob("session_*.json"),
+            (p for p in self.evidence_dir.glob("session_*.json") if not p.name.endswith(INDEX_SUFFIX)),
             key=lambda p: p.stat().st_mtime,
             reverse=True
         )
@@ -318,3 +462,89 @@ class EvidenceLogger:
         
         if removed_count > 0:
             print(f"🧹 {removed_count} ancien(s) fichier(s) supprimé(s)")
+
+
+class EvidenceReader:
+    """
+    Relecture d'une session via son index
+    
+    Usage:
+        reader = EvidenceReader.latest(Path('.ai-agents/evidence'))
+        reader.agents()                        # ['a1_security', ...]
+        for finding in reader.iter_findings('a3_duplications'):
+            ...
+    
+    Seuls les enregistrements demandés sont lus (seek + lecture, une
+    frame zstd décompressée par enregistrement).
+    """
+    
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        
+        self.session_id = self.index['session_id']
+        self.stream_path = self.index_path.parent / self.index['stream']
+        self.decompressor = None
+        if self.index.get('compression') == 'zstd':
+            if zstandard is None:
+                raise RuntimeError(f"zstandard requis pour lire {self.stream_path.name}")
+            self.decompressor = zstandard.ZstdDecompressor()
+    
+    @classmethod
+    def open(cls, evidence_dir: Path, session_id: str) -> "EvidenceReader":
+        """Session par identifiant (ex: 20250101_120000)"""
+        return cls(Path(evidence_dir) / f"session_{session_id}{INDEX_SUFFIX}")
+    
+    @classmethod
+    def latest(cls, evidence_dir: Path) -> Optional["EvidenceReader"]:
+        """Session la plus récente (None si aucune)"""
+        indexes = sorted(Path(evidence_dir).glob(f"session_*{INDEX_SUFFIX}"))
+        return cls(indexes[-1]) if indexes else None
+    
+    def agents(self, section: str = 'analysis') -> List[str]:
+        """Agents enregistrés dans une section ('analysis' ou 'fixes')"""
+        return list(self.index[section])
+    
+    def results(self, section: str = 'analysis') -> List[Dict[str, Any]]:
+        """En-têtes des résultats (statut, durée, compteurs), sans les findings"""
+        return [
+            self._read(entry['result'])
+            for entries in self.index[section].values()
+            for entry in entries
+        ]
+    
+    def result(self, agent_name: str, section: str = 'analysis') -> Optional[Dict[str, Any]]:
+        """En-tête du dernier résultat enregistré pour un agent"""
+        entries = self.index[section].get(agent_name)
+        return self._read(entries[-1]['result']) if entries else None
+    
+    def iter_findings(self, agent_name: str, section: str = 'analysis') -> Iterator[Any]:
+        """Findings (ou corrections pour 'fixes') d'un agent, lot par lot"""
+        for entry in self.index[section].get(agent_name, []):
+            for offset, length, _count in entry['batches']:
+                yield from self._read((offset, length))['items']
+    
+    def findings(self, agent_name: str, section: str = 'analysis') -> List[Any]:
+        """Findings d'un agent (liste complète)"""
+        return list(self.iter_findings(agent_name, section))
+    
+    def validation(self) -> Dict[str, Any]:
+        """Résultats de validation (vide si la phase n'a pas eu lieu)"""
+        pointer = self.index.get('validation')
+        return self._read(pointer)['results'] if pointer else {}
+    
+    def decision(self) -> Dict[str, Any]:
+        """Décision finale (vide si la phase n'a pas eu lieu)"""
+        pointer = self.index.get('decision')
+        return self._read(pointer)['decision'] if pointer else {}
+    
+    def _read(self, pointer: Tuple[int, int]) -> Dict[str, Any]:
+        """Lit un enregistrement à partir de son (offset, longueur)"""
+        offset, length = pointer[0], pointer[1]
+        with open(self.stream_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        if self.decompressor:
+            data = self.decompressor.decompress(data)
+        return json.loads(data)
@@ -0,0 +1,188 @@
+"""
+File Index - Inventaire unique des fichiers du workspace
+
+Construit une seule fois par run (un seul parcours du filesystem) puis
+partagé entre tous les agents d'analyse, qui l'interrogent par extension
+ou par glob au lieu de refaire leur propre rglob.
+
+Les dossiers exclus par la config (node_modules, dist, .git...) sont
+élagués pendant le parcours: leurs fichiers ne sont jamais énumérés ni
+présents dans l'index. Les fichiers exclus par pattern (*.test.ts...)
+restent indexés avec `excluded=True` (A11 a besoin des tests).
+"""
+
+import os
+import heapq
+import fnmatch
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .config import Config
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Entrée de l'inventaire"""
+    path: Path
+    rel_path: str  # Relatif au workspace, séparateur '/'
+    ext: str  # Suffixe ('.ts', '.tsx', ...) ou '' si aucun
+    size: int
+    mtime: float
+    excluded: bool  # Verdict des exclusions de la config (chemin relatif)
+
+
+class FileIndex:
+    """
+    Inventaire des fichiers d'un workspace
+
+    Usage:
+        index = FileIndex.build(workspace_root, config)
+        for entry in index.by_extension('.ts', '.tsx'):
+            ...
+
+    Un index scopé (`index.scoped(chemins)`, mode --since/--staged) ne
+    renvoie que les fichiers du périmètre dans ses requêtes; `get()` et
+    `unscoped()` donnent toujours accès à tout le workspace.
+    """
+
+    def __init__(self, root: Path, entries: List[FileEntry]):
+        self.root = root
+        self.entries = entries
+        self.scope: Optional[Set[str]] = None  # Chemins relatifs, None = tout
+        self._full: Optional["FileIndex"] = None
+        # Par extension: (position dans l'index, entrée), pour refusionner en ordre de parcours
+        self._by_ext: Dict[str, List[Tuple[int, FileEntry]]] = {}
+        self._by_rel: Dict[str, FileEntry] = {}
+
+        for position, entry in enumerate(entries):
+            self._by_ext.setdefault(entry.ext, []).append((position, entry))
+            self._by_rel[entry.rel_path] = entry
+
+    @classmethod
+    def build(cls, root: Path, config: Config) -> "FileIndex":
+        """
+        Parcourt le workspace une seule fois et calcule les verdicts d'exclusion
+
+        Ordre déterministe (comme os.walk trié): fichiers d'un dossier par
+        nom, puis ses sous-dossiers par nom. Les liens symboliques vers des
+        dossiers ne sont pas suivis.
+        """
+        root = Path(root)
+        exclusions = config.exclusions
+        entries: List[FileEntry] = []
+        stack = [(str(root), '')]  # (chemin absolu, chemin relatif '' ou 'a/b/')
+
+        while stack:
+            dirpath, rel_dir = stack.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    dir_entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for dir_entry in dir_entries:
+                rel_path = rel_dir + dir_entry.name
+                try:
+                    if dir_entry.is_dir():
+                        # Élagage: jamais de descente dans un dossier exclu
+                        if not dir_entry.is_symlink() and not exclusions.excludes_dir(rel_path):
+                            subdirs.append((dir_entry.path, rel_path + '/'))
+                        continue
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+
+                path = Path(dir_entry.path)
+                entries.append(FileEntry(
+                    path=path,
+                    rel_path=rel_path,
+                    ext=path.suffix,
+                    size=stat.st_size,
+                    mtime=stat.st_mtime,
+                    excluded=exclusions.match(rel_path),
+                ))
+
+            stack.extend(reversed(subdirs))
+
+        return cls(root, entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self.entries)
+
+    def scoped(self, rel_paths: Iterable[str]) -> "FileIndex":
+        """Vue restreinte aux chemins relatifs donnés (qui partage les entrées)"""
+        full = self.unscoped()
+        scope = set(rel_paths)
+        index = FileIndex(full.root, [e for e in full.entries if e.rel_path in scope])
+        index.scope = scope
+        index._full = full
+        return index
+
+    def unscoped(self) -> "FileIndex":
+        """Index complet du workspace (lui-même s'il n'est pas scopé)"""
+        return self._full if self._full is not None else self
+
+    @property
+    def is_scoped(self) -> bool:
+        return self.scope is not None
+
+    def in_scope(self, rel_path: str) -> bool:
+        """Le fichier fait-il partie du périmètre analysé ?"""
+        return self.scope is None or rel_path in self.scope
+
+    def get(self, rel_path: str) -> Optional[FileEntry]:
+        """Retourne l'entrée d'un chemin relatif (ou None), dans tout le workspace"""
+        return self.unscoped()._by_rel.get(rel_path)
+
+    def files(self, include_excluded: bool = True) -> List[FileEntry]:
+        """Tous les fichiers, avec ou sans ceux exclus par la config"""
+        if include_excluded:
+            return list(self.entries)
+        return [e for e in self.entries if not e.excluded]
+
+    def by_extension(self, *extensions: str, include_excluded: bool = True) -> List[FileEntry]:
+        """Fichiers dont le suffixe est dans `extensions` (ordre de l'index)"""
+        if len(extensions) == 1 and not isinstance(extensions[0], str):
+            extensions = tuple(extensions[0])
+
+        buckets = [self._by_ext[ext] for ext in dict.fromkeys(extensions) if ext in self._by_ext]
+        if len(buckets) == 1:
+            entries = [e for _, e in buckets[0]]
+        else:
+            # Positions uniques: le tuple ne compare jamais les FileEntry
+            entries = [e for _, e in heapq.merge(*buckets)]
+        if include_excluded:
+            return entries
+        return [e for e in entries if not e.excluded]
+
+    def glob(self, pattern: str, include_excluded: bool = True) -> List[FileEntry]:
+        """
+        Fichiers dont le chemin relatif matche un glob fnmatch
+        (ex: 'frontend/**/*.tsx'). Un pattern sans '/' matche sur le nom.
+        """
+        if '/' in pattern:
+            entries = [e for e in self.entries if fnmatch.fnmatch(e.rel_path, pattern)]
+        else:
+            entries = [e for e in self.entries if fnmatch.fnmatch(e.path.name, pattern)]
+
+        if include_excluded:
+            return entries
+        return [e for e in entries if not e.excluded]
+
+    def under(self, rel_dir: str, include_excluded: bool = True) -> List[FileEntry]:
+        """Fichiers situés sous un répertoire relatif"""
+        prefix = rel_dir.rstrip('/') + '/'
+        entries = [e for e in self.entries if e.rel_path.startswith(prefix)]
+        if include_excluded:
+            return entries
+        return [e for e in entries if not e.excluded]
+
+    @staticmethod
+    def paths(entries: Iterable[FileEntry]) -> List[Path]:
+        """Raccourci: liste des Path d'une sélection d'entrées"""
+        return [e.path for e in entries]
@@ -0,0 +1,328 @@
+"""
+Git Index - Historique et diff git du workspace, calculés une fois par run
+
+Remplace les appels git dispersés (F15, M1, M7) par deux commandes:
+
+- un seul `git log --numstat` sur la fenêtre d'historique (90 jours):
+  par fichier, la liste des commits (date, correctif ou non, lignes
+  ajoutées/supprimées). Ne dépend que de HEAD: mis en cache sous
+  `.ai-agents/cache/git_index.json`, clé = sha de HEAD. Les fenêtres
+  (30/90 jours) sont appliquées à la lecture, un cache un peu ancien
+  reste donc exact.
+- un seul `git diff -U0` combiné (index ou ref de base): hunks et texte
+  du diff par fichier. Jamais mis en cache (dépend de l'arbre de travail).
+
+Tous les chemins sont relatifs au workspace (`--relative`).
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# Fenêtres d'historique (jours)
+HISTORY_DAYS = 90
+RECENT_DAYS = 30
+
+# Message de commit de correctif (équivalent de `--grep=fix --grep=bug -i`)
+BUG_FIX_RE = re.compile(r'fix|bug', re.IGNORECASE)
+
+# Séparateurs du format de log (enregistrement / champ)
+_RECORD_SEP = '\x1e'
+_FIELD_SEP = '\x1f'
+_LOG_FORMAT = f'--format={_RECORD_SEP}%ct{_FIELD_SEP}%B{_FIELD_SEP}'
+
+_HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@', re.MULTILINE)
+
+# Échappements des chemins cités par git ("a/x\ty", octal pour les octets de contrôle)
+_QUOTED_ESCAPE_RE = re.compile(r'\\([0-7]{3}|.)')
+_QUOTED_ESCAPES = {'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13}
+
+CACHE_VERSION = '1'
+
+
+@dataclass
+class FileHistory:
+    """Historique récent d'un fichier"""
+    commits: int = 0  # Commits sur la fenêtre
+    bug_fixes: int = 0  # Dont commits de correctif
+    lines_added: int = 0
+    lines_deleted: int = 0
+
+    @property
+    def churn(self) -> int:
+        """Lignes ajoutées + supprimées"""
+        return self.lines_added + self.lines_deleted
+
+
+@dataclass
+class Hunk:
+    """Bloc modifié d'un diff (-U0: uniquement les lignes changées)"""
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+
+    @property
+    def modified(self) -> int:
+        """Lignes remplacées (présentes des deux côtés)"""
+        return min(self.old_count, self.new_count)
+
+    @property
+    def added(self) -> int:
+        """Lignes purement ajoutées"""
+        return self.new_count - self.modified
+
+
+@dataclass
+class FileDiff:
+    """Diff d'un fichier"""
+    path: str
+    text: str = ''
+    hunks: List[Hunk] = field(default_factory=list)
+
+
+class GitIndex:
+    """
+    Historique et diff git du workspace
+
+    Usage:
+        index = GitIndex.build(workspace_root, diff_base=None)
+        index.history('backend/src/app.ts', days=30).commits
+        index.diff('backend/src/app.ts').hunks
+    """
+
+    def __init__(
+        self,
+        workspace_root: Path,
+        head: Optional[str],
+        commits: Dict[str, List[Tuple[int, bool, int, int]]],
+        diffs: Dict[str, FileDiff],
+        now: Optional[float] = None
+    ):
+        self.workspace_root = Path(workspace_root)
+        self.head = head
+        self.now = now if now is not None else time.time()
+        # Par fichier: [(timestamp, correctif, ajoutées, supprimées), ...]
+        self._commits = commits
+        self._diffs = diffs
+
+    @classmethod
+    def build(
+        cls,
+        workspace_root: Path,
+        diff_base: Optional[str] = None,
+        use_cache: bool = True
+    ) -> "GitIndex":
+        """
+        Construit l'index (2 commandes git, historique depuis le cache si HEAD est inchangé)
+
+        Args:
+            workspace_root: Racine du workspace (dans un dépôt git)
+            diff_base: Ref git du diff (None = index vs HEAD, `--cached`)
+            use_cache: Lire/écrire l'historique dans .ai-agents/cache
+        """
+        workspace_root = Path(workspace_root)
+        head = _git(workspace_root, 'rev-parse', 'HEAD')
+        head = head.strip() if head else None
+
+        cache_path = workspace_root / '.ai-agents' / 'cache' / 'git_index.json'
+        commits = _load_history(cache_path, head) if use_cache and head else None
+        if commits is None:
+            commits = _read_history(workspace_root)
+            if use_cache and head:
+                _save_history(cache_path, head, commits)
+
+        diffs = _read_diff(workspace_root, diff_base)
+        return cls(workspace_root, head, commits, diffs)
+
+    def relative(self, path: Union[str, Path]) -> str:
+        """Chemin relatif au workspace (séparateurs POSIX)"""
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.workspace_root)
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    def history(self, path: Union[str, Path], days: int = HISTORY_DAYS) -> FileHistory:
+        """Commits, correctifs et churn d'un fichier sur les `days` derniers jours"""
+        since = self.now - days * 86400
+        result = FileHistory()
+        for timestamp, bug_fix, added, deleted in self._commits.get(self.relative(path), ()):
+            if timestamp < since:
+                continue
+            result.commits += 1
+            result.bug_fixes += bug_fix
+            result.lines_added += added
+            result.lines_deleted += deleted
+        return result
+
+    def diff(self, path: Union[str, Path]) -> FileDiff:
+        """Diff d'un fichier (vide s'il n'est pas modifié)"""
+        rel_path = self.relative(path)
+        return self._diffs.get(rel_path) or FileDiff(rel_path)
+
+    @property
+    def changed_files(self) -> List[str]:
+        """Fichiers présents dans le diff"""
+        return sorted(self._diffs)
+
+
+def _git(workspace_root: Path, *args: str) -> Optional[str]:
+    """Sortie d'une commande git (None si git échoue ou est absent)"""
+    try:
+        return subprocess.check_output(
+            ['git', '-c', 'core.quotePath=false', *args],
+            cwd=workspace_root,
+            text=True,
+            errors='replace',
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _read_history(workspace_root: Path) -> Dict[str, List[Tuple[int, bool, int, int]]]:
+    """Un seul `git log --numstat` sur la fenêtre d'historique"""
+    output = _git(
+        workspace_root, 'log', f'--since={HISTORY_DAYS} days ago',
+        '--no-renames', '--numstat', '--relative', _LOG_FORMAT
+    )
+    commits: Dict[str, List[Tuple[int, bool, int, int]]] = {}
+    if not output:
+        return commits
+
+    for record in output.split(_RECORD_SEP)[1:]:
+        timestamp, message, numstat = record.split(_FIELD_SEP, 2)
+        bug_fix = BUG_FIX_RE.search(message) is not None
+        for line in numstat.splitlines():
+            parts = line.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            # Fichiers binaires: "-\t-\tchemin"
+            added = int(parts[0]) if parts[0].isdigit() else 0
+            deleted = int(parts[1]) if parts[1].isdigit() else 0
+            commits.setdefault(_unquote_path(parts[2]), []).append((int(timestamp), bug_fix, added, deleted))
+
+    return commits
+
+
+def _read_diff(workspace_root: Path, diff_base: Optional[str]) -> Dict[str, FileDiff]:
+    """Un seul `git diff -U0` combiné, découpé par fichier"""
+    output = _git(
+        workspace_root, 'diff', '-U0', '--no-renames', '--no-color', '--relative',
+        diff_base if diff_base else '--cached'
+    )
+    diffs: Dict[str, FileDiff] = {}
+    if not output:
+        return diffs
+
+    for section in re.split(r'^(?=diff --git )', output, flags=re.MULTILINE):
+        path = _diff_path(section)
+        if path is None:
+            continue
+        hunks = [
+            Hunk(
+                old_start=int(m.group(1)),
+                old_count=int(m.group(2)) if m.group(2) is not None else 1,
+                new_start=int(m.group(3)),
+                new_count=int(m.group(4)) if m.group(4) is not None else 1,
+            )
+            for m in _HUNK_RE.finditer(section)
+        ]
+        diffs[path] = FileDiff(path, section, hunks)
+
+    return diffs
+
+
+def _unquote_path(path: str) -> str:
+    """Chemin tel qu'affiché par git, sans guillemets ni échappements C (`"a\\tb"` -> a<TAB>b)"""
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    raw = bytearray()
+    pos = 0
+    inner = path[1:-1]
+    for m in _QUOTED_ESCAPE_RE.finditer(inner):
+        raw += inner[pos:m.start()].encode('utf-8')
+        code = m.group(1)
+        if len(code) == 3:
+            raw.append(int(code, 8))
+        elif code in _QUOTED_ESCAPES:
+            raw.append(_QUOTED_ESCAPES[code])
+        else:
+            raw += code.encode('utf-8')  # \" et \\
+        pos = m.end()
+    raw += inner[pos:].encode('utf-8')
+    return raw.decode('utf-8', errors='replace')
+
+
+def _diff_path(section: str) -> Optional[str]:
+    """
+    Chemin d'une section de diff (côté `+++ b/`, ou `--- a/` si supprimé)
+
+    git termine la ligne par une tabulation quand le chemin contient une
+    espace, et cite (guillemets + échappements) les chemins spéciaux. Sans
+    lignes ---/+++ (fichier binaire), repli sur l'en-tête `diff --git a/P b/P`
+    (symétrique: pas de renommage avec --no-renames).
+    """
+    old_path = None
+    header_path = None
+    for line in section.splitlines():
+        if line.startswith('@@'):
+            break
+        if line.startswith('diff --git '):
+            header_path = _header_path(line[11:])
+        if line.startswith('--- ') or line.startswith('+++ '):
+            value = line[4:]
+            if value.endswith('\t'):
+                value = value[:-1]
+            value = _unquote_path(value)
+            if line.startswith('+++ ') and value.startswith('b/'):
+                return value[2:]
+            if line.startswith('--- ') and value.startswith('a/'):
+                old_path = value[2:]
+    return old_path or header_path
+
+
+def _header_path(rest: str) -> Optional[str]:
+    """Chemin de `a/P b/P` (en-tête diff --git, éventuellement cité)"""
+    if rest.startswith('"'):
+        m = re.match(r'^("a/(?:[^"\\]|\\.)*") "b/', rest)
+        return _unquote_path(m.group(1))[2:] if m else None
+    half = (len(rest) - 1) // 2
+    old, new = rest[:half], rest[half + 1:]
+    if old.startswith('a/') and new.startswith('b/') and old[2:] == new[2:]:
+        return old[2:]
+    return None
+
+
+def _load_history(cache_path: Path, head: str) -> Optional[Dict[str, List[Tuple[int, bool, int, int]]]]:
+    """Historique en cache s'il a été calculé pour ce HEAD"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION or data.get('head') != head:
+        return None
+    return {path: [tuple(entry) for entry in entries] for path, entries in data.get('files', {}).items()}
+
+
+def _save_history(cache_path: Path, head: str, commits: Dict[str, List[Tuple[int, bool, int, int]]]):
+    """Écrit l'historique (écriture atomique)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'head': head, 'files': commits}, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,314 @@
+"""
+Import Graph - Graphe des imports JS/TS du workspace
+
+Résout les imports vers les fichiers de l'index: chemins relatifs
+('./x', '../y'), alias `paths` des tsconfig.json ('~/*', '@common/*'...),
+`baseUrl` et packages du monorepo (nom du package.json). Le graphe est
+indexé dans les deux sens: imports d'un fichier et fichiers qui
+l'importent (dépendants).
+
+Utilisé par A4 (fichiers inatteignables depuis les points d'entrée), par
+le mode scopé (--since/--staged) pour étendre un ensemble de fichiers
+modifiés d'un niveau, et par M1 (dépendants des fichiers cassés).
+"""
+
+import re
+import json
+import posixpath
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .content_store import ContentStore
+from .file_index import FileEntry, FileIndex
+
+
+# import ... from / export ... from (multi-lignes), import(), require(), import 'x'
+IMPORT_RE = re.compile(
+    r'\b(?:import|export)\s+[\w$*{}\s,]*?\s*from\s*[\'"]([^\'"]+)[\'"]'
+    r'|\bimport\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
+    r'|\brequire\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
+    r'|\bimport\s+[\'"]([^\'"]+)[\'"]'
+)
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+# Commentaires JSONC (tsconfig.json), sans toucher aux chaînes ("./app/*")
+_JSONC_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_JSONC_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+
+def extract_imports(code: str) -> Set[str]:
+    """Specifiers importés par un fichier (code sans commentaires de préférence)"""
+    imports = set()
+    for match in IMPORT_RE.finditer(code):
+        imports.add(next(group for group in match.groups() if group is not None))
+    return imports
+
+
+def _load_jsonc(text: str) -> dict:
+    """Parse un JSON avec commentaires et virgules finales (format tsconfig)"""
+    text = _JSONC_COMMENT_RE.sub(lambda m: m.group(1) or '', text)
+    return json.loads(_JSONC_TRAILING_COMMA_RE.sub(r'\1', text))
+
+
+def _join(*parts: str) -> str:
+    """Jointure normalisée de chemins relatifs au workspace ('' = racine)"""
+    path = posixpath.normpath(posixpath.join(*parts))
+    return '' if path == '.' else path
+
+
+class ModuleResolver:
+    """
+    Résout un specifier d'import vers un fichier de l'index (chemin relatif)
+
+    Les packages npm externes ne sont pas résolus (None).
+    """
+
+    def __init__(self, index: FileIndex, store: Optional[ContentStore] = None):
+        self.index = index.unscoped()
+        self.store = store or ContentStore()
+        # Dossier -> (dossier de base, [(préfixe, suffixe, cibles)]) du tsconfig le plus proche
+        self._tsconfig_by_dir: Dict[str, Optional[Tuple[str, List[Tuple[str, Optional[str], List[str]]]]]] = {}
+        self.packages = self._load_workspace_packages()
+
+    def resolve(self, importer: str, specifier: str) -> Optional[str]:
+        """Chemin relatif du fichier importé, ou None si externe / introuvable"""
+        if specifier.startswith('.'):
+            return self._resolve_path(_join(posixpath.dirname(importer), specifier))
+
+        tsconfig = self._tsconfig_for(posixpath.dirname(importer))
+        if tsconfig is not None:
+            base_dir, patterns = tsconfig
+            for prefix, suffix, targets in patterns:
+                if suffix is None:
+                    # Alias exact (sans '*')
+                    if specifier != prefix:
+                        continue
+                    star = ''
+                elif (specifier.startswith(prefix) and specifier.endswith(suffix)
+                        and len(specifier) >= len(prefix) + len(suffix)):
+                    star = specifier[len(prefix):len(specifier) - len(suffix)]
+                else:
+                    continue
+                for target in targets:
+                    resolved = self._resolve_path(_join(base_dir, target.replace('*', star, 1)))
+                    if resolved is not None:
+                        return resolved
+
+        return self._resolve_package(specifier)
+
+    def _resolve_path(self, base: str) -> Optional[str]:
+        """Essaie le chemin tel quel, avec extension, puis comme dossier (index.*)"""
+        candidates = [base]
+        stem, ext = posixpath.splitext(base)
+        if ext in ('.js', '.jsx', '.mjs', '.cjs'):
+            # Imports ESM de TypeScript: './x.js' désigne './x.ts'
+            candidates.extend([stem + '.ts', stem + '.tsx'])
+        candidates.extend(base + ext for ext in SOURCE_EXTENSIONS)
+        candidates.extend(f"{base}/index{ext}" for ext in SOURCE_EXTENSIONS)
+
+        for candidate in candidates:
+            if self.index.get(candidate) is not None:
+                return candidate
+
+        return None
+
+    def _resolve_package(self, specifier: str) -> Optional[str]:
+        """Package du monorepo ('@repo/x', '@repo/x/sub') vers ses sources"""
+        parts = specifier.split('/')
+        name_length = 2 if specifier.startswith('@') else 1
+        name = '/'.join(parts[:name_length])
+        package = self.packages.get(name)
+        if package is None:
+            return None
+
+        package_dir, main = package
+        subpath = '/'.join(parts[name_length:])
+        if subpath:
+            bases = [_join(package_dir, subpath), _join(package_dir, 'src', subpath)]
+        else:
+            bases = [_join(package_dir, main)] if main else []
+            bases.extend([_join(package_dir, 'src', 'index'), _join(package_dir, 'index')])
+
+        for base in bases:
+            resolved = self._resolve_path(base)
+            if resolved is not None:
+                return resolved
+
+        return None
+
+    def _load_workspace_packages(self) -> Dict[str, Tuple[str, str]]:
+        """Nom -> (dossier, point d'entrée) des package.json du workspace (hors exclus)"""
+        packages = {}
+        for entry in self.index.by_extension('.json', include_excluded=False):
+            if entry.path.name != 'package.json':
+                continue
+            try:
+                data = json.loads(self.store.read_text(entry.path))
+            except (OSError, ValueError):
+                continue
+            name = data.get('name') if isinstance(data, dict) else None
+            if isinstance(name, str) and name not in packages:
+                main = data.get('types') or data.get('main') or ''
+                packages[name] = (posixpath.dirname(entry.rel_path), main if isinstance(main, str) else '')
+        return packages
+
+    def _tsconfig_for(self, rel_dir: str):
+        """Alias du tsconfig.json le plus proche (dossier courant puis parents)"""
+        if rel_dir in self._tsconfig_by_dir:
+            return self._tsconfig_by_dir[rel_dir]
+
+        entry = self.index.get(_join(rel_dir, 'tsconfig.json'))
+        if entry is not None:
+            result = self._load_tsconfig(entry)
+        elif rel_dir:
+            result = self._tsconfig_for(posixpath.dirname(rel_dir))
+        else:
+            result = None
+
+        self._tsconfig_by_dir[rel_dir] = result
+        return result
+
+    def _load_tsconfig(self, entry: FileEntry, depth: int = 0):
+        """
+        Lit `baseUrl` et `paths` d'un tsconfig (en suivant `extends` relatif)
+
+        Returns:
+            (dossier de base, [(préfixe, suffixe, cibles)]) trié par préfixe
+            le plus long (règle TypeScript), ou None sans alias. Le suffixe
+            vaut None pour un alias exact (sans '*').
+        """
+        try:
+            data = _load_jsonc(self.store.read_text(entry.path))
+        except (OSError, ValueError):
+            return None
+
+        config_dir = posixpath.dirname(entry.rel_path)
+        inherited = None
+        extends = data.get('extends')
+        if isinstance(extends, str) and extends.startswith('.') and depth < 5:
+            parent = self.index.get(_join(config_dir, extends))
+            if parent is None and not extends.endswith('.json'):
+                parent = self.index.get(_join(config_dir, extends + '.json'))
+            if parent is not None:
+                inherited = self._load_tsconfig(parent, depth + 1)
+
+        options = data.get('compilerOptions') or {}
+        paths = options.get('paths')
+        base_url = options.get('baseUrl')
+        if not isinstance(paths, dict):
+            if base_url is None:
+                return inherited
+            paths = {'*': ['*']}
+
+        base_dir = _join(config_dir, base_url) if isinstance(base_url, str) else config_dir
+        patterns = []
+        for pattern, targets in paths.items():
+            if isinstance(targets, str):
+                targets = [targets]
+            prefix, star, suffix = pattern.partition('*')
+            patterns.append((prefix, suffix if star else None, [t for t in targets if isinstance(t, str)]))
+
+        patterns.sort(key=lambda p: len(p[0]), reverse=True)
+        return base_dir, patterns
+
+
+class ImportGraph:
+    """
+    Graphe d'imports (chemins relatifs au workspace, séparateur '/')
+
+    Usage:
+        graph = ImportGraph.build(index, store)
+        graph.dependents({'frontend/app/utils/api.ts'})
+        graph.reachable({'frontend/app/root.tsx'})
+    """
+
+    def __init__(self):
+        self.imports: Dict[str, Set[str]] = {}
+        self.importers: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        index: FileIndex,
+        store: Optional[ContentStore] = None,
+        specifiers: Optional[Callable[[FileEntry], Iterable[str]]] = None,
+    ) -> "ImportGraph":
+        """
+        Construit le graphe sur tous les fichiers sources de l'index (hors exclus)
+
+        Args:
+            specifiers: Specifiers importés par un fichier (défaut: extraits
+                du code via IMPORT_RE), permet à A4 de passer par son cache
+        """
+        index = index.unscoped()
+        store = store or ContentStore()
+        resolver = ModuleResolver(index, store)
+        graph = cls()
+
+        for entry in index.by_extension(SOURCE_EXTENSIONS, include_excluded=False):
+            if specifiers is not None:
+                imported = specifiers(entry)
+            else:
+                try:
+                    imported = extract_imports(store.get(entry.path).code)
+                except OSError:
+                    continue
+
+            targets = set()
+            for specifier in imported:
+                target = resolver.resolve(entry.rel_path, specifier)
+                if target is not None and target != entry.rel_path:
+                    targets.add(target)
+
+            graph.add(entry.rel_path, targets)
+
+        return graph
+
+    def add(self, importer: str, targets: Iterable[str]):
+        """Enregistre les imports (résolus) d'un fichier"""
+        targets = set(targets)
+        self.imports[importer] = targets
+        for target in targets:
+            self.importers.setdefault(target, set()).add(importer)
+
+    def dependents(self, rel_paths: Iterable[str]) -> Set[str]:
+        """Fichiers qui importent directement l'un des fichiers donnés"""
+        result: Set[str] = set()
+        for rel_path in rel_paths:
+            result.update(self.importers.get(rel_path, ()))
+        return result
+
+    def dependencies(self, rel_paths: Iterable[str]) -> Set[str]:
+        """Fichiers importés directement par l'un des fichiers donnés"""
+        result: Set[str] = set()
+        for rel_path in rel_paths:
+            result.update(self.imports.get(rel_path, ()))
+        return result
+
+    def reachable(self, roots: Iterable[str]) -> Set[str]:
+        """Fichiers atteignables depuis `roots` (parcours en largeur, roots inclus)"""
+        seen = set(roots)
+        queue = deque(seen)
+        while queue:
+            for target in self.imports.get(queue.popleft(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def expand(self, rel_paths: Iterable[str], reverse: bool = True, forward: bool = False) -> List[str]:
+        """
+        Étend un ensemble de fichiers d'un niveau dans le graphe
+
+        Args:
+            reverse: Ajouter les dépendants (fichiers qui les importent)
+            forward: Ajouter les dépendances (fichiers qu'ils importent)
+        """
+        rel_paths = set(rel_paths)
+        result = set(rel_paths)
+        if reverse:
+            result |= self.dependents(rel_paths)
+        if forward:
+            result |= self.dependencies(rel_paths)
+        return sorted(result)
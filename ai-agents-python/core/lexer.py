@@ -0,0 +1,740 @@
+"""
+Lexer - Arbre des fonctions d'un fichier TS/TSX/JS ou Python en une passe
+
+Un lexer par langage découpe le texte en tokens en sautant chaînes,
+template literals (avec leurs `${...}` imbriqués), regex littérales et
+commentaires, et apparie les accolades/parenthèses au passage. Une seule
+passe sur les tokens construit ensuite l'arbre des fonctions (fonctions,
+méthodes, arrow functions, def) et calcule pour chaque nœud, sans
+re-parcourir son corps:
+
+- complexité cyclomatique (1 + points de décision)
+- complexité cognitive (structures pénalisées par leur nidification)
+- profondeur de nidification des blocs de contrôle
+- nombre de paramètres
+
+Les métriques d'une fonction imbriquée (callback, closure) sont comptées
+dans son propre nœud, pas dans celui de la fonction qui la contient.
+
+Limite connue: le texte JSX n'est pas analysé comme tel. Les apostrophes
+dans un mot (d'un, l'État) sont ignorées, mais un '/*' dans du texte JSX
+ouvre toujours un commentaire.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+LANGUAGES = {
+    '.ts': 'script',
+    '.tsx': 'script',
+    '.js': 'script',
+    '.jsx': 'script',
+    '.mjs': 'script',
+    '.cjs': 'script',
+    '.py': 'python',
+}
+
+ANONYMOUS = '<anonymous>'
+
+# Lexer JS/TS: un token par appel à match(), positionné sur le texte
+# (blancs et commentaires sautés dans le même match que le token suivant)
+_SCRIPT_TOKEN_RE = re.compile(
+    r'(?:\s+|//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))*'
+    r'(?:(?P<str>\'(?:[^\'\\\n]|\\[\s\S])*\'?|"(?:[^"\\\n]|\\[\s\S])*"?)'
+    r'|(?P<name>[^\W\d][\w$]*|\$[\w$]*)'
+    r'|(?P<num>\d[\w.]*|\.\d\w*)'
+    r'|(?P<op>=>|\?\?|\?\.(?!\d)|&&|\|\||\.\.\.|[\s\S])'
+    r'|(?P<end>\Z))'
+)
+_NEWLINE_RE = re.compile(r'\n')
+_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+_REGEX_LITERAL_RE = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*')
+
+# Tokens après lesquels un '/' ouvre une regex (sinon c'est une division)
+_REGEX_PREFIX = {
+    '(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';', '+', '-', '*',
+    '%', '>', '~', '^', '=>', '&&', '||', '??', '...',
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'yield', 'await', 'instanceof',
+}
+
+_OPENERS = {'(', '[', '{'}
+_CLOSERS = {')', ']', '}'}
+
+# Identifiants suivis de '(' qui ne sont pas des méthodes
+_NOT_METHODS = {
+    'if', 'for', 'while', 'switch', 'catch', 'with', 'return', 'function',
+    'typeof', 'await', 'yield', 'new', 'delete', 'void', 'throw', 'super',
+    'import', 'in', 'of', 'instanceof', 'case', 'do', 'else',
+}
+
+# Mots-clés qui terminent une arrow function à corps expression (ASI)
+_STATEMENT_STARTS = {
+    'const', 'let', 'var', 'function', 'class', 'export', 'import', 'return',
+    'if', 'for', 'while', 'do', 'switch', 'try', 'throw', 'interface', 'type',
+}
+
+_SCRIPT_SPECIAL = {
+    'if', 'else', 'for', 'while', 'do', 'switch', 'case', 'catch',
+    '?', '&&', '||', '??',
+}
+_DEFINITION_NEXT = {'(', '<', '=>'}  # Token suivant le nom d'une méthode / d'un paramètre
+_LOGICAL_RESET = {'(', ')', ';', '{', '}', ',', '?', ':'}
+
+# Annotation de type: un '{' après ces tokens est un type littéral, pas un corps
+_TYPE_JOINERS = {':', '|', '&', '<', ',', '(', '['}
+_TYPE_SCAN_LIMIT = 200
+_TYPE_STOP = {'{', '=>', ';', ',', '=', ')', ']', '}'}
+
+# Lexer Python
+_PYTHON_TOKEN_RE = re.compile(
+    r'(?P<ws>[ \t\f]+|\\\r?\n)'
+    r'|(?P<nl>\r?\n)'
+    r'|(?P<comment>#[^\n]*)'
+    r'|(?P<str>(?:[rRbBuUfF]{1,2})?(?:\'\'\'[\s\S]*?(?:\'\'\'|\Z)|"""[\s\S]*?(?:"""|\Z)'
+    r'|\'(?:[^\'\\\n]|\\[\s\S])*\'?|"(?:[^"\\\n]|\\[\s\S])*"?))'
+    r'|(?P<name>[^\W\d]\w*)'
+    r'|(?P<num>\d[\w.]*|\.\d\w*)'
+    r'|(?P<op>->|\*\*|//|:=|[<>!=]=|[\s\S])'
+)
+
+# Instructions composées: (cyclomatique, cognitive avec nidification, cognitive plate, bloc nidifiant)
+_PYTHON_COMPOUND = {
+    'if': (1, True, 0, True),
+    'elif': (1, False, 1, True),
+    'else': (0, False, 1, True),
+    'for': (1, True, 0, True),
+    'while': (1, True, 0, True),
+    'except': (1, True, 0, True),
+    'match': (0, True, 0, True),
+    'case': (1, False, 0, False),
+    'try': (0, False, 0, False),
+    'finally': (0, False, 0, False),
+    'with': (0, False, 0, False),
+}
+_PYTHON_SOFT_KEYWORDS = {'match', 'case'}
+
+
+@dataclass
+class FunctionSpan:
+    """Fonction détectée et ses métriques (lignes 1-based, bornes incluses)"""
+    name: str
+    start_line: int
+    end_line: int = 0
+    params: int = 0
+    cyclomatic: int = 1
+    cognitive: int = 0
+    nesting: int = 0  # Profondeur max des blocs de contrôle dans le corps
+    children: List["FunctionSpan"] = field(default_factory=list)
+
+    def walk(self) -> Iterator["FunctionSpan"]:
+        """Ce nœud puis ses descendants (préordre)"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def language_for(suffix: str) -> Optional[str]:
+    """Langage ('script' ou 'python') d'une extension, None si non supportée"""
+    return LANGUAGES.get(suffix.lower())
+
+
+def scan_functions(text: str, language: str) -> List[FunctionSpan]:
+    """
+    Arbre des fonctions d'un texte (fonctions de premier niveau)
+
+    Args:
+        language: 'script' (TS/TSX/JS/JSX) ou 'python', voir language_for()
+    """
+    if language == 'python':
+        return _scan_python(text)
+    if language == 'script':
+        return _scan_script(text)
+    raise ValueError(f"Langage non supporté: {language}")
+
+
+def iter_functions(spans: Iterable[FunctionSpan]) -> Iterator[FunctionSpan]:
+    """Tous les nœuds d'un arbre de fonctions (préordre)"""
+    for span in spans:
+        yield from span.walk()
+
+
+class _Frame:
+    """Fonction JS/TS ouverte pendant la passe"""
+
+    __slots__ = ('span', 'end', 'arrow', 'expr_depth', 'control_base', 'last_logical')
+
+    def __init__(self, span: FunctionSpan, end: Optional[int], arrow: int, expr_depth: Optional[int], control_base: int):
+        self.span = span
+        self.end = end  # Index du '}' fermant le corps (None: corps expression)
+        self.arrow = arrow  # Index du '=>' (-1 si pas d'arrow)
+        self.expr_depth = expr_depth  # Profondeur de parenthésage du corps expression
+        self.control_base = control_base
+        self.last_logical: Optional[str] = None
+
+
+def _lex_script(text: str) -> Tuple[List[str], List[int], Dict[int, int]]:
+    """
+    Tokens significatifs d'un fichier JS/TS
+
+    Returns:
+        (tokens, offsets, match) où match[i] est l'index du token appairé
+        pour ( [ { et ) ] } (len(tokens) si non fermé). Chaînes, templates
+        et regex deviennent un token '"', les nombres '0'.
+    """
+    tokens: List[str] = []
+    starts: List[int] = []
+    match: Dict[int, int] = {}
+    opens: List[int] = []
+    templates: List[int] = []  # Profondeur de `opens` à l'ouverture de chaque ${
+    length = len(text)
+    finditer = _SCRIPT_TOKEN_RE.finditer
+
+    def template(pos: int) -> int:
+        """Lit un morceau de template literal; retourne la position après ` ou ${"""
+        end = _TEMPLATE_CHUNK_RE.match(text, pos).end()
+        if text.startswith('${', end):
+            opens.append(len(tokens))
+            templates.append(len(opens))
+            tokens.append('{')
+            starts.append(end)
+            return end + 2
+        return min(end + 1, length)
+
+    pos: Optional[int] = 0
+    while pos is not None:
+        # finditer tant qu'aucun token ne demande de repositionner le scan
+        resume = None
+        for m in finditer(text, pos):
+            kind = m.lastgroup
+            if kind == 'name':
+                tokens.append(m.group(kind))
+                starts.append(m.start(kind))
+                continue
+
+            if kind == 'op':
+                tok = m.group(kind)
+                start = m.start(kind)
+                if tok in _OPENERS:
+                    opens.append(len(tokens))
+                elif tok in _CLOSERS:
+                    if templates and templates[-1] == len(opens) and tok == '}':
+                        # Fin d'un ${...}: retour dans le template literal
+                        templates.pop()
+                        index = len(tokens)
+                        match[index] = opens[-1]
+                        match[opens.pop()] = index
+                        tokens.append(tok)
+                        starts.append(start)
+                        resume = template(start + 1)
+                        break
+                    if opens and (not templates or templates[-1] < len(opens)):
+                        index = len(tokens)
+                        match[index] = opens[-1]
+                        match[opens.pop()] = index
+                elif tok == '`':
+                    tokens.append('"')
+                    starts.append(start)
+                    resume = template(start + 1)
+                    break
+                elif tok == '/' and (not tokens or tokens[-1] in _REGEX_PREFIX):
+                    regex = _REGEX_LITERAL_RE.match(text, start)
+                    if regex is not None:
+                        tokens.append('"')
+                        starts.append(start)
+                        resume = regex.end()
+                        break
+                tokens.append(tok)
+                starts.append(start)
+                continue
+
+            if kind == 'str':
+                start = m.start(kind)
+                if start and text[start - 1].isalnum():
+                    # Apostrophe dans un texte JSX (d'un, l'État): jamais une chaîne en JS
+                    resume = start + 1
+                    break
+                tokens.append('"')
+                starts.append(start)
+            elif kind == 'num':
+                tokens.append('0')
+                starts.append(m.start(kind))
+        pos = resume
+
+    count = len(tokens)
+    for index in opens:
+        match[index] = count
+
+    return tokens, starts, match
+
+
+def _is_name(tok: str) -> bool:
+    """Identifiant (les littéraux sont '"' et '0')"""
+    return tok[0].isalpha() or tok[0] in '_$'
+
+
+def _skip_generics(tokens: List[str], j: int) -> int:
+    """Saute un '<...>' de paramètres de type, retourne l'index suivant"""
+    if j >= len(tokens) or tokens[j] != '<':
+        return j
+    angle = 0
+    limit = min(len(tokens), j + _TYPE_SCAN_LIMIT)
+    while j < limit:
+        tok = tokens[j]
+        if tok == '<':
+            angle += 1
+        elif tok == '>':
+            angle -= 1
+            if angle == 0:
+                return j + 1
+        elif tok in _TYPE_STOP and tok != ',':
+            break
+        j += 1
+    return j
+
+
+def _skip_type(tokens: List[str], match: Dict[int, int], j: int) -> int:
+    """Saute une annotation de type de retour, retourne l'index du token qui la suit"""
+    count = len(tokens)
+    start = j
+    angle = 0
+    limit = min(count, j + _TYPE_SCAN_LIMIT)
+    while j < limit:
+        tok = tokens[j]
+        if tok == '(' or tok == '[' or (tok == '{' and (angle or j == start or tokens[j - 1] in _TYPE_JOINERS)):
+            j = match[j] + 1
+            continue
+        if tok == '<':
+            angle += 1
+        elif tok == '>' and angle:
+            angle -= 1
+        elif angle == 0 and tok in _TYPE_STOP:
+            break
+        j += 1
+    return j
+
+
+def _signature_end(tokens: List[str], match: Dict[int, int], j: int) -> Optional[Tuple[int, bool]]:
+    """
+    Après la ')' des paramètres: (index du '{' du corps, False) ou
+    (index du '=>', True), None si ce n'est pas une définition de fonction
+    """
+    count = len(tokens)
+    if j < count and tokens[j] == ':':
+        j = _skip_type(tokens, match, j + 1)
+    if j < count:
+        if tokens[j] == '{':
+            return j, False
+        if tokens[j] == '=>':
+            return j, True
+    return None
+
+
+def _count_params(tokens: List[str], match: Dict[int, int], open_index: int, skip_first: Iterable[str] = ()) -> int:
+    """Paramètres d'un groupe '(...)': virgules de premier niveau (hors génériques)"""
+    close = min(match[open_index], len(tokens))
+    j = open_index + 1
+    if j >= close:
+        return 0
+    if tokens[j] in skip_first:
+        j += 1
+        while j < close and tokens[j] != ',':
+            j = match[j] + 1 if tokens[j] in _OPENERS else j + 1
+        j += 1
+        if j >= close:
+            return 0
+
+    count = 1
+    angle = 0
+    last = None
+    while j < close:
+        tok = tokens[j]
+        if tok in _OPENERS:
+            j = match[j]
+        elif tok == '<':
+            angle += 1
+        elif tok == '>' and angle:
+            angle -= 1
+        elif tok == ',' and not angle:
+            count += 1
+        last = tok
+        j += 1
+    if last == ',':
+        count -= 1  # Virgule finale
+    return count
+
+
+def _skip_generics_back(tokens: List[str], j: int) -> int:
+    """Depuis le '>' fermant d'un '<...>', retourne l'index qui précède le '<' (j si non équilibré)"""
+    angle = 0
+    k = j
+    while k >= max(0, j - _TYPE_SCAN_LIMIT):
+        angle += {'>': 1, '<': -1}.get(tokens[k], 0)
+        k -= 1
+        if angle == 0:
+            return k
+    return j
+
+
+def _script_name(tokens: List[str], start: int, opens: List[int]) -> str:
+    """Nom d'une fonction anonyme d'après son contexte (const x =, clé:, callback)"""
+    j = start - 1
+    if j >= 0 and tokens[j] == '>':
+        # Arrow générique: const f = <T,>(x: T) => ...
+        j = _skip_generics_back(tokens, j)
+    if j >= 0 and tokens[j] == 'async':
+        j -= 1
+    if j < 0:
+        return ANONYMOUS
+
+    prev = tokens[j]
+    if prev == '=':
+        # const x: Type = ... -> x
+        for k in range(j - 1, max(0, j - 12), -1):
+            if tokens[k - 1] in ('const', 'let', 'var'):
+                return tokens[k]
+        if j >= 1 and _is_name(tokens[j - 1]):
+            return tokens[j - 1]
+    elif prev == ':' and j >= 1 and _is_name(tokens[j - 1]):
+        return tokens[j - 1]
+    elif prev == 'default':
+        return 'default'
+    elif (prev == '(' or prev == ',') and opens:
+        call = opens[-1]
+        if tokens[call] == '(':
+            callee = call - 1
+            if callee >= 0 and tokens[callee] == '>':
+                # forwardRef<A, B>(...)
+                callee = _skip_generics_back(tokens, callee)
+            if callee >= 0 and _is_name(tokens[callee]):
+                return f"{tokens[callee]}(callback)"
+
+    return ANONYMOUS
+
+
+def _scan_script(text: str) -> List[FunctionSpan]:
+    """Passe unique sur les tokens JS/TS: arbre des fonctions + métriques"""
+    tokens, starts, match = _lex_script(text)
+    newlines = [m.start() for m in _NEWLINE_RE.finditer(text)]
+
+    def line_of(index: int) -> int:
+        return bisect_right(newlines, starts[index]) + 1
+
+    count = len(tokens)
+    roots: List[FunctionSpan] = []
+    frames: List[_Frame] = []
+    opens: List[int] = []  # Index des ( [ { ouverts
+    control_braces: Set[int] = set()  # '{' ouvrant un bloc de contrôle
+    control_ends: List[int] = []  # '}' fermant les blocs de contrôle ouverts
+    do_ends: Set[int] = set()  # '}' fermant un bloc do (le while suivant n'est pas une boucle)
+
+    def push(start: int, name: str, params: int, body: Tuple[int, bool]):
+        index, is_arrow = body
+        if is_arrow and frames and frames[-1].arrow == index:
+            # Identifiant ou parenthèse du type de retour: `(): T => ...`
+            return
+        span = FunctionSpan(name=name, start_line=line_of(start), params=params)
+        if frames:
+            frames[-1].span.children.append(span)
+        else:
+            roots.append(span)
+        if not is_arrow:
+            frame = _Frame(span, match[index], -1, None, len(control_ends))
+        elif index + 1 < count and tokens[index + 1] == '{':
+            frame = _Frame(span, match[index + 1], index, None, len(control_ends))
+        else:
+            frame = _Frame(span, None, index, len(opens), len(control_ends))
+        frames.append(frame)
+
+    for i in range(count):
+        tok = tokens[i]
+
+        # Fin des arrow functions à corps expression
+        while frames:
+            frame = frames[-1]
+            if frame.expr_depth is None or i <= frame.arrow + 1 or len(opens) != frame.expr_depth:
+                break
+            if not (tok in _CLOSERS or tok == ',' or tok == ';'
+                    or (tok in _STATEMENT_STARTS and line_of(i) > line_of(i - 1))):
+                break
+            frame.span.end_line = line_of(i - 1)
+            frames.pop()
+
+        prev = tokens[i - 1] if i else None
+        nxt = tokens[i + 1] if i + 1 < count else None
+        member = prev == '.' or prev == '?.'
+
+        # Détection des définitions de fonctions
+        if tok == 'function' and not member:
+            j = i + 1
+            if j < count and tokens[j] == '*':
+                j += 1
+            name = None
+            if j < count and _is_name(tokens[j]) and tokens[j] != '(':
+                name = tokens[j]
+                j += 1
+            j = _skip_generics(tokens, j)
+            if j < count and tokens[j] == '(':
+                body = _signature_end(tokens, match, match[j] + 1)
+                if body is not None and not body[1]:
+                    push(i, name or _script_name(tokens, i, opens), _count_params(tokens, match, j, ('this',)), body)
+        elif nxt in _DEFINITION_NEXT and not member and tok not in _NOT_METHODS and prev != 'function' and _is_name(tok):
+            j = i + 1
+            if nxt == '=>':
+                # x => ...
+                push(i, _script_name(tokens, i, opens), 1, (j, True))
+            else:
+                j = _skip_generics(tokens, j)
+                if j < count and tokens[j] == '(':
+                    body = _signature_end(tokens, match, match[j] + 1)
+                    if body is not None and not body[1]:
+                        # Méthode de classe / d'objet: nom(...) { ... }
+                        push(i, tok, _count_params(tokens, match, j, ('this',)), body)
+        elif tok == '(' and (prev is None or not _is_name(prev) or prev == 'async' or prev in _NOT_METHODS):
+            body = _signature_end(tokens, match, match[i] + 1)
+            if body is not None and body[1]:
+                # (a, b) => ...
+                push(i, _script_name(tokens, i, opens), _count_params(tokens, match, i), body)
+
+        # Métriques de la fonction courante
+        if tok in _SCRIPT_SPECIAL and not member:
+            nesting = len(control_ends) - frames[-1].control_base if frames else 0
+            span = frames[-1].span if frames else None
+
+            if tok == 'if':
+                if span is not None:
+                    span.cyclomatic += 1
+                    span.cognitive += 1 if prev == 'else' else 1 + nesting
+                if nxt == '(' and match[i + 1] + 1 < count and tokens[match[i + 1] + 1] == '{':
+                    control_braces.add(match[i + 1] + 1)
+            elif tok in ('for', 'while', 'switch', 'catch'):
+                do_tail = tok == 'while' and prev == '}' and (i - 1) in do_ends
+                if span is not None:
+                    if tok != 'switch':
+                        span.cyclomatic += 1
+                    if not do_tail:
+                        span.cognitive += 1 + nesting
+                if nxt == '(' and not do_tail:
+                    j = match[i + 1] + 1
+                    if j < count and tokens[j] == '{':
+                        control_braces.add(j)
+            elif tok == 'else' or tok == 'do':
+                if span is not None and nxt != 'if':
+                    span.cognitive += 1 if tok == 'else' else 1 + nesting
+                if nxt == '{':
+                    control_braces.add(i + 1)
+                    if tok == 'do':
+                        do_ends.add(match[i + 1])
+            elif span is None:
+                pass
+            elif tok == 'case':
+                span.cyclomatic += 1
+            elif tok == '?':
+                # Ternaire (pas un paramètre optionnel `x?: T`, `x?)`)
+                if nxt not in (':', ')', ',', '=', None):
+                    span.cyclomatic += 1
+                    span.cognitive += 1 + nesting
+            elif tok in ('&&', '||', '??'):
+                span.cyclomatic += 1
+                frame = frames[-1]
+                if frame.last_logical != tok:
+                    span.cognitive += 1
+                    frame.last_logical = tok
+
+        if tok in _LOGICAL_RESET and frames:
+            frames[-1].last_logical = None
+
+        # Parenthésage et blocs de contrôle
+        if tok in _OPENERS:
+            opens.append(i)
+            if i in control_braces:
+                control_ends.append(match[i])
+                if frames:
+                    frame = frames[-1]
+                    frame.span.nesting = max(frame.span.nesting, len(control_ends) - frame.control_base)
+        elif tok in _CLOSERS:
+            if opens:
+                opens.pop()
+            while control_ends and control_ends[-1] <= i:
+                control_ends.pop()
+
+        # Fin des fonctions à corps bloc
+        while frames and frames[-1].end is not None and frames[-1].end <= i:
+            frames.pop().span.end_line = line_of(i)
+
+    last_line = line_of(count - 1) if count else 1
+    for frame in frames:
+        frame.span.end_line = last_line
+
+    return roots
+
+
+def _lex_python(text: str) -> Tuple[List[str], List[int], Dict[int, int], List[Tuple[int, int, int]]]:
+    """
+    Tokens significatifs d'un fichier Python
+
+    Returns:
+        (tokens, lignes, match, lignes logiques [(indentation, début, fin)])
+        avec la même convention que _lex_script pour match.
+    """
+    tokens: List[str] = []
+    lines: List[int] = []
+    match: Dict[int, int] = {}
+    logical: List[Tuple[int, int, int]] = []
+    opens: List[int] = []
+    line = 1
+    line_start = 0  # Offset du début de la ligne physique courante
+    indent = -1  # Indentation de la ligne logique en cours (-1: aucune)
+    first = 0
+    pos = 0
+    length = len(text)
+    scan = _PYTHON_TOKEN_RE.match
+
+    while pos < length:
+        m = scan(text, pos)
+        kind = m.lastgroup
+        tok = m.group()
+        end = m.end()
+
+        if kind == 'nl':
+            line += 1
+            line_start = end
+            if not opens and indent >= 0:
+                logical.append((indent, first, len(tokens)))
+                indent = -1
+            pos = end
+            continue
+
+        if kind == 'ws' or kind == 'comment':
+            if tok.endswith('\n'):
+                line += 1
+                line_start = end
+            pos = end
+            continue
+
+        if indent < 0:
+            indent = pos - line_start
+            first = len(tokens)
+
+        index = len(tokens)
+        lines.append(line)
+        if kind == 'str':
+            tokens.append('"')
+            newlines = tok.count('\n')
+            if newlines:
+                line += newlines
+                line_start = pos + tok.rfind('\n') + 1
+        else:
+            tokens.append('0' if kind == 'num' else tok)
+            if tok in _OPENERS:
+                opens.append(index)
+            elif tok in _CLOSERS and opens:
+                match[index] = opens[-1]
+                match[opens.pop()] = index
+        pos = end
+
+    if indent >= 0:
+        logical.append((indent, first, len(tokens)))
+
+    count = len(tokens)
+    for index in opens:
+        match[index] = count
+
+    return tokens, lines, match, logical
+
+
+def _python_params(tokens: List[str], match: Dict[int, int], open_index: int) -> int:
+    """Paramètres d'un def (hors self/cls et séparateurs * et /)"""
+    params = _count_params(tokens, match, open_index, ('self', 'cls'))
+    close = min(match[open_index], len(tokens))
+    depth = 0
+    for j in range(open_index + 1, close):
+        tok = tokens[j]
+        if tok in _OPENERS:
+            depth += 1
+        elif tok in _CLOSERS:
+            depth -= 1
+        elif depth == 0 and tok in ('*', '/') and tokens[j - 1] in ('(', ',') and tokens[j + 1:j + 2] in ([','], [')']):
+            params -= 1
+    return max(params, 0)
+
+
+def _scan_python(text: str) -> List[FunctionSpan]:
+    """Passe unique sur les lignes logiques Python: arbre des fonctions + métriques"""
+    tokens, lines, match, logical = _lex_python(text)
+    roots: List[FunctionSpan] = []
+    # Blocs ouverts: [indentation, nature ('def', 'control', 'block'), span, blocs de contrôle cumulés]
+    stack: List[list] = []
+    functions: List[list] = []
+    last_line = 1
+
+    for indent, start, end in logical:
+        while stack and stack[-1][0] >= indent:
+            block = stack.pop()
+            if block[1] == 'def':
+                block[2].end_line = last_line
+                functions.pop()
+        controls = stack[-1][3] if stack else 0
+
+        head = start + 1 if tokens[start] == 'async' and end - start > 1 else start
+        keyword = tokens[head]
+        if keyword in _PYTHON_SOFT_KEYWORDS and (tokens[end - 1] != ':' or tokens[head + 1] in ('=', '.', ',', ')', ':')):
+            keyword = None
+
+        if keyword == 'def' and head + 2 < end:
+            span = FunctionSpan(name=tokens[head + 1], start_line=lines[start])
+            j = head + 2
+            if tokens[j] == '[':
+                j = match[j] + 1
+            if j < end and tokens[j] == '(':
+                span.params = _python_params(tokens, match, j)
+            if functions:
+                functions[-1][2].children.append(span)
+            else:
+                roots.append(span)
+            block = [indent, 'def', span, controls]
+            stack.append(block)
+            functions.append(block)
+            head += 1
+        elif keyword == 'class':
+            stack.append([indent, 'block', None, controls])
+        elif keyword in _PYTHON_COMPOUND:
+            cyclomatic, nested, flat, nesting_block = _PYTHON_COMPOUND[keyword]
+            if functions:
+                span = functions[-1][2]
+                nesting = controls - functions[-1][3]
+                span.cyclomatic += cyclomatic
+                span.cognitive += flat + (1 + nesting if nested else 0)
+                if nesting_block:
+                    span.nesting = max(span.nesting, nesting + 1)
+            stack.append([indent, 'control' if nesting_block else 'block', None, controls + nesting_block])
+            head += 1
+        else:
+            head = start
+
+        # Points de décision dans l'expression (ternaires, compréhensions, and/or)
+        if functions:
+            span = functions[-1][2]
+            last_logical = None
+            for j in range(head, end):
+                tok = tokens[j]
+                if tok == 'if' or tok == 'for':
+                    span.cyclomatic += 1
+                    span.cognitive += 1
+                elif tok == 'and' or tok == 'or':
+                    span.cyclomatic += 1
+                    if last_logical != tok:
+                        span.cognitive += 1
+                        last_logical = tok
+                elif tok in _OPENERS or tok in _CLOSERS or tok == ',':
+                    last_logical = None
+
+        last_line = lines[end - 1]
+
+    for block in functions:
+        block[2].end_line = last_line
+
+    return roots
@@ -0,0 +1,234 @@
+"""
+Profiling - Spans imbriqués (temps mur, CPU, fichiers, RSS) et cProfile
+
+Les agents découpent leur travail en phases nommées:
+
+    with self.profiler.span('tokenize') as span:
+        ...
+        span.files = len(files)
+        span.counters['tokens'] = len(vocab)
+
+Les phases communes aux agents d'analyse (walk: sélection dans l'index,
+read: préchargement des contenus, match: analyse des fichiers) passent par
+`analysis_phases`; un agent ne déclare lui-même que ses phases propres
+(graph, bundle, translations...).
+
+Le runner donne un profiler à chaque agent, ouvre son span racine et range
+l'arbre sérialisé dans `AgentResult.metadata['spans']` (donc dans l'evidence). En mode --profile,
+chaque agent tourne aussi sous cProfile: `.prof` (snakeviz, flameprof,
+gprof2dot), top des fonctions en texte et spans au format « folded stacks »
+(flamegraph.pl, speedscope) sous `.ai-agents/profiles/<session>/`.
+
+Le RSS est le pic du processus (ru_maxrss) à la fermeture du span: une
+valeur monotone, qui indique la phase où le pic est atteint.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows: pas de getrusage, RSS non mesuré
+    resource = None
+
+
+# Fonctions listées dans le résumé texte d'un .prof
+PROFILE_TOP = 40
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Pic de mémoire résidente du processus (Ko), None si non mesurable"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS: octets, Linux: kilo-octets
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+@dataclass
+class Span:
+    """Phase mesurée (éventuellement découpée en sous-phases)"""
+    name: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    files: Optional[int] = None
+    peak_rss_kb: Optional[int] = None
+    counters: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'name': self.name,
+            'wall_ms': round(self.wall_ms, 1),
+            'cpu_ms': round(self.cpu_ms, 1),
+        }
+        if self.files is not None:
+            data['files'] = self.files
+        if self.peak_rss_kb is not None:
+            data['peak_rss_kb'] = self.peak_rss_kb
+        if self.counters:
+            data['counters'] = dict(self.counters)
+        if self.children:
+            data['children'] = [child.to_dict() for child in self.children]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        return cls(
+            name=data['name'],
+            wall_ms=data.get('wall_ms', 0.0),
+            cpu_ms=data.get('cpu_ms', 0.0),
+            files=data.get('files'),
+            peak_rss_kb=data.get('peak_rss_kb'),
+            counters=dict(data.get('counters', {})),
+            children=[cls.from_dict(child) for child in data.get('children', [])],
+        )
+
+    def lines(self, depth: int = 0) -> List[str]:
+        """Arbre lisible: une ligne par span, indentée par profondeur"""
+        details = [f"cpu {self.cpu_ms / 1000:.1f}s"]
+        if self.files is not None:
+            details.append(f"{self.files} fichier(s)")
+        details.extend(f"{key}={value}" for key, value in self.counters.items())
+        if self.peak_rss_kb is not None:
+            details.append(f"rss {self.peak_rss_kb // 1024}Mo")
+        lines = [f"{'  ' * depth}{self.name}: {self.wall_ms / 1000:.2f}s ({', '.join(details)})"]
+        for child in self.children:
+            lines.extend(child.lines(depth + 1))
+        return lines
+
+    def folded(self, prefix: str = '') -> List[str]:
+        """
+        Folded stacks (`a;b;c <valeur>`), valeur = temps propre en ms
+
+        Le temps propre exclut celui des enfants: la somme d'une pile
+        redonne le temps mur du span racine (sauf enfants concurrents,
+        agents en --jobs: le temps propre est alors borné à 0).
+        """
+        stack = f"{prefix};{self.name}" if prefix else self.name
+        own = self.wall_ms - sum(child.wall_ms for child in self.children)
+        lines = [f"{stack} {max(0, round(own))}"]
+        for child in self.children:
+            lines.extend(child.folded(stack))
+        return lines
+
+
+class Profiler:
+    """
+    Pile de spans d'un agent (ou du runner)
+
+    Usage:
+        profiler = Profiler('a3_duplications')
+        with profiler.span('walk') as span:
+            span.files = len(files)
+        profiler.root.to_dict()
+    """
+
+    def __init__(self, name: str = 'root'):
+        self.root = Span(name)
+        self._stack: List[Span] = [self.root]
+        self._started: Optional[tuple] = None
+
+    @contextmanager
+    def span(self, name: str, files: Optional[int] = None, **counters: Any) -> Iterator[Span]:
+        """Mesure un bloc comme sous-phase du span courant"""
+        span = Span(name, files=files, counters=dict(counters))
+        self._stack[-1].children.append(span)
+        self._stack.append(span)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_ms = (time.perf_counter() - wall) * 1000
+            span.cpu_ms = (time.process_time() - cpu) * 1000
+            span.peak_rss_kb = peak_rss_kb()
+            self._stack.pop()
+
+    def start(self):
+        """Démarre la mesure du span racine (fermé par stop)"""
+        self._started = (time.perf_counter(), time.process_time())
+
+    def stop(self) -> Span:
+        """Ferme le span racine et le retourne"""
+        if self._started is not None:
+            wall, cpu = self._started
+            self.root.wall_ms = (time.perf_counter() - wall) * 1000
+            self.root.cpu_ms = (time.process_time() - cpu) * 1000
+            self.root.peak_rss_kb = peak_rss_kb()
+            self._started = None
+        return self.root
+
+    def attach(self, data: Dict[str, Any]):
+        """Ajoute un arbre sérialisé (span d'un agent) sous le span courant"""
+        self._stack[-1].children.append(Span.from_dict(data))
+
+
+class CallProfile:
+    """
+    cProfile autour d'un appel, écrit sous `profiles_dir`
+
+    Produit `<name>.prof` (pstats), `<name>.txt` (top cumulatif) et, si des
+    spans sont fournis, `<name>.folded`.
+    """
+
+    def __init__(self, profiles_dir: Path, name: str):
+        self.profiles_dir = Path(profiles_dir)
+        self.name = name
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> "CallProfile":
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        return False
+
+    def dump(self, span: Optional[Span] = None) -> Path:
+        """Écrit les fichiers de profil, retourne le chemin du .prof"""
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        prof_path = self.profiles_dir / f"{self.name}.prof"
+        self._profile.dump_stats(str(prof_path))
+
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        (self.profiles_dir / f"{self.name}.txt").write_text(out.getvalue(), encoding='utf-8')
+
+        if span is not None:
+            write_folded(self.profiles_dir / f"{self.name}.folded", span)
+        return prof_path
+
+
+def write_folded(path: Path, span: Span):
+    """Écrit un arbre de spans au format folded stacks"""
+    Path(path).write_text('\n'.join(span.folded()) + '\n', encoding='utf-8')
+
+
+
+@contextmanager
+def analysis_phases(agent: Any, entries: Iterable[Any],
+                    accept: Optional[Callable[[Path], bool]] = None) -> Iterator[List[Any]]:
+    """
+    Phases « walk », « read » et « match » d'un agent d'analyse
+
+    walk: entrées de l'index retenues par `accept(path)` (toutes si None);
+    read: préchargement dans `agent.content_store`; match: le bloc `with`,
+    qui reçoit les entrées retenues (ordre de l'index). Les spans vont dans
+    `agent.profiler` (posé par le runner), ignorés en exécution standalone.
+    """
+    profiler = getattr(agent, 'profiler', None) or Profiler()
+    with profiler.span('walk') as span:
+        selected = [entry for entry in entries if accept is None or accept(entry.path)]
+        span.files = len(selected)
+    with profiler.span('read') as span:
+        span.files = agent.content_store.preload(entry.path for entry in selected)
+    with profiler.span('match', files=len(selected)):
+        yield selected
@@ -0,0 +1,570 @@
+"""
+Report Engine - Rapports markdown / JSON / HTML depuis l'evidence d'un run
+
+Les rapports sont rendus à partir du flux d'evidence d'une session
+(core.evidence.EvidenceReader): aucune analyse n'est relancée, régénérer
+ou comparer des rapports ne coûte que la relecture des enregistrements.
+
+Usage:
+    engine = ReportEngine.from_session(evidence_dir)            # dernière session
+    engine.write(Path('RAPPORT_ANALYSE.md'))                     # format déduit du suffixe
+    engine.write_diff(ReportEngine.from_session(evidence_dir, '20250101_120000'),
+                      Path('diff.html'))
+"""
+
+import html
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .evidence import EvidenceReader
+
+
+FORMATS = ('markdown', 'json', 'html')
+
+# Suffixe de fichier -> format
+SUFFIX_FORMATS = {'.md': 'markdown', '.json': 'json', '.html': 'html', '.htm': 'html'}
+
+# Libellés des agents (emoji, titre)
+AGENT_LABELS = {
+    'a1_security': ('🔒', 'Sécurité'),
+    'a2_massive_files': ('📏', 'Fichiers Volumineux'),
+    'a3_duplications': ('🔁', 'Code Dupliqué'),
+    'a4_dead_code': ('💀', 'Code Mort'),
+    'a5_complexity': ('🧠', 'Complexité'),
+    'a6_dependencies': ('📦', 'Dépendances'),
+    'a7_performance': ('⚡', 'Performance'),
+    'a8_accessibility': ('♿', 'Accessibilité'),
+    'a9_seo': ('🔍', 'SEO'),
+    'a10_i18n': ('🌍', 'Internationalisation'),
+    'a11_tests': ('🧪', 'Tests'),
+    'a12_documentation': ('📚', 'Documentation'),
+}
+
+SEVERITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3, 'INFO': 4}
+SEVERITY_EMOJI = {'CRITICAL': '🔴', 'HIGH': '🟠', 'MEDIUM': '🟡', 'LOW': '🟢'}
+
+# Champs identifiant un finding d'un run à l'autre (les numéros de ligne
+# bougent au moindre ajout: ils n'en font pas partie)
+IDENTITY_FIELDS = (
+    'file_path', 'file', 'path', 'function', 'function_name', 'symbol', 'package', 'name',
+    'key', 'rule', 'type', 'category', 'fragment', 'description', 'message',
+)
+
+# Clés d'identité réellement émises par agent (IDENTITY_FIELDS sinon)
+AGENT_IDENTITY_FIELDS = {
+    'a2_massive_files': ('file_path', 'category'),
+    'a3_duplications': ('files', 'fragment'),
+    'a5_complexity': ('file', 'function'),
+    'a6_dependencies': ('package', 'category'),
+    'a12_documentation': ('file', 'category', 'entity_type', 'entity_name'),
+}
+
+# A5: fonctions sans nom propre (`<anonymous>`, `useEffect(callback)`), plusieurs
+# par fichier: seule la ligne les distingue
+_UNNAMED_MARKERS = ('<', '(')
+
+# Exemples par agent (rapports) et findings listés par agent (diff)
+TOP_FILES = 5
+DIFF_LIMIT = 20
+
+
+def label(agent_name: str) -> Tuple[str, str]:
+    """(emoji, titre) d'un agent"""
+    return AGENT_LABELS.get(agent_name, ('📊', agent_name))
+
+
+def unwrap_findings(findings: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Findings réels d'un agent
+
+    Certains agents renvoient un seul finding résumé qui contient la liste
+    (`[{'findings': [...], ...}]`): on la déplie.
+    """
+    if len(findings) == 1 and isinstance(findings[0], dict) and isinstance(findings[0].get('findings'), list):
+        findings = findings[0]['findings']
+    return [f for f in findings if isinstance(f, dict)]
+
+
+def finding_file(finding: Dict[str, Any]) -> str:
+    """Fichier d'un finding (les agents n'utilisent pas tous la même clé; A3: premier fichier)"""
+    for key in ('file_path', 'file', 'path'):
+        if key in finding:
+            return str(finding[key])
+    files = finding.get('files') or [loc.get('file') for loc in finding.get('locations') or () if isinstance(loc, dict)]
+    return str(files[0]) if files and files[0] else 'N/A'
+
+
+def finding_severity(finding: Dict[str, Any]) -> str:
+    """Sévérité normalisée (majuscules, vide si absente)"""
+    return str(finding.get('severity', '')).upper()
+
+
+def finding_identity(agent_name: str, finding: Dict[str, Any]) -> str:
+    """Empreinte stable d'un finding (agent + champs d'identité)"""
+    fields = AGENT_IDENTITY_FIELDS.get(agent_name, IDENTITY_FIELDS)
+    identity = {k: finding[k] for k in fields if k in finding}
+    function = str(identity.get('function', ''))
+    if agent_name == 'a5_complexity' and any(marker in function for marker in _UNNAMED_MARKERS):
+        identity['line'] = finding.get('line')
+    if not identity:
+        identity = finding
+    return agent_name + ':' + json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _group_by_identity(agent_name: str, findings: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Findings regroupés par empreinte (ordre conservé)"""
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for finding in findings:
+        groups[finding_identity(agent_name, finding)].append(finding)
+    return groups
+
+
+def describe(finding: Dict[str, Any], file_count: int = 1) -> str:
+    """Description courte d'un finding selon sa forme (markdown léger)"""
+    if 'lines' in finding:  # Massive files
+        desc = f"**{finding.get('lines')} lignes** ({finding.get('category', 'N/A')})"
+        if finding.get('suggestions'):
+            desc += f" - {finding['suggestions'][0]}"
+    elif 'function' in finding or 'function_name' in finding:  # Complexity
+        desc = (
+            f"Fonction `{finding.get('function', finding.get('function_name'))}` "
+            f"(ligne {finding.get('line', finding.get('line_number', '?'))}) - "
+            f"Cyclo: {finding.get('cyclomatic', finding.get('cyclomatic_complexity', '?'))}, "
+            f"Cogn: {finding.get('cognitive', finding.get('cognitive_complexity', '?'))}"
+        )
+        if file_count > 1:
+            desc += f" (+ {file_count - 1} autres fonctions complexes)"
+    elif 'category' in finding:  # Security, Performance
+        desc = f"{finding.get('category', 'N/A')}"
+        if finding.get('description'):
+            desc += f" - {str(finding['description'])[:80]}"
+        if file_count > 1:
+            desc += f" ({file_count} problèmes dans ce fichier)"
+    elif 'fragment' in finding:  # Duplications
+        desc = (
+            f"**{finding.get('occurrences', '?')} occurrences** "
+            f"({finding.get('lines_duplicated', '?')} lignes dupliquées)"
+        )
+        others = [f for f in finding.get('files') or () if f != finding_file(finding)]
+        if others:
+            desc += f" - aussi dans `{others[0]}`"
+            if len(others) > 1:
+                desc += f" (+ {len(others) - 1})"
+        if file_count > 1:
+            desc += f" (+ {file_count - 1} autres duplications dans ce fichier)"
+    else:
+        desc = str(finding.get('description', finding.get('message', finding.get('reason', finding.get('type', 'N/A')))))
+        if file_count > 1:
+            desc += f" (+ {file_count - 1} autres problèmes)"
+    return desc
+
+
+def priority(count: int) -> str:
+    """Priorité d'un agent d'après son nombre de findings"""
+    if count > 100:
+        return '🔴 Haute'
+    if count > 20:
+        return '🟠 Moyenne'
+    return '🟢 Basse' if count > 0 else '✅ OK'
+
+
+class ReportEngine:
+    """
+    Rendu des rapports d'une session d'evidence
+
+    Les findings d'un agent ne sont lus (seek dans le flux) qu'au premier
+    besoin, puis gardés pour les rendus suivants.
+    """
+
+    def __init__(self, reader: EvidenceReader, agents: Optional[List[str]] = None):
+        self.reader = reader
+        self.session_id = reader.session_id
+        self.start_time = reader.index.get('start_time', '')
+        # Agents retenus (tous par défaut)
+        self._headers: Dict[str, Dict[str, Any]] = {
+            name: reader.result(name)
+            for name in reader.agents('analysis')
+            if not agents or name in agents
+        }
+        self._findings: Dict[str, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_session(
+        cls,
+        evidence_dir: Path,
+        session: str = 'latest',
+        agents: Optional[List[str]] = None
+    ) -> "ReportEngine":
+        """Session par identifiant, ou la plus récente ('latest')"""
+        if session == 'latest':
+            reader = EvidenceReader.latest(evidence_dir)
+            if reader is None:
+                raise FileNotFoundError(f"Aucune session d'evidence dans {evidence_dir}")
+        else:
+            reader = EvidenceReader.open(evidence_dir, session)
+        return cls(reader, agents)
+
+    @property
+    def agents(self) -> List[str]:
+        """Agents d'analyse du rapport (ordre d'exécution)"""
+        return list(self._headers)
+
+    def header(self, agent_name: str) -> Dict[str, Any]:
+        """En-tête enregistré d'un agent (statut, durée, erreurs)"""
+        return self._headers.get(agent_name) or {}
+
+    def findings(self, agent_name: str) -> List[Dict[str, Any]]:
+        """Findings (dépliés) d'un agent"""
+        if agent_name not in self._findings:
+            raw = self.reader.findings(agent_name) if agent_name in self._headers else []
+            self._findings[agent_name] = unwrap_findings(raw)
+        return self._findings[agent_name]
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre de findings par agent"""
+        return {name: len(self.findings(name)) for name in self.agents}
+
+    def severity_counts(self) -> Dict[str, int]:
+        """Nombre de findings par sévérité, tous agents confondus"""
+        counts: Dict[str, int] = defaultdict(int)
+        for name in self.agents:
+            for finding in self.findings(name):
+                severity = finding_severity(finding)
+                if severity:
+                    counts[severity] += 1
+        return dict(sorted(counts.items(), key=lambda item: SEVERITY_ORDER.get(item[0], 5)))
+
+    def top_files(self, agent_name: str, limit: int = TOP_FILES) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Fichiers les plus touchés d'un agent (nombre de findings, puis sévérité)"""
+        by_file: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for finding in self.findings(agent_name):
+            by_file[finding_file(finding)].append(finding)
+
+        ranked = sorted(
+            by_file.items(),
+            key=lambda item: (-len(item[1]), SEVERITY_ORDER.get(finding_severity(item[1][0]) or 'INFO', 5))
+        )
+        return ranked[:limit]
+
+    def summary(self) -> Dict[str, Any]:
+        """Synthèse du run (structure commune aux trois formats)"""
+        counts = self.counts()
+        validation = self.reader.validation()
+        decision = self.reader.decision()
+        return {
+            'session_id': self.session_id,
+            'start_time': self.start_time,
+            'total_findings': sum(counts.values()),
+            'duration_ms': sum(self.header(name).get('duration_ms', 0) for name in self.agents),
+            'agents': [
+                {
+                    'name': name,
+                    'status': self.header(name).get('status'),
+                    'duration_ms': self.header(name).get('duration_ms', 0),
+                    'findings': counts[name],
+                    'errors': self.header(name).get('errors', []),
+                }
+                for name in self.agents
+            ],
+            'severities': self.severity_counts(),
+            'fixes': {
+                header['agent']: header.get('fixes_count', 0)
+                for header in self.reader.results('fixes')
+            },
+            'validation_passed': validation.get('all_passed') if validation else None,
+            'decision': decision.get('action') if decision else None,
+        }
+
+    def diff(self, base: "ReportEngine") -> Dict[str, Any]:
+        """
+        Différences avec un run de référence (`base` = run précédent)
+
+        Par agent: compteurs avant/après et findings nouveaux ou résolus
+        (comparés par empreinte, voir AGENT_IDENTITY_FIELDS / IDENTITY_FIELDS).
+        """
+        agents = []
+        for name in list(dict.fromkeys(base.agents + self.agents)):
+            before = _group_by_identity(name, base.findings(name))
+            after = _group_by_identity(name, self.findings(name))
+            # Multi-ensembles: N occurrences avant, M après -> M-N nouvelles
+            new = [f for key, items in after.items() for f in items[len(before.get(key, ())):]]
+            resolved = [f for key, items in before.items() for f in items[len(after.get(key, ())):]]
+            agents.append({
+                'name': name,
+                'before': len(base.findings(name)),
+                'after': len(self.findings(name)),
+                'new': new,
+                'resolved': resolved,
+            })
+
+        return {
+            'base_session': base.session_id,
+            'session_id': self.session_id,
+            'total_before': sum(a['before'] for a in agents),
+            'total_after': sum(a['after'] for a in agents),
+            'agents': agents,
+        }
+
+    def render(self, fmt: str = 'markdown') -> str:
+        """Rapport du run dans un des FORMATS"""
+        if fmt == 'markdown':
+            return self.render_markdown()
+        if fmt == 'json':
+            return self.render_json()
+        if fmt == 'html':
+            return self.render_html()
+        raise ValueError(f"Format inconnu: {fmt} (attendu: {', '.join(FORMATS)})")
+
+    def render_diff(self, base: "ReportEngine", fmt: str = 'markdown') -> str:
+        """Comparaison avec un run de référence dans un des FORMATS"""
+        diff = self.diff(base)
+        if fmt == 'markdown':
+            return self._diff_markdown(diff)
+        if fmt == 'json':
+            return json.dumps(diff, indent=2, ensure_ascii=False, default=str)
+        if fmt == 'html':
+            return self._diff_html(diff)
+        raise ValueError(f"Format inconnu: {fmt} (attendu: {', '.join(FORMATS)})")
+
+    def write(self, path: Path, fmt: Optional[str] = None) -> Path:
+        """Écrit le rapport (format déduit du suffixe si non précisé)"""
+        path = Path(path)
+        path.write_text(self.render(fmt or format_for(path)), encoding='utf-8')
+        return path
+
+    def write_diff(self, base: "ReportEngine", path: Path, fmt: Optional[str] = None) -> Path:
+        """Écrit la comparaison avec `base` (format déduit du suffixe si non précisé)"""
+        path = Path(path)
+        path.write_text(self.render_diff(base, fmt or format_for(path)), encoding='utf-8')
+        return path
+
+    def render_json(self) -> str:
+        report = self.summary()
+        for agent in report['agents']:
+            agent['top_files'] = [
+                {'file': file, 'findings': len(items), 'example': items[0]}
+                for file, items in self.top_files(agent['name'])
+            ]
+        return json.dumps(report, indent=2, ensure_ascii=False, default=str)
+
+    def render_markdown(self) -> str:
+        summary = self.summary()
+        counts = self.counts()
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+        md = "# 📊 Rapport d'Analyse Monorepo NestJS/Remix\n\n"
+        md += f"**Session** : `{self.session_id}`  \n"
+        md += f"**Date** : {_format_date(self.start_time)}  \n"
+        md += f"**Agents exécutés** : {len(self.agents)}  \n"
+        md += f"**Total problèmes détectés** : **{summary['total_findings']:,}**\n\n"
+        md += "---\n\n## 🎯 Résumé Exécutif\n\n"
+
+        md += "### Top 5 des Problèmes\n\n"
+        for name, count in ranked[:5]:
+            if count > 0:
+                emoji, title = label(name)
+                md += f"- {emoji} **{title}** : {count:,} problèmes\n"
+
+        if summary['decision']:
+            status = '✅ PASS' if summary['validation_passed'] else '❌ FAIL'
+            md += f"\n**Validation** : {status} · **Décision** : `{summary['decision']}`\n"
+
+        md += "\n---\n\n## 📋 Détail par Agent\n\n"
+        for name, count in ranked:
+            emoji, title = label(name)
+            errors = self.header(name).get('errors') or []
+
+            if count == 0 and not errors:
+                md += f"### ✅ {emoji} {title}\n\n**Aucun problème détecté** - Excellent !\n\n"
+                continue
+
+            md += f"### {emoji} {title}\n\n"
+            for error in errors:
+                md += f"- ❌ {error}\n"
+            if errors:
+                md += "\n"
+            if count == 0:
+                continue
+
+            md += f"**{count:,} problèmes détectés**\n\n**Top 5 exemples** :\n\n"
+            for i, (file, items) in enumerate(self.top_files(name), 1):
+                severity_emoji = SEVERITY_EMOJI.get(finding_severity(items[0]), '')
+                md += f"{i}. `{_shorten(file)}`"
+                if severity_emoji:
+                    md += f" {severity_emoji}"
+                md += f"\n   {describe(items[0], len(items))}\n\n"
+
+            if count > TOP_FILES:
+                md += f"*... et {count - TOP_FILES:,} autres problèmes*\n\n"
+
+        md += "---\n\n## 🎯 Plan d'Action Recommandé\n\n"
+        md += _action_plan(counts)
+
+        md += "---\n\n## 📊 Vue d'Ensemble\n\n"
+        md += "| Agent | Problèmes | Priorité |\n|-------|-----------|----------|\n"
+        for name, count in ranked:
+            emoji, title = label(name)
+            md += f"| {emoji} {title} | {count:,} | {priority(count)} |\n"
+
+        md += "\n\n---\n\n"
+        md += f"**📁 Données brutes** : `.ai-agents/evidence/{self.reader.stream_path.name}`  \n"
+        md += "**🔄 Relancer l'analyse** : `cd ai-agents-python && python run.py`  \n"
+        md += f"**📅 Généré le** : {datetime.now().strftime('%d/%m/%Y à %H:%M:%S')}\n"
+        return md
+
+    def render_html(self) -> str:
+        summary = self.summary()
+        counts = self.counts()
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+        rows = ''.join(
+            f"<tr><td>{_e(' '.join(label(name)))}</td><td>{count:,}</td><td>{_e(priority(count))}</td></tr>"
+            for name, count in ranked
+        )
+        sections = []
+        for name, count in ranked:
+            if count == 0:
+                continue
+            items = ''.join(
+                f"<li><code>{_e(file)}</code> {_e(SEVERITY_EMOJI.get(finding_severity(found[0]), ''))}"
+                f"<br>{_e(describe(found[0], len(found)).replace('**', '').replace('`', ''))}</li>"
+                for file, found in self.top_files(name)
+            )
+            more = f"<p><em>... et {count - TOP_FILES:,} autres problèmes</em></p>" if count > TOP_FILES else ''
+            sections.append(
+                f"<h3>{_e(' '.join(label(name)))} ({count:,})</h3><ol>{items}</ol>{more}"
+            )
+
+        body = (
+            f"<h1>📊 Rapport d'Analyse</h1>"
+            f"<p>Session <code>{_e(self.session_id)}</code> · {_e(_format_date(self.start_time))} · "
+            f"<strong>{summary['total_findings']:,}</strong> problèmes</p>"
+            f"<h2>Vue d'ensemble</h2>"
+            f"<table><tr><th>Agent</th><th>Problèmes</th><th>Priorité</th></tr>{rows}</table>"
+            f"<h2>Détail par agent</h2>{''.join(sections)}"
+        )
+        return _html_page(f"Rapport {self.session_id}", body)
+
+    def _diff_markdown(self, diff: Dict[str, Any]) -> str:
+        delta = diff['total_after'] - diff['total_before']
+        md = "# 🔄 Comparaison de Runs\n\n"
+        md += f"**Référence** : `{diff['base_session']}` → **Run** : `{diff['session_id']}`  \n"
+        md += f"**Total** : {diff['total_before']:,} → {diff['total_after']:,} ({delta:+,})\n\n"
+        md += "| Agent | Avant | Après | Nouveaux | Résolus |\n|-------|-------|-------|----------|---------|\n"
+        for agent in diff['agents']:
+            emoji, title = label(agent['name'])
+            md += (
+                f"| {emoji} {title} | {agent['before']:,} | {agent['after']:,} | "
+                f"{len(agent['new']):,} | {len(agent['resolved']):,} |\n"
+            )
+
+        for agent in diff['agents']:
+            if not agent['new'] and not agent['resolved']:
+                continue
+            emoji, title = label(agent['name'])
+            md += f"\n## {emoji} {title}\n\n"
+            for heading, items in (('🆕 Nouveaux', agent['new']), ('✅ Résolus', agent['resolved'])):
+                if not items:
+                    continue
+                md += f"**{heading}** ({len(items):,}) :\n\n"
+                for finding in items[:DIFF_LIMIT]:
+                    md += f"- `{_shorten(finding_file(finding))}` - {describe(finding)}\n"
+                if len(items) > DIFF_LIMIT:
+                    md += f"- *... et {len(items) - DIFF_LIMIT:,} autres*\n"
+                md += "\n"
+        return md
+
+    def _diff_html(self, diff: Dict[str, Any]) -> str:
+        rows = ''.join(
+            f"<tr><td>{_e(' '.join(label(a['name'])))}</td><td>{a['before']:,}</td><td>{a['after']:,}</td>"
+            f"<td>{len(a['new']):,}</td><td>{len(a['resolved']):,}</td></tr>"
+            for a in diff['agents']
+        )
+        sections = []
+        for agent in diff['agents']:
+            for heading, items in (('Nouveaux', agent['new']), ('Résolus', agent['resolved'])):
+                if not items:
+                    continue
+                lis = ''.join(
+                    f"<li><code>{_e(finding_file(f))}</code> {_e(describe(f).replace('**', '').replace('`', ''))}</li>"
+                    for f in items[:DIFF_LIMIT]
+                )
+                sections.append(f"<h3>{_e(' '.join(label(agent['name'])))} - {heading} ({len(items):,})</h3><ul>{lis}</ul>")
+
+        body = (
+            f"<h1>🔄 Comparaison de Runs</h1>"
+            f"<p><code>{_e(diff['base_session'])}</code> → <code>{_e(diff['session_id'])}</code> · "
+            f"{diff['total_before']:,} → {diff['total_after']:,}</p>"
+            f"<table><tr><th>Agent</th><th>Avant</th><th>Après</th><th>Nouveaux</th><th>Résolus</th></tr>{rows}</table>"
+            f"{''.join(sections)}"
+        )
+        return _html_page(f"Diff {diff['base_session']} → {diff['session_id']}", body)
+
+
+def format_for(path: Path) -> str:
+    """Format d'après le suffixe du fichier (markdown par défaut)"""
+    return SUFFIX_FORMATS.get(Path(path).suffix.lower(), 'markdown')
+
+
+def _action_plan(counts: Dict[str, int]) -> str:
+    """Plan d'action recommandé d'après les volumes par agent"""
+    md = ''
+    if counts.get('a1_security', 0) > 0 or counts.get('a2_massive_files', 0) > 50:
+        md += "### 🔥 Priorité 1 - Cette Semaine\n\n"
+        if counts.get('a1_security', 0) > 0:
+            md += f"1. **Sécurité** : Analyser et corriger les {counts['a1_security']} vulnérabilités\n"
+        if counts.get('a2_massive_files', 0) > 50:
+            md += "2. **Refactoring** : Découper les 10-15 fichiers les plus volumineux (> 1000 lignes)\n"
+        if counts.get('a3_duplications', 0) > 200:
+            md += "3. **Duplications** : Extraire le code dupliqué (focus top 20)\n"
+        md += "\n"
+
+    if counts.get('a5_complexity', 0) > 100 or counts.get('a7_performance', 0) > 100:
+        md += "### ⚡ Priorité 2 - Ce Mois\n\n"
+        if counts.get('a5_complexity', 0) > 100:
+            md += "1. **Complexité** : Simplifier les fonctions les plus complexes (top 20)\n"
+        if counts.get('a6_dependencies', 0) > 0:
+            md += "2. **Dépendances** : Mettre à jour packages obsolètes et vulnérables\n"
+        if counts.get('a7_performance', 0) > 100:
+            md += "3. **Performance** : Optimiser les bottlenecks (console.log, imports, etc.)\n"
+        md += "\n"
+
+    md += "### 📅 Moyen Terme (1-2 Mois)\n\n"
+    md += f"1. **Tests** : Améliorer couverture ({counts.get('a11_tests', 0)} gaps)\n"
+    md += f"2. **Documentation** : Compléter docs manquantes ({counts.get('a12_documentation', 0)} items)\n"
+    md += f"3. **Accessibilité** : Corriger WCAG ({counts.get('a8_accessibility', 0)} violations)\n"
+    md += f"4. **SEO** : Optimiser référencement ({counts.get('a9_seo', 0)} améliorations)\n"
+    md += f"5. **I18n** : Compléter traductions ({counts.get('a10_i18n', 0)} clés)\n\n"
+    return md
+
+
+def _shorten(path: str, width: int = 65) -> str:
+    """Chemin tronqué par la gauche"""
+    return '...' + path[-(width - 3):] if len(path) > width else path
+
+
+def _format_date(iso: str) -> str:
+    try:
+        return datetime.fromisoformat(iso).strftime('%d/%m/%Y à %H:%M')
+    except (TypeError, ValueError):
+        return iso or 'N/A'
+
+
+def _e(value: Any) -> str:
+    """Échappement HTML"""
+    return html.escape(str(value))
+
+
+def _html_page(title: str, body: str) -> str:
+    """Page HTML autonome (styles inline, aucune ressource externe)"""
+    return (
+        "<!DOCTYPE html>\n<html lang=\"fr\"><head><meta charset=\"utf-8\">"
+        f"<title>{_e(title)}</title><style>"
+        "body{font-family:system-ui,sans-serif;max-width:960px;margin:2em auto;padding:0 1em;color:#222}"
+        "table{border-collapse:collapse;width:100%}th,td{border:1px solid #ddd;padding:.4em .6em;text-align:left}"
+        "th{background:#f5f5f5}code{background:#f3f3f3;padding:0 .2em}"
+        f"</style></head><body>{body}</body></html>\n"
+    )
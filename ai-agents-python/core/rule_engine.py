@@ -0,0 +1,211 @@
+"""
+Rule Engine - Moteur de règles regex partagé par les agents à patterns
+
+Les agents A7, A8, A9, A10 et A12 déclarent des tables de règles
+(compilées une seule fois au chargement de la classe) et délèguent ici le
+parcours: préfiltre par sous-chaînes littérales (un fichier ou une ligne
+sans aucun littéral de la règle n'est pas passé à la regex), numéros de
+ligne par bisect sur les offsets de lignes du FileContent, et profil par
+règle (fichiers, hits, temps) pour repérer les règles les plus lentes.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Match, Optional, Pattern, Set, Tuple, Union
+
+from .content_store import FileContent
+
+
+# Commentaires ignorés par les règles ligne par ligne (skip_comments)
+COMMENT_PREFIXES = ('//', '#', '/*', '*')
+
+
+@dataclass(eq=False)
+class Rule:
+    """
+    Règle de détection
+
+    Args:
+        name: Identifiant (clé du profil)
+        pattern: Regex (str compilée à la création, ou déjà compilée)
+        literals: Sous-chaînes dont l'une figure forcément dans tout match
+            (vide = pas de préfiltre). Casse ignorée si la regex est IGNORECASE.
+        per_line: Chercher ligne par ligne (re.search sur chaque ligne) au lieu
+            de finditer sur tout le texte
+        skip_comments: Mode ligne: ignorer les lignes de commentaire
+        meta: Données libres de l'agent (sévérité, catégorie, message...)
+    """
+    name: str
+    pattern: Union[str, Pattern]
+    literals: Tuple[str, ...] = ()
+    per_line: bool = False
+    skip_comments: bool = False
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if isinstance(self.pattern, str):
+            self.pattern = re.compile(self.pattern)
+        self.literals = tuple(self.literals)
+        self.ignore_case = bool(self.pattern.flags & re.IGNORECASE)
+        if self.ignore_case:
+            self.literals = tuple(literal.lower() for literal in self.literals)
+
+
+class RuleHit:
+    """
+    Match d'une règle
+
+    En mode ligne, `match` porte sur la ligne (positions relatives à la ligne).
+    Sinon le numéro de ligne est calculé à la demande (bisect), les agents
+    qui ne l'utilisent pas ne paient pas la table des offsets.
+    """
+
+    __slots__ = ('rule', 'match', '_doc', '_line')
+
+    def __init__(self, rule: Rule, match: Match, doc: Optional[FileContent] = None, line: Optional[int] = None):
+        self.rule = rule
+        self.match = match
+        self._doc = doc
+        self._line = line
+
+    @property
+    def line(self) -> int:
+        if self._line is None:
+            self._line = self._doc.line_number(self.match.start())
+        return self._line
+
+
+@dataclass
+class RuleStats:
+    """Profil cumulé d'une règle"""
+    files: int = 0  # Fichiers passés à la regex
+    skipped: int = 0  # Fichiers écartés par le préfiltre
+    hits: int = 0
+    seconds: float = 0.0
+
+
+class RuleEngine:
+    """
+    Applique une table de règles à des fichiers du content store
+
+    Usage:
+        engine = RuleEngine(RULES)
+        for hit in engine.scan(store.get(path)):
+            hit.rule.meta['severity'], hit.line, hit.match.group(1)
+        engine.profile(top=5)
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules: List[Rule] = list(rules)
+        self.by_name: Dict[str, Rule] = {rule.name: rule for rule in self.rules}
+        self.stats: Dict[str, RuleStats] = {rule.name: RuleStats() for rule in self.rules}
+        self._lowered: Optional[Tuple[FileContent, str]] = None
+
+    def scan(self, doc: FileContent, names: Optional[Iterable[str]] = None) -> List[RuleHit]:
+        """
+        Matches de toutes les règles (ou de `names`), règle par règle dans
+        l'ordre de la table puis par position
+        """
+        rules = self.rules if names is None else [self.by_name[name] for name in names]
+        hits: List[RuleHit] = []
+
+        for rule in rules:
+            stats = self.stats[rule.name]
+            if not self._passes_prefilter(rule, doc):
+                stats.skipped += 1
+                continue
+
+            start = time.perf_counter()
+            count = len(hits)
+            if rule.per_line:
+                self._scan_lines(rule, doc, hits)
+            else:
+                for match in rule.pattern.finditer(doc.text):
+                    hits.append(RuleHit(rule, match, doc=doc))
+
+            stats.files += 1
+            stats.hits += len(hits) - count
+            stats.seconds += time.perf_counter() - start
+
+        return hits
+
+    def search(self, doc: FileContent, name: str) -> Optional[Match]:
+        """Premier match d'une règle dans tout le texte (test de présence)"""
+        rule = self.by_name[name]
+        stats = self.stats[rule.name]
+        if not self._passes_prefilter(rule, doc):
+            stats.skipped += 1
+            return None
+
+        start = time.perf_counter()
+        match = rule.pattern.search(doc.text)
+        stats.files += 1
+        stats.hits += match is not None
+        stats.seconds += time.perf_counter() - start
+        return match
+
+    def _scan_lines(self, rule: Rule, doc: FileContent, hits: List[RuleHit]):
+        """Mode ligne: seules les lignes contenant un littéral sont testées"""
+        lines = doc.lines
+        for line_num in self._candidate_lines(rule, doc):
+            line = lines[line_num - 1]
+            match = rule.pattern.search(line)
+            if match is None:
+                continue
+            if rule.skip_comments and line.strip().startswith(COMMENT_PREFIXES):
+                continue
+            hits.append(RuleHit(rule, match, line=line_num))
+
+    def _candidate_lines(self, rule: Rule, doc: FileContent) -> Iterable[int]:
+        """Numéros de ligne (triés) contenant au moins un littéral de la règle"""
+        text = doc.text
+        if rule.ignore_case:
+            text = self._lower(doc)
+            if len(text) != len(doc.text):
+                # Minuscules de longueur différente (unicode): offsets inutilisables
+                return range(1, len(doc.lines) + 1)
+        if not rule.literals:
+            return range(1, len(doc.lines) + 1)
+
+        offsets = doc.line_offsets
+        line_nums: Set[int] = set()
+        for literal in rule.literals:
+            pos = text.find(literal)
+            while pos != -1:
+                line_num = doc.line_number(pos)
+                line_nums.add(line_num)
+                if line_num >= len(offsets):
+                    break
+                # Ligne suivante: un seul test par ligne
+                pos = text.find(literal, offsets[line_num])
+
+        return sorted(line_nums)
+
+    def _passes_prefilter(self, rule: Rule, doc: FileContent) -> bool:
+        """Le fichier contient-il au moins un littéral de la règle ?"""
+        if not rule.literals:
+            return True
+        text = self._lower(doc) if rule.ignore_case else doc.text
+        return any(literal in text for literal in rule.literals)
+
+    def _lower(self, doc: FileContent) -> str:
+        """Texte en minuscules du dernier fichier (calculé une fois par fichier)"""
+        if self._lowered is None or self._lowered[0] is not doc:
+            self._lowered = (doc, doc.text.lower())
+        return self._lowered[1]
+
+    def profile(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Profil par règle, les plus lentes d'abord"""
+        entries = [
+            {
+                'rule': name,
+                'files': stats.files,
+                'skipped': stats.skipped,
+                'hits': stats.hits,
+                'ms': round(stats.seconds * 1000, 1),
+            }
+            for name, stats in self.stats.items()
+        ]
+        entries.sort(key=lambda e: e['ms'], reverse=True)
+        return entries[:top] if top is not None else entries
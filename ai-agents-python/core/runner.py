@@ -5,15 +5,27 @@ Inspiré de AIDriver TypeScript mais adapté pour le workflow local-first Python
 """
 
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import importlib
+import inspect
+import json
+import posixpath
+import subprocess
 import sys
 
 from .config import Config
 from .evidence import EvidenceLogger
+from .file_index import FileIndex
+from .content_store import ContentStore
+from .analysis_cache import AnalysisCache
+from .agent_pool import AgentPool, PoolOutcome
+from .import_graph import ImportGraph
+from .git_index import GitIndex
+from .profiling import CallProfile, Profiler, Span, write_folded
 
 
 @dataclass
@@ -43,6 +55,55 @@ class RunReport:
     summary: Dict[str, Any]
 
 
+# Registres d'agents: clé -> (module, classe), instanciés à la demande.
+# Des specs (et non des lambdas) pour que le runner reste sérialisable
+# vers les processus de l'exécution parallèle (--jobs).
+
+# Agents d'analyse (A1-A12)
+ANALYSIS_AGENTS: Dict[str, Tuple[str, str]] = {
+    'a1_security': ('agents.analysis.a1_security', 'A1SecurityAgent'),
+    'a2_massive_files': ('agents.analysis.a2_massive_files', 'MassiveFilesDetector'),
+    'a3_duplications': ('agents.analysis.a3_duplications', 'DuplicationDetector'),
+    'a4_dead_code': ('agents.analysis.a4_dead_code', 'DeadCodeDetector'),
+    'a5_complexity': ('agents.analysis.a5_complexity', 'A5ComplexityAgent'),
+    'a6_dependencies': ('agents.analysis.a6_dependencies', 'A6DependenciesAgent'),
+    'a7_performance': ('agents.analysis.a7_performance', 'A7PerformanceAgent'),
+    'a8_accessibility': ('agents.analysis.a8_accessibility', 'A8AccessibilityAgent'),
+    'a9_seo': ('agents.analysis.a9_seo', 'A9SEOAgent'),
+    'a10_i18n': ('agents.analysis.a10_i18n', 'A10I18nAgent'),
+    'a11_tests': ('agents.analysis.a11_tests', 'A11TestsAgent'),
+    'a12_documentation': ('agents.analysis.a12_documentation', 'A12DocumentationAgent'),
+}
+
+# Agents de correction (F0-F15)
+FIX_AGENTS: Dict[str, Tuple[str, str]] = {
+    'f0_autoimport': ('agents.fixproof.f0_autoimport', 'F0AutoImportAgent'),
+    'f1_dead_code_surgeon': ('agents.fixproof.f1_dead_code_surgeon', 'DeadCodeSurgeon'),
+    'f2_lint_format': ('agents.fixproof.f2_lint_format', 'LintFormatter'),
+    # 'f3_duplication_extractor': ('agents.fixproof.f3_duplication_extractor', 'DuplicationExtractorAgent'),
+    # 'f4_massive_splitter': ('agents.fixproof.f4_massive_splitter', 'MassiveSplitterAgent'),
+    'f15_risk_scorer': ('agents.fixproof.f15_risk_scorer', 'RiskScorer'),
+}
+
+# Gates de validation (M1-M7)
+VALIDATION_GATES: Dict[str, Tuple[str, str]] = {
+    'm1_contracts': ('tests.m1_contracts', 'ContractsGate'),
+    # 'm5_budgets': ('tests.m5_budgets', 'BudgetsGate'),
+    # 'm6_graph': ('tests.m6_graph', 'GraphGate'),
+    'm7_diff_coverage': ('tests.m7_diff_coverage', 'DiffCoverageGate'),
+}
+
+
+def _run_analysis_job(runner: "AgentRunner", agent_key: str) -> Optional["AgentResult"]:
+    """Exécute un agent d'analyse dans un processus du pool (--jobs)"""
+    agent = runner._load_agent(*runner.analysis_agents[agent_key])
+    if agent is None:
+        return None
+    
+    runner._attach_shared_state(agent_key, agent)
+    return runner._execute_analysis_agent(agent_key, agent)
+
+
 class AgentRunner:
     """
     Orchestrateur d'agents - version Python local-first
@@ -55,54 +116,59 @@ class AgentRunner:
     - Logger evidence
     """
     
-    def __init__(self, config: Config, workspace_root: Path):
+    def __init__(
+        self,
+        config: Config,
+        workspace_root: Path,
+        use_cache: bool = True,
+        jobs: int = 1,
+        agent_timeout: Optional[float] = None,
+        since: Optional[str] = None,
+        staged: bool = False,
+        profile: bool = False
+    ):
         self.config = config
         self.workspace_root = workspace_root
-        self.evidence = EvidenceLogger(workspace_root / ".ai-agents")
+        self.use_cache = use_cache
+        
+        # Exécution parallèle des agents d'analyse (1 = séquentiel, en process)
+        self.jobs = jobs
+        self.agent_timeout = agent_timeout  # Secondes par agent (mode parallèle)
+        
+        # Mode scopé: seulement les fichiers modifiés (git diff)
+        self.since = since
+        self.staged = staged
+        
+        # Spans du run (index, phases, agents); --profile: cProfile par agent
+        self.profile = profile
+        self.profiler = Profiler('run')
+        self.profiler.start()
+        self.changed_files: Optional[List[str]] = None
+        self.import_graph: Optional[ImportGraph] = None
+        self.git_index: Optional[GitIndex] = None
+        self.evidence = EvidenceLogger(
+            workspace_root / ".ai-agents",
+            compression=config.output.evidence_compression
+        )
+        
+        # Inventaire des fichiers (construit une seule fois par run)
+        self.file_index: Optional[FileIndex] = None
+        
+        # Contenus des fichiers (lus une seule fois, partagés entre agents)
+        self.content_store = ContentStore()
         
         # Registres d'agents
-        self.analysis_agents: Dict[str, Any] = {}
-        self.fix_agents: Dict[str, Any] = {}
-        self.validation_gates: Dict[str, Any] = {}
+        self.analysis_agents: Dict[str, Tuple[str, str]] = {}
+        self.fix_agents: Dict[str, Tuple[str, str]] = {}
+        self.validation_gates: Dict[str, Tuple[str, str]] = {}
         
         self._register_agents()
     
     def _register_agents(self):
         """Enregistre tous les agents disponibles (lazy loading)"""
-        
-        # Agents d'analyse (A1-A12)
-        self.analysis_agents = {
-            'a1_security': lambda: self._load_agent('agents.analysis.a1_security', 'A1SecurityAgent'),
-            'a2_massive_files': lambda: self._load_agent('agents.analysis.a2_massive_files', 'MassiveFilesDetector'),
-            'a3_duplications': lambda: self._load_agent('agents.analysis.a3_duplications', 'DuplicationDetector'),
-            'a4_dead_code': lambda: self._load_agent('agents.analysis.a4_dead_code', 'DeadCodeDetector'),
-            'a5_complexity': lambda: self._load_agent('agents.analysis.a5_complexity', 'A5ComplexityAgent'),
-            'a6_dependencies': lambda: self._load_agent('agents.analysis.a6_dependencies', 'A6DependenciesAgent'),
-            'a7_performance': lambda: self._load_agent('agents.analysis.a7_performance', 'A7PerformanceAgent'),
-            'a8_accessibility': lambda: self._load_agent('agents.analysis.a8_accessibility', 'A8AccessibilityAgent'),
-            'a9_seo': lambda: self._load_agent('agents.analysis.a9_seo', 'A9SEOAgent'),
-            'a10_i18n': lambda: self._load_agent('agents.analysis.a10_i18n', 'A10I18nAgent'),
-            'a11_tests': lambda: self._load_agent('agents.analysis.a11_tests', 'A11TestsAgent'),
-            'a12_documentation': lambda: self._load_agent('agents.analysis.a12_documentation', 'A12DocumentationAgent'),
-        }
-        
-        # Agents de correction (F0-F15)
-        self.fix_agents = {
-            'f0_autoimport': lambda: self._load_agent('agents.fixproof.f0_autoimport', 'F0AutoImportAgent'),
-            'f1_dead_code_surgeon': lambda: self._load_agent('agents.fixproof.f1_dead_code_surgeon', 'DeadCodeSurgeon'),
-            'f2_lint_format': lambda: self._load_agent('agents.fixproof.f2_lint_format', 'LintFormatter'),
-            # 'f3_duplication_extractor': lambda: self._load_agent('agents.fixproof.f3_duplication_extractor', 'DuplicationExtractorAgent'),
-            # 'f4_massive_splitter': lambda: self._load_agent('agents.fixproof.f4_massive_splitter', 'MassiveSplitterAgent'),
-            'f15_risk_scorer': lambda: self._load_agent('agents.fixproof.f15_risk_scorer', 'RiskScorer'),
-        }
-        
-        # Gates de validation (M1-M7)
-        self.validation_gates = {
-            'm1_contracts': lambda: self._load_agent('tests.m1_contracts', 'ContractsGate'),
-            # 'm5_budgets': lambda: self._load_agent('tests.m5_budgets', 'BudgetsGate'),
-            # 'm6_graph': lambda: self._load_agent('tests.m6_graph', 'GraphGate'),
-            'm7_diff_coverage': lambda: self._load_agent('tests.m7_diff_coverage', 'DiffCoverageGate'),
-        }
+        self.analysis_agents = dict(ANALYSIS_AGENTS)
+        self.fix_agents = dict(FIX_AGENTS)
+        self.validation_gates = dict(VALIDATION_GATES)
     
     def _load_agent(self, module_path: str, class_name: str):
         """Lazy loading d'un agent"""
@@ -110,11 +176,176 @@ class AgentRunner:
             module = importlib.import_module(module_path)
             agent_class = getattr(module, class_name)
             # Ordre: workspace_root, config (comme défini dans les agents)
+            # sauf pour les agents/gates déclarés (config, workspace_root)
+            params = list(inspect.signature(agent_class).parameters)
+            if params and params[0] == 'config':
+                return agent_class(self.config, self.workspace_root)
             return agent_class(self.workspace_root, self.config)
         except Exception as e:
             print(f"⚠️  Impossible de charger {module_path}.{class_name}: {e}")
             return None
     
+    @property
+    def is_scoped(self) -> bool:
+        """Analyse restreinte aux fichiers modifiés (--since / --staged)"""
+        return self.since is not None or self.staged
+    
+    def get_changed_files(self) -> Optional[List[str]]:
+        """
+        Fichiers modifiés (relatifs au workspace), via `git diff`
+        
+        --staged: index vs HEAD. --since REF: arbre de travail vs REF, plus
+        les fichiers non suivis (`git ls-files --others --exclude-standard`):
+        un fichier créé mais pas encore indexé fait partie du travail en cours.
+        --staged reste limité à l'index (ce qui sera réellement commité).
+        Les dossiers exclus par la config (.ai-agents, node_modules...) sont
+        ignorés, même absents du .gitignore du workspace.
+        Retourne None hors mode scopé ou si git échoue (analyse complète).
+        """
+        if not self.is_scoped:
+            return None
+        
+        if self.changed_files is None:
+            cmd = ['git', 'diff', '--name-only', '--relative', '--diff-filter=d']
+            cmd.append('--cached' if self.staged else self.since)
+            commands = [cmd]
+            if not self.staged:
+                commands.append(['git', 'ls-files', '--others', '--exclude-standard'])
+            
+            exclusions = self.config.exclusions
+            changed = set()
+            for command in commands:
+                try:
+                    output = subprocess.check_output(
+                        command,
+                        cwd=self.workspace_root,
+                        text=True,
+                        stderr=subprocess.PIPE
+                    )
+                except (OSError, subprocess.CalledProcessError) as e:
+                    detail = e.stderr.strip().splitlines()[0] if getattr(e, 'stderr', None) else e
+                    print(f"⚠️  git {command[1]} impossible ({detail}): analyse complète")
+                    self.since, self.staged = None, False
+                    return None
+                changed.update(
+                    line for line in output.splitlines()
+                    if line and not exclusions.excludes_dir(posixpath.dirname(line))
+                )
+            
+            self.changed_files = sorted(changed)
+            label = 'staged' if self.staged else f"depuis {self.since} + non suivis"
+            print(f"🎯 Périmètre: {len(self.changed_files)} fichier(s) modifié(s) ({label})")
+        
+        return self.changed_files
+    
+    def get_file_index(self) -> FileIndex:
+        """Construit (une seule fois) l'inventaire partagé des fichiers"""
+        if self.file_index is None:
+            with self.profiler.span('file_index') as span:
+                self.file_index = FileIndex.build(self.workspace_root, self.config)
+                span.files = len(self.file_index)
+            print(f"📁 Index: {len(self.file_index)} fichier(s) - {span.wall_ms:.0f}ms")
+            
+            changed = self.get_changed_files()
+            if changed is not None:
+                self.file_index = self.file_index.scoped(changed)
+        return self.file_index
+    
+    def get_import_graph(self) -> ImportGraph:
+        """Graphe d'imports du workspace (construit une seule fois)"""
+        if self.import_graph is None:
+            file_index = self.get_file_index()
+            with self.profiler.span('import_graph') as span:
+                self.import_graph = ImportGraph.build(file_index, self.content_store)
+                span.files = len(self.import_graph.imports)
+            print(f"🕸️  Graphe d'imports: {len(self.import_graph.imports)} fichier(s) - {span.wall_ms:.0f}ms")
+        return self.import_graph
+    
+    def get_git_index(self) -> GitIndex:
+        """Historique et diff git du run (un `git log` + un `git diff`, une seule fois)"""
+        if self.git_index is None:
+            diff_base = None if self.staged else self.since
+            with self.profiler.span('git_index') as span:
+                self.git_index = GitIndex.build(self.workspace_root, diff_base=diff_base, use_cache=self.use_cache)
+                span.files = len(self.git_index.changed_files)
+            print(f"🗂️  Index git: {len(self.git_index.changed_files)} fichier(s) dans le diff - {span.wall_ms:.0f}ms")
+        return self.git_index
+    
+    def _attach_shared_state(self, agent_key: str, agent: Any):
+        """Partage l'état du run (index fichiers, contenus, cache) avec un agent d'analyse"""
+        if hasattr(agent, 'file_index'):
+            agent.file_index = self.get_file_index()
+        if hasattr(agent, 'content_store'):
+            agent.content_store = self.content_store
+        if self.use_cache and hasattr(agent, 'analysis_cache'):
+            agent.analysis_cache = AnalysisCache.for_agent(self.workspace_root, agent_key, agent, self.config)
+        if hasattr(agent, 'use_cache'):
+            # Caches propres à l'agent (snapshot A6, index A10): ignorés avec --no-cache
+            agent.use_cache = self.use_cache
+        if hasattr(agent, 'import_graph') and (self.is_scoped or self.import_graph is not None):
+            agent.import_graph = self.get_import_graph()
+        # Spans de l'agent (analysis_phases, phases propres), sous son span racine
+        agent.profiler = Profiler(agent_key)
+    
+    @property
+    def profiles_dir(self) -> Path:
+        """Dossier des profils du run (--profile)"""
+        return self.workspace_root / '.ai-agents' / 'profiles' / self.evidence.session_id
+    
+    @contextmanager
+    def _profiled(self, agent_key: str, profiler: Profiler):
+        """
+        Span racine d'un agent (temps mur, CPU, RSS)
+        
+        Avec --profile, l'appel tourne aussi sous cProfile: `<agent>.prof`,
+        `<agent>.txt` et `<agent>.folded` sous profiles_dir.
+        """
+        call = CallProfile(self.profiles_dir, agent_key) if self.profile else None
+        profiler.start()
+        try:
+            if call is None:
+                yield
+            else:
+                with call:
+                    yield
+        finally:
+            root = profiler.stop()
+            if call is not None:
+                try:
+                    call.dump(root)
+                except OSError as e:
+                    print(f"   ⚠️  Profil non sauvegardé: {e}")
+    
+    def write_profile(self) -> Optional[Path]:
+        """Écrit l'arbre de spans du run (`run.json`, `run.folded`), en mode --profile"""
+        if not self.profile:
+            return None
+        
+        root = self.profiler.stop()
+        self.profiles_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.profiles_dir / 'run.json', 'w', encoding='utf-8') as f:
+            json.dump(root.to_dict(), f, indent=2)
+        write_folded(self.profiles_dir / 'run.folded', root)
+        
+        print(f"⏱️  Profils: {self.profiles_dir}")
+        return self.profiles_dir
+    
+    def _save_analysis_cache(self, agent: Any):
+        """Persiste le cache d'un agent (après une analyse réussie)"""
+        cache = getattr(agent, 'analysis_cache', None)
+        if cache is None:
+            return
+        
+        try:
+            # Mode scopé: garder les entrées des fichiers hors périmètre
+            cache.save(prune=not self.is_scoped)
+        except OSError as e:
+            print(f"   ⚠️  Cache non sauvegardé: {e}")
+            return
+        
+        stats = cache.stats()
+        print(f"   💾 Cache: {stats['hits']}/{stats['hits'] + stats['misses']} fichier(s) réutilisé(s)")
+    
     def run_analysis_agents(self, specific: Optional[List[str]] = None) -> List[AgentResult]:
         """
         Exécute les agents d'analyse
@@ -124,71 +355,180 @@ class AgentRunner:
                      Si None, exécute tous les agents disponibles
         
         Returns:
-            Liste des résultats d'analyse
+            Liste des résultats d'analyse (dans l'ordre des agents demandés)
         """
         print("\n🔍 === PHASE 1: ANALYSE ===\n")
         
-        results = []
-        agents_to_run = specific if specific else list(self.analysis_agents.keys())
-        
-        for agent_key in agents_to_run:
+        agents_to_run = []
+        for agent_key in (specific if specific else list(self.analysis_agents.keys())):
             if agent_key not in self.analysis_agents:
                 print(f"⚠️  Agent inconnu: {agent_key}")
                 continue
+            agents_to_run.append(agent_key)
+        
+        with self.profiler.span('analysis'):
+            if self.jobs > 1 and len(agents_to_run) > 1:
+                results = self._run_analysis_parallel(agents_to_run)
+            else:
+                results = self._run_analysis_serial(agents_to_run)
             
+            # Spans des agents (calculés dans leur processus en mode --jobs)
+            for result in results:
+                if result.metadata.get('spans'):
+                    self.profiler.attach(result.metadata['spans'])
+        
+        print(f"\n📊 Analyse terminée: {len(results)} agent(s)")
+        store = self.content_store.stats()
+        if store['files']:
+            print(f"   📄 Contenus: {store['files']} fichier(s) lus, {store['hits']} lecture(s) évitée(s)")
+        return results
+    
+    def _run_analysis_serial(self, agents_to_run: List[str]) -> List[AgentResult]:
+        """Exécute les agents un par un dans le processus courant"""
+        results = []
+        
+        for agent_key in agents_to_run:
             # Lazy load de l'agent
-            agent_factory = self.analysis_agents[agent_key]
-            agent = agent_factory()
+            agent = self._load_agent(*self.analysis_agents[agent_key])
             
             if agent is None:
                 continue
             
+            self._attach_shared_state(agent_key, agent)
+            
             print(f"▶️  Exécution: {agent_key}")
-            start = time.time()
+            result = self._execute_analysis_agent(agent_key, agent)
+            results.append(result)
             
-            try:
-                # Exécuter l'analyse
-                findings = agent.analyze()
-                duration_ms = int((time.time() - start) * 1000)
-                
-                result = AgentResult(
-                    agent_name=agent_key,
-                    agent_type='analysis',
-                    status='success' if findings else 'success',
-                    duration_ms=duration_ms,
-                    findings=findings if isinstance(findings, list) else [findings],
-                    fixes_applied=[],
-                    errors=[],
-                    warnings=[],
-                    metadata={'count': len(findings) if isinstance(findings, list) else 1}
-                )
-                
-                results.append(result)
-                
-                # Logger evidence
-                self.evidence.log_analysis(agent_key, result)
-                
-                print(f"   ✅ {len(result.findings)} finding(s) - {duration_ms}ms")
-                
-            except Exception as e:
-                duration_ms = int((time.time() - start) * 1000)
+            # Logger evidence
+            self.evidence.log_analysis(agent_key, result)
+            self._print_analysis_result(result)
+        
+        return results
+    
+    def _run_analysis_parallel(self, agents_to_run: List[str]) -> List[AgentResult]:
+        """
+        Exécute les agents indépendants sur un pool de processus
+        
+        Chaque agent tourne dans son propre processus (isolation des crashs,
+        timeout par agent). Les résultats sont rendus dans l'ordre demandé,
+        indépendamment de l'ordre de terminaison.
+        """
+        timeout_label = f", timeout {self.agent_timeout:g}s/agent" if self.agent_timeout else ""
+        print(f"⚡ Exécution parallèle: {len(agents_to_run)} agent(s), {self.jobs} processus{timeout_label}")
+        
+        # Index (et graphe en mode scopé) construits une fois ici, hérités par les processus
+        self.get_file_index()
+        if self.is_scoped:
+            self.get_import_graph()
+        
+        def on_done(outcome: PoolOutcome):
+            status = "✅" if outcome.ok else "❌"
+            print(f"   {status} Terminé: {outcome.key} - {outcome.duration_ms}ms")
+        
+        pool = AgentPool(self.jobs, timeout=self.agent_timeout)
+        outcomes = pool.run(
+            [(agent_key, _run_analysis_job, (self, agent_key)) for agent_key in agents_to_run],
+            on_done=on_done,
+        )
+        
+        results = []
+        for agent_key in agents_to_run:
+            outcome = outcomes[agent_key]
+            
+            if outcome.ok:
+                result = outcome.value
+                if result is None:
+                    # Agent non chargeable (déjà signalé par le processus)
+                    continue
+            else:
                 result = AgentResult(
                     agent_name=agent_key,
                     agent_type='analysis',
                     status='error',
-                    duration_ms=duration_ms,
+                    duration_ms=outcome.duration_ms,
                     findings=[],
                     fixes_applied=[],
-                    errors=[str(e)],
+                    errors=[outcome.error],
                     warnings=[],
-                    metadata={}
+                    metadata={'timed_out': outcome.timed_out}
                 )
-                results.append(result)
-                print(f"   ❌ Erreur: {e}")
+            
+            results.append(result)
+            self.evidence.log_analysis(agent_key, result)
+        
+        print()
+        for result in results:
+            print(f"▶️  {result.agent_name}")
+            self._print_analysis_result(result)
         
-        print(f"\n📊 Analyse terminée: {len(results)} agent(s)")
         return results
     
+    def _execute_analysis_agent(self, agent_key: str, agent: Any) -> AgentResult:
+        """Exécute un agent chargé et construit son AgentResult (erreurs capturées)"""
+        profiler = getattr(agent, 'profiler', None) or Profiler(agent_key)
+        start = time.time()
+        
+        try:
+            # Exécuter l'analyse
+            with self._profiled(agent_key, profiler):
+                findings = agent.analyze()
+            duration_ms = int((time.time() - start) * 1000)
+            
+            # Metadata propres à l'agent (débit, compteurs...) en plus du total
+            metadata = {'count': len(findings) if isinstance(findings, list) else 1}
+            agent_metadata = getattr(agent, 'metadata', None)
+            if isinstance(agent_metadata, dict):
+                metadata.update(agent_metadata)
+            metadata['spans'] = profiler.root.to_dict()
+            
+            result = AgentResult(
+                agent_name=agent_key,
+                agent_type='analysis',
+                status='success' if findings else 'success',
+                duration_ms=duration_ms,
+                findings=findings if isinstance(findings, list) else [findings],
+                fixes_applied=[],
+                errors=[],
+                warnings=[],
+                metadata=metadata
+            )
+            
+            self._save_analysis_cache(agent)
+            
+            # Graphe d'imports construit par l'agent (A4): réutilisé par M1
+            if self.import_graph is None and getattr(agent, 'import_graph', None) is not None:
+                self.import_graph = agent.import_graph
+            
+        except Exception as e:
+            duration_ms = int((time.time() - start) * 1000)
+            result = AgentResult(
+                agent_name=agent_key,
+                agent_type='analysis',
+                status='error',
+                duration_ms=duration_ms,
+                findings=[],
+                fixes_applied=[],
+                errors=[str(e)],
+                warnings=[],
+                metadata={'spans': profiler.root.to_dict()}
+            )
+        
+        return result
+    
+    def _print_analysis_result(self, result: AgentResult):
+        """Affiche le statut d'un agent d'analyse"""
+        if result.status == 'error':
+            print(f"   ❌ Erreur: {'; '.join(result.errors)}")
+        else:
+            print(f"   ✅ {len(result.findings)} finding(s) - {result.duration_ms}ms")
+        
+        # Phases déclarées par l'agent (profiler.span)
+        spans = result.metadata.get('spans') or {}
+        for child in spans.get('children', []):
+            for line in Span.from_dict(child).lines(depth=1):
+                print(f"   {line}")
+    
     def run_fix_agents(
         self,
         analysis_results: List[AgentResult],
@@ -225,8 +565,7 @@ class AgentRunner:
                 continue
             
             # Lazy load
-            agent_factory = self.fix_agents[agent_key]
-            agent = agent_factory()
+            agent = self._load_agent(*self.fix_agents[agent_key])
             
             if agent is None:
                 continue
@@ -239,11 +578,13 @@ class AgentRunner:
                 continue
             
             print(f"▶️  Exécution: {agent_key} ({len(relevant_findings)} finding(s))")
+            profiler = getattr(agent, 'profiler', None) or Profiler(agent_key)
             start = time.time()
             
             try:
                 # Exécuter les corrections
-                fixes = agent.fix(relevant_findings, dry_run=dry_run)
+                with self._profiled(agent_key, profiler):
+                    fixes = agent.fix(relevant_findings, dry_run=dry_run)
                 duration_ms = int((time.time() - start) * 1000)
                 
                 result = AgentResult(
@@ -255,7 +596,10 @@ class AgentRunner:
                     fixes_applied=fixes if isinstance(fixes, list) else [fixes],
                     errors=[],
                     warnings=[],
-                    metadata={'count': len(fixes) if isinstance(fixes, list) else 1}
+                    metadata={
+                        'count': len(fixes) if isinstance(fixes, list) else 1,
+                        'spans': profiler.root.to_dict()
+                    }
                 )
                 
                 results.append(result)
@@ -277,14 +621,32 @@ class AgentRunner:
                     fixes_applied=[],
                     errors=[str(e)],
                     warnings=[],
-                    metadata={}
+                    metadata={'spans': profiler.root.to_dict()}
                 )
                 results.append(result)
                 print(f"   ❌ Erreur: {e}")
+            
+            self.profiler.attach(result.metadata['spans'])
         
         print(f"\n📊 Correction terminée: {len(results)} agent(s)")
         return results
     
+    def _attach_gate_scope(self, gate: Any):
+        """Transmet aux gates le graphe d'imports, l'index git et, en mode scopé, les fichiers modifiés"""
+        if hasattr(gate, 'import_graph'):
+            gate.import_graph = self.get_import_graph()
+        if hasattr(gate, 'git_index'):
+            gate.git_index = self.get_git_index()
+        
+        changed = self.get_changed_files()
+        if changed is None:
+            return
+        
+        if hasattr(gate, 'changed_files'):
+            gate.changed_files = changed
+        if hasattr(gate, 'diff_base') and not self.staged:
+            gate.diff_base = self.since
+    
     def run_validation(self, fix_results: List[AgentResult]) -> Dict[str, Any]:
         """
         Exécute les gates de validation (M1-M7)
@@ -300,24 +662,29 @@ class AgentRunner:
             'critical_failures': []
         }
         
-        for gate_key, gate_factory in self.validation_gates.items():
-            gate = gate_factory()
+        for gate_key, gate_spec in self.validation_gates.items():
+            gate = self._load_agent(*gate_spec)
             
             if gate is None:
                 continue
             
+            self._attach_gate_scope(gate)
+            
             print(f"▶️  Gate: {gate_key}")
+            profiler = getattr(gate, 'profiler', None) or Profiler(gate_key)
             start = time.time()
             
             try:
-                result = gate.validate(fix_results)
+                with self._profiled(gate_key, profiler):
+                    result = gate.validate(fix_results)
                 duration_ms = int((time.time() - start) * 1000)
                 
                 validation['gates'][gate_key] = {
                     'passed': result.get('passed', False),
                     'score': result.get('score', 0),
                     'details': result.get('details', {}),
-                    'duration_ms': duration_ms
+                    'duration_ms': duration_ms,
+                    'spans': profiler.root.to_dict()
                 }
                 
                 if not result.get('passed'):
@@ -331,10 +698,13 @@ class AgentRunner:
             except Exception as e:
                 validation['gates'][gate_key] = {
                     'passed': False,
-                    'error': str(e)
+                    'error': str(e),
+                    'spans': profiler.root.to_dict()
                 }
                 validation['all_passed'] = False
                 print(f"   ❌ Erreur: {e}")
+            
+            self.profiler.attach(validation['gates'][gate_key]['spans'])
         
         # Logger evidence
         self.evidence.log_validation(validation)
@@ -8,9 +8,14 @@ Crée un fichier markdown avec:
 - Liste complète des fichiers
 - Suggestions de refactoring
 
+Les findings sont relus depuis l'evidence du dernier run (aucune
+ré-analyse); --run force une détection fraîche.
+
 Usage:
     python generate_a2_report.py
     python generate_a2_report.py --output reports/massive-files-YYYY-MM-DD.md
+    python generate_a2_report.py --session 20250101_120000
+    python generate_a2_report.py --run
 """
 
 import sys
@@ -20,6 +25,7 @@ from collections import defaultdict
 from datetime import datetime
 
 from core.config import Config
+from core.report_engine import ReportEngine
 from agents.analysis.a2_massive_files import MassiveFilesDetector
 
 
@@ -224,16 +230,34 @@ def main():
                        help='Chemin fichier output (default: reports/massive-files-YYYY-MM-DD.md)')
     parser.add_argument('--print', '-p', action='store_true',
                        help='Afficher dans terminal aussi')
+    parser.add_argument('--session', default='latest',
+                       help='Session d\'evidence à relire (default: la dernière)')
+    parser.add_argument('--run', action='store_true',
+                       help='Relancer la détection au lieu de relire l\'evidence')
     
     args = parser.parse_args()
     
     workspace_root = Path(__file__).parent.parent
-    config = Config.load(str(Path(__file__).parent / "config.yaml"))
     
-    # Détecter fichiers massifs
-    print("🔍 Détection fichiers massifs...\n")
-    detector = MassiveFilesDetector(config, workspace_root)
-    findings = detector.analyze()
+    findings = None
+    if not args.run:
+        # Findings A2 du run (seek dans le flux d'evidence, sans ré-analyse)
+        try:
+            engine = ReportEngine.from_session(
+                workspace_root / '.ai-agents' / 'evidence', args.session, ['a2_massive_files']
+            )
+            if 'a2_massive_files' in engine.agents:
+                findings = engine.findings('a2_massive_files')
+                print(f"📂 Session: {engine.session_id}\n")
+        except FileNotFoundError:
+            pass
+    
+    if findings is None:
+        # Pas d'evidence A2: détecter fichiers massifs
+        config = Config.load(str(Path(__file__).parent / "config.yaml"))
+        print("🔍 Détection fichiers massifs...\n")
+        detector = MassiveFilesDetector(config, workspace_root)
+        findings = detector.analyze()
     
     if not findings:
         print("✅ Aucun fichier massif détecté")
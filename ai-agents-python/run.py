@@ -10,15 +10,38 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from core.config import Config
 from core.runner import AgentRunner
+from core.evidence import EvidenceReader
+from core.report_engine import ReportEngine
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='AI agents - analyse, corrections, validation')
+    parser.add_argument('--no-cache', action='store_true', help='Ré-analyser tous les fichiers (ignorer .ai-agents/cache)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Agents d'analyse en parallèle (default: 1)")
+    parser.add_argument('--timeout', type=float, default=600, help='Timeout par agent en secondes, mode --jobs (default: 600)')
+    parser.add_argument('--profile', action='store_true', help='cProfile par agent + spans, sous .ai-agents/profiles/<session>/')
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument('--since', metavar='REF', help='Analyser seulement les fichiers modifiés depuis REF (git diff REF) + fichiers non suivis')
+    scope.add_argument('--staged', action='store_true', help='Analyser seulement les fichiers indexés (git diff --cached)')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("🤖 AI AGENTS - MVP")
     print("=" * 60)
     
     workspace_root = Path(__file__).parent.parent
     config = Config.load(str(Path(__file__).parent / "config.yaml"))
-    runner = AgentRunner(config, workspace_root)
+    runner = AgentRunner(
+        config,
+        workspace_root,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+        agent_timeout=args.timeout,
+        since=args.since,
+        staged=args.staged,
+        profile=args.profile,
+    )
     
     start = time.time()
     
@@ -28,21 +51,6 @@ def main():
     total_findings = sum(len(r.findings) for r in analysis_results)
     print(f"✅ {len(analysis_results)} agent(s), {total_findings} finding(s)")
     
-    # Sauvegarder les résultats en JSON
-    results_dir = Path(__file__).parent
-    for result in analysis_results:
-        output_file = results_dir / f"{result.agent_name}_results.json"
-        import json
-        with open(output_file, 'w') as f:
-            json.dump({
-                'agent_name': result.agent_name,
-                'status': result.status,
-                'duration_ms': result.duration_ms,
-                'findings': result.findings,
-                'errors': result.errors,
-                'warnings': result.warnings
-            }, f, indent=2)
-    
     # Fix
     print("\n🔧 CORRECTIONS...")
     fix_results = runner.run_fix_agents(analysis_results, dry_run=False)
@@ -60,15 +68,14 @@ def main():
     print(f"   Confidence: {decision['confidence']['overall']:.0f}/100")
     print(f"   Action: {decision['action']}")
     print(f"   Durée: {time.time()-start:.1f}s")
+    runner.write_profile()
     
-    # Générer rapport actionnable
+    # Générer rapport actionnable (depuis l'evidence du run, sans sous-processus)
     if total_findings > 0:
         print("\n📄 RAPPORT...")
-        import subprocess
-        try:
-            subprocess.run([sys.executable, str(results_dir / "generate_report_final.py")], check=False)
-        except:
-            pass
+        engine = ReportEngine(EvidenceReader(runner.evidence.index_path))
+        output = engine.write(Path(__file__).parent / 'RAPPORT_ANALYSE.md')
+        print(f"✅ Rapport généré : {output}")
     
     return 0 if decision['action'] == "AUTO_COMMIT" else 1
 
@@ -37,12 +37,26 @@ def main():
     parser.add_argument('--batch-size', type=int, default=10, help='Taille des lots (default: 10)')
     parser.add_argument('--max-risk', type=int, default=30, help='Risk max acceptable (default: 30)')
     parser.add_argument('--dry-run', action='store_true', help='Mode simulation')
+    parser.add_argument('--no-cache', action='store_true', help='Ré-analyser tous les fichiers (ignorer .ai-agents/cache)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Agents d'analyse en parallèle (default: 1)")
+    parser.add_argument('--timeout', type=float, default=600, help='Timeout par agent en secondes, mode --jobs (default: 600)')
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument('--since', metavar='REF', help='Analyser seulement les fichiers modifiés depuis REF (git diff REF)')
+    scope.add_argument('--staged', action='store_true', help='Analyser seulement les fichiers indexés (git diff --cached)')
     
     args = parser.parse_args()
     
     workspace_root = Path(__file__).parent.parent
     config = Config.load(str(Path(__file__).parent / "config.yaml"))
-    runner = AgentRunner(config, workspace_root)
+    runner = AgentRunner(
+        config,
+        workspace_root,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+        agent_timeout=args.timeout,
+        since=args.since,
+        staged=args.staged,
+    )
     
     print(f"\n🔄 MODE INCRÉMENTAL")
     print(f"   Batch size: {args.batch_size}")
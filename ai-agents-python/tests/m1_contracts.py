@@ -10,11 +10,18 @@ Stratégie:
 """
 
 import json
-import subprocess
 from pathlib import Path
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Optional
 from dataclasses import dataclass
 
+try:
+    from core.git_index import GitIndex
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from core.git_index import GitIndex
+
 
 @dataclass
 class ContractChange:
@@ -44,9 +51,22 @@ class ContractsGate:
     - 0-49: Breaking changes détectés
     """
     
+    # Fichiers dont les exports sont analysés
+    SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+    
     def __init__(self, config, workspace_root: Path):
         self.config = config
         self.workspace_root = workspace_root
+        
+        # Graphe d'imports du run (dépendants des fichiers cassés), renseigné par le runner
+        self.import_graph = None  # core.import_graph.ImportGraph
+        
+        # Mode scopé (--since/--staged), renseignés par le runner
+        self.changed_files: Optional[List[str]] = None
+        self.diff_base: Optional[str] = None  # Ref git (défaut: --cached)
+        
+        # Diff combiné du run (un seul `git diff`), renseigné par le runner
+        self.git_index = None  # core.git_index.GitIndex
     
     def validate(self, fix_results: List[Any]) -> Dict[str, Any]:
         """
@@ -66,8 +86,12 @@ class ContractsGate:
         """
         print("🧪 M1 - Validation contrats API...")
         
-        # Extraire fichiers modifiés
+        # Extraire fichiers modifiés (corrections + périmètre git en mode scopé)
         modified_files = self._get_modified_files(fix_results)
+        if self.changed_files:
+            modified_files = sorted(set(modified_files) | {
+                f for f in self.changed_files if f.endswith(self.SOURCE_EXTENSIONS)
+            })
         
         if not modified_files:
             return {
@@ -84,10 +108,18 @@ class ContractsGate:
         breaking_changes = [c for c in changes if c.breaking]
         safe_changes = [c for c in changes if not c.breaking]
         
+        # Dépendants directs des fichiers cassés (un niveau du graphe d'imports)
+        impacted_files = []
+        if breaking_changes and self.import_graph is not None:
+            broken = {c.file_path for c in breaking_changes}
+            impacted_files = sorted(self.import_graph.dependents(broken) - broken)
+        
         if breaking_changes:
             score = max(0, 40 - len(breaking_changes) * 10)
             passed = False
             message = f"❌ {len(breaking_changes)} breaking change(s) détecté(s)"
+            if impacted_files:
+                message += f", {len(impacted_files)} fichier(s) dépendant(s) impacté(s)"
         elif safe_changes:
             score = max(80, 100 - len(safe_changes) * 5)
             passed = True
@@ -105,6 +137,7 @@ class ContractsGate:
                 'total_changes': len(changes),
                 'breaking_changes': len(breaking_changes),
                 'safe_changes': len(safe_changes),
+                'impacted_files': impacted_files[:20],
                 'changes': [
                     {
                         'file': c.file_path,
@@ -132,32 +165,26 @@ class ContractsGate:
     
     def _analyze_contract_changes(self, files: List[str]) -> List[ContractChange]:
         """
-        Analyse changements de contrats (via git diff)
+        Analyse changements de contrats (via le diff combiné du GitIndex)
         
         Détecte:
         - export function/class/interface ajouté/supprimé/modifié
         - Signatures de fonctions changées
         - Props de composants modifiées
         """
+        if self.git_index is None:
+            self.git_index = GitIndex.build(self.workspace_root, diff_base=self.diff_base)
+        
         changes = []
         
         for file_path in files:
-            # Git diff pour ce fichier
-            try:
-                diff = subprocess.check_output(
-                    ['git', 'diff', '--cached', '--', file_path],
-                    cwd=self.workspace_root,
-                    text=True,
-                    stderr=subprocess.DEVNULL
-                )
-                
-                # Parser diff pour détecter changements d'exports
-                file_changes = self._parse_export_changes(file_path, diff)
-                changes.extend(file_changes)
-                
-            except subprocess.CalledProcessError:
-                # Pas de diff (fichier nouveau ou non-git)
+            diff = self.git_index.diff(file_path).text
+            if not diff:
+                # Pas de diff (fichier inchangé ou non-git)
                 continue
+            
+            # Parser diff pour détecter changements d'exports
+            changes.extend(self._parse_export_changes(file_path, diff))
         
         return changes
     
@@ -4,17 +4,24 @@ Gate M7 - Diff Coverage Validation
 Vérifie que le code modifié est couvert par des tests (≥80%)
 
 Stratégie:
-- Détecte lignes modifiées (git diff)
+- Détecte lignes modifiées (hunks du diff combiné, core.git_index)
 - Vérifie couverture de tests sur ces lignes
 - Score basé sur % de couverture différentielle
 """
 
-import subprocess
 import json
 from pathlib import Path
-from typing import Dict, Any, List, Set, Tuple
+from typing import Dict, Any, List, Set, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from core.git_index import GitIndex
+except ImportError:
+    # Fallback pour exécution standalone
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from core.git_index import GitIndex
+
 
 @dataclass
 class DiffCoverageResult:
@@ -46,6 +53,12 @@ class DiffCoverageGate:
         self.config = config
         self.workspace_root = workspace_root
         self.min_coverage = 80  # Minimum requis
+        
+        # Mode scopé (--since), renseigné par le runner
+        self.diff_base: Optional[str] = None  # Ref git (défaut: --cached)
+        
+        # Diff combiné du run (un seul `git diff`), renseigné par le runner
+        self.git_index = None  # core.git_index.GitIndex
     
     def validate(self, fix_results: List[Any]) -> Dict[str, Any]:
         """
@@ -184,31 +197,17 @@ class DiffCoverageGate:
         return any(pattern in file_path for pattern in skip_patterns)
     
     def _count_diff_lines(self, file_path: str) -> Tuple[int, int]:
-        """Compte lignes ajoutées/modifiées via git diff"""
-        try:
-            diff = subprocess.check_output(
-                ['git', 'diff', '--cached', '--numstat', '--', file_path],
-                cwd=self.workspace_root,
-                text=True,
-                stderr=subprocess.DEVNULL
-            )
-            
-            if not diff.strip():
-                return (0, 0)
-            
-            # Format: "added\tdeleted\tfilename"
-            parts = diff.strip().split('\t')
-            added = int(parts[0]) if parts[0] != '-' else 0
-            deleted = int(parts[1]) if parts[1] != '-' else 0
-            
-            # Lignes modifiées = min(added, deleted)
-            modified = min(added, deleted)
-            truly_added = added - modified
-            
-            return (truly_added, modified)
-            
-        except subprocess.CalledProcessError:
-            return (0, 0)
+        """Compte lignes ajoutées/modifiées depuis les hunks du diff combiné"""
+        if self.git_index is None:
+            self.git_index = GitIndex.build(self.workspace_root, diff_base=self.diff_base)
+        
+        hunks = self.git_index.diff(file_path).hunks
+        
+        # Par hunk: lignes modifiées = min(supprimées, ajoutées), le reste est ajouté
+        modified = sum(h.modified for h in hunks)
+        truly_added = sum(h.added for h in hunks)
+        
+        return (truly_added, modified)
     
     def _estimate_coverage(self, file_path: str) -> float:
         """
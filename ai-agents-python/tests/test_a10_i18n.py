@@ -0,0 +1,49 @@
+"""
+Tests unitaires - agents.analysis.a10_i18n (clés utilisées, index sans cache)
+"""
+
+from agents.analysis.a10_i18n import A10I18nAgent
+from core.file_index import FileEntry
+
+
+def _entry(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    stat = path.stat()
+    return FileEntry(path, name, path.suffix, stat.st_size, stat.st_mtime, False)
+
+
+def test_key_usages_only_in_i18n_contexts(tmp_path):
+    entry = _entry(tmp_path, 'page.tsx', """
+const user = { id: 'not.a.key' };
+const route = findRoute({ id: 'routes.home' });
+const title = t('page.title');
+const label = i18n.t(`status.${state}`);
+const el = <Trans i18nKey="page.intro" />;
+const messages = defineMessages({
+  greeting: { id: 'app.greeting', defaultMessage: format('x') },
+});
+const text = intl.formatMessage({ id: 'app.footer' });
+""")
+    usages = A10I18nAgent(tmp_path, None)._parse_key_usages(entry)
+    assert usages['keys'] == ['app.footer', 'app.greeting', 'page.intro', 'page.title']
+    assert usages['prefixes'] == ['status.']
+
+
+def test_key_index_bypassed_without_cache(tmp_path):
+    entries = [_entry(tmp_path, 'a.ts', "t('a.b')")]
+    cached = A10I18nAgent(tmp_path, None)
+    cached._get_key_index().update('usages', entries, cached._parse_key_usages)
+    cached._get_key_index().save()
+    index_path = tmp_path / '.ai-agents' / 'cache' / 'a10_i18n_keys.json'
+    saved = index_path.read_text()
+
+    # --no-cache: l'index persisté n'est ni relu ni réécrit
+    agent = A10I18nAgent(tmp_path, None)
+    agent.use_cache = False
+    index = agent._get_key_index()
+    assert index.sections['usages'] == {}
+    index.update('usages', entries + [_entry(tmp_path, 'b.ts', "t('c.d')")], agent._parse_key_usages)
+    index.save()
+    assert index.parsed == 2
+    assert index_path.read_text() == saved
@@ -0,0 +1,97 @@
+"""
+Tests unitaires - core.git_index (chemins de diff, cache d'historique par HEAD)
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from core import git_index
+from core.git_index import GitIndex, _diff_path
+
+
+def _section(old: str, new: str, header: str = 'diff --git a/x b/x') -> str:
+    return f"{header}\nindex 1..2 100644\n{old}\n{new}\n@@ -1 +1 @@\n-a\n+b\n"
+
+
+@pytest.mark.parametrize('old, new, expected', [
+    ('--- a/src/app.ts', '+++ b/src/app.ts', 'src/app.ts'),
+    # Chemin avec espace: git ajoute une tabulation finale
+    ('--- a/backend/sp ace.json\t', '+++ b/backend/sp ace.json\t', 'backend/sp ace.json'),
+    # Chemin cité (guillemets, échappements C, octal)
+    ('--- "a/q\\"uote.ts"', '+++ "b/q\\"uote.ts"', 'q"uote.ts'),
+    ('--- "a/tab\\there.ts"', '+++ "b/tab\\there.ts"', 'tab\there.ts'),
+    ('--- "a/caf\\303\\251.ts"', '+++ "b/caf\\303\\251.ts"', 'café.ts'),
+    # Fichier supprimé: côté ---
+    ('--- a/gone.ts', '+++ /dev/null', 'gone.ts'),
+    ('--- a/gone space.ts\t', '+++ /dev/null', 'gone space.ts'),
+    # Fichier ajouté
+    ('--- /dev/null', '+++ b/new.ts', 'new.ts'),
+])
+def test_diff_path_headers(old, new, expected):
+    assert _diff_path(_section(old, new)) == expected
+
+
+def test_diff_path_binary_falls_back_to_git_header():
+    assert _diff_path('diff --git a/img one.png b/img one.png\nBinary files differ\n') == 'img one.png'
+    assert _diff_path('diff --git "a/q\\"b.bin" "b/q\\"b.bin"\nBinary files differ\n') == 'q"b.bin'
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    if shutil.which('git') is None:
+        pytest.skip('git absent')
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'sp ace.ts').write_text('a\n')
+    (tmp_path / 'app.ts').write_text('a\n')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-q', '-m', 'fix: init')
+    return tmp_path
+
+
+def test_diff_of_path_with_space(repo):
+    (repo / 'sp ace.ts').write_text('b\nc\n')
+    _git(repo, 'add', '.')
+    index = GitIndex.build(repo, use_cache=False)
+    assert index.changed_files == ['sp ace.ts']
+    hunks = index.diff('sp ace.ts').hunks
+    assert len(hunks) == 1 and hunks[0].new_count == 2
+    assert index.diff(repo / 'sp ace.ts').hunks == hunks
+
+
+def test_history_cache_is_keyed_by_head(repo, monkeypatch):
+    cache_path = repo / '.ai-agents' / 'cache' / 'git_index.json'
+    first = GitIndex.build(repo)
+    assert first.history('sp ace.ts').commits == 1
+    assert first.history('app.ts').bug_fixes == 1
+    assert json.loads(cache_path.read_text())['head'] == first.head
+
+    # Même HEAD: l'historique vient du cache, sans git log
+    calls = []
+    real_read = git_index._read_history
+    monkeypatch.setattr(git_index, '_read_history', lambda root: calls.append(root) or real_read(root))
+    assert GitIndex.build(repo).history('app.ts').commits == 1
+    assert calls == []
+
+    # Nouveau commit: HEAD change, l'historique est relu
+    (repo / 'app.ts').write_text('b\n')
+    _git(repo, 'commit', '-q', '-am', 'feature')
+    second = GitIndex.build(repo)
+    assert calls == [repo]
+    assert second.head != first.head
+    assert second.history('app.ts').commits == 2
+    assert json.loads(cache_path.read_text())['head'] == second.head
+
+
+def test_history_cache_disabled(repo):
+    GitIndex.build(repo, use_cache=False)
+    assert not (repo / '.ai-agents' / 'cache' / 'git_index.json').exists()
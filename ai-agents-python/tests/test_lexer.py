@@ -0,0 +1,155 @@
+"""
+Tests unitaires - core.lexer (arbre des fonctions TS/Python) et métriques A5
+"""
+
+import pytest
+
+from agents.analysis.a5_complexity import A5ComplexityAgent
+from core.lexer import iter_functions, language_for, scan_functions
+
+
+def _functions(text, language='script'):
+    """{nom: FunctionSpan} de tout l'arbre (noms uniques dans les tests)"""
+    return {span.name: span for span in iter_functions(scan_functions(text, language))}
+
+
+def test_braces_in_strings_templates_comments_and_regex_are_skipped():
+    functions = _functions("""
+function outer(a, b) {
+  const s = "}{ pas une accolade";
+  const q = '}';
+  const t = `x ${a ? '}' : `{${b}}`} y`;
+  // } commentaire
+  /* { bloc } */
+  const re = /[}{]+\\//g;
+  if (a) {
+    return s;
+  }
+  return t;
+}
+function after() { return 1; }
+""")
+    assert list(functions) == ['outer', 'after']
+    outer = functions['outer']
+    assert (outer.start_line, outer.end_line, outer.params) == (2, 13, 2)
+    # if + ternaire du template
+    assert outer.cyclomatic == 3
+    assert functions['after'].start_line == functions['after'].end_line == 14
+
+
+def test_division_is_not_a_regex():
+    functions = _functions("""
+const total = rows.reduce((acc, row) => acc + row.value / 2, 0) / count;
+const half = function named(a) { return a / 2 / 3; };
+function next() { return 1; }
+""")
+    assert list(functions) == ['reduce(callback)', 'named', 'next']
+    assert functions['next'].start_line == 4
+
+
+def test_nested_functions_are_separate_nodes():
+    roots = scan_functions("""
+function parent(x) {
+  function inner(y) {
+    if (y) { return 1; }
+    return 2;
+  }
+  const curry = (z) => (w) => z + w;
+  items.map(item => {
+    if (item) { return item; }
+  });
+  return inner(x);
+}
+""", 'script')
+    assert [span.name for span in roots] == ['parent']
+    parent = roots[0]
+    assert [child.name for child in parent.children] == ['inner', 'curry', 'map(callback)']
+    assert [child.name for child in parent.children[1].children] == ['<anonymous>']
+    # Les if des fonctions imbriquées ne comptent pas pour la fonction parente
+    assert (parent.cyclomatic, parent.cognitive, parent.nesting) == (1, 0, 0)
+    assert (parent.children[0].cyclomatic, parent.children[0].nesting) == (2, 1)
+    assert parent.children[2].end_line == 10
+
+
+def test_control_blocks_are_not_functions():
+    functions = _functions("""
+class Service {
+  async load(id: string, opts?: { force: boolean }): Promise<void> {
+    if (id) {
+      for (const x of opts) {
+        while (x) { break; }
+      }
+    } else if (opts) {
+      switch (id) { case 'a': return; }
+    }
+    try { run(); } catch (e) { log(e); }
+    const ok = b && c || d;
+  }
+}
+""")
+    assert list(functions) == ['load']
+    load = functions['load']
+    assert (load.start_line, load.end_line, load.params) == (3, 13, 2)
+    # if, for, while, else if, case, catch, &&, ||
+    assert load.cyclomatic == 9
+    assert load.nesting == 3
+
+
+def test_python_functions_and_parameters():
+    functions = _functions('''
+def outer(a, b, /, c, *, d, **kw):
+    s = "def fake(): pass"
+    t = """
+    def also_fake(x):
+        if x: pass
+    """
+    # def comment(): pass
+    def inner(x, *args):
+        if x and args:
+            return 1
+        elif x:
+            return 2
+        return 3
+    for i in range(3):
+        if i:
+            pass
+    return inner
+
+class Model:
+    def method(self, *, key=None):
+        return key
+''', 'python')
+    assert list(functions) == ['outer', 'inner', 'method']
+    outer, inner, method = functions['outer'], functions['inner'], functions['method']
+    # '/' et '*' seuls ne sont pas des paramètres, self non plus
+    assert (outer.params, inner.params, method.params) == (5, 2, 1)
+    assert (outer.start_line, outer.end_line) == (2, 18)
+    assert (outer.cyclomatic, outer.cognitive, outer.nesting) == (3, 3, 2)
+    assert (inner.cyclomatic, inner.cognitive, inner.nesting) == (4, 3, 1)
+
+
+@pytest.mark.parametrize('suffix, expected', [
+    ('.ts', 'script'), ('.TSX', 'script'), ('.py', 'python'), ('.css', None),
+])
+def test_language_for(suffix, expected):
+    assert language_for(suffix) == expected
+
+
+def test_a5_reports_complex_function_without_its_callbacks(tmp_path):
+    branches = '\n'.join(f"  if (x === {i}) {{ return {i}; }}" for i in range(6))
+    path = tmp_path / 'service.ts'
+    path.write_text(f"""
+export function route(x) {{
+{branches}
+  return handlers.map(h => {{
+    if (h.a) {{ return 1; }}
+    if (h.b) {{ return 2; }}
+    return 0;
+  }});
+}}
+""", encoding='utf-8')
+    agent = A5ComplexityAgent(tmp_path, None)
+    findings = agent.analyze_file(path)
+    assert agent.functions_scanned == 2
+    assert [(f.function_name, f.line_number, f.cyclomatic_complexity) for f in findings] == [('route', 2, 7)]
+    assert findings[0].file_path == 'service.ts'
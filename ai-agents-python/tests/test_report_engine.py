@@ -0,0 +1,101 @@
+"""
+Tests unitaires - core.report_engine (identité et rendu des findings A3 / A5)
+"""
+
+from core.evidence import EvidenceLogger
+from core.report_engine import ReportEngine, describe, finding_file, finding_identity
+from core.runner import AgentResult
+
+
+def _a5(function, line, cyclomatic=12, file='frontend/app/routes/cart.tsx'):
+    """Finding A5 tel que sérialisé par A5ComplexityAgent.analyze()"""
+    return {
+        'file': file, 'function': function, 'line': line,
+        'cyclomatic': cyclomatic, 'cognitive': 9, 'nesting': 2, 'parameters': 1,
+        'severity': 'MEDIUM', 'recommendation': 'Diviser en fonctions plus petites',
+    }
+
+
+def _a5_result(findings):
+    """A5 renvoie un seul résumé contenant la liste des findings"""
+    return {'total_complex_functions': len(findings), 'findings': findings}
+
+
+def _a3(files, fragment, start=10):
+    """Finding A3 tel que sérialisé par DuplicationDetector._serialize()"""
+    return {
+        'files': files,
+        'lines_duplicated': 8,
+        'tokens': 60,
+        'fragment': fragment,
+        'locations': [{'file': f, 'start_line': start, 'end_line': start + 7} for f in files],
+        'severity': 'MEDIUM',
+        'occurrences': len(files),
+        'impact_score': 8 * len(files),
+    }
+
+
+def _session(tmp_path, name, results):
+    logger = EvidenceLogger(tmp_path / name)
+    for agent_name, findings in results.items():
+        logger.log_analysis(agent_name, AgentResult(
+            agent_name=agent_name, agent_type='analysis', status='success', duration_ms=1,
+            findings=findings, fixes_applied=[], errors=[], warnings=[], metadata={},
+        ))
+    return ReportEngine.from_session(logger.evidence_dir)
+
+
+def test_a5_identity_distinguishes_functions_of_a_file():
+    loader, action = _a5('loader', 10), _a5('action', 80)
+    assert finding_identity('a5_complexity', loader) != finding_identity('a5_complexity', action)
+    # Une fonction nommée qui se déplace garde son identité
+    assert finding_identity('a5_complexity', loader) == finding_identity('a5_complexity', _a5('loader', 14))
+    # Fonctions anonymes / callbacks: la ligne les distingue
+    assert (finding_identity('a5_complexity', _a5('useEffect(callback)', 20))
+            != finding_identity('a5_complexity', _a5('useEffect(callback)', 40)))
+
+
+def test_a3_identity_and_file():
+    dup = _a3(['backend/src/a.ts', 'backend/src/b.ts'], 'const total = items.reduce(')
+    other = _a3(['backend/src/a.ts', 'backend/src/c.ts'], 'const total = items.reduce(')
+    assert finding_file(dup) == 'backend/src/a.ts'
+    assert finding_identity('a3_duplications', dup) != finding_identity('a3_duplications', other)
+    assert 'aussi dans `backend/src/b.ts`' in describe(dup)
+
+
+def test_a5_description_uses_emitted_keys():
+    desc = describe(_a5('loader', 10, cyclomatic=17))
+    assert desc.startswith('Fonction `loader` (ligne 10) - Cyclo: 17')
+    assert 'N/A' not in desc
+
+
+def test_report_renders_a3_and_a5_per_file(tmp_path):
+    engine = _session(tmp_path, 'run', {
+        'a3_duplications': [
+            _a3(['backend/src/a.ts', 'backend/src/b.ts'], 'fragment one is long enough'),
+            _a3(['backend/src/c.ts', 'backend/src/a.ts'], 'fragment two is long enough'),
+            _a3(['backend/src/d.ts', 'backend/src/e.ts'], 'fragment three is long enough'),
+        ],
+        'a5_complexity': [_a5_result([_a5('loader', 10), _a5('action', 80)])],
+    })
+    top = dict(engine.top_files('a3_duplications'))
+    assert sorted(top) == ['backend/src/a.ts', 'backend/src/c.ts', 'backend/src/d.ts']
+    assert 'N/A' not in top
+
+    report = engine.render('markdown')
+    assert '`frontend/app/routes/cart.tsx`' in report
+    assert 'Fonction `loader` (ligne 10)' in report
+    assert '`N/A`' not in report
+
+
+def test_diff_reports_the_regressed_function(tmp_path):
+    base = _session(tmp_path, 'base', {
+        'a5_complexity': [_a5_result([_a5('loader', 10), _a5('action', 80)])],
+    })
+    current = _session(tmp_path, 'current', {
+        # loader déplacé (ligne 12), action résolue, meta nouvelle
+        'a5_complexity': [_a5_result([_a5('loader', 12), _a5('meta', 120)])],
+    })
+    agent = current.diff(base)['agents'][0]
+    assert [f['function'] for f in agent['new']] == ['meta']
+    assert [f['function'] for f in agent['resolved']] == ['action']
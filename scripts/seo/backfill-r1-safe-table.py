@@ -45,6 +45,9 @@ import psycopg2.extras
 import yaml
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "wiki-generators"))
+import frontmatter_cache
+
 # ==========================================================================
 # CONFIG
 # ==========================================================================
@@ -121,12 +124,15 @@ def read_rag_frontmatter(alias: str) -> dict[str, Any] | None:
     fp = RAG_GAMMES_DIR / f"{alias}.md"
     if not fp.exists():
         return None
-    raw = fp.read_text(encoding="utf-8")
+    return frontmatter_cache.cached_parse(fp, "backfill-r1.read_rag_frontmatter@1", _parse_rag_frontmatter)
+
+
+def _parse_rag_frontmatter(raw: str) -> dict[str, Any] | None:
     parts = raw.split("---", 2)
     if len(parts) < 3:
         return None
     try:
-        return yaml.safe_load(parts[1]) or {}
+        return frontmatter_cache.safe_load(parts[1]) or {}
     except yaml.YAMLError:
         return None
 
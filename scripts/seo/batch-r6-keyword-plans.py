@@ -20,6 +20,9 @@ from typing import Any
 import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "wiki-generators"))
+import frontmatter_cache
+
 # Load env from backend/.env
 BACKEND_ENV = Path(__file__).resolve().parent.parent.parent / "backend" / ".env"
 load_dotenv(BACKEND_ENV)
@@ -70,7 +73,11 @@ SECTION_TEMPLATE = [
 
 def parse_rag_md(filepath: Path) -> dict[str, Any]:
     """Extract structured data from a RAG gamme .md file."""
-    text = filepath.read_text(encoding="utf-8", errors="replace")
+    return frontmatter_cache.cached_parse(filepath, "batch-r6.parse_rag_md@1", _parse_rag_text, errors="replace")
+
+
+def _parse_rag_text(text: str) -> dict[str, Any]:
+    """Extract structured data from RAG gamme markdown text."""
 
     def extract_field(pattern: str, default: str = "") -> str:
         m = re.search(pattern, text, re.MULTILINE)
@@ -24,6 +24,9 @@ import glob as glob_mod
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "wiki-generators"))
+import frontmatter_cache
+
 RAG_DIR = "/opt/automecanik/rag/knowledge/gammes"
 
 # Mapping section → blocs RAG requis + minimum items
@@ -107,20 +110,24 @@ def _worst(current: str, new: str) -> str:
 def parse_rag_frontmatter(filepath: str) -> Optional[dict]:
     """Parse le frontmatter YAML d'un fichier RAG gamme."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+        return frontmatter_cache.cached_parse(
+            filepath, "rag.parse_rag_frontmatter@1", _parse_rag_frontmatter_text)
     except FileNotFoundError:
         return None
 
+
+def _parse_rag_frontmatter_text(content: str) -> Optional[dict]:
+    """Frontmatter YAML d'un contenu RAG gamme (tout le contenu si pas de ---)."""
+
     match = re.match(r"^---\s*\n(.*?)\n---", content, re.DOTALL)
     if not match:
         try:
-            return yaml.safe_load(content)
+            return frontmatter_cache.safe_load(content)
         except yaml.YAMLError:
             return None
 
     try:
-        return yaml.safe_load(match.group(1))
+        return frontmatter_cache.safe_load(match.group(1))
     except yaml.YAMLError:
         return None
 
@@ -26,6 +26,9 @@ from datetime import date
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "wiki-generators"))
+import frontmatter_cache
+
 RAG_DIR = "/opt/automecanik/rag/knowledge/gammes"
 BACKUP_DIR = os.path.join(RAG_DIR, ".backup-v1")
 
@@ -37,15 +40,17 @@ def today_iso() -> str:
 def parse_file(filepath: str) -> tuple[Optional[dict], str]:
     """Parse frontmatter YAML and return (frontmatter, markdown_body)."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+        return frontmatter_cache.cached_parse(filepath, "rag-upgrade-v4.parse_file@1", _parse_content)
     except FileNotFoundError:
         return None, ""
 
+
+def _parse_content(content: str) -> tuple[Optional[dict], str]:
+    """(frontmatter, markdown_body) of a file content ; whole content as YAML if no delimiters."""
     match = re.match(r"^---\s*\n(.*?)\n---\s*\n?(.*)", content, re.DOTALL)
     if match:
         try:
-            fm = yaml.safe_load(match.group(1))
+            fm = frontmatter_cache.safe_load(match.group(1))
             body = match.group(2)
             return fm, body
         except yaml.YAMLError:
@@ -53,7 +58,7 @@ def parse_file(filepath: str) -> tuple[Optional[dict], str]:
 
     # No frontmatter delimiters — try parsing entire file as YAML
     try:
-        fm = yaml.safe_load(content)
+        fm = frontmatter_cache.safe_load(content)
         return fm, ""
     except yaml.YAMLError:
         return None, ""
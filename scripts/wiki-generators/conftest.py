@@ -0,0 +1,11 @@
+"""Shared pytest fixtures for the wiki-generators suites."""
+import pytest
+
+import frontmatter_cache  # Same module object the scripts import (their sys.path insert)
+
+
+@pytest.fixture(autouse=True)
+def isolated_frontmatter_cache(tmp_path, monkeypatch):
+    """Per-test frontmatter cache : tests never read or fill ~/.cache/automecanik."""
+    monkeypatch.setenv("FRONTMATTER_CACHE_PATH", str(tmp_path / "frontmatter-cache.sqlite"))
+    monkeypatch.setattr(frontmatter_cache, "_default_cache", None)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+frontmatter_cache.py — Shared on-disk cache of parsed RAW/RAG markdown (frontmatter + body).
+
+The gamme and web `.md` corpora are parsed by several single-file scripts, each with its
+own (intentionally different) parser :
+  - promote-raw-gammes-to-wiki.py      parse_frontmatter      (tolerant Convention A/B)
+  - gamme-from-web-corpus-generator.py read_web_file          (flat key: value)
+  - seo/rag-check.py, seo/seo-queries.py parse_rag_frontmatter
+  - seo/batch-r6-keyword-plans.py      parse_rag_md           (regex extraction)
+  - seo/backfill-r1-safe-table.py      read_rag_frontmatter
+  - seo/rag-upgrade-v4.py              parse_file
+
+Each parser keeps its semantics ; this module memoizes its result per (parser, path) in a
+SQLite sidecar. An entry is reused while (mtime_ns, size) match (no read at all), or when the
+content sha1 still matches (touched but unchanged file). Parse errors are never cached.
+
+Parser names carry a version (`rag-check.frontmatter@1`) : bump it when a parser changes.
+YAML goes through `safe_load` (libyaml CSafeLoader when available).
+
+Values are stored as JSON (never pickle : the sidecar is a shared file under ~/.cache). Types
+JSON lacks — date/datetime, tuple, set, bytes, dicts with non-str keys — are tagged as
+{"__t": <type>, "v": ...} ; a value with any other type is returned but not cached.
+
+Configurable via env :
+  FRONTMATTER_CACHE_PATH (default $XDG_CACHE_HOME/automecanik/frontmatter-cache.sqlite)
+  FRONTMATTER_CACHE      (0 | off — disable, parse every time)
+
+Usage :
+  python3 scripts/wiki-generators/frontmatter_cache.py [--stats] [--clear]
+"""
+import os
+import sys
+import json
+import base64
+import sqlite3
+import hashlib
+import argparse
+import datetime
+from pathlib import Path
+
+try:
+    import yaml
+except ImportError:
+    yaml = None  # Only safe_load needs it (read_web_file / parse_rag_md parse without YAML)
+
+# libyaml C loader (~10x faster) when PyYAML was built with it, pure Python otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+DEFAULT_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "automecanik" / "frontmatter-cache.sqlite"
+)
+
+# Bumped when the stored value encoding changes : older tables are dropped on open
+# (2 = tagged JSON ; 0/1 = pickle, never loaded)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    parser   TEXT NOT NULL,
+    path     TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    sha1     TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    PRIMARY KEY (parser, path)
+)
+"""
+
+TAG = "__t"
+
+
+def safe_load(text):
+    """yaml.safe_load via libyaml when available (same result types as yaml.safe_load)."""
+    if yaml is None:
+        raise ImportError("Manque : pip install pyyaml")
+    return yaml.load(text, Loader=YAML_LOADER)
+
+
+def _encode(value):
+    """Parse result → JSON-compatible tree ; TypeError for a type with no tag."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if TAG not in value and all(isinstance(k, str) for k in value):
+            return {k: _encode(v) for k, v in value.items()}
+        return {TAG: "map", "v": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {TAG: "tuple", "v": [_encode(v) for v in value]}
+    if isinstance(value, datetime.datetime):  # Before date : datetime is a date subclass
+        return {TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {TAG: "date", "v": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {TAG: "set", "v": [_encode(v) for v in value]}
+    if isinstance(value, bytes):
+        return {TAG: "bytes", "v": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"not cacheable : {type(value).__name__}")
+
+
+_DECODERS = {
+    "map": lambda v: {k: item for k, item in v},
+    "tuple": tuple,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "set": set,
+    "bytes": base64.b64decode,
+}
+
+
+def _decode_object(obj):
+    """json object_hook : tagged objects back to their Python type (inner objects first)."""
+    if TAG in obj and len(obj) == 2 and "v" in obj:
+        return _DECODERS[obj[TAG]](obj["v"])
+    return obj
+
+
+def dumps(value):
+    """Tagged JSON text of a parse result (TypeError / ValueError when not encodable)."""
+    return json.dumps(_encode(value), ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(text):
+    """Inverse of dumps."""
+    return json.loads(text, object_hook=_decode_object)
+
+
+class FrontmatterCache:
+    """SQLite sidecar : (parser, path) → tagged-JSON parse result, validated by mtime/size/sha1.
+
+    Safe across fork (process pools) : a child process reopens its own connection.
+    Each write is its own transaction (WAL), so short-lived workers lose nothing.
+    An unusable cache file (unwritable directory, corrupt database) degrades to plain parsing.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else Path(os.getenv("FRONTMATTER_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._unavailable = False
+
+    def _connection(self):
+        """Open (once per process) connection, or None when the cache file cannot be used."""
+        if self._pid != os.getpid():
+            self._conn, self._unavailable = None, False
+            self._pid = os.getpid()
+        if self._conn is None and not self._unavailable:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS parsed")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute(SCHEMA)
+                self._conn = conn
+            except (sqlite3.Error, OSError):
+                self._unavailable = True  # Don't retry on every file
+        return self._conn
+
+    def get(self, path, parser, parse, errors="strict"):
+        """Parse result of `parse(text)` for `path`, from cache when the file is unchanged.
+
+        Raises OSError (e.g. FileNotFoundError) like a plain read ; exceptions raised by
+        `parse` propagate and nothing is cached.
+        """
+        key = str(Path(path).resolve())
+        st = os.stat(key)
+        conn, row = self._connection(), None
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT mtime_ns, size, sha1, value FROM parsed WHERE parser = ? AND path = ?",
+                    (parser, key),
+                ).fetchone()
+            except sqlite3.Error:
+                conn = None
+
+        cached = None
+        if row is not None:
+            try:
+                cached = loads(row[3])
+            except (ValueError, TypeError, KeyError):
+                row = None  # Undecodable entry : parse again and overwrite it
+
+        if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            self.hits += 1
+            return cached
+
+        with open(key, "rb") as f:
+            data = f.read()
+        sha1 = hashlib.sha1(data).hexdigest()
+        if row is not None and row[2] == sha1:
+            # Touched, not changed : refresh stat, keep parsed value
+            self.hits += 1
+            self._store(conn, parser, key, st, sha1, row[3])
+            return cached
+
+        self.misses += 1
+        text = data.decode("utf-8", errors=errors)
+        if "\r" in text:
+            # Same universal newlines as open(path) / read_text() in the parsers
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        value = parse(text)
+        try:
+            encoded = dumps(value)
+        except (TypeError, ValueError):
+            return value  # Untagged type (or cycle) : returned, just not cached
+        self._store(conn, parser, key, st, sha1, encoded)
+        return value
+
+    def _store(self, conn, parser, key, st, sha1, encoded):
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed (parser, path, mtime_ns, size, sha1, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (parser, key, st.st_mtime_ns, st.st_size, sha1, encoded),
+            )
+        except (sqlite3.Error, OSError):
+            pass  # Read-only / locked cache : parse result still returned
+
+    def _require_connection(self):
+        conn = self._connection()
+        if conn is None:
+            raise OSError(f"frontmatter cache unavailable : {self.path}")
+        return conn
+
+    def stats(self):
+        """Entries per parser + hits/misses of this process."""
+        rows = self._require_connection().execute(
+            "SELECT parser, COUNT(*), SUM(LENGTH(CAST(value AS BLOB))) FROM parsed GROUP BY parser ORDER BY parser"
+        ).fetchall()
+        return {
+            "path": str(self.path),
+            "parsers": {parser: {"entries": n, "bytes": size} for parser, n, size in rows},
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        self._require_connection().execute("DELETE FROM parsed")
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache, or None when disabled (FRONTMATTER_CACHE=0|off)."""
+    global _default_cache
+    if os.getenv("FRONTMATTER_CACHE", "").lower() in ("0", "off", "false", "no"):
+        return None
+    if _default_cache is None:
+        _default_cache = FrontmatterCache()
+    return _default_cache
+
+
+def cached_parse(path, parser, parse, errors="strict"):
+    """`parse(text)` of the file at `path`, memoized in the default cache (if enabled)."""
+    cache = default_cache()
+    if cache is None:
+        return parse(Path(path).read_text(encoding="utf-8", errors=errors))
+    return cache.get(path, parser, parse, errors=errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect / clear the shared parsed-frontmatter cache.")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached entry")
+    parser.add_argument("--stats", action="store_true", help="Entries per parser (default)")
+    args = parser.parse_args()
+
+    cache = FrontmatterCache()
+    try:
+        if args.clear:
+            cache.clear()
+            sys.stderr.write(f"[frontmatter-cache] cleared {cache.path}\n")
+        stats = cache.stats()
+    except OSError as e:
+        sys.stderr.write(f"[frontmatter-cache] {e}\n")
+        return 1
+    print(f"cache : {stats['path']} (yaml loader : {getattr(YAML_LOADER, '__name__', None)})")
+    for name, entry in stats["parsers"].items():
+        print(f"  {name:<40} {entry['entries']:>6} entries  {entry['bytes'] / 1024:>8.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,17 +12,37 @@ Configurable via env :
   AUTOMECANIK_RAW_PATH  (default /opt/automecanik/automecanik-raw) — INPUT corpus web
   AUTOMECANIK_WIKI_PATH (default /opt/automecanik/automecanik-wiki) — OUTPUT artefact
 
+Incrémental : un manifest (`<gammes>/.web-corpus-manifest.json`, hash fichier web → gammes
+alimentées) limite le re-scan aux fichiers ajoutés/modifiés et le recalcul aux gammes touchées ;
+un bloc phase5_enrichment identique (hors `_enriched_at`) n'est pas réécrit. --full ignore le manifest.
+
+Le mapping fichier → gammes compile GAMME_KEYWORDS une fois en automate Aho-Corasick
+(pyahocorasick si installé, implémentation Python sinon) : chaque body est parcouru une
+seule fois. Lecture + extraction technique sont réparties sur un pool de process (--jobs).
+
 Usage:
-  python3 scripts/wiki-generators/gamme-from-web-corpus-generator.py [--dry-run] [--gamme disque-de-frein] [--force]
+  python3 scripts/wiki-generators/gamme-from-web-corpus-generator.py [--dry-run] [--gamme disque-de-frein] [--force] [--jobs N] [--full]
 """
 
 import os
 import re
+import sys
 import json
+import hashlib
+import inspect
 import argparse
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import ahocorasick  # pyahocorasick (C) — optionnel, ~6x plus rapide que le fallback Python
+except ImportError:
+    ahocorasick = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import frontmatter_cache
+
 # INPUT : corpus web brut hébergé dans automecanik-raw/recycled/rag-knowledge/
 # (post PR raw #15 — Phase C extension import contenu métier).
 RAW_REPO = os.getenv("AUTOMECANIK_RAW_PATH", "/opt/automecanik/automecanik-raw")
@@ -387,8 +407,11 @@ GAMME_TYPE_EXCLUSIONS = {
 
 def read_web_file(filepath):
     """Lit un fichier web .md et retourne frontmatter + body."""
-    with open(filepath) as f:
-        raw = f.read()
+    return frontmatter_cache.cached_parse(filepath, "web-corpus.read_web_file@1", _parse_web_text)
+
+
+def _parse_web_text(raw):
+    """Frontmatter plat `clé: valeur` (sans YAML) + body d'un fichier web."""
     parts = raw.split('---', 2)
     if len(parts) < 3:
         return {}, ''
@@ -436,56 +459,296 @@ def extract_technical_data(body, source_url):
     return data
 
 
-def build_gamme_mapping():
-    """Mappe chaque gamme vers ses fichiers web OEM par contenu.
-    Cherche dans WEB_DIR + WEB_CATALOG_DIR (les deux corpus OEM).
+class KeywordAutomaton:
+    """Automate Aho-Corasick : mot-clé (minuscule) → slugs de gamme, un seul passage par texte.
+
+    Équivalent à `any(kw.lower() in text_lower for kw in keywords)` évalué pour chaque slug,
+    y compris pour les mots-clés qui se chevauchent ou s'emboîtent ('abs' dans 'capteur abs').
     """
-    mapping = defaultdict(list)  # gamme_slug → [(file, domain, technical_data)]
 
+    def __init__(self, gamme_keywords):
+        slugs_by_kw = defaultdict(set)
+        for slug, keywords in gamme_keywords.items():
+            for kw in keywords:
+                if kw:
+                    slugs_by_kw[kw.lower()].add(slug)
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw, slugs in slugs_by_kw.items():
+                self._automaton.add_word(kw, frozenset(slugs))
+            self._automaton.make_automaton()
+            return
+
+        self._automaton = None
+        # Trie : transitions par état + slugs terminaux
+        self._goto = [{}]
+        out = [set()]
+        for kw, slugs in slugs_by_kw.items():
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    self._goto.append({})
+                    out.append(set())
+                    nxt = len(self._goto) - 1
+                    self._goto[state][ch] = nxt
+                state = nxt
+            out[state] |= slugs
+
+        # Liens d'échec en largeur ; chaque état hérite des slugs de son suffixe (output links)
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                out[nxt] |= out[self._fail[nxt]]
+        self._out = [frozenset(o) for o in out]
+
+    def match_slugs(self, text_lower):
+        """Ensemble des slugs dont au moins un mot-clé apparaît dans `text_lower`."""
+        found = set()
+        if self._automaton is not None:
+            for _, slugs in self._automaton.iter(text_lower):
+                found |= slugs
+            return found
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text_lower:
+            transitions = goto[state]
+            while ch not in transitions and state:
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+_keyword_automaton = None
+
+
+def keyword_automaton():
+    """Automate GAMME_KEYWORDS compilé une fois par process (hérité par les workers forkés)."""
+    global _keyword_automaton
+    if _keyword_automaton is None:
+        _keyword_automaton = KeywordAutomaton(GAMME_KEYWORDS)
+    return _keyword_automaton
+
+
+def scan_web_file(fp):
+    """Worker : un fichier web → (file, domain, tech_data, slugs) ou None (court / non-OEM).
+
+    Slugs : slug_gamme direct si présent, sinon gammes dont un mot-clé matche le body
+    (ordre de GAMME_KEYWORDS).
+    """
+    fm, body = read_web_file(fp)
+    if not body or len(body) < 200:
+        return None
+
+    source_url = fm.get('source_url', '')
+    domain = source_url.split('/')[2] if '//' in source_url else ''
+    is_oem = any(d in domain for d in OEM_DOMAINS)
+    if not is_oem:
+        return None
+
+    tech_data = extract_technical_data(body, source_url)
+
+    # Mapping direct via slug_gamme (fichiers Wikipedia + corpus tagués)
+    direct_slug = fm.get('slug_gamme', '').strip()
+    if direct_slug:
+        slugs = [direct_slug]  # Pas besoin de keyword matching si slug direct
+    else:
+        matched = keyword_automaton().match_slugs(body.lower())
+        slugs = [slug for slug in GAMME_KEYWORDS if slug in matched]
+
+    return os.path.basename(fp), domain.replace('www.', ''), tech_data, slugs
+
+
+def list_corpus_files():
+    """[(clé manifest, chemin)] des .md de WEB_DIR + WEB_CATALOG_DIR, ordre stable (dir puis nom)."""
+    files = []
     corpus_dirs = [WEB_DIR, WEB_CATALOG_DIR]
     for corpus_dir in corpus_dirs:
         if not os.path.isdir(corpus_dir):
             continue
         for f in sorted(os.listdir(corpus_dir)):
-            if not f.endswith('.md'):
-                continue
-            fp = os.path.join(corpus_dir, f)
-            fm, body = read_web_file(fp)
-            if not body or len(body) < 200:
-                continue
+            if f.endswith('.md'):
+                files.append((f"{os.path.basename(os.path.normpath(corpus_dir))}/{f}", os.path.join(corpus_dir, f)))
+    return files
 
-            source_url = fm.get('source_url', '')
-            domain = source_url.split('/')[2] if '//' in source_url else ''
-            is_oem = any(d in domain for d in OEM_DOMAINS)
-            if not is_oem:
-                continue
 
-            body_lower = body.lower()
-            tech_data = extract_technical_data(body, source_url)
-
-            # Mapping direct via slug_gamme (fichiers Wikipedia + corpus tagués)
-            direct_slug = fm.get('slug_gamme', '').strip()
-            if direct_slug:
-                mapping[direct_slug].append({
-                    'file': f,
-                    'domain': domain.replace('www.', ''),
-                    'tech_data': tech_data,
-                })
-                continue  # Pas besoin de keyword matching si slug direct
-
-            for slug, keywords in GAMME_KEYWORDS.items():
-                for kw in keywords:
-                    if kw.lower() in body_lower:
-                        mapping[slug].append({
-                            'file': f,
-                            'domain': domain.replace('www.', ''),
-                            'tech_data': tech_data,
-                        })
-                        break
+def scan_web_files(paths, jobs=None):
+    """scan_web_file sur chaque chemin, réparti sur `jobs` process (défaut : CPU count ; 1 = séquentiel)."""
+    keyword_automaton()  # Compilé avant le fork : partagé par les workers
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths) or 1))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(scan_web_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    return [scan_web_file(fp) for fp in paths]
+
 
+def mapping_from_scans(results):
+    """Résultats de scan_web_file (ordre fichiers) → gamme_slug → [{file, domain, tech_data}]."""
+    mapping = defaultdict(list)  # gamme_slug → [(file, domain, technical_data)]
+    for result in results:
+        if result is None:
+            continue
+        f, domain, tech_data, slugs = result
+        for slug in slugs:
+            mapping[slug].append({
+                'file': f,
+                'domain': domain,
+                'tech_data': tech_data,
+            })
     return mapping
 
 
+def build_gamme_mapping(jobs=None):
+    """Mappe chaque gamme vers ses fichiers web OEM par contenu.
+    Cherche dans WEB_DIR + WEB_CATALOG_DIR (les deux corpus OEM).
+    `jobs` : nombre de process (défaut : CPU count ; 1 = séquentiel).
+    """
+    paths = [fp for _, fp in list_corpus_files()]
+    return mapping_from_scans(scan_web_files(paths, jobs=jobs))
+
+
+# === MANIFEST INCRÉMENTAL ===
+# Par fichier web : stat + sha1 + résultat du scan (slugs, domaine, données techniques), et par
+# gamme le hash du dernier bloc appliqué + stat/sha1 du fichier gamme écrit. Un run ne re-scanne
+# que les fichiers ajoutés/modifiés et ne recalcule que les gammes touchées par un fichier
+# ajouté, modifié ou supprimé, ou dont le fichier gamme a changé depuis (reset, édition).
+MANIFEST_PATH = f"{GAMMES_DIR}/.web-corpus-manifest.json"
+# À incrémenter si le format du manifest change. Le code d'extraction est déjà couvert par
+# corpus_fingerprint (source des fonctions) : le modifier invalide le manifest sans bump.
+MANIFEST_VERSION = 2
+
+
+def corpus_fingerprint():
+    """Empreinte des règles de mapping/extraction : si elle change, le manifest est ignoré.
+
+    Couvre les constantes (mots-clés, domaines OEM, regex) et le source des fonctions
+    d'extraction : un changement de filtre (ex : _is_valid_value) force un re-scan complet.
+    """
+    # Fonctions dont le résultat est mémorisé dans le manifest (scan par fichier, bloc par gamme)
+    extraction = (_parse_web_text, _is_valid_value, extract_technical_data, scan_web_file, build_enrichment_block)
+    rules = [
+        MANIFEST_VERSION,
+        GAMME_KEYWORDS,
+        sorted(OEM_DOMAINS),
+        [r.pattern for r in (NORM_RE, MATERIAL_RE, VALUE_RE, TYPE_RE)],
+        [inspect.getsource(fn) for fn in extraction],
+    ]
+    return hashlib.sha1(json.dumps(rules, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def load_manifest(path=None):
+    """Manifest précédent, ou manifest vide (absent, illisible ou règles modifiées)."""
+    empty = {'fingerprint': corpus_fingerprint(), 'files': {}, 'gammes': {}}
+    try:
+        with open(path or MANIFEST_PATH, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(manifest, dict) or manifest.get('fingerprint') != empty['fingerprint']:
+        return empty
+    manifest.setdefault('files', {})
+    manifest.setdefault('gammes', {})
+    return manifest
+
+
+def save_manifest(manifest, path=None):
+    """Écriture atomique (tmp + rename) à côté des gammes."""
+    path = path or MANIFEST_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def gamme_file_state(gamme_path):
+    """État du fichier gamme enregistré dans `manifest['gammes']` (stat + sha1)."""
+    st = os.stat(gamme_path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha1': _file_sha1(gamme_path)}
+
+
+def gamme_file_unchanged(gamme_path, entry):
+    """True si le fichier gamme est celui enregistré (stat identique ou, à défaut, même sha1)."""
+    try:
+        st = os.stat(gamme_path)
+        if entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return True
+        if entry['sha1'] != _file_sha1(gamme_path):
+            return False
+    except OSError:
+        return False
+    entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)  # Touché, pas modifié
+    return True
+
+
+def refresh_manifest(manifest, jobs=None):
+    """Met à jour `manifest['files']` depuis le corpus ; ne scanne que les fichiers ajoutés/modifiés.
+
+    Un fichier est inchangé si (mtime_ns, size) ou, à défaut, son sha1 correspond au manifest.
+    Retourne (mapping complet, gammes touchées, compteurs added/changed/removed/unchanged).
+    """
+    previous = manifest['files']
+    current = {}
+    to_scan = []
+    counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+
+    for key, fp in list_corpus_files():
+        st = os.stat(fp)
+        entry = previous.get(key)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            current[key] = entry
+            counts['unchanged'] += 1
+            continue
+        sha1 = _file_sha1(fp)
+        if entry and entry['sha1'] == sha1:
+            # Touché, pas modifié : stat rafraîchi, scan réutilisé
+            current[key] = dict(entry, mtime_ns=st.st_mtime_ns, size=st.st_size)
+            counts['unchanged'] += 1
+            continue
+        counts['changed' if entry else 'added'] += 1
+        current[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha1': sha1}
+        to_scan.append((key, fp))
+
+    affected = set()
+    for key, result in zip([k for k, _ in to_scan], scan_web_files([fp for _, fp in to_scan], jobs=jobs)):
+        entry = current[key]
+        if result is None:
+            entry['slugs'] = []
+        else:
+            _, entry['domain'], entry['tech_data'], entry['slugs'] = result
+        affected.update(entry['slugs'])
+        affected.update(previous.get(key, {}).get('slugs', []))
+
+    for key in previous.keys() - current.keys():
+        counts['removed'] += 1
+        affected.update(previous[key].get('slugs', []))
+
+    manifest['files'] = current
+    mapping = mapping_from_scans(
+        (key.split('/', 1)[1], entry['domain'], entry['tech_data'], entry['slugs']) if entry['slugs'] else None
+        for key, entry in current.items()
+    )
+    return mapping, affected, counts
+
+
 def build_enrichment_block(slug, files_data):
     """Construit le bloc phase5_enrichment YAML depuis les données web OEM."""
     # Agréger les données de tous les fichiers
@@ -550,26 +813,58 @@ def build_enrichment_block(slug, files_data):
     return '\n'.join(lines) + '\n'
 
 
+def block_hash(block):
+    """sha1 du bloc phase5_enrichment rendu, hors `_enriched_at` (date du run)."""
+    stable = '\n'.join(line for line in block.split('\n') if not line.lstrip().startswith('_enriched_at:'))
+    return hashlib.sha1(stable.encode('utf-8')).hexdigest()
+
+
+def find_enrichment_block(content):
+    """(début, fin) du bloc phase5_enrichment dans le contenu d'une gamme, ou None."""
+    if 'phase5_enrichment:' not in content:
+        return None
+    start = content.index('phase5_enrichment:')
+    rest = content[start:]
+    lines = rest.split('\n')
+    end_offset = 0
+    for i, line in enumerate(lines):
+        if i == 0:
+            continue
+        if line and not line.startswith(' ') and not line.startswith('#'):
+            end_offset = sum(len(l) + 1 for l in lines[:i])
+            break
+    if end_offset == 0:
+        end_offset = len(rest)
+    return start, start + end_offset
+
+
+def current_block_hash(gamme_path):
+    """block_hash du bloc phase5_enrichment présent dans le fichier gamme, ou None."""
+    try:
+        with open(gamme_path) as f:
+            content = f.read()
+    except OSError:
+        return None
+    span = find_enrichment_block(content)
+    return block_hash(content[span[0]:span[1]]) if span else None
+
+
 def inject_into_gamme(gamme_path, block):
-    """Injecte le bloc phase5_enrichment dans le frontmatter d'une gamme."""
+    """Injecte le bloc phase5_enrichment dans le frontmatter d'une gamme.
+
+    Retourne "written", "skip_unchanged" (bloc existant de même hash : fichier non réécrit)
+    ou "skip_malformed".
+    """
     with open(gamme_path) as f:
         content = f.read()
 
     # Supprimer l'ancien bloc phase5 LLM s'il existe
-    if 'phase5_enrichment:' in content:
-        start = content.index('phase5_enrichment:')
-        rest = content[start:]
-        lines = rest.split('\n')
-        end_offset = 0
-        for i, line in enumerate(lines):
-            if i == 0:
-                continue
-            if line and not line.startswith(' ') and not line.startswith('#'):
-                end_offset = sum(len(l) + 1 for l in lines[:i])
-                break
-        if end_offset == 0:
-            end_offset = len(rest)
-        content = content[:start] + content[start + end_offset:]
+    span = find_enrichment_block(content)
+    if span:
+        start, end = span
+        if block_hash(content[start:end]) == block_hash(block):
+            return "skip_unchanged"
+        content = content[:start] + content[end:]
 
     # Insérer le nouveau bloc avant conseil_v5: ou ---
     if 'conseil_v5:' in content:
@@ -580,7 +875,7 @@ def inject_into_gamme(gamme_path, block):
             second = content.index('---', first + 3)
         except ValueError:
             print(f"     ⚠️  Frontmatter malformé, skip")
-            return
+            return "skip_malformed"
         content = content[:second] + block + content[second:]
 
     # Update lifecycle
@@ -589,6 +884,7 @@ def inject_into_gamme(gamme_path, block):
 
     with open(gamme_path, 'w') as f:
         f.write(content)
+    return "written"
 
 
 PROTECTED_STATUSES = {'manually_curated', 'expert_reviewed'}
@@ -610,15 +906,23 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help="Ne pas écrire, juste rapport")
     parser.add_argument('--gamme', type=str, help="Enrichir une seule gamme")
     parser.add_argument('--force', action='store_true',
-                        help='Écraser les gammes déjà oem_verified (défaut: skip)')
+                        help='Écraser les gammes déjà oem_verified et recalculer même sans changement (défaut: skip)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Process pour lecture + extraction du corpus (défaut : CPU count)")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignorer le manifest : re-scanner tout le corpus et recalculer toutes les gammes")
     args = parser.parse_args()
 
     if not args.dry_run:
         os.makedirs(GAMMES_DIR, exist_ok=True)
 
     print("Étape 1 : Mapping gammes → fichiers web OEM...")
-    mapping = build_gamme_mapping()
+    manifest = {'fingerprint': corpus_fingerprint(), 'files': {}, 'gammes': {}} if args.full else load_manifest()
+    mapping, affected, counts = refresh_manifest(manifest, jobs=args.jobs)
+    recorded = manifest['gammes']
 
+    print(f"  Corpus : {counts['added']} ajoutés | {counts['changed']} modifiés | "
+          f"{counts['removed']} supprimés | {counts['unchanged']} inchangés")
     print(f"  {len(mapping)} gammes avec fichiers web OEM")
     print(f"  {sum(len(v) for v in mapping.values())} fichiers mappés total")
 
@@ -629,13 +933,26 @@ def main():
     skip_filter = 0
     skip_protected = 0
     skip_already = 0
+    skip_corpus_unchanged = 0
+    skip_block_unchanged = 0
 
     for slug in sorted(mapping.keys()):
         if args.gamme and slug != args.gamme:
             skip_filter += 1
+            if slug in affected:
+                recorded.pop(slug, None)  # Reste à recalculer au prochain run
             continue
 
         gamme_path = os.path.join(GAMMES_DIR, f"{slug}.md")
+
+        # Incrémental : aucun fichier contributeur ajouté/modifié/supprimé depuis le dernier bloc
+        # appliqué, et fichier gamme tel qu'écrit alors
+        if (not args.force and slug not in affected and slug in recorded
+                and gamme_file_unchanged(gamme_path, recorded[slug])):
+            skip_corpus_unchanged += 1
+            continue
+        previous = recorded.pop(slug, None)
+
         if not os.path.exists(gamme_path):
             continue
 
@@ -647,8 +964,11 @@ def main():
             skip_protected += 1
             continue
 
-        # oem_verified : skip sauf si --force
-        if current_status == 'oem_verified' and not args.force:
+        # oem_verified : skip sauf si --force, ou si le corpus de la gamme a changé et que
+        # son bloc est toujours celui écrit par ce script (pas d'édition depuis)
+        regenerate = (slug in affected and previous is not None
+                      and previous.get('block') == current_block_hash(gamme_path))
+        if current_status == 'oem_verified' and not args.force and not regenerate:
             skip_already += 1
             continue
 
@@ -661,11 +981,24 @@ def main():
         if args.dry_run:
             print(f"  [DRY] {slug} — {len(files_data)} fichiers, {n_rich} riches, sources: {', '.join(sorted(sources)[:3])}")
         else:
-            inject_into_gamme(gamme_path, block)
+            status = inject_into_gamme(gamme_path, block)
+            if status == "skip_malformed":
+                continue
+            recorded[slug] = dict(gamme_file_state(gamme_path), block=block_hash(block))
+            if status == "skip_unchanged":
+                skip_block_unchanged += 1
+                continue
             print(f"  [OK]  {slug} — {len(files_data)} fichiers, {n_rich} riches, sources: {', '.join(sorted(sources)[:3])}")
         ok += 1
 
+    for slug in recorded.keys() - mapping.keys():
+        del recorded[slug]  # Plus aucun fichier OEM : bloc laissé en place, plus suivi
+
+    if not args.dry_run:
+        save_manifest(manifest)
+
     print(f"\nRésultat : {ok} gammes enrichies | {skip_no_data} sans données | {skip_filter} filtrées | {skip_protected} protégées | {skip_already} déjà oem_verified")
+    print(f"  Incrémental : {skip_corpus_unchanged} gammes sans changement corpus | {skip_block_unchanged} blocs identiques (non réécrits)")
 
     # Rapport gammes sans couverture
     covered = set(mapping.keys())
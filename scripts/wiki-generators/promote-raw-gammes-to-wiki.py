@@ -18,6 +18,11 @@ Configurable via env :
 Usage Phase A :
   python3 scripts/wiki-generators/promote-raw-gammes-to-wiki.py --gamme <slug> --dry-run [--verbose]
 
+Usage batch (web corpus parsed once into a slug → entries index, gammes across a process pool,
+one aggregated run log) :
+  python3 scripts/wiki-generators/promote-raw-gammes-to-wiki.py --all --dry-run [--jobs N]
+  python3 scripts/wiki-generators/promote-raw-gammes-to-wiki.py --gammes-file gammes.txt --dry-run
+
 Refs :
   - Plan : ~/.claude/plans/verdict-verdict-oui-avec-cheeky-catmull.md
   - Schema : automecanik-wiki/_meta/schema/entity-data/gamme.schema.json (v2.0.0)
@@ -30,7 +35,9 @@ import json
 import uuid
 import hashlib
 import argparse
+import traceback
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -41,6 +48,9 @@ except ImportError:
     sys.stderr.write("Manque : pip install pyyaml jsonschema\n")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import frontmatter_cache
+
 # === ENV CONFIG (mirror gamme-from-web-corpus-generator.py convention) ===
 RAW_REPO = Path(os.getenv("AUTOMECANIK_RAW_PATH", "/opt/automecanik/automecanik-raw"))
 WIKI_REPO = Path(os.getenv("AUTOMECANIK_WIKI_PATH", "/opt/automecanik/automecanik-wiki"))
@@ -82,12 +92,17 @@ def parse_frontmatter(content):
         body_lines = [line[len(indent):] if line.startswith(indent) else line
                       for line in body.split("\n")]
         body = "\n".join(body_lines)
-    fm = yaml.safe_load(fm_text)
+    fm = frontmatter_cache.safe_load(fm_text)
     if not isinstance(fm, dict):
         return None
     return {"frontmatter": fm, "body": body.strip(), "indent": len(indent)}
 
 
+def parse_frontmatter_file(path):
+    """parse_frontmatter of a file, memoized in frontmatter_cache."""
+    return frontmatter_cache.cached_parse(path, "promote.parse_frontmatter@1", parse_frontmatter)
+
+
 def is_rag_recycled_candidate(frontmatter):
     """Detect RAG-enriched content for candidate requalification (canon doctrine 2026-05-27).
 
@@ -135,8 +150,7 @@ def read_raw_gamme(path):
     """
     if not path.exists():
         raise FileNotFoundError(f"RAW gamme not found: {path}")
-    content = path.read_text(encoding="utf-8")
-    parsed = parse_frontmatter(content)
+    parsed = parse_frontmatter_file(path)
     if parsed is None:
         raise ValueError(f"No YAML frontmatter in {path}")
     fm_full = parsed["frontmatter"]
@@ -152,65 +166,70 @@ def read_raw_gamme(path):
     }
 
 
-def _web_file_matches_slug(fm, slug):
-    """Check if a web file frontmatter matches the gamme slug.
+def _web_corpus_entry(fm, body, path, slug):
+    """Build the aggregated web corpus entry of one web file for one matched slug."""
+    # B1.2 : detect mapped_gammes (Convention B) for matched_kind metadata
+    matched_kind = "slug_gamme" if fm.get("slug_gamme") == slug else "mapped_gammes"
+    all_mapped = fm.get("mapped_gammes") if isinstance(fm.get("mapped_gammes"), list) else None
+    if not all_mapped and fm.get("slug_gamme"):
+        all_mapped = [fm.get("slug_gamme")]
+    return {
+        "slug_gamme": slug,
+        "matched_kind": matched_kind,
+        "all_mapped_gammes": all_mapped or [],
+        "source_uri": fm.get("source_uri") or fm.get("source_url"),
+        "source_domain": fm.get("source_domain"),
+        "title": fm.get("title"),
+        "body": body,
+        "content_hash": fm.get("content_hash"),
+        "truth_level": fm.get("truth_level"),
+        "ingested_by": fm.get("ingested_by"),
+        # B1.2 : capture vehicles from explicit frontmatter (NEVER body-inferred)
+        "frontmatter_vehicles": fm.get("vehicles") if isinstance(fm.get("vehicles"), list) else None,
+        "frontmatter_extra": {k: v for k, v in fm.items() if k in ("vehicles", "compatibility", "motorisations")},
+        "path": str(path),
+    }
+
 
-    B1.2 : support 2 conventions :
+def build_web_corpus_index(web_dir):
+    """Parse web/*.md OEM-scraped corpus ONCE into an inverted index slug → entries.
+
+    B1.2 : a file is attached to every slug it matches, 2 conventions :
       - Convention A (418 files) : slug_gamme scalar
       - Convention B (Hella/NGK) : mapped_gammes array
+    Entries per slug keep sorted file order (= `aggregate_web_corpus_by_slug(web_dir, slug)`).
     """
-    if fm.get("slug_gamme") == slug:
-        return True
-    mapped = fm.get("mapped_gammes")
-    if isinstance(mapped, list) and slug in mapped:
-        return True
-    return False
+    index = {}
+    if not web_dir.exists():
+        return index
+    for f in sorted(web_dir.glob("*.md")):
+        try:
+            parsed = parse_frontmatter_file(f)
+        except (OSError, yaml.YAMLError):
+            continue
+        if parsed is None:
+            continue
+        fm = parsed["frontmatter"]
+        if not (fm.get("source_uri") or fm.get("source_url")):
+            continue  # Guard : web source sans URL traçable = REFUS
+        slugs = []
+        if isinstance(fm.get("slug_gamme"), str):
+            slugs.append(fm["slug_gamme"])
+        mapped = fm.get("mapped_gammes")
+        if isinstance(mapped, list):
+            slugs.extend(s for s in mapped if isinstance(s, str) and s not in slugs)
+        for slug in slugs:
+            index.setdefault(slug, []).append(_web_corpus_entry(fm, parsed["body"], f, slug))
+    return index
 
 
 def aggregate_web_corpus_by_slug(web_dir, slug):
     """Read web/*.md OEM-scraped corpus, return entries with slug_gamme==slug + source_uri.
 
     Tolerant parser supports Convention A (indented frontmatter) + B (non-indented + mapped_gammes).
+    Batch mode : build `build_web_corpus_index` once instead of calling this per gamme.
     """
-    results = []
-    if not web_dir.exists():
-        return results
-    for f in sorted(web_dir.glob("*.md")):
-        try:
-            content = f.read_text(encoding="utf-8")
-            parsed = parse_frontmatter(content)
-            if parsed is None:
-                continue
-            fm = parsed["frontmatter"]
-            if not _web_file_matches_slug(fm, slug):
-                continue
-            source_uri = fm.get("source_uri") or fm.get("source_url")
-            if not source_uri:
-                continue  # Guard : web source sans URL traçable = REFUS
-            # B1.2 : detect mapped_gammes (Convention B) for matched_kind metadata
-            matched_kind = "slug_gamme" if fm.get("slug_gamme") == slug else "mapped_gammes"
-            all_mapped = fm.get("mapped_gammes") if isinstance(fm.get("mapped_gammes"), list) else None
-            if not all_mapped and fm.get("slug_gamme"):
-                all_mapped = [fm.get("slug_gamme")]
-            results.append({
-                "slug_gamme": slug,
-                "matched_kind": matched_kind,
-                "all_mapped_gammes": all_mapped or [],
-                "source_uri": source_uri,
-                "source_domain": fm.get("source_domain"),
-                "title": fm.get("title"),
-                "body": parsed["body"],
-                "content_hash": fm.get("content_hash"),
-                "truth_level": fm.get("truth_level"),
-                "ingested_by": fm.get("ingested_by"),
-                # B1.2 : capture vehicles from explicit frontmatter (NEVER body-inferred)
-                "frontmatter_vehicles": fm.get("vehicles") if isinstance(fm.get("vehicles"), list) else None,
-                "frontmatter_extra": {k: v for k, v in fm.items() if k in ("vehicles", "compatibility", "motorisations")},
-                "path": str(f),
-            })
-        except (OSError, yaml.YAMLError):
-            continue
-    return results
+    return build_web_corpus_index(web_dir).get(slug, [])
 
 
 # === B3 : compatibility-url-json ingest (PROD runtime proof source) ===
@@ -1252,9 +1271,10 @@ def _build_body_markdown(raw, dimensions):
 
 
 def build_proposal_v2(raw, web_corpus, dimensions, schema_option):
-    """Build WIKI v2.0.0 proposal text (frontmatter YAML + body markdown).
+    """Build WIKI v2.0.0 proposal : (text = frontmatter YAML + body markdown, frontmatter dict).
 
     Phase A Option C (default) : dimensions dans body + review_notes, pas entity_data.dimensions.
+    The frontmatter dict is the one rendered into the text : validate it directly (no YAML round-trip).
     """
     fm_full = raw["frontmatter_full"]
     safe_tax = raw["safe_taxonomic_fields"]
@@ -1346,7 +1366,30 @@ def build_proposal_v2(raw, web_corpus, dimensions, schema_option):
 
     body = _build_body_markdown(raw, dimensions)
     fm_yaml = yaml.dump(proposal_fm, sort_keys=False, allow_unicode=True, default_flow_style=False)
-    return "---\n" + fm_yaml + "---\n\n" + body
+    return "---\n" + fm_yaml + "---\n\n" + body, proposal_fm
+
+
+# Compiled validators, one per schema file version (path, mtime_ns) per process
+_SCHEMA_VALIDATORS = {}
+
+
+def _schema_validator():
+    """gamme.schema.json validator, compiled once per process (recompiled if the schema file changes).
+
+    Same semantics as jsonschema.validate : draft from $schema, schema checked once, no format assertion.
+    """
+    mtime_ns = SCHEMA_PATH.stat().st_mtime_ns
+    key = str(SCHEMA_PATH)
+    cached = _SCHEMA_VALIDATORS.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    with open(SCHEMA_PATH) as f:
+        schema = json.load(f)
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    _SCHEMA_VALIDATORS[key] = (mtime_ns, validator)
+    return validator
 
 
 def validate_schema(frontmatter, schema_option):
@@ -1356,8 +1399,7 @@ def validate_schema(frontmatter, schema_option):
     Option A/B (Task 8a additive) : keeps `dimensions` key, validates against schema v2.1.0.
     """
     try:
-        with open(SCHEMA_PATH) as f:
-            schema = json.load(f)
+        validator = _schema_validator()
     except (OSError, json.JSONDecodeError) as e:
         return {"valid": False, "errors": [f"schema_load_failed: {e}"]}
     ed = frontmatter.get("entity_data", {}) or {}
@@ -1367,11 +1409,11 @@ def validate_schema(frontmatter, schema_option):
     else:
         # Option A/B : v2.2.0 schema accepts both dimensions (v2.1.0) and decision_brief (v2.2.0) natively
         ed_to_validate = ed
-    try:
-        jsonschema.validate(ed_to_validate, schema)
+    # Same error selection as jsonschema.validate (best_match)
+    error = jsonschema.exceptions.best_match(validator.iter_errors(ed_to_validate))
+    if error is None:
         return {"valid": True, "errors": []}
-    except jsonschema.ValidationError as e:
-        return {"valid": False, "errors": [str(e.message)]}
+    return {"valid": False, "errors": [str(error.message)]}
 # === Task 7 : structured run log writer ===
 
 def write_run_log(run_data):
@@ -1383,12 +1425,234 @@ def write_run_log(run_data):
     return path
 
 
+def promote_gamme(slug, web, compat_data=None, schema_option=SCHEMA_OPTION_DEFAULT):
+    """Per-gamme pipeline : RAW → extract_dimensions → build_proposal_v2 → anti-filler + validate_schema.
+
+    Pure (no writes) so batch mode can run it in a process pool.
+    Returns {"slug", "proposal", "content_hash", "variant_readiness", "record"} ;
+    `record` is the gamme entry of the run log (`gammes_processed`).
+    """
+    raw_path = GAMMES_DIR / f"{slug}.md"
+    raw = read_raw_gamme(raw_path)
+
+    # Extract dimensions + post-extraction projection (decision_brief facets) + evaluate gates
+    dims = extract_dimensions(raw, web, compatibility_url_data=compat_data)
+    # Task 8c (2026-05-28, additive) — project decision_brief from extracted dimensions.
+    # Post-processor : reads from already-extracted dimensions, does NOT touch RAW. None-safe.
+    dims["decision_brief"] = derive_decision_brief(dims)
+    vr = evaluate_variant_readiness(dims, is_r2_sensitive=True)
+
+    # Build proposal + anti-filler + schema validation
+    proposal, fm = build_proposal_v2(raw, web, dims, schema_option=schema_option)
+    body_only = proposal.split("---\n", 2)[2] if proposal.count("---\n") >= 2 else proposal
+    af = validate_anti_filler(body_only)
+    sv = validate_schema(fm, schema_option=schema_option)
+    chash = compute_content_hash(body_only)
+
+    record = {
+        "slug": slug,
+        "status": vr["status"],
+        "raw_source": str(raw_path),
+        "raw_is_rag_candidate": raw["is_rag_candidate"],
+        "oem_sources_count": sum(1 for r in dims["source_refs"] if r.get("kind") == "oem_web"),
+        "tier1_sources_count": sum(1 for r in dims["source_refs"] if r.get("tier") == "tier1"),
+        "tier2_sources_count": sum(1 for r in dims["source_refs"] if r.get("tier") == "tier2"),
+        "rag_candidate_sources_count": sum(1 for r in dims["source_refs"]
+                                           if r.get("tier") == "rag_recycled_candidate"),
+        "content_hash": chash,
+        "schema_valid": sv["valid"],
+        "schema_errors": sv.get("errors", []),
+        "anti_filler": af,
+        "variant_readiness": vr,
+        "web_relations": dims.get("web_relations", []),
+        "web_with_vehicle_evidence": sum(1 for rel in dims.get("web_relations", [])
+                                         if rel.get("relation_status") == "VEHICLE_EVIDENCE_PRESENT"),
+        "web_no_vehicle_evidence": sum(1 for rel in dims.get("web_relations", [])
+                                       if rel.get("relation_status") == "NO_VEHICLE_EVIDENCE"),
+        "compatibility_proven_by_url_count": len(dims.get("compatibility_proven_by_url", [])),
+        "compatibility_factors_source_kind": dims.get("compatibility_factors", {}).get("source_kind"),
+        "decision_brief_present": bool(dims.get("decision_brief")),
+        "decision_brief_source_kind": (dims.get("decision_brief") or {}).get("source_kind"),
+        "decision_brief_cross_check_status": (dims.get("decision_brief") or {}).get("cross_check_status"),
+        # Issue 3 fix (2026-05-28) : explicit quality verdict for downstream consumers
+        # (wiki sas reviewers + future batch aggregators). Maps source_kind 1:1 :
+        #   deterministic_transform -> STRONG (all facets from CONFIRMED dimensions)
+        #   rag_candidate           -> DATA_WEAK (requires_review humain, NOT a FAIL)
+        #   no decision_brief       -> NOT_APPLICABLE (insufficient inputs)
+        "decision_brief_quality_verdict": (
+            "STRONG" if (dims.get("decision_brief") or {}).get("source_kind") == "deterministic_transform"
+            else "DATA_WEAK" if (dims.get("decision_brief") or {}).get("source_kind") == "rag_candidate"
+            else "NOT_APPLICABLE"
+        ),
+        "related_parts_filtered_count": dims.get("related_parts_filtered_count", 0),
+    }
+    return {
+        "slug": slug,
+        "raw": raw,
+        "web_corpus_files": len(web),
+        "proposal": proposal,
+        "content_hash": chash,
+        "anti_filler": af,
+        "schema_validation": sv,
+        "variant_readiness": vr,
+        "record": record,
+    }
+
+
+def _promote_batch_item(task):
+    """Process-pool worker : (slug, web entries, compat_data, schema_option) → result or error.
+
+    Any exception is caught so one bad gamme never aborts the batch (nor breaks the pool).
+    """
+    slug, web, compat_data, schema_option = task
+    try:
+        return promote_gamme(slug, web, compat_data=compat_data, schema_option=schema_option)
+    except Exception as e:
+        return {"slug": slug, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+
+
+def write_proposal(slug, proposal, chash):
+    """Write wiki/proposals/<slug>.md. Idempotent : SKIP_UNCHANGED if content_hash identical.
+
+    Returns ("written" | "skip_unchanged", path).
+    """
+    PROPOSALS_DIR.mkdir(parents=True, exist_ok=True)
+    proposal_path = PROPOSALS_DIR / f"{slug}.md"
+    # Idempotence check
+    if proposal_path.exists():
+        existing = proposal_path.read_text(encoding="utf-8")
+        existing_body = existing.split("---\n", 2)[2] if existing.count("---\n") >= 2 else existing
+        if compute_content_hash(existing_body) == chash:
+            return "skip_unchanged", proposal_path
+    proposal_path.write_text(proposal, encoding="utf-8")
+    return "written", proposal_path
+
+
+def _base_run_data(scope, scope_input, dry_run, schema_option):
+    """Run log header shared by single-gamme and batch modes."""
+    return {
+        "run_id": str(uuid.uuid4()),
+        "script_version": "v0.1",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "scope": scope,
+        "scope_input": scope_input,
+        "dry_run": dry_run,
+        "schema_option": schema_option,
+        "generation_mode": "deterministic_transform_only",
+        "llm_used": False,
+        "paraphrase_used": False,
+        "sources_only": True,
+    }
+
+
+def read_gammes_file(path):
+    """Read a gammes list file : one slug per line, blank lines + `#` comments ignored."""
+    slugs = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line and line not in slugs:
+            slugs.append(line)
+    return slugs
+
+
+def run_batch(slugs, scope_input, args, schema_option, compat_data=None):
+    """Batch mode : parse web corpus once (slug → entries index), promote gammes across a process pool.
+
+    compat_data (B2/B4 JSON) is only applied to the gamme named by its `gamme_focus`.
+    Writes (non-dry-run) stay sequential in the parent, same guards as single mode.
+    Emits ONE aggregated run log. Returns exit code (2 if a non-dry run is not unlocked,
+    before any work ; 1 if any gamme errored).
+    """
+    # Non-dry-run write guard, same as single mode, checked before the pool starts
+    if not args.dry_run:
+        if not args.owner_go:
+            sys.stderr.write("⚠️  Non-dry-run mode requires --owner-go flag (Task 8 owner gate). "
+                             "Aborting safely.\n")
+            return 2
+        if schema_option == "C":
+            sys.stderr.write("⚠️  SCHEMA_OPTION=C : Phase A stays dry-run only "
+                             "(schema unchanged, dimensions in body only). Set SCHEMA_OPTION=A or B "
+                             "to enable real write.\n")
+            return 2
+
+    started = datetime.now(timezone.utc)
+    web_index = build_web_corpus_index(WEB_DIR)
+    if args.verbose:
+        web_files = len({e["path"] for entries in web_index.values() for e in entries})
+        sys.stderr.write(f"[promote] batch gammes={len(slugs)} web_corpus_files={web_files} "
+                         f"web_corpus_slugs={len(web_index)}\n")
+
+    focus = compat_data.get("gamme_focus") if compat_data else None
+    tasks = [(slug, web_index.get(slug, []), compat_data if focus == slug else None, schema_option)
+             for slug in slugs]
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(tasks) or 1))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_promote_batch_item, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    else:
+        results = [_promote_batch_item(task) for task in tasks]
+
+    can_write = not args.dry_run
+    gammes_processed = []
+    for result in results:
+        if "error" in result:
+            gammes_processed.append({"slug": result["slug"], "status": "ERROR", "error": result["error"],
+                                     "traceback": result["traceback"]})
+            print(f"{result['slug']:<45} ERROR {result['error']}")
+            continue
+        record = result["record"]
+        if can_write:
+            if record["status"] in ("FAIL_NOT_VARIANT_READY", "FAIL_UNTRACED_RAG_PROMOTION"):
+                record["write"] = "blocked"
+            else:
+                try:
+                    record["write"], _ = write_proposal(result["slug"], result["proposal"], result["content_hash"])
+                except OSError as e:
+                    gammes_processed.append({"slug": result["slug"], "status": "ERROR",
+                                             "error": f"{type(e).__name__}: {e}",
+                                             "traceback": traceback.format_exc()})
+                    print(f"{result['slug']:<45} ERROR {type(e).__name__}: {e}")
+                    continue
+        gammes_processed.append(record)
+        print(f"{result['slug']:<45} {record['status']:<30} schema_valid={record['schema_valid']}"
+              + (f" write={record['write']}" if "write" in record else ""))
+
+    by_status = {}
+    for record in gammes_processed:
+        by_status[record["status"]] = by_status.get(record["status"], 0) + 1
+    run_data = _base_run_data("batch", scope_input, args.dry_run, schema_option)
+    run_data["started_at"] = started.isoformat()
+    run_data["batch_summary"] = {
+        "gammes_total": len(slugs),
+        "by_status": by_status,
+        "schema_invalid": sum(1 for r in gammes_processed if r.get("schema_valid") is False),
+        "errors": by_status.get("ERROR", 0),
+        "written": sum(1 for r in gammes_processed if r.get("write") == "written"),
+        "web_corpus_slugs": len(web_index),
+        "jobs": jobs,
+        "duration_ms": int((datetime.now(timezone.utc) - started).total_seconds() * 1000),
+    }
+    run_data["gammes_processed"] = gammes_processed
+
+    print("\nRUN SUMMARY:")
+    print(json.dumps(run_data["batch_summary"], indent=2, ensure_ascii=False))
+    log_path = write_run_log(run_data)
+    sys.stderr.write(f"[promote] run_log_written={log_path}\n")
+    return 1 if by_status.get("ERROR") else 0
+
+
 def main():
-    """Phase A CLI : --gamme <slug> --dry-run --verbose only (refuse autres flags)."""
+    """Phase A CLI : --gamme <slug> --dry-run --verbose ; batch : --all | --gammes-file <path> [--jobs N]."""
     parser = argparse.ArgumentParser(
-        description="Promote RAW v5 SSOT gamme to WIKI v2.0.0 proposal (Phase A single-gamme).",
+        description="Promote RAW v5 SSOT gamme to WIKI v2.0.0 proposal (Phase A single-gamme or batch).",
     )
-    parser.add_argument("--gamme", required=True, help="Single gamme slug (Phase A LOCKED)")
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--gamme", help="Single gamme slug (Phase A LOCKED)")
+    scope.add_argument("--all", action="store_true", help="Batch : every RAW gamme in GAMMES_DIR")
+    scope.add_argument("--gammes-file", type=str, default=None,
+                       help="Batch : file with one gamme slug per line (# comments allowed)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Batch : worker processes (default : CPU count)")
     parser.add_argument("--dry-run", action="store_true", help="No writes, stdout report only")
     parser.add_argument("--verbose", action="store_true", help="Per-step trace")
     parser.add_argument("--owner-go", action="store_true",
@@ -1398,16 +1662,6 @@ def main():
     args = parser.parse_args()
 
     schema_option = os.getenv("SCHEMA_OPTION", SCHEMA_OPTION_DEFAULT)
-    raw_path = GAMMES_DIR / f"{args.gamme}.md"
-
-    if args.verbose:
-        sys.stderr.write(f"[promote] gamme={args.gamme} dry_run={args.dry_run} "
-                         f"schema_option={schema_option}\n")
-        sys.stderr.write(f"[promote] RAW={raw_path}\n")
-
-    # Read RAW + aggregate web corpus
-    raw = read_raw_gamme(raw_path)
-    web = aggregate_web_corpus_by_slug(WEB_DIR, args.gamme)
 
     # B3 : optional compatibility-url-json ingest (PROD runtime proof)
     compat_data = None
@@ -1419,31 +1673,34 @@ def main():
                              f"{compat_data['url_count']} proven URLs "
                              f"(filtered status 200 from {compat_data['url_count_total_input']})\n")
 
-    if args.verbose:
-        sys.stderr.write(f"[promote] is_rag_candidate={raw['is_rag_candidate']} "
-                         f"web_corpus_files={len(web)}\n")
+    if args.all or args.gammes_file:
+        if args.all:
+            slugs, scope_input = sorted(p.stem for p in GAMMES_DIR.glob("*.md")), "all"
+        else:
+            slugs, scope_input = read_gammes_file(args.gammes_file), args.gammes_file
+        return run_batch(slugs, scope_input, args, schema_option, compat_data=compat_data)
+
+    raw_path = GAMMES_DIR / f"{args.gamme}.md"
 
-    # Extract dimensions + post-extraction projection (decision_brief facets) + evaluate gates
-    dims = extract_dimensions(raw, web, compatibility_url_data=compat_data)
-    # Task 8c (2026-05-28, additive) — project decision_brief from extracted dimensions.
-    # Post-processor : reads from already-extracted dimensions, does NOT touch RAW. None-safe.
-    dims["decision_brief"] = derive_decision_brief(dims)
-    vr = evaluate_variant_readiness(dims, is_r2_sensitive=True)
     if args.verbose:
-        sys.stderr.write(f"[promote] variant_readiness={vr['status']} "
-                         f"({vr['dimensions_count']} dim, {vr['dimensions_confirmed_count']} confirmed)\n")
+        sys.stderr.write(f"[promote] gamme={args.gamme} dry_run={args.dry_run} "
+                         f"schema_option={schema_option}\n")
+        sys.stderr.write(f"[promote] RAW={raw_path}\n")
 
-    # Build proposal + anti-filler + schema validation
-    proposal = build_proposal_v2(raw, web, dims, schema_option=schema_option)
-    body_only = proposal.split("---\n", 2)[2] if proposal.count("---\n") >= 2 else proposal
-    af = validate_anti_filler(body_only)
-    fm = yaml.safe_load(proposal.split("---\n")[1])
-    sv = validate_schema(fm, schema_option=schema_option)
-    chash = compute_content_hash(body_only)
-    run_id = str(uuid.uuid4())
+    # Read RAW + aggregate web corpus, then run the per-gamme pipeline
+    web = aggregate_web_corpus_by_slug(WEB_DIR, args.gamme)
+    result = promote_gamme(args.gamme, web, compat_data=compat_data, schema_option=schema_option)
+    proposal = result["proposal"]
+    vr = result["variant_readiness"]
+    chash = result["content_hash"]
 
     if args.verbose:
-        sys.stderr.write(f"[promote] anti_filler={af['pass']} schema_valid={sv['valid']} "
+        sys.stderr.write(f"[promote] is_rag_candidate={result['raw']['is_rag_candidate']} "
+                         f"web_corpus_files={len(web)}\n")
+        sys.stderr.write(f"[promote] variant_readiness={vr['status']} "
+                         f"({vr['dimensions_count']} dim, {vr['dimensions_confirmed_count']} confirmed)\n")
+        sys.stderr.write(f"[promote] anti_filler={result['anti_filler']['pass']} "
+                         f"schema_valid={result['schema_validation']['valid']} "
                          f"content_hash={chash[:16]}...\n")
 
     # Print proposal to stdout (always — for verbose review)
@@ -1452,56 +1709,8 @@ def main():
     print("=" * 70)
 
     # Print run log JSON (always — for traceability)
-    run_data = {
-        "run_id": run_id,
-        "script_version": "v0.1",
-        "started_at": datetime.now(timezone.utc).isoformat(),
-        "scope": "gamme",
-        "scope_input": args.gamme,
-        "dry_run": args.dry_run,
-        "schema_option": schema_option,
-        "generation_mode": "deterministic_transform_only",
-        "llm_used": False,
-        "paraphrase_used": False,
-        "sources_only": True,
-        "gammes_processed": [{
-            "slug": args.gamme,
-            "status": vr["status"],
-            "raw_source": str(raw_path),
-            "raw_is_rag_candidate": raw["is_rag_candidate"],
-            "oem_sources_count": sum(1 for r in dims["source_refs"] if r.get("kind") == "oem_web"),
-            "tier1_sources_count": sum(1 for r in dims["source_refs"] if r.get("tier") == "tier1"),
-            "tier2_sources_count": sum(1 for r in dims["source_refs"] if r.get("tier") == "tier2"),
-            "rag_candidate_sources_count": sum(1 for r in dims["source_refs"]
-                                               if r.get("tier") == "rag_recycled_candidate"),
-            "content_hash": chash,
-            "schema_valid": sv["valid"],
-            "schema_errors": sv.get("errors", []),
-            "anti_filler": af,
-            "variant_readiness": vr,
-            "web_relations": dims.get("web_relations", []),
-            "web_with_vehicle_evidence": sum(1 for rel in dims.get("web_relations", [])
-                                             if rel.get("relation_status") == "VEHICLE_EVIDENCE_PRESENT"),
-            "web_no_vehicle_evidence": sum(1 for rel in dims.get("web_relations", [])
-                                           if rel.get("relation_status") == "NO_VEHICLE_EVIDENCE"),
-            "compatibility_proven_by_url_count": len(dims.get("compatibility_proven_by_url", [])),
-            "compatibility_factors_source_kind": dims.get("compatibility_factors", {}).get("source_kind"),
-            "decision_brief_present": bool(dims.get("decision_brief")),
-            "decision_brief_source_kind": (dims.get("decision_brief") or {}).get("source_kind"),
-            "decision_brief_cross_check_status": (dims.get("decision_brief") or {}).get("cross_check_status"),
-            # Issue 3 fix (2026-05-28) : explicit quality verdict for downstream consumers
-            # (wiki sas reviewers + future batch aggregators). Maps source_kind 1:1 :
-            #   deterministic_transform -> STRONG (all facets from CONFIRMED dimensions)
-            #   rag_candidate           -> DATA_WEAK (requires_review humain, NOT a FAIL)
-            #   no decision_brief       -> NOT_APPLICABLE (insufficient inputs)
-            "decision_brief_quality_verdict": (
-                "STRONG" if (dims.get("decision_brief") or {}).get("source_kind") == "deterministic_transform"
-                else "DATA_WEAK" if (dims.get("decision_brief") or {}).get("source_kind") == "rag_candidate"
-                else "NOT_APPLICABLE"
-            ),
-            "related_parts_filtered_count": dims.get("related_parts_filtered_count", 0),
-        }],
-    }
+    run_data = _base_run_data("gamme", args.gamme, args.dry_run, schema_option)
+    run_data["gammes_processed"] = [result["record"]]
     print("\nRUN LOG:")
     print(json.dumps(run_data, indent=2, ensure_ascii=False))
 
@@ -1529,16 +1738,10 @@ def main():
             sys.stderr.write(f"⚠️  Variant-readiness {vr['status']} blocks write. Aborting.\n")
             return 3
         # Owner GO + Option A/B + readiness OK → write to wiki/proposals/<slug>.md
-        PROPOSALS_DIR.mkdir(parents=True, exist_ok=True)
-        proposal_path = PROPOSALS_DIR / f"{args.gamme}.md"
-        # Idempotence check
-        if proposal_path.exists():
-            existing = proposal_path.read_text(encoding="utf-8")
-            existing_body = existing.split("---\n", 2)[2] if existing.count("---\n") >= 2 else existing
-            if compute_content_hash(existing_body) == chash:
-                sys.stderr.write(f"[promote] SKIP_UNCHANGED (content_hash identical) {proposal_path}\n")
-                return 0
-        proposal_path.write_text(proposal, encoding="utf-8")
+        outcome, proposal_path = write_proposal(args.gamme, proposal, chash)
+        if outcome == "skip_unchanged":
+            sys.stderr.write(f"[promote] SKIP_UNCHANGED (content_hash identical) {proposal_path}\n")
+            return 0
         sys.stderr.write(f"✅ Written {proposal_path}\n")
     return 0
 
@@ -0,0 +1,187 @@
+"""pytest suite for frontmatter_cache.py — shared parsed-frontmatter cache (SQLite sidecar).
+
+Imports via importlib.util.spec_from_file_location (single-file convention canon).
+"""
+import datetime
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parent / "frontmatter_cache.py"
+_spec = importlib.util.spec_from_file_location("frontmatter_cache", SCRIPT_PATH)
+fmc = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fmc)
+
+
+class CountingParser:
+    """parse(text) that records how many times it really ran."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        fm = fmc.safe_load(text.split("---\n")[1])
+        return {"frontmatter": fm, "body": text.split("---\n", 2)[2]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = fmc.FrontmatterCache(tmp_path / "cache.sqlite")
+    yield c
+    c.close()
+
+
+def _write(path, slug, body="Corps."):
+    path.write_text(f"---\nslug: {slug}\ncreated: 2026-05-27\n---\n{body}\n", encoding="utf-8")
+
+
+def test_unchanged_file_is_parsed_once(tmp_path, cache):
+    md = tmp_path / "vanne-egr.md"
+    _write(md, "vanne-egr")
+    parse = CountingParser()
+    first = cache.get(md, "test@1", parse)
+    second = cache.get(md, "test@1", parse)
+    assert parse.calls == 1
+    assert first == second
+    # YAML types survive the sidecar (datetime.date, not str)
+    assert str(second["frontmatter"]["created"]) == "2026-05-27"
+    assert type(second["frontmatter"]["created"]).__name__ == "date"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_value_is_a_fresh_copy(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    cache.get(md, "test@1", parse)["frontmatter"]["slug"] = "mutated"
+    assert cache.get(md, "test@1", parse)["frontmatter"]["slug"] == "a"
+
+
+def test_changed_content_is_reparsed(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    cache.get(md, "test@1", parse)
+    _write(md, "a-modified-and-longer")
+    assert cache.get(md, "test@1", parse)["frontmatter"]["slug"] == "a-modified-and-longer"
+    assert parse.calls == 2
+
+
+def test_touched_file_with_same_sha_is_not_reparsed(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    cache.get(md, "test@1", parse)
+    st = md.stat()
+    os.utime(md, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    cache.get(md, "test@1", parse)
+    assert parse.calls == 1
+
+
+def test_parsers_do_not_share_entries(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    cache.get(md, "test@1", parse)
+    cache.get(md, "test@2", parse)
+    assert parse.calls == 2
+    assert sorted(cache.stats()["parsers"]) == ["test@1", "test@2"]
+
+
+def test_parse_errors_are_not_cached(tmp_path, cache):
+    md = tmp_path / "broken.md"
+    md.write_text("---\nslug: [unclosed\n---\nbody\n", encoding="utf-8")
+    parse = CountingParser()
+    for _ in range(2):
+        with pytest.raises(fmc.yaml.YAMLError):
+            cache.get(md, "test@1", parse)
+    assert parse.calls == 2
+
+
+def test_missing_file_raises_file_not_found(tmp_path, cache):
+    with pytest.raises(FileNotFoundError):
+        cache.get(tmp_path / "does-not-exist.md", "test@1", CountingParser())
+
+
+def test_crlf_is_normalized_like_text_mode(tmp_path, cache):
+    md = tmp_path / "crlf.md"
+    md.write_bytes(b"---\r\nslug: crlf\r\n---\r\nbody\r\n")
+    assert cache.get(md, "test@1", CountingParser())["frontmatter"] == {"slug": "crlf"}
+
+
+def test_unwritable_cache_path_falls_back_to_plain_parse(tmp_path, monkeypatch):
+    monkeypatch.setenv("FRONTMATTER_CACHE_PATH", "/proc/nope/c.sqlite")
+    monkeypatch.setattr(fmc, "_default_cache", None)  # spec-loaded copy, not the conftest one
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    assert fmc.cached_parse(md, "test@1", parse)["frontmatter"]["slug"] == "a"
+    assert fmc.cached_parse(md, "test@1", parse)["frontmatter"]["slug"] == "a"
+    assert parse.calls == 2
+    with pytest.raises(OSError):
+        fmc.default_cache().stats()
+
+
+def test_cached_parse_disabled_by_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("FRONTMATTER_CACHE", "off")
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    parse = CountingParser()
+    fmc.cached_parse(md, "test@1", parse)
+    fmc.cached_parse(md, "test@1", parse)
+    assert parse.calls == 2
+    assert fmc.default_cache() is None
+
+
+def test_tagged_json_round_trips_non_json_types():
+    value = {
+        "date": datetime.date(2026, 5, 27),
+        "at": datetime.datetime(2026, 5, 27, 8, 30, tzinfo=datetime.timezone.utc),
+        "pair": ({"a": 1}, "body"),
+        "tags": {"x"},
+        "raw": b"\x00\xff",
+        "years": {2019: "ok", 2020: None},
+        "user": {"__t": "date", "v": "not-a-date"},
+        "nested": [1.5, True, None, ["s"]],
+    }
+    assert fmc.loads(fmc.dumps(value)) == value
+    assert fmc.loads(fmc.dumps(("fm", ""))) == ("fm", "")
+
+
+def test_values_are_stored_as_json_not_pickle(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    cache.get(md, "test@1", CountingParser())
+    (stored,) = cache._connection().execute("SELECT value FROM parsed").fetchone()
+    assert isinstance(stored, str)
+    assert fmc.loads(stored)["frontmatter"]["slug"] == "a"
+
+
+def test_pickle_era_table_is_dropped(tmp_path):
+    path = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(str(path))
+    conn.execute(fmc.SCHEMA.replace("TEXT NOT NULL,\n    PRIMARY", "BLOB NOT NULL,\n    PRIMARY"))
+    conn.execute("INSERT INTO parsed VALUES ('test@1', 'x', 0, 0, '', x'80049500')")
+    conn.commit()
+    conn.close()
+    cache = fmc.FrontmatterCache(path)
+    assert cache.stats()["parsers"] == {}
+    cache.close()
+
+
+def test_uncacheable_value_is_returned_but_not_cached(tmp_path, cache):
+    md = tmp_path / "a.md"
+    _write(md, "a")
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return {"obj": object()}
+
+    assert "obj" in cache.get(md, "test@1", parse)
+    cache.get(md, "test@1", parse)
+    assert len(calls) == 2
@@ -0,0 +1,228 @@
+"""pytest suite for gamme-from-web-corpus-generator.py — single-file convention canon.
+
+Imports via importlib.util.spec_from_file_location (no package, no sys.path mutation).
+"""
+import importlib.util
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).parent / "gamme-from-web-corpus-generator.py"
+_spec = importlib.util.spec_from_file_location("gamme_from_web_corpus_generator", SCRIPT_PATH)
+gen = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gen)
+
+FILLER = " Texte descriptif du fournisseur OEM." * 10
+
+
+def _substring_slugs(table, text_lower):
+    """Reference semantics : the former per-slug / per-keyword `in` scan."""
+    return {slug for slug, kws in table.items() if any(kw.lower() in text_lower for kw in kws)}
+
+
+def test_automaton_handles_overlapping_and_nested_keywords():
+    table = {
+        "capteur-abs": ["capteur ABS", "abs"],
+        "bague-abs": ["bague abs"],
+        "disque": ["disque"],
+        "disque-ventile": ["disque ventilé"],
+        "rien": ["introuvable"],
+    }
+    automaton = gen.KeywordAutomaton(table)
+    text = "la bague absorbe ; disque ventilé et capteur abs".lower()
+    assert automaton.match_slugs(text) == _substring_slugs(table, text)
+    assert automaton.match_slugs(text) == {"capteur-abs", "bague-abs", "disque", "disque-ventile"}
+    assert automaton.match_slugs("") == set()
+
+
+def test_automaton_matches_substring_scan_on_gamme_keywords():
+    automaton = gen.KeywordAutomaton(gen.GAMME_KEYWORDS)
+    samples = [
+        "Le disque de frein ventilé Brembo et les plaquettes de frein céramique.",
+        "Vanne EGR, capteur ABS, sonde lambda, TPMS et filtre à huile mann.",
+        "Kit de distribution avec pompe à eau ; courroie d'accessoire poly-V.",
+        "aucun mot-clé ici",
+    ]
+    for text in samples:
+        assert automaton.match_slugs(text.lower()) == _substring_slugs(gen.GAMME_KEYWORDS, text.lower())
+
+
+def _write_corpus_fixture(tmp_path, monkeypatch):
+    """Web corpus (OEM keyword file, slug_gamme file, non-OEM, too short) + 2 gammes under tmp_path."""
+    web_dir = tmp_path / "web"
+    gammes_dir = tmp_path / "gammes"
+    web_dir.mkdir()
+    gammes_dir.mkdir()
+    (web_dir / "a-brembo.md").write_text(
+        "---\nsource_url: https://www.bremboparts.com/disque\n---\n"
+        "Disque de frein ventilé en fonte grise, norme ECE R90." + FILLER + "\n",
+        encoding="utf-8",
+    )
+    (web_dir / "b-wiki.md").write_text(
+        "---\nsource_url: https://fr.wikipedia.org/wiki/Frein\nslug_gamme: plaquette-de-frein\n---\n"
+        "Disque de frein et plaquettes." + FILLER + "\n",
+        encoding="utf-8",
+    )
+    (web_dir / "c-non-oem.md").write_text(
+        "---\nsource_url: https://example.com/disque\n---\nDisque de frein." + FILLER + "\n",
+        encoding="utf-8",
+    )
+    (web_dir / "d-short.md").write_text(
+        "---\nsource_url: https://textar.com/x\n---\nDisque de frein.\n", encoding="utf-8")
+    for slug in ("disque-de-frein", "plaquette-de-frein"):
+        (gammes_dir / f"{slug}.md").write_text(
+            f"---\nslug: {slug}\nlast_enriched_by: human\nconseil_v5: x\n---\nCorps.\n", encoding="utf-8")
+    monkeypatch.setattr(gen, "WEB_DIR", str(web_dir))
+    monkeypatch.setattr(gen, "WEB_CATALOG_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(gen, "GAMMES_DIR", str(gammes_dir))
+    monkeypatch.setattr(gen, "MANIFEST_PATH", str(gammes_dir / ".web-corpus-manifest.json"))
+    return web_dir, gammes_dir
+
+
+def test_build_gamme_mapping_keyword_and_direct_slug(tmp_path, monkeypatch):
+    _write_corpus_fixture(tmp_path, monkeypatch)
+
+    mapping = gen.build_gamme_mapping(jobs=1)
+
+    assert [fd["file"] for fd in mapping["disque-de-frein"]] == ["a-brembo.md"]
+    # slug_gamme direct : no keyword matching for that file
+    assert [fd["file"] for fd in mapping["plaquette-de-frein"]] == ["b-wiki.md"]
+    entry = mapping["disque-de-frein"][0]
+    assert entry["domain"] == "bremboparts.com"
+    assert "ECE R90" in entry["tech_data"]["norms"]
+
+
+def test_refresh_manifest_only_rescans_changed_files(tmp_path, monkeypatch):
+    web_dir, _ = _write_corpus_fixture(tmp_path, monkeypatch)
+    manifest = gen.load_manifest()
+    mapping, affected, counts = gen.refresh_manifest(manifest, jobs=1)
+    assert counts == {"added": 4, "changed": 0, "removed": 0, "unchanged": 0}
+    assert affected == {"disque-de-frein", "plaquette-de-frein"}
+    gen.save_manifest(manifest)
+
+    manifest = gen.load_manifest()
+    scanned = []
+    real_scan = gen.scan_web_files
+    monkeypatch.setattr(gen, "scan_web_files", lambda paths, jobs=None: scanned.extend(paths) or real_scan(paths, jobs))
+    again, affected, counts = gen.refresh_manifest(manifest, jobs=1)
+    assert counts["unchanged"] == 4 and not affected and scanned == []
+    # Mapping rebuilt from the manifest is the full-scan mapping (JSON round-trip)
+    assert [fd["file"] for fd in again["disque-de-frein"]] == ["a-brembo.md"]
+    assert sorted(again["disque-de-frein"][0]["tech_data"]["norms"]) == sorted(mapping["disque-de-frein"][0]["tech_data"]["norms"])
+
+    (web_dir / "b-wiki.md").unlink()
+    (web_dir / "c-non-oem.md").write_text(
+        "---\nsource_url: https://textar.com/disque\n---\nDisque de frein." + FILLER + "\n", encoding="utf-8")
+    again, affected, counts = gen.refresh_manifest(manifest, jobs=1)
+    assert (counts["removed"], counts["changed"], counts["unchanged"]) == (1, 1, 2)
+    assert scanned == [str(web_dir / "c-non-oem.md")]
+    assert affected == {"disque-de-frein", "plaquette-de-frein"}
+    assert [fd["file"] for fd in again["disque-de-frein"]] == ["a-brembo.md", "c-non-oem.md"]
+    assert "plaquette-de-frein" not in again
+
+
+def test_manifest_ignored_when_rules_change(tmp_path, monkeypatch):
+    _write_corpus_fixture(tmp_path, monkeypatch)
+    manifest = gen.load_manifest()
+    gen.refresh_manifest(manifest, jobs=1)
+    gen.save_manifest(manifest)
+    monkeypatch.setattr(gen, "OEM_DOMAINS", gen.OEM_DOMAINS | {"example.com"})
+    assert gen.load_manifest()["files"] == {}
+
+
+def test_manifest_ignored_when_extraction_code_changes(tmp_path, monkeypatch):
+    _write_corpus_fixture(tmp_path, monkeypatch)
+    manifest = gen.load_manifest()
+    gen.refresh_manifest(manifest, jobs=1)
+    gen.save_manifest(manifest)
+    assert gen.load_manifest()["files"]
+
+    def _is_valid_value(num_str, unit):
+        return True  # Filtre modifié : plus aucun rejet
+
+    monkeypatch.setattr(gen, "_is_valid_value", _is_valid_value)
+    assert gen.load_manifest()["files"] == {}
+
+
+def test_inject_skips_write_when_block_unchanged(tmp_path, monkeypatch):
+    _, gammes_dir = _write_corpus_fixture(tmp_path, monkeypatch)
+    gamme_path = gammes_dir / "disque-de-frein.md"
+    files_data = gen.build_gamme_mapping(jobs=1)["disque-de-frein"]
+    block = gen.build_enrichment_block("disque-de-frein", files_data)
+
+    assert gen.inject_into_gamme(str(gamme_path), block) == "written"
+    written = gamme_path.read_text(encoding="utf-8")
+    assert "last_enriched_by: script:rag-enrich-from-web-corpus" in written
+
+    # Same block on another day : only _enriched_at differs → not rewritten
+    later = block.replace(block.split("_enriched_at: ")[1].split("\n")[0], "'2099-01-01'")
+    assert gen.inject_into_gamme(str(gamme_path), later) == "skip_unchanged"
+    assert gamme_path.read_text(encoding="utf-8") == written
+
+    changed = block.replace("_web_files_count: 1", "_web_files_count: 2")
+    assert gen.inject_into_gamme(str(gamme_path), changed) == "written"
+    assert gamme_path.read_text(encoding="utf-8").count("phase5_enrichment:") == 1
+
+
+def _run_main(monkeypatch, capsys, *argv):
+    monkeypatch.setattr("sys.argv", ["gamme-from-web-corpus-generator.py", "--jobs", "1", *argv])
+    gen.main()
+    return capsys.readouterr().out
+
+
+def test_main_skips_unchanged_gammes_unless_forced(tmp_path, monkeypatch, capsys):
+    _, gammes_dir = _write_corpus_fixture(tmp_path, monkeypatch)
+    assert "Résultat : 2 gammes enrichies" in _run_main(monkeypatch, capsys)
+    assert "Incrémental : 2 gammes sans changement corpus" in _run_main(monkeypatch, capsys)
+
+    # --force : every gamme is recomputed (identical blocks are still not rewritten)
+    out = _run_main(monkeypatch, capsys, "--force")
+    assert "Incrémental : 0 gammes sans changement corpus | 2 blocs identiques" in out
+    assert "phase5_enrichment:" in (gammes_dir / "disque-de-frein.md").read_text(encoding="utf-8")
+
+
+def test_main_reprocesses_reset_gamme_file(tmp_path, monkeypatch, capsys):
+    _, gammes_dir = _write_corpus_fixture(tmp_path, monkeypatch)
+    gamme_path = gammes_dir / "disque-de-frein.md"
+    original = gamme_path.read_text(encoding="utf-8")
+    _run_main(monkeypatch, capsys)
+    assert "phase5_enrichment:" in gamme_path.read_text(encoding="utf-8")
+
+    # Gamme reset (e.g. git checkout) with an unchanged corpus : the block is injected again
+    gamme_path.write_text(original, encoding="utf-8")
+    out = _run_main(monkeypatch, capsys)
+    assert "[OK]  disque-de-frein" in out
+    assert "Incrémental : 1 gammes sans changement corpus" in out
+    assert "phase5_enrichment:" in gamme_path.read_text(encoding="utf-8")
+    assert "Incrémental : 2 gammes sans changement corpus" in _run_main(monkeypatch, capsys)
+
+
+def test_main_updates_oem_verified_block_when_corpus_changes(tmp_path, monkeypatch, capsys):
+    web_dir, gammes_dir = _write_corpus_fixture(tmp_path, monkeypatch)
+    gamme_path = gammes_dir / "disque-de-frein.md"
+    _run_main(monkeypatch, capsys)
+    assert "_validation_status: oem_verified" in gamme_path.read_text(encoding="utf-8")
+
+    # Corpus file changed : the oem_verified block written by the script is rebuilt without --force
+    (web_dir / "a-brembo.md").write_text(
+        "---\nsource_url: https://www.bremboparts.com/disque\n---\n"
+        "Disque de frein ventilé en fonte grise, norme ECE R90 et SAE J2522." + FILLER + "\n",
+        encoding="utf-8",
+    )
+    out = _run_main(monkeypatch, capsys)
+    assert "[OK]  disque-de-frein" in out
+    assert "0 déjà oem_verified" in out
+    written = gamme_path.read_text(encoding="utf-8")
+    assert "SAE J2522" in written
+    assert written.count("phase5_enrichment:") == 1
+
+    # Block edited by hand since : left alone, only --force overwrites it
+    gamme_path.write_text(written.replace("SAE J2522", "SAE J2707"), encoding="utf-8")
+    (web_dir / "a-brembo.md").write_text(
+        "---\nsource_url: https://www.bremboparts.com/disque\n---\n"
+        "Disque de frein ventilé en fonte grise, norme ECE R90 et ISO 26867." + FILLER + "\n",
+        encoding="utf-8",
+    )
+    out = _run_main(monkeypatch, capsys)
+    assert "1 déjà oem_verified" in out
+    assert "SAE J2707" in gamme_path.read_text(encoding="utf-8")
+    _run_main(monkeypatch, capsys, "--force")
+    assert "ISO 26867" in gamme_path.read_text(encoding="utf-8")
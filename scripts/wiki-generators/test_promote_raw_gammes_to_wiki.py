@@ -270,7 +270,7 @@ def test_build_proposal_v2_vanne_egr_option_c():
     raw = promote.read_raw_gamme(VANNE_EGR_PATH)
     web = promote.aggregate_web_corpus_by_slug(promote.WEB_DIR, "vanne-egr")
     dims = promote.extract_dimensions(raw, web)
-    proposal_text = promote.build_proposal_v2(raw, web, dims, schema_option="C")
+    proposal_text, proposal_fm = promote.build_proposal_v2(raw, web, dims, schema_option="C")
     # Frontmatter v2.0.0 canon
     assert proposal_text.startswith("---\n")
     assert "schema_version: 2.0.0" in proposal_text
@@ -293,7 +293,7 @@ def test_build_proposal_v2_rag_candidate_flagged_in_review_notes():
     raw = promote.read_raw_gamme(VANNE_EGR_PATH)
     web = promote.aggregate_web_corpus_by_slug(promote.WEB_DIR, "vanne-egr")
     dims = promote.extract_dimensions(raw, web)
-    proposal_text = promote.build_proposal_v2(raw, web, dims, schema_option="C")
+    proposal_text, proposal_fm = promote.build_proposal_v2(raw, web, dims, schema_option="C")
     # review_notes should mention rag_recycled_candidate
     assert "rag_recycled_candidate" in proposal_text or "candidate" in proposal_text.lower()
 
@@ -302,11 +302,13 @@ def test_validate_schema_vanne_egr_passes():
     raw = promote.read_raw_gamme(VANNE_EGR_PATH)
     web = promote.aggregate_web_corpus_by_slug(promote.WEB_DIR, "vanne-egr")
     dims = promote.extract_dimensions(raw, web)
-    proposal_text = promote.build_proposal_v2(raw, web, dims, schema_option="C")
+    proposal_text, proposal_fm = promote.build_proposal_v2(raw, web, dims, schema_option="C")
     import yaml as _yaml
     fm_match = re.match(r'^---\n(.*?)\n---\n', proposal_text, re.DOTALL)
     fm = _yaml.safe_load(fm_match.group(1))
-    result = promote.validate_schema(fm, schema_option="C")
+    # build_proposal_v2 returns the rendered frontmatter dict : no YAML round-trip needed
+    assert fm == proposal_fm
+    result = promote.validate_schema(proposal_fm, schema_option="C")
     assert result["valid"] is True, f"Schema errors: {result.get('errors')}"
 
 
@@ -900,3 +902,147 @@ def test_extract_dimensions_no_new_dimensions_when_yaml_missing():
     assert dims["variants_summary"] == []
     # No maintenance YAML, no body km → maint is empty
     assert dims["maintenance_context"] == {}
+
+
+# === Batch mode tests : web corpus inverted index + process-pool promotion + aggregated run log ===
+
+def _write_batch_fixture(tmp_path, monkeypatch):
+    """Minimal RAW + web corpus + permissive schema under tmp_path (no /opt dependency)."""
+    gammes_dir = tmp_path / "gammes"
+    web_dir = tmp_path / "web"
+    gammes_dir.mkdir()
+    web_dir.mkdir()
+    for slug, pg_id in (("disque-de-frein", 82), ("plaquette-de-frein", 402)):
+        (gammes_dir / f"{slug}.md").write_text(
+            f"---\nslug: {slug}\ntitle: {slug}\npg_id: {pg_id}\ncategory: freinage\n"
+            f"intent_targets: [achat]\n---\n\nCorps RAW {slug}.\n",
+            encoding="utf-8",
+        )
+    # Convention A : indented frontmatter + slug_gamme scalar
+    (web_dir / "brembo-disque.md").write_text(
+        "        ---\n        slug_gamme: disque-de-frein\n        source_uri: https://bremboparts.com/disque\n"
+        "        source_domain: bremboparts.com\n        ---\n        Le disque assure le freinage.\n",
+        encoding="utf-8",
+    )
+    # Convention B : mapped_gammes array → indexed under both slugs
+    (web_dir / "textar-freinage.md").write_text(
+        "---\nmapped_gammes: [disque-de-frein, plaquette-de-frein]\nsource_url: https://textar.com/freinage\n"
+        "source_domain: textar.com\n---\nPlaquettes et disques.\n",
+        encoding="utf-8",
+    )
+    # No traceable URL → refused
+    (web_dir / "no-url.md").write_text("---\nslug_gamme: disque-de-frein\n---\nSans source.\n", encoding="utf-8")
+    schema_path = tmp_path / "gamme.schema.json"
+    schema_path.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(promote, "GAMMES_DIR", gammes_dir)
+    monkeypatch.setattr(promote, "WEB_DIR", web_dir)
+    monkeypatch.setattr(promote, "SCHEMA_PATH", schema_path)
+    monkeypatch.setattr(promote, "RUN_LOG_DIR", tmp_path / "runs")
+    return web_dir
+
+
+def test_build_web_corpus_index_matches_per_slug_aggregate(tmp_path, monkeypatch):
+    web_dir = _write_batch_fixture(tmp_path, monkeypatch)
+    index = promote.build_web_corpus_index(web_dir)
+    assert sorted(index) == ["disque-de-frein", "plaquette-de-frein"]
+    assert [e["matched_kind"] for e in index["disque-de-frein"]] == ["slug_gamme", "mapped_gammes"]
+    assert [e["source_uri"] for e in index["plaquette-de-frein"]] == ["https://textar.com/freinage"]
+    for slug, entries in index.items():
+        assert promote.aggregate_web_corpus_by_slug(web_dir, slug) == entries
+
+
+def test_read_gammes_file_skips_comments_and_duplicates(tmp_path):
+    path = tmp_path / "gammes.txt"
+    path.write_text("# freinage\ndisque-de-frein\n\nplaquette-de-frein  # R2\ndisque-de-frein\n", encoding="utf-8")
+    assert promote.read_gammes_file(path) == ["disque-de-frein", "plaquette-de-frein"]
+
+
+def test_run_batch_writes_one_aggregated_run_log(tmp_path, monkeypatch, capsys):
+    import argparse
+    import json as _json
+    _write_batch_fixture(tmp_path, monkeypatch)
+    args = argparse.Namespace(dry_run=True, owner_go=False, verbose=False, jobs=1)
+    code = promote.run_batch(["disque-de-frein", "plaquette-de-frein", "does-not-exist"], "test", args, "C")
+    assert code == 1  # does-not-exist → ERROR, others promoted
+    logs = list((tmp_path / "runs").glob("*.json"))
+    assert len(logs) == 1
+    run_data = _json.loads(logs[0].read_text())
+    assert run_data["scope"] == "batch"
+    assert [g["slug"] for g in run_data["gammes_processed"]] == ["disque-de-frein", "plaquette-de-frein", "does-not-exist"]
+    assert run_data["gammes_processed"][2]["status"] == "ERROR"
+    assert run_data["gammes_processed"][0]["oem_sources_count"] >= 1
+    assert run_data["batch_summary"]["errors"] == 1
+    assert "RUN SUMMARY" in capsys.readouterr().out
+
+
+def test_run_batch_records_unexpected_error_and_continues(tmp_path, monkeypatch):
+    import argparse
+    import json as _json
+    _write_batch_fixture(tmp_path, monkeypatch)
+    # intent_targets scalar → TypeError deep in extract_dimensions (not an OSError/ValueError)
+    (promote.GAMMES_DIR / "bad-gamme.md").write_text(
+        "---\nslug: bad-gamme\ntitle: bad\npg_id: 1\ncategory: freinage\nintent_targets: 5\n---\nCorps.\n",
+        encoding="utf-8",
+    )
+    args = argparse.Namespace(dry_run=True, owner_go=False, verbose=False, jobs=1)
+    code = promote.run_batch(["disque-de-frein", "bad-gamme", "plaquette-de-frein"], "test", args, "C")
+    assert code == 1
+    run_data = _json.loads(next((tmp_path / "runs").glob("*.json")).read_text())
+    bad = run_data["gammes_processed"][1]
+    assert bad["status"] == "ERROR" and bad["error"].startswith("TypeError:")
+    assert "Traceback (most recent call last)" in bad["traceback"]
+    assert run_data["gammes_processed"][2]["slug"] == "plaquette-de-frein"
+    assert run_data["gammes_processed"][2]["status"] != "ERROR"
+
+
+def test_run_batch_rejects_locked_non_dry_run_up_front(tmp_path, monkeypatch):
+    import argparse
+    _write_batch_fixture(tmp_path, monkeypatch)
+
+    def no_index(_web_dir):
+        raise AssertionError("web corpus indexed before the write guard")
+
+    monkeypatch.setattr(promote, "build_web_corpus_index", no_index)
+    # Same exit code as single mode : no --owner-go, or SCHEMA_OPTION=C
+    for owner_go, schema_option in ((False, "A"), (True, "C")):
+        args = argparse.Namespace(dry_run=False, owner_go=owner_go, verbose=False, jobs=2)
+        assert promote.run_batch(["disque-de-frein"], "test", args, schema_option) == 2
+    assert not list((tmp_path / "runs").glob("*.json"))
+
+
+# === Compiled schema validator + frontmatter dict returned by build_proposal_v2 ===
+
+def test_build_proposal_v2_returns_rendered_frontmatter(tmp_path, monkeypatch):
+    import yaml as _yaml
+    _write_batch_fixture(tmp_path, monkeypatch)
+    raw = promote.read_raw_gamme(promote.GAMMES_DIR / "disque-de-frein.md")
+    web = promote.aggregate_web_corpus_by_slug(promote.WEB_DIR, "disque-de-frein")
+    dims = promote.extract_dimensions(raw, web)
+    proposal_text, proposal_fm = promote.build_proposal_v2(raw, web, dims, schema_option="C")
+    assert _yaml.safe_load(proposal_text.split("---\n")[1]) == proposal_fm
+    assert proposal_fm["id"] == "gamme:disque-de-frein"
+
+
+def test_schema_validator_compiled_once_and_recompiled_on_change(tmp_path, monkeypatch):
+    import os as _os
+    schema_path = tmp_path / "gamme.schema.json"
+    schema_path.write_text('{"type": "object", "required": ["pg_id"]}', encoding="utf-8")
+    monkeypatch.setattr(promote, "SCHEMA_PATH", schema_path)
+    first = promote._schema_validator()
+    assert promote._schema_validator() is first
+    assert promote.validate_schema({"entity_data": {"pg_id": 1}}, schema_option="C")["valid"] is True
+    invalid = promote.validate_schema({"entity_data": {}}, schema_option="C")
+    assert invalid == {"valid": False, "errors": ["'pg_id' is a required property"]}
+    # Schema bump : new file version → new validator
+    schema_path.write_text('{"type": "object"}', encoding="utf-8")
+    st = schema_path.stat()
+    _os.utime(schema_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert promote._schema_validator() is not first
+    assert promote.validate_schema({"entity_data": {}}, schema_option="C")["valid"] is True
+
+
+def test_validate_schema_reports_schema_load_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(promote, "SCHEMA_PATH", tmp_path / "missing.schema.json")
+    result = promote.validate_schema({"entity_data": {}}, schema_option="C")
+    assert result["valid"] is False
+    assert result["errors"][0].startswith("schema_load_failed:")